@@ -0,0 +1,532 @@
+"""
+Dexter Batch Runner - vorbereitete Conversations aus JSONL
+
+Führt viele Analysten-Fragen (z.B. monatliche Reporting-Prompts pro Kunde)
+ohne interaktive CLI aus:
+- Jede Zeile der Eingabe ist eine Conversation in einer isolierten
+  DexterAgent-Session (eigene History, geteilter OpenAIService)
+- Konfigurierbare Parallelität, Zeitbudget pro Conversation
+- Model-Calls mit PRIORITY_BATCH (interaktive Chats haben Vorrang)
+- Ergebnisse werden als JSONL geschrieben, sobald eine Conversation fertig ist
+- Checkpoint/Resume: die Ausgabedatei ist der Checkpoint, mit --resume
+  werden bereits erfolgreiche IDs übersprungen
+- Zusammenfassung mit Durchsatz, Tokens und Kosten (PRICE_*_PER_1M)
+
+Eingabe (eine Conversation pro Zeile):
+    {"id": "kunde-042", "messages": ["Berechne den ROI ...", "Und der Break-Even?"]}
+    {"id": "kunde-043", "prompt": "Erstelle eine Verkaufsprognose ..."}
+
+Ausgabe (eine Zeile pro Conversation, in Fertigstellungs-Reihenfolge):
+    {"id": "kunde-042", "status": "ok", "responses": [...], "prompt_tokens": ..., "cost": ...}
+
+Verwendung:
+    python batch_runner.py prompts.jsonl --output results.jsonl --concurrency 8
+    python batch_runner.py prompts.jsonl --output results.jsonl --resume
+
+Author: Dexter Agent Development Team
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import math
+import sys
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, TextIO
+
+from config import BatchConfig, config
+from lib.ai.admission import PRIORITY_BATCH
+from lib.ai.metrics import SessionMetrics
+from lib.ai.openai_service import OpenAIService, close_shared_async_clients
+from lib.logging_setup import configure_logging
+from main import DexterAgent
+
+logger = logging.getLogger(__name__)
+
+# Status einer Conversation im Ergebnis
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+STATUS_TIMEOUT = "timeout"
+STATUS_OVERLOADED = "overloaded"
+
+
+class BatchInputError(ValueError):
+    """Ungültige Zeile in der Batch-Eingabe"""
+
+
+@dataclass
+class BatchItem:
+    """Eine Conversation der Eingabe"""
+    item_id: str
+    messages: List[str]
+    line: int = 0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class ItemResult:
+    """Ergebnis einer Conversation (eine Zeile der Ausgabe)"""
+    id: str
+    status: str
+    responses: List[str] = field(default_factory=list)
+    error: str = ""
+    attempts: int = 1
+    turns: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    model_calls: int = 0
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+    cost: float = 0.0
+    metadata: Dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        if not self.metadata:
+            del data["metadata"]
+        return data
+
+
+# ============================================================================
+# EIN- UND AUSGABE
+# ============================================================================
+
+def parse_item(data: Any, line: int) -> BatchItem:
+    """
+    Wandelt eine JSON-Zeile in ein BatchItem
+
+    Akzeptiert "messages" (Liste von Strings oder {"role": "user", "content": ...})
+    oder "prompt" / "message" (einzelner String). Ohne "id" wird "line-<n>" verwendet.
+
+    Raises:
+        BatchInputError: Wenn keine User-Nachricht enthalten ist
+    """
+    if not isinstance(data, dict):
+        raise BatchInputError(f"Zeile {line}: JSON-Objekt erwartet")
+
+    raw = data.get("messages")
+    if raw is None:
+        single = data.get("prompt", data.get("message"))
+        raw = [single] if single is not None else []
+    if not isinstance(raw, list):
+        raw = [raw]
+
+    messages = []
+    for entry in raw:
+        if isinstance(entry, dict):
+            if entry.get("role", "user") != "user":
+                continue
+            entry = entry.get("content")
+        if not isinstance(entry, str) or not entry.strip():
+            raise BatchInputError(f"Zeile {line}: Nachrichten müssen nicht-leere Strings sein")
+        messages.append(entry)
+    if not messages:
+        raise BatchInputError(f"Zeile {line}: 'messages' oder 'prompt' fehlt")
+
+    metadata = {key: value for key, value in data.items() if key not in ("id", "messages", "prompt", "message")}
+    return BatchItem(item_id=str(data.get("id", f"line-{line}")), messages=messages, line=line, metadata=metadata)
+
+
+def load_items(path: Path) -> List[BatchItem]:
+    """
+    Liest alle Conversations einer JSONL-Datei (leere Zeilen werden ignoriert)
+
+    Raises:
+        BatchInputError: Bei ungültigem JSON, fehlenden Nachrichten oder doppelten IDs
+    """
+    items: List[BatchItem] = []
+    seen: Dict[str, int] = {}
+    with open(path, encoding="utf-8") as file:
+        for line_number, line in enumerate(file, start=1):
+            if not line.strip():
+                continue
+            try:
+                data = json.loads(line)
+            except json.JSONDecodeError as e:
+                raise BatchInputError(f"Zeile {line_number}: ungültiges JSON ({e.msg})") from None
+            item = parse_item(data, line_number)
+            if item.item_id in seen:
+                raise BatchInputError(
+                    f"Zeile {line_number}: ID '{item.item_id}' bereits in Zeile {seen[item.item_id]}"
+                )
+            seen[item.item_id] = line_number
+            items.append(item)
+    return items
+
+
+def load_checkpoint(path: Path) -> Dict[str, str]:
+    """
+    Letzter Status pro ID aus einer vorhandenen Ausgabedatei
+
+    Unvollständige Zeilen (Abbruch während des Schreibens) werden ignoriert.
+
+    Returns:
+        Dict ID → Status (leer, wenn die Datei nicht existiert)
+    """
+    statuses: Dict[str, str] = {}
+    if not path.exists():
+        return statuses
+    with open(path, encoding="utf-8") as file:
+        for line in file:
+            try:
+                data = json.loads(line)
+                statuses[str(data["id"])] = data["status"]
+            except (json.JSONDecodeError, KeyError, TypeError):
+                continue
+    return statuses
+
+
+class ResultWriter:
+    """
+    Hängt Ergebnisse zeilenweise an eine JSONL-Datei an (flush pro Zeile)
+
+    Endet eine vorhandene Datei mit einer abgebrochenen Zeile, wird zuerst ein
+    Zeilenumbruch geschrieben, damit die nächste Zeile wieder gültig ist.
+    """
+
+    def __init__(self, path: Path):
+        self.path = path
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        needs_newline = False
+        if path.exists() and path.stat().st_size:
+            with open(path, "rb") as existing:
+                existing.seek(-1, 2)
+                needs_newline = existing.read(1) != b"\n"
+        self._file: TextIO = open(path, "a", encoding="utf-8")
+        if needs_newline:
+            self._file.write("\n")
+        self.written = 0
+
+    def write(self, result: ItemResult) -> None:
+        self._file.write(json.dumps(result.to_dict(), ensure_ascii=False, default=str) + "\n")
+        self._file.flush()
+        self.written += 1
+
+    def close(self) -> None:
+        self._file.close()
+
+    def __enter__(self) -> "ResultWriter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+
+# ============================================================================
+# ZUSAMMENFASSUNG
+# ============================================================================
+
+def _percentile(sorted_values: List[float], p: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, math.ceil(p / 100 * len(sorted_values)) - 1))
+    return sorted_values[index]
+
+
+@dataclass
+class BatchSummary:
+    """Aufsummierte Kennzahlen eines Batch-Laufs"""
+    total: int = 0
+    skipped: int = 0
+    statuses: Dict[str, int] = field(default_factory=dict)
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    model_calls: int = 0
+    cost: float = 0.0
+    wall_seconds: float = 0.0
+    durations: List[float] = field(default_factory=list, repr=False)
+
+    @property
+    def completed(self) -> int:
+        return sum(self.statuses.values())
+
+    @property
+    def failed(self) -> int:
+        return self.completed - self.statuses.get(STATUS_OK, 0)
+
+    def add(self, result: ItemResult) -> None:
+        self.statuses[result.status] = self.statuses.get(result.status, 0) + 1
+        self.prompt_tokens += result.prompt_tokens
+        self.completion_tokens += result.completion_tokens
+        self.cached_tokens += result.cached_tokens
+        self.model_calls += result.model_calls
+        self.cost += result.cost
+        self.durations.append(result.duration_seconds)
+
+    def to_dict(self) -> Dict[str, Any]:
+        durations = sorted(self.durations)
+        total_tokens = self.prompt_tokens + self.completion_tokens
+        wall = self.wall_seconds
+        return {
+            "total": self.total,
+            "skipped": self.skipped,
+            "completed": self.completed,
+            "failed": self.failed,
+            "statuses": dict(self.statuses),
+            "wall_seconds": round(wall, 3),
+            "items_per_second": round(self.completed / wall, 3) if wall else 0.0,
+            "duration_seconds": {
+                "p50": round(_percentile(durations, 50), 3),
+                "p95": round(_percentile(durations, 95), 3),
+                "max": round(durations[-1], 3) if durations else 0.0,
+            },
+            "model_calls": self.model_calls,
+            "prompt_tokens": self.prompt_tokens,
+            "completion_tokens": self.completion_tokens,
+            "cached_tokens": self.cached_tokens,
+            "total_tokens": total_tokens,
+            "tokens_per_second": round(total_tokens / wall, 1) if wall else 0.0,
+            "cost": round(self.cost, 6),
+            "cost_per_item": round(self.cost / self.completed, 6) if self.completed else 0.0,
+        }
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+class BatchRunner:
+    """
+    Führt Conversations mit begrenzter Parallelität aus
+
+    N Worker ziehen Items aus einem gemeinsamen Iterator; jede Conversation
+    bekommt einen frischen DexterAgent. Ergebnisse gehen sofort an den
+    Writer - ein Abbruch verliert höchstens die laufenden Conversations.
+    """
+
+    def __init__(
+        self,
+        concurrency: Optional[int] = None,
+        item_timeout_seconds: Optional[float] = None,
+        overload_retries: Optional[int] = None,
+        agent_factory: Optional[Callable[[], DexterAgent]] = None,
+        settings: Optional[BatchConfig] = None
+    ):
+        """
+        Args:
+            concurrency: Optional - Parallel laufende Conversations (Default aus config.batch)
+            item_timeout_seconds: Optional - Zeitbudget pro Conversation, 0 = unbegrenzt
+                (Default aus config.batch)
+            overload_retries: Optional - Neuversuche bei Load Shedding (Default aus config.batch)
+            agent_factory: Optional - Erzeugt isolierte Agents (Default: DexterAgent mit
+                geteiltem OpenAIService und PRIORITY_BATCH)
+            settings: Optional - BatchConfig für Token-Preise (Default: config.batch)
+        """
+        self.settings = settings or config.batch
+        self.concurrency = concurrency or self.settings.concurrency
+        self.item_timeout_seconds = (
+            self.settings.item_timeout_seconds if item_timeout_seconds is None else item_timeout_seconds
+        )
+        self.overload_retries = (
+            self.settings.overload_retries if overload_retries is None else overload_retries
+        )
+
+        if agent_factory is None:
+            shared_service = OpenAIService(api_key=config.api_key)
+            agent_factory = lambda: DexterAgent(openai_service=shared_service, priority=PRIORITY_BATCH)
+        self._agent_factory = agent_factory
+
+    async def _converse(self, agent: DexterAgent, item: BatchItem, responses: List[str]) -> ItemResult:
+        """Führt alle Turns einer Conversation aus (bricht beim ersten Fehler ab)"""
+        for message in item.messages:
+            responses.append("")
+            async for chunk in agent.chat(message):
+                responses[-1] += chunk      # Teil-Antwort bleibt bei Timeout erhalten
+            turn = agent.session_metrics.last_turn
+            if turn.outcome != "ok":
+                status = STATUS_OVERLOADED if turn.outcome == "overloaded" else STATUS_ERROR
+                return ItemResult(id=item.item_id, status=status, error=turn.error or turn.outcome)
+        return ItemResult(id=item.item_id, status=STATUS_OK)
+
+    async def run_item(self, item: BatchItem) -> ItemResult:
+        """
+        Führt eine Conversation in einer isolierten Session aus
+
+        Bei Load Shedding (Admission Control) wird die Conversation mit frischem
+        Agent und exponentiellem Backoff wiederholt. Tokens, Model-Calls und
+        Kosten summieren alle Versuche.
+
+        Returns:
+            ItemResult (wirft nie - Fehler landen im Status)
+        """
+        start = time.perf_counter()
+        session = SessionMetrics()
+        for attempt in range(1, self.overload_retries + 2):
+            agent = self._agent_factory()
+            responses: List[str] = []
+            try:
+                async with asyncio.timeout(self.item_timeout_seconds or None):
+                    result = await self._converse(agent, item, responses)
+            except TimeoutError:
+                result = ItemResult(
+                    id=item.item_id, status=STATUS_TIMEOUT,
+                    error=f"Zeitbudget von {self.item_timeout_seconds:g}s überschritten"
+                )
+            except Exception as e:
+                logger.error(f"Batch-Item {item.item_id} fehlgeschlagen: {e}", exc_info=True)
+                result = ItemResult(id=item.item_id, status=STATUS_ERROR, error=str(e))
+
+            # Auch abgewiesene Versuche haben Tokens verbraucht
+            session.merge(agent.session_metrics)
+            if result.status != STATUS_OVERLOADED or attempt > self.overload_retries:
+                break
+            await asyncio.sleep(min(2 ** (attempt - 1), 30))
+
+        result.responses = responses
+        result.attempts = attempt
+        result.turns = session.turns
+        result.prompt_tokens = session.prompt_tokens
+        result.completion_tokens = session.completion_tokens
+        result.cached_tokens = session.cached_tokens
+        result.model_calls = session.model_calls
+        result.tool_calls = dict(session.tool_calls)
+        result.duration_seconds = round(time.perf_counter() - start, 3)
+        result.cost = round(self.settings.token_cost(
+            session.prompt_tokens, session.completion_tokens, session.cached_tokens
+        ), 6)
+        result.metadata = item.metadata
+        return result
+
+    async def run(
+        self,
+        items: Iterable[BatchItem],
+        writer: ResultWriter,
+        on_result: Optional[Callable[[ItemResult], None]] = None
+    ) -> BatchSummary:
+        """
+        Führt alle Items aus und schreibt jedes Ergebnis sofort
+
+        Args:
+            items: Auszuführende Conversations
+            writer: Ziel der Ergebnis-Zeilen
+            on_result: Optional - Callback pro fertiger Conversation (z.B. Fortschritt)
+
+        Returns:
+            BatchSummary (skipped/total setzt der Aufrufer)
+        """
+        items = list(items)
+        summary = BatchSummary(total=len(items))
+        iterator = iter(items)
+
+        async def worker() -> None:
+            for item in iterator:
+                result = await self.run_item(item)
+                writer.write(result)
+                summary.add(result)
+                if on_result is not None:
+                    on_result(result)
+
+        start = time.perf_counter()
+        try:
+            await asyncio.gather(*(worker() for _ in range(min(self.concurrency, len(items)))))
+        finally:
+            summary.wall_seconds = time.perf_counter() - start
+        return summary
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def print_summary(summary: Dict[str, Any], output: Path) -> None:
+    """Gibt die Zusammenfassung als Tabelle aus"""
+    statuses = ", ".join(f"{status}: {count}" for status, count in sorted(summary["statuses"].items())) or "-"
+    print(f"\n📦 Dexter Batch abgeschlossen → {output}")
+    print(f"   Conversations: {summary['completed']}/{summary['total']} ({statuses}), "
+          f"übersprungen: {summary['skipped']}")
+    print(f"   Wall: {summary['wall_seconds']}s | {summary['items_per_second']} Conversations/s | "
+          f"p50 {summary['duration_seconds']['p50']}s, p95 {summary['duration_seconds']['p95']}s")
+    print(f"   Tokens: {summary['total_tokens']:,} (Prompt {summary['prompt_tokens']:,}, "
+          f"davon gecacht {summary['cached_tokens']:,}, Completion {summary['completion_tokens']:,}) | "
+          f"{summary['tokens_per_second']} Tokens/s")
+    if summary["cost"]:
+        print(f"   Kosten: {summary['cost']:.4f} (Ø {summary['cost_per_item']:.4f} pro Conversation)")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dexter Conversations aus einer JSONL-Datei ausführen")
+    parser.add_argument("input", type=Path, help="JSONL-Datei mit einer Conversation pro Zeile")
+    parser.add_argument("--output", type=Path, help="Ergebnis-JSONL (Default: <input>.results.jsonl)")
+    parser.add_argument("--concurrency", type=int, help="Parallele Conversations (Default: BATCH_CONCURRENCY)")
+    parser.add_argument("--timeout", type=float, help="Sekunden pro Conversation, 0 = unbegrenzt (Default: BATCH_ITEM_TIMEOUT)")
+    parser.add_argument("--resume", action="store_true", help="Bereits erfolgreiche IDs der Ausgabe überspringen")
+    parser.add_argument("--overwrite", action="store_true", help="Vorhandene Ausgabe verwerfen")
+    parser.add_argument("--summary-json", type=Path, help="Zusammenfassung zusätzlich als JSON speichern")
+    parser.add_argument("--quiet", action="store_true", help="Kein Fortschritt pro Conversation")
+    return parser.parse_args(argv)
+
+
+async def run_batch(args: argparse.Namespace, runner: Optional[BatchRunner] = None) -> Dict[str, Any]:
+    """
+    Liest Eingabe und Checkpoint, führt offene Conversations aus
+
+    Args:
+        args: CLI-Argumente (siehe parse_args)
+        runner: Optional - vorkonfigurierter BatchRunner (Default aus args/config)
+
+    Returns:
+        Zusammenfassung inkl. Pfad der Ausgabe
+    """
+    output = args.output or args.input.with_suffix(".results.jsonl")
+    items = load_items(args.input)
+
+    if output.exists() and output.stat().st_size and not (args.resume or args.overwrite):
+        raise FileExistsError(f"{output} existiert bereits - --resume oder --overwrite angeben")
+    if args.overwrite:
+        output.unlink(missing_ok=True)
+
+    done = {item_id for item_id, status in load_checkpoint(output).items() if status == STATUS_OK}
+    pending = [item for item in items if item.item_id not in done]
+
+    runner = runner or BatchRunner(concurrency=args.concurrency, item_timeout_seconds=args.timeout)
+    progress = {"count": 0}
+
+    def report(result: ItemResult) -> None:
+        progress["count"] += 1
+        if not args.quiet:
+            suffix = f" - {result.error}" if result.error else ""
+            print(f"[{progress['count']}/{len(pending)}] {result.id}: {result.status} "
+                  f"({result.duration_seconds:.1f}s, {result.total_tokens} Tokens){suffix}", file=sys.stderr)
+
+    try:
+        with ResultWriter(output) as writer:
+            summary = await runner.run(pending, writer, on_result=report)
+    finally:
+        await close_shared_async_clients()
+
+    summary.total = len(items)
+    summary.skipped = len(items) - len(pending)
+    return {"output": str(output), **summary.to_dict()}
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    configure_logging()
+
+    try:
+        summary = asyncio.run(run_batch(args))
+    except (BatchInputError, FileExistsError, FileNotFoundError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\n⏹️ Abgebrochen - mit --resume fortsetzen", file=sys.stderr)
+        return 130
+
+    print_summary(summary, Path(summary["output"]))
+    if args.summary_json:
+        args.summary_json.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Zusammenfassung gespeichert: {args.summary_json}")
+    return 1 if summary["failed"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,364 @@
+"""
+Offline End-to-End Latenz-Benchmark für DexterAgent.chat
+
+Treibt realistische Multi-Tool Conversations gegen den lokalen Mock-Server
+(mock_openai_server.py) - ohne Netzwerk und ohne API Key, reproduzierbar
+auf CI-Maschinen. Gemessen wird pro Turn:
+
+- Time to First Chunk (chat()-Start bis zum ersten gelieferten Chunk)
+- Model-Zeit (Summe der Model-Calls inkl. Mock-Latenz)
+- Tool-Zeit (Wall-Clock der Tool-Ausführung, parallele Tools überlappend)
+- Agent-Overhead pro Iteration: (Turn - Model - Tool) / Iterationen
+
+und als p50/p95/p99 berichtet. Mit --max-overhead-ms schlägt der Lauf fehl
+(Exit-Code 1), wenn der p95-Overhead pro Iteration das Limit überschreitet.
+
+Verwendung:
+    python benchmark_agent.py --turns 200 --concurrency 8 --latency-ms 20
+    python benchmark_agent.py --stream --json reports/benchmark.json --max-overhead-ms 5
+
+Author: Dexter Agent Development Team
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import sys
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Tuple
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.openai_service import close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import (
+    LatencyProfile, MockOpenAIServer, MockReply, MockToolCall, Responder, scripted_responder
+)
+
+
+# ============================================================================
+# SZENARIEN
+# ============================================================================
+
+_MONTHLY_SALES = [
+    {"date": f"2024-{month:02d}-01", "amount": 10000 + month * 850 + (month % 3) * 400}
+    for month in range(1, 13)
+]
+
+_ROI = MockToolCall("calculate_roi", {
+    "investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12
+})
+_BREAK_EVEN = MockToolCall("analyze_break_even", {
+    "fixed_costs": 25000, "variable_cost_per_unit": 12.5,
+    "selling_price_per_unit": 39.9, "current_sales_units": 1400
+})
+_PNL = MockToolCall("calculate_pnl", {
+    "revenue": 480000, "cost_of_goods_sold": 210000,
+    "operating_expenses": {"salaries": 120000, "rent": 36000, "marketing": 24000},
+    "period": "2024"
+})
+_BALANCE_SHEET = MockToolCall("generate_balance_sheet", {
+    "assets": {"cash": 85000, "accounts_receivable": 42000, "inventory": 31000, "equipment": 150000},
+    "liabilities": {"accounts_payable": 28000, "long_term_debt": 90000},
+    "equity": {"share_capital": 100000, "retained_earnings": 90000},
+    "date": "2024-12-31"
+})
+_CASH_FLOW = MockToolCall("generate_cash_flow_statement", {
+    "operating_activities": {"net_income": 62000, "depreciation_amortization": 15000, "changes_in_receivables": -6000},
+    "investing_activities": {"capital_expenditures": -40000},
+    "financing_activities": {"debt_repayment": -12000, "dividends_paid": -8000},
+    "beginning_cash": 70000,
+    "period": "2024"
+})
+_FORECAST = MockToolCall("forecast_sales", {
+    "historical_sales": _MONTHLY_SALES, "forecast_months": 6, "include_seasonality": False
+})
+
+_FINAL_TEXT = (
+    "Zusammenfassung der Analyse: Die Kennzahlen zeigen eine solide Profitabilität "
+    "mit stabilem Wachstum. Empfehlung: Fixkosten beobachten und Liquiditätspuffer halten."
+)
+
+# Szenario → Tool-Calls pro Iteration (innere Liste = parallele Tool-Calls)
+SCENARIOS: Dict[str, List[List[MockToolCall]]] = {
+    "single_tool": [[_ROI]],
+    "parallel_tools": [[_ROI, _BREAK_EVEN]],
+    "full_analysis": [[_PNL, _BALANCE_SHEET], [_CASH_FLOW, _FORECAST], [_BREAK_EVEN]],
+    "text_only": [],
+}
+
+
+def scenario_responder() -> Responder:
+    """Responder, der das Szenario aus dem Marker "[scenario:name]" der User-Message liest"""
+    responders = {name: scripted_responder(steps, _FINAL_TEXT) for name, steps in SCENARIOS.items()}
+
+    def respond(request: Dict[str, Any]) -> MockReply:
+        for message in reversed(request.get("messages", [])):
+            if message.get("role") == "user":
+                marker = message.get("content", "").split("]", 1)[0]
+                name = marker.removeprefix("[scenario:")
+                return responders.get(name, responders["text_only"])(request)
+        return responders["text_only"](request)
+
+    return respond
+
+
+# ============================================================================
+# MESSUNG
+# ============================================================================
+
+@dataclass
+class TurnTiming:
+    """Messwerte eines chat()-Turns (Sekunden)"""
+    scenario: str
+    total: float = 0.0
+    first_chunk: float = 0.0
+    model: float = 0.0
+    tool: float = 0.0
+    iterations: int = 0
+    tool_calls: int = 0
+    tool_errors: int = 0
+    chunks: int = 0
+    intervals: List[Tuple[float, float]] = field(default_factory=list, repr=False)
+
+    @property
+    def overhead(self) -> float:
+        return max(0.0, self.total - self.model - self.tool)
+
+    @property
+    def overhead_per_iteration(self) -> float:
+        return self.overhead / self.iterations if self.iterations else self.overhead
+
+
+def _union_length(intervals: List[Tuple[float, float]]) -> float:
+    """Gesamtlänge überlappender Zeitintervalle (parallele Tools zählen einmal)"""
+    total = 0.0
+    current_start, current_end = None, None
+    for start, end in sorted(intervals):
+        if current_end is None or start > current_end:
+            if current_end is not None:
+                total += current_end - current_start
+            current_start, current_end = start, end
+        else:
+            current_end = max(current_end, end)
+    if current_end is not None:
+        total += current_end - current_start
+    return total
+
+
+def instrument(agent: DexterAgent, timing_ref: List[TurnTiming]) -> None:
+    """
+    Hängt Zeitmessung an Model-Calls und Tool-Ausführung eines Agents
+
+    timing_ref[0] ist der aktuell laufende Turn.
+    """
+    model_events = agent._model_events
+    execute_tool = agent._execute_tool
+
+    async def timed_model_events(messages):
+        timing = timing_ref[0]
+        timing.iterations += 1
+        start = time.perf_counter()
+        async for event in model_events(messages):
+            if event.type == "done":
+                timing.model += time.perf_counter() - start
+            yield event
+
+    async def timed_execute_tool(tool_name, tool_input):
+        timing = timing_ref[0]
+        start = time.perf_counter()
+        result = await execute_tool(tool_name, tool_input)
+        timing.intervals.append((start, time.perf_counter()))
+        timing.tool_calls += 1
+        if "error" in result:
+            timing.tool_errors += 1
+        return result
+
+    agent._model_events = timed_model_events
+    agent._execute_tool = timed_execute_tool
+
+
+async def run_turn(agent: DexterAgent, timing_ref: List[TurnTiming], scenario: str) -> TurnTiming:
+    """Führt einen chat()-Turn aus und misst ihn"""
+    timing = TurnTiming(scenario=scenario)
+    timing_ref[0] = timing
+
+    start = time.perf_counter()
+    async for _ in agent.chat(f"[scenario:{scenario}] Bitte analysiere die Zahlen."):
+        if timing.chunks == 0:
+            timing.first_chunk = time.perf_counter() - start
+        timing.chunks += 1
+    timing.total = time.perf_counter() - start
+    timing.tool = _union_length(timing.intervals)
+    return timing
+
+
+def percentile(values: List[float], p: float) -> float:
+    """Perzentil mit linearer Interpolation (wie numpy.percentile)"""
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * p / 100
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+def summarize(timings: List[TurnTiming]) -> Dict[str, Dict[str, float]]:
+    """p50/p95/p99/Mittelwert pro Kennzahl in Millisekunden"""
+    metrics = {
+        "turn_total_ms": [t.total for t in timings],
+        "first_chunk_ms": [t.first_chunk for t in timings],
+        "model_ms": [t.model for t in timings],
+        "tool_ms": [t.tool for t in timings],
+        "overhead_per_iteration_ms": [t.overhead_per_iteration for t in timings],
+    }
+    return {
+        name: {
+            "p50": round(percentile(values, 50) * 1000, 3),
+            "p95": round(percentile(values, 95) * 1000, 3),
+            "p99": round(percentile(values, 99) * 1000, 3),
+            "mean": round(sum(values) / len(values) * 1000, 3) if values else 0.0,
+        }
+        for name, values in metrics.items()
+    }
+
+
+# ============================================================================
+# RUNNER
+# ============================================================================
+
+async def run_benchmark(args: argparse.Namespace) -> Dict[str, Any]:
+    """Startet Mock-Server, führt alle Turns aus und liefert den Report"""
+    latency = (
+        LatencyProfile("lognormal", args.latency_ms / 1000, args.sigma) if args.sigma
+        else LatencyProfile("fixed", args.latency_ms / 1000)
+    )
+    scenarios = args.scenarios or list(SCENARIOS)
+    rng = random.Random(args.seed)
+    plan = [scenarios[i % len(scenarios)] for i in range(args.turns)]
+    rng.shuffle(plan)
+
+    async with MockOpenAIServer(
+        scenario_responder(),
+        latency=latency,
+        chunk_delay=LatencyProfile("fixed", args.chunk_delay_ms / 1000),
+        error_rate=args.error_rate,
+        seed=args.seed
+    ) as server:
+        service = server.make_service()
+
+        queue: "asyncio.Queue[str]" = asyncio.Queue()
+        for scenario in plan:
+            queue.put_nowait(scenario)
+        timings: List[TurnTiming] = []
+
+        async def worker() -> None:
+            # Eine Conversation pro Worker; neue History pro Turn (gleiche Prompt-Größe)
+            agent = DexterAgent(openai_service=service, stream=args.stream)
+            if not args.tool_cache:
+                agent.tool_cache = None
+            timing_ref: List[TurnTiming] = [TurnTiming(scenario="")]
+            instrument(agent, timing_ref)
+            while not queue.empty():
+                scenario = queue.get_nowait()
+                agent.reset_conversation()
+                timings.append(await run_turn(agent, timing_ref, scenario))
+
+        # Warmup: Verbindungen und Lazy-Imports vor der Messung
+        await service.warmup(args.concurrency)
+
+        wall_start = time.perf_counter()
+        await asyncio.gather(*(worker() for _ in range(args.concurrency)))
+        wall_time = time.perf_counter() - wall_start
+
+        requests, injected_errors = server.requests, server.injected_errors
+
+    await close_shared_async_clients()
+
+    return {
+        "config": {
+            "turns": args.turns,
+            "concurrency": args.concurrency,
+            "stream": args.stream,
+            "latency_ms": args.latency_ms,
+            "sigma": args.sigma,
+            "error_rate": args.error_rate,
+            "tool_cache": args.tool_cache,
+            "scenarios": scenarios,
+        },
+        "wall_time_s": round(wall_time, 3),
+        "turns_per_second": round(len(timings) / wall_time, 2) if wall_time else 0.0,
+        "model_requests": requests,
+        "injected_errors": injected_errors,
+        "iterations": sum(t.iterations for t in timings),
+        "tool_calls": sum(t.tool_calls for t in timings),
+        "tool_errors": sum(t.tool_errors for t in timings),
+        "latency": summarize(timings),
+        "by_scenario": {
+            name: summarize([t for t in timings if t.scenario == name])
+            for name in scenarios
+        },
+    }
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Gibt den Report als Tabelle aus"""
+    cfg = report["config"]
+    print("\n📊 Dexter Agent Benchmark (Mock-Server, offline)")
+    print(f"   Turns: {cfg['turns']} | Concurrency: {cfg['concurrency']} | "
+          f"Streaming: {cfg['stream']} | Mock-Latenz: {cfg['latency_ms']}ms")
+    print(f"   Wall: {report['wall_time_s']}s | {report['turns_per_second']} Turns/s | "
+          f"Model-Requests: {report['model_requests']} | Tool-Calls: {report['tool_calls']} "
+          f"({report['tool_errors']} Fehler)")
+    print(f"\n   {'Kennzahl':<28}{'p50':>10}{'p95':>10}{'p99':>10}{'mean':>10}")
+    for name, stats in report["latency"].items():
+        print(f"   {name:<28}{stats['p50']:>10.3f}{stats['p95']:>10.3f}{stats['p99']:>10.3f}{stats['mean']:>10.3f}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Offline Latenz-Benchmark für DexterAgent.chat")
+    parser.add_argument("--turns", type=int, default=100, help="Anzahl chat()-Turns")
+    parser.add_argument("--concurrency", type=int, default=4, help="Parallele Conversations")
+    parser.add_argument("--scenarios", nargs="*", choices=list(SCENARIOS), help="Szenarien (Default: alle)")
+    parser.add_argument("--stream", action="store_true", help="Streaming-Modus des Agents")
+    parser.add_argument("--latency-ms", type=float, default=20.0, help="(Median-)Latenz des Mock-Modells")
+    parser.add_argument("--sigma", type=float, default=0.3, help="Lognormal-Sigma (0 = feste Latenz)")
+    parser.add_argument("--chunk-delay-ms", type=float, default=0.0, help="Latenz zwischen Stream-Chunks")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil injizierter 503-Fehler")
+    parser.add_argument("--tool-cache", action="store_true", help="Tool-Result-Cache aktiv lassen")
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", type=Path, help="Report zusätzlich als JSON speichern")
+    parser.add_argument("--max-overhead-ms", type=float, help="Fehler wenn p95 Overhead/Iteration darüber liegt")
+    return parser.parse_args(argv)
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    # Agent-Logging (INFO pro Tool-Call) würde die Messung verfälschen
+    logging.getLogger().setLevel(logging.WARNING)
+
+    report = asyncio.run(run_benchmark(args))
+    print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Report gespeichert: {args.json}")
+
+    if args.max_overhead_ms is not None:
+        p95 = report["latency"]["overhead_per_iteration_ms"]["p95"]
+        if p95 > args.max_overhead_ms:
+            print(f"\n❌ Regression: p95 Overhead/Iteration {p95:.3f}ms > {args.max_overhead_ms}ms")
+            return 1
+        print(f"\n✅ p95 Overhead/Iteration {p95:.3f}ms ≤ {args.max_overhead_ms}ms")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
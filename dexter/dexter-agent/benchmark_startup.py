@@ -0,0 +1,174 @@
+"""
+Startup-Benchmark: Import-Zeit von Config, Tools und Agent
+
+Importiert jedes Modul in einem frischen Interpreter (ohne OPENAI_API_KEY)
+und misst die Import-Zeit als Median über mehrere Läufe. Zusätzlich wird
+geprüft, dass der Import keine Konfiguration auflöst und Tool-Module keine
+schweren Abhängigkeiten (numpy, openai, dotenv) laden.
+
+Mit --check schlägt der Lauf fehl (Exit-Code 1), wenn ein Modul sein
+Zeitbudget überschreitet oder eine der Invarianten verletzt.
+
+Verwendung:
+    python benchmark_startup.py --runs 7
+    python benchmark_startup.py --check --budget tools=150 --json reports/startup.json
+
+Author: Dexter Agent Development Team
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Tuple
+
+PROJECT_DIR = Path(__file__).parent
+
+# Module, deren Laden beim Import eines Tools ein Startup-Regression ist
+HEAVY_MODULES = ("numpy", "openai", "dotenv", "dateutil", "asyncio")
+
+
+@dataclass(frozen=True)
+class StartupTarget:
+    """Zu messendes Modul mit Budget und verbotenen Abhängigkeiten"""
+    module: str
+    budget_ms: float
+    forbidden: Tuple[str, ...] = ()
+
+
+TARGETS: Tuple[StartupTarget, ...] = (
+    StartupTarget("config", 50.0, HEAVY_MODULES),
+    StartupTarget("tools.roi_calculator", 80.0, HEAVY_MODULES),
+    StartupTarget("tools.sales_forecaster", 80.0, HEAVY_MODULES),
+    StartupTarget("tools", 20.0, HEAVY_MODULES),
+    StartupTarget("lib.ai.tool_registry", 80.0, ("numpy", "openai")),
+    StartupTarget("main", 1500.0),
+)
+
+# Läuft im Kind-Prozess: misst nur den Import selbst (ohne Interpreter-Start)
+_PROBE = """
+import json, sys, time
+start = time.perf_counter()
+import {module}
+elapsed_ms = (time.perf_counter() - start) * 1000
+config_module = sys.modules.get("config")
+print(json.dumps({{
+    "import_ms": elapsed_ms,
+    "loaded": [name for name in {heavy!r} if name in sys.modules],
+    "config_resolved": bool(config_module and config_module._config is not None),
+}}))
+"""
+
+
+def probe(module: str, env: Dict[str, str]) -> Dict[str, Any]:
+    """Importiert ein Modul in einem frischen Interpreter"""
+    code = _PROBE.format(module=module, heavy=HEAVY_MODULES)
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=False
+    )
+    if completed.returncode != 0:
+        raise RuntimeError(f"Import von {module} fehlgeschlagen:\n{completed.stderr.strip()}")
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_benchmark(targets: List[StartupTarget], runs: int) -> Dict[str, Any]:
+    """Misst alle Targets und liefert den Report"""
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    env["PYTHONPATH"] = str(PROJECT_DIR)
+
+    results = {}
+    for target in targets:
+        # Erster Lauf wärmt Bytecode- und Dateisystem-Caches, zählt nicht
+        samples = [probe(target.module, env) for _ in range(runs + 1)][1:]
+        times = sorted(sample["import_ms"] for sample in samples)
+        loaded = sorted({name for sample in samples for name in sample["loaded"]})
+        results[target.module] = {
+            "p50_ms": round(statistics.median(times), 2),
+            "min_ms": round(times[0], 2),
+            "max_ms": round(times[-1], 2),
+            "budget_ms": target.budget_ms,
+            "loaded": loaded,
+            "forbidden_loaded": [name for name in loaded if name in target.forbidden],
+            "config_resolved": any(sample["config_resolved"] for sample in samples),
+        }
+    return {"runs": runs, "python": sys.version.split()[0], "modules": results}
+
+
+def violations(report: Dict[str, Any]) -> List[str]:
+    """Budget- und Invarianten-Verletzungen des Reports"""
+    problems = []
+    for module, stats in report["modules"].items():
+        if stats["p50_ms"] > stats["budget_ms"]:
+            problems.append(f"{module}: p50 {stats['p50_ms']:.1f}ms > Budget {stats['budget_ms']:.0f}ms")
+        if stats["forbidden_loaded"]:
+            problems.append(f"{module}: lädt beim Import {', '.join(stats['forbidden_loaded'])}")
+        if stats["config_resolved"]:
+            problems.append(f"{module}: löst beim Import die Konfiguration auf")
+    return problems
+
+
+def print_report(report: Dict[str, Any]) -> None:
+    """Gibt den Report als Tabelle aus"""
+    print(f"\n🚀 Dexter Startup-Benchmark (Python {report['python']}, {report['runs']} Läufe, ohne API Key)")
+    print(f"\n   {'Modul':<26}{'p50 ms':>10}{'min':>10}{'max':>10}{'Budget':>10}   Geladen")
+    for module, stats in report["modules"].items():
+        loaded = ", ".join(stats["loaded"]) or "-"
+        print(f"   {module:<26}{stats['p50_ms']:>10.1f}{stats['min_ms']:>10.1f}"
+              f"{stats['max_ms']:>10.1f}{stats['budget_ms']:>10.0f}   {loaded}")
+
+
+def parse_budget(value: str) -> Tuple[str, float]:
+    module, _, budget = value.partition("=")
+    try:
+        return module, float(budget)
+    except ValueError:
+        raise argparse.ArgumentTypeError(f"Erwartet MODUL=MS, erhalten: {value}") from None
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Import-Zeit Benchmark für Config, Tools und Agent")
+    parser.add_argument("--runs", type=int, default=5, help="Gemessene Läufe pro Modul")
+    parser.add_argument("--modules", nargs="*", choices=[t.module for t in TARGETS], help="Module (Default: alle)")
+    parser.add_argument("--budget", type=parse_budget, action="append", default=[],
+                        metavar="MODUL=MS", help="Budget eines Moduls überschreiben")
+    parser.add_argument("--check", action="store_true", help="Fehler bei Budget- oder Invarianten-Verletzung")
+    parser.add_argument("--json", type=Path, help="Report zusätzlich als JSON speichern")
+    return parser.parse_args(argv)
+
+
+def select_targets(modules: Optional[List[str]], budgets: List[Tuple[str, float]]) -> List[StartupTarget]:
+    overrides = dict(budgets)
+    return [
+        StartupTarget(t.module, overrides.get(t.module, t.budget_ms), t.forbidden)
+        for t in TARGETS
+        if not modules or t.module in modules
+    ]
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+    report = run_benchmark(select_targets(args.modules, args.budget), args.runs)
+    print_report(report)
+
+    if args.json:
+        args.json.write_text(json.dumps(report, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Report gespeichert: {args.json}")
+
+    if args.check:
+        problems = violations(report)
+        if problems:
+            print("\n❌ Startup-Regression:")
+            for problem in problems:
+                print(f"   - {problem}")
+            return 1
+        print("\n✅ Alle Module innerhalb Budget, keine schweren Imports")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
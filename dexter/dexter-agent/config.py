@@ -6,13 +6,10 @@ Finanz-Kennzahlen-Schwellenwerte und Verzeichnispfade.
 """
 
 import os
+import json
 from pathlib import Path
-from typing import Optional
-from dataclasses import dataclass
-from dotenv import load_dotenv
-
-# Lade Environment-Variablen aus .env Datei
-load_dotenv()
+from typing import Any, Dict, List, Optional
+from dataclasses import dataclass, field
 
 
 @dataclass
@@ -49,6 +46,7 @@ class ModelConfig:
     model_name: str = "gpt-4-turbo-preview"
     temperature: float = 0.0  # Konsistente, deterministische Berechnungen
     max_tokens: int = 4096
+    fallback_model_name: str = ""  # Ziel für Hedged Requests (leer = kein Fallback)
 
     def __post_init__(self):
         """Validiere Modell-Parameter."""
@@ -58,6 +56,272 @@ class ModelConfig:
             raise ValueError("max_tokens muss positiv sein")
 
 
+@dataclass
+class HedgingConfig:
+    """Konfiguration für latenzbasiertes Request Hedging (Fallback-Modell)."""
+
+    enabled: bool = False                 # Hedging aktiv (benötigt FALLBACK_MODEL_NAME)
+    percentile: float = 95.0              # Hedge nach p-Perzentil der Primär-Latenz
+    max_hedge_ratio: float = 0.05         # Max. Anteil gehedgter Requests
+    min_samples: int = 50                 # Messungen bevor gehedgt wird
+    window_seconds: float = 300.0         # Zeitfenster der Latenz-Histogramme
+
+    def __post_init__(self):
+        """Validiere Hedging-Parameter."""
+        if not 0.0 < self.percentile < 100.0:
+            raise ValueError("percentile muss zwischen 0 und 100 liegen")
+        if not 0.0 <= self.max_hedge_ratio <= 1.0:
+            raise ValueError("max_hedge_ratio muss zwischen 0.0 und 1.0 liegen")
+        if self.min_samples < 1:
+            raise ValueError("min_samples muss mindestens 1 sein")
+        if self.window_seconds <= 0:
+            raise ValueError("window_seconds muss positiv sein")
+
+
+@dataclass
+class AdmissionConfig:
+    """Konfiguration für die prozessweite Admission Control vor dem OpenAIService."""
+
+    max_concurrent: int = 0               # Gleichzeitige Model-Calls (0 = unbegrenzt, aus)
+    max_queue: int = 100                  # Max. wartende Calls, darüber Load Shedding
+    max_wait_seconds: float = 10.0        # Max. Wartezeit in der Queue, darüber Load Shedding
+
+    def __post_init__(self):
+        """Validiere Admission-Parameter."""
+        if self.max_concurrent < 0:
+            raise ValueError("max_concurrent darf nicht negativ sein")
+        if self.max_queue < 0:
+            raise ValueError("max_queue darf nicht negativ sein")
+        if self.max_wait_seconds <= 0:
+            raise ValueError("max_wait_seconds muss positiv sein")
+
+    @property
+    def enabled(self) -> bool:
+        """Ist ein Concurrency-Limit gesetzt?"""
+        return self.max_concurrent > 0
+
+
+@dataclass
+class MetricsConfig:
+    """Konfiguration für den Export der Performance-Metriken."""
+
+    export_path: str = ""                 # Datei beim Beenden (.json = JSON, sonst Prometheus), leer = aus
+
+
+@dataclass
+class TracingConfig:
+    """Konfiguration für Tracing-Spans (OTLP/JSON Lines Export)."""
+
+    enabled: bool = False                 # Spans aufzeichnen
+    sample_rate: float = 1.0              # Anteil gesampelter Turns (0.0-1.0)
+    export_path: str = "./logs/traces.jsonl"
+
+    def __post_init__(self):
+        """Validiere Tracing-Parameter."""
+        if not 0.0 <= self.sample_rate <= 1.0:
+            raise ValueError("sample_rate muss zwischen 0.0 und 1.0 liegen")
+
+
+@dataclass
+class LoggingConfig:
+    """Konfiguration für das nicht-blockierende Logging (Queue + Hintergrund-Writer)."""
+
+    level: str = "INFO"
+    json_format: bool = False             # JSON Lines statt Textzeilen
+    log_dir: str = "./logs"
+    console_enabled: bool = True          # Auf stderr schreiben
+    file_enabled: bool = True             # In rotierende Logdatei schreiben
+    max_file_mb: float = 10.0             # Rotation ab dieser Dateigröße
+    backup_count: int = 5                 # Anzahl rotierter Dateien
+    max_message_chars: int = 4000         # Längere Nachrichten (z.B. Payloads) werden gekürzt
+    debug_sample_rate: float = 1.0        # Anteil geschriebener DEBUG-Records
+    queue_size: int = 10000               # Gepufferte Records, darüber wird verworfen
+
+    def __post_init__(self):
+        """Validiere Logging-Parameter."""
+        if self.level.upper() not in ("DEBUG", "INFO", "WARNING", "ERROR", "CRITICAL"):
+            raise ValueError(f"Ungültiges LOG_LEVEL: {self.level}")
+        if self.max_file_mb <= 0:
+            raise ValueError("max_file_mb muss positiv sein")
+        if self.backup_count < 0:
+            raise ValueError("backup_count darf nicht negativ sein")
+        if self.max_message_chars < 100:
+            raise ValueError("max_message_chars muss mindestens 100 sein")
+        if not 0.0 <= self.debug_sample_rate <= 1.0:
+            raise ValueError("debug_sample_rate muss zwischen 0.0 und 1.0 liegen")
+        if self.queue_size < 1:
+            raise ValueError("queue_size muss mindestens 1 sein")
+
+
+@dataclass
+class TransportConfig:
+    """Konfiguration für den HTTP-Transport zur OpenAI API (prozessweiter Connection-Pool)."""
+
+    max_connections: int = 200            # Max. gleichzeitige Verbindungen
+    max_keepalive_connections: int = 50   # Max. offene Idle-Verbindungen im Pool
+    keepalive_expiry: float = 30.0        # Idle-Verbindungen nach x Sekunden schließen
+    connect_timeout: float = 5.0          # Timeout für Verbindungsaufbau (Sekunden)
+    request_timeout: float = 60.0         # Default-Timeout pro Request (Sekunden)
+    warmup_connections: int = 0           # Verbindungen beim Start vorwärmen (0 = aus)
+
+    def __post_init__(self):
+        """Validiere Transport-Parameter."""
+        if self.max_connections <= 0:
+            raise ValueError("max_connections muss positiv sein")
+        if not 0 <= self.max_keepalive_connections <= self.max_connections:
+            raise ValueError("max_keepalive_connections muss zwischen 0 und max_connections liegen")
+        if self.connect_timeout <= 0 or self.request_timeout <= 0:
+            raise ValueError("Timeouts müssen positiv sein")
+
+
+@dataclass
+class AgentConfig:
+    """Konfiguration für den Agent-Loop (Function Calling)."""
+
+    max_iterations: int = 10           # Max. Function-Calling-Runden pro Turn
+    parallel_tool_calls: bool = True   # Tool-Calls einer Response parallel ausführen
+    max_concurrent_tools: int = 4      # Obergrenze gleichzeitig laufender Tools
+    history_max_tokens: int = 16000    # Token-Budget der Conversation History
+    stream_responses: bool = False     # Model-Responses token-weise streamen
+    # Allow-List der Ergebnis-Felder pro Tool für den model-facing Payload
+    # (überschreibt MODEL_PAYLOAD_FIELDS des Tool-Moduls)
+    tool_payload_fields: Dict[str, List[str]] = field(default_factory=dict)
+
+    def __post_init__(self):
+        """Validiere Agent-Parameter."""
+        if self.max_iterations <= 0:
+            raise ValueError("max_iterations muss positiv sein")
+        if self.max_concurrent_tools <= 0:
+            raise ValueError("max_concurrent_tools muss positiv sein")
+        if self.history_max_tokens <= 0:
+            raise ValueError("history_max_tokens muss positiv sein")
+        if not isinstance(self.tool_payload_fields, dict) or not all(
+            isinstance(fields, list) and all(isinstance(name, str) for name in fields)
+            for fields in self.tool_payload_fields.values()
+        ):
+            raise ValueError('tool_payload_fields muss die Form {"tool_name": ["feld", ...]} haben')
+
+
+@dataclass
+class SessionConfig:
+    """Konfiguration für den Multi-Session-Betrieb (SessionManager)."""
+
+    max_sessions: int = 1000              # Max. gleichzeitig residente Sessions
+    idle_ttl_seconds: float = 1800.0      # Idle-Sessions nach x Sekunden verwerfen
+    max_resident_tokens: int = 0          # Globales Token-Budget aller Histories (0 = unbegrenzt)
+
+    def __post_init__(self):
+        """Validiere Session-Parameter."""
+        if self.max_sessions <= 0:
+            raise ValueError("max_sessions muss positiv sein")
+        if self.idle_ttl_seconds <= 0:
+            raise ValueError("idle_ttl_seconds muss positiv sein")
+        if self.max_resident_tokens < 0:
+            raise ValueError("max_resident_tokens darf nicht negativ sein")
+
+
+@dataclass
+class BatchConfig:
+    """Konfiguration für den Batch-Runner (JSONL Conversations) und Token-Kosten."""
+
+    concurrency: int = 4                  # Parallel laufende Conversations
+    item_timeout_seconds: float = 300.0   # Zeitbudget pro Conversation (0 = unbegrenzt)
+    overload_retries: int = 3             # Neuversuche bei Load Shedding (Admission Control)
+    price_prompt_per_1m: float = 0.0     # Preis pro 1M Prompt-Tokens (ungecacht)
+    price_cached_per_1m: float = 0.0     # Preis pro 1M gecachte Prompt-Tokens
+    price_completion_per_1m: float = 0.0  # Preis pro 1M Completion-Tokens
+    tool_workers: int = 0                 # Prozesse für direkte Tool-Batches (0 = CPU-Anzahl)
+    tool_chunk_size: int = 0              # Zeilen pro Chunk (0 = automatisch)
+
+    def __post_init__(self):
+        """Validiere Batch-Parameter."""
+        if self.concurrency <= 0:
+            raise ValueError("concurrency muss positiv sein")
+        if self.item_timeout_seconds < 0:
+            raise ValueError("item_timeout_seconds darf nicht negativ sein")
+        if self.overload_retries < 0:
+            raise ValueError("overload_retries darf nicht negativ sein")
+        if min(self.price_prompt_per_1m, self.price_cached_per_1m, self.price_completion_per_1m) < 0:
+            raise ValueError("Token-Preise dürfen nicht negativ sein")
+        if self.tool_workers < 0 or self.tool_chunk_size < 0:
+            raise ValueError("tool_workers und tool_chunk_size dürfen nicht negativ sein")
+
+    def token_cost(self, prompt_tokens: int, completion_tokens: int, cached_tokens: int = 0) -> float:
+        """Kosten für Token-Verbrauch (cached_tokens sind Teil der prompt_tokens)."""
+        return (
+            (prompt_tokens - cached_tokens) * self.price_prompt_per_1m
+            + cached_tokens * self.price_cached_per_1m
+            + completion_tokens * self.price_completion_per_1m
+        ) / 1_000_000
+
+
+@dataclass
+class RetryConfig:
+    """Konfiguration für Retries, Circuit Breaker und Turn-Deadline."""
+
+    max_retries: int = 3                  # Wiederholungen pro Model-Call
+    base_delay: float = 0.5               # Full-Jitter Backoff: uniform(0, base * 2^n)
+    max_delay: float = 20.0               # Obergrenze des Backoffs
+    max_retry_after: float = 30.0         # Obergrenze für Retry-After des Servers
+    turn_deadline_seconds: float = 120.0  # Zeitbudget pro chat()-Turn (0 = unbegrenzt)
+    breaker_failure_threshold: int = 5    # Upstream-Fehler in Folge bis Fail-Fast (0 = aus)
+    breaker_recovery_seconds: float = 30.0  # Wartezeit bis zum Probe-Request
+
+    def __post_init__(self):
+        """Validiere Retry-Parameter."""
+        if self.max_retries < 0:
+            raise ValueError("max_retries darf nicht negativ sein")
+        if self.base_delay < 0 or self.max_delay < self.base_delay:
+            raise ValueError("Backoff muss 0 <= base_delay <= max_delay erfüllen")
+        if self.turn_deadline_seconds < 0:
+            raise ValueError("turn_deadline_seconds darf nicht negativ sein")
+        if self.breaker_failure_threshold < 0:
+            raise ValueError("breaker_failure_threshold darf nicht negativ sein")
+
+
+@dataclass
+class RateLimitConfig:
+    """Konfiguration für das clientseitige Rate Limiting (Token Bucket)."""
+
+    requests_per_minute: int = 0          # Request-Budget (0 = unbegrenzt)
+    tokens_per_minute: int = 0            # Token-Budget inkl. max_tokens Reserve (0 = unbegrenzt)
+
+    def __post_init__(self):
+        """Validiere Rate-Limit-Parameter."""
+        if self.requests_per_minute < 0:
+            raise ValueError("requests_per_minute darf nicht negativ sein")
+        if self.tokens_per_minute < 0:
+            raise ValueError("tokens_per_minute darf nicht negativ sein")
+
+    @property
+    def enabled(self) -> bool:
+        """Ist mindestens ein Budget gesetzt?"""
+        return bool(self.requests_per_minute or self.tokens_per_minute)
+
+
+@dataclass
+class CacheConfig:
+    """Konfiguration für Ergebnis-Caches."""
+
+    tool_cache_enabled: bool = True       # Deterministische Tool-Ergebnisse memoizen
+    tool_cache_max_entries: int = 1024    # LRU-Größenlimit
+    tool_cache_ttl_seconds: float = 0.0   # Lebensdauer eines Eintrags (0 = unbegrenzt)
+    tool_cache_excluded: List[str] = field(default_factory=list)  # Tools ohne Caching
+    completion_cache_mode: str = "off"    # Model-Completions: off | on | record | replay
+    completion_cache_max_mb: float = 256.0  # Größenlimit des Disk-Caches
+
+    def __post_init__(self):
+        """Validiere Cache-Parameter."""
+        if self.tool_cache_max_entries <= 0:
+            raise ValueError("tool_cache_max_entries muss positiv sein")
+        if self.tool_cache_ttl_seconds < 0:
+            raise ValueError("tool_cache_ttl_seconds darf nicht negativ sein")
+        if self.completion_cache_mode not in ("off", "on", "record", "replay"):
+            raise ValueError("completion_cache_mode muss off, on, record oder replay sein")
+        if self.completion_cache_max_mb <= 0:
+            raise ValueError("completion_cache_max_mb muss positiv sein")
+
+
 @dataclass
 class OutputConfig:
     """Konfiguration für Output-Formatierung."""
@@ -91,8 +355,8 @@ class DexterConfig:
     def __init__(self):
         """Initialisiere Konfiguration aus Environment-Variablen."""
 
-        # API-Konfiguration
-        self.api_key: str = self._get_required_env("OPENAI_API_KEY")
+        # API-Konfiguration (Pflicht erst beim Zugriff - Tools brauchen keinen Key)
+        self._api_key: Optional[str] = os.getenv("OPENAI_API_KEY") or None
 
         # Agent-Identität
         self.agent_name: str = os.getenv("AGENT_NAME", "Dexter")
@@ -103,15 +367,110 @@ class DexterConfig:
         self.data_dir: Path = self._resolve_path(os.getenv("DATA_DIR", "./data"))
         self.reports_dir: Path = self._resolve_path(os.getenv("REPORTS_DIR", "./reports"))
 
-        # Erstelle Verzeichnisse falls nicht vorhanden
-        self.data_dir.mkdir(exist_ok=True, parents=True)
-        self.reports_dir.mkdir(exist_ok=True, parents=True)
+        self._directories_ready = False
 
         # Model-Konfiguration
         self.model = ModelConfig(
             model_name=os.getenv("MODEL_NAME", "gpt-4-turbo-preview"),
             temperature=float(os.getenv("TEMPERATURE", "0.0")),
-            max_tokens=int(os.getenv("MAX_TOKENS", "4096"))
+            max_tokens=int(os.getenv("MAX_TOKENS", "4096")),
+            fallback_model_name=os.getenv("FALLBACK_MODEL_NAME", "")
+        )
+
+        # Request Hedging (Tail-Latenz)
+        self.hedging = HedgingConfig(
+            enabled=os.getenv("HEDGE_ENABLED", "False").lower() == "true",
+            percentile=float(os.getenv("HEDGE_PERCENTILE", "95")),
+            max_hedge_ratio=float(os.getenv("HEDGE_MAX_RATIO", "0.05")),
+            min_samples=int(os.getenv("HEDGE_MIN_SAMPLES", "50")),
+            window_seconds=float(os.getenv("HEDGE_WINDOW_SECONDS", "300"))
+        )
+
+        # Transport-Konfiguration (Connection-Pool)
+        self.transport = TransportConfig(
+            max_connections=int(os.getenv("HTTP_MAX_CONNECTIONS", "200")),
+            max_keepalive_connections=int(os.getenv("HTTP_MAX_KEEPALIVE_CONNECTIONS", "50")),
+            keepalive_expiry=float(os.getenv("HTTP_KEEPALIVE_EXPIRY", "30.0")),
+            connect_timeout=float(os.getenv("HTTP_CONNECT_TIMEOUT", "5.0")),
+            request_timeout=float(os.getenv("HTTP_REQUEST_TIMEOUT", "60.0")),
+            warmup_connections=int(os.getenv("HTTP_WARMUP_CONNECTIONS", "0"))
+        )
+
+        # Agent-Konfiguration
+        self.agent = AgentConfig(
+            max_iterations=int(os.getenv("MAX_ITERATIONS", "10")),
+            parallel_tool_calls=os.getenv("PARALLEL_TOOL_CALLS", "True").lower() == "true",
+            max_concurrent_tools=int(os.getenv("MAX_CONCURRENT_TOOLS", "4")),
+            history_max_tokens=int(os.getenv("HISTORY_MAX_TOKENS", "16000")),
+            stream_responses=os.getenv("STREAM_RESPONSES", "False").lower() == "true",
+            tool_payload_fields=json.loads(os.getenv("TOOL_PAYLOAD_FIELDS", "{}"))
+        )
+
+        # Session-Konfiguration
+        self.sessions = SessionConfig(
+            max_sessions=int(os.getenv("SESSION_MAX_COUNT", "1000")),
+            idle_ttl_seconds=float(os.getenv("SESSION_IDLE_TTL", "1800")),
+            max_resident_tokens=int(os.getenv("SESSION_MAX_RESIDENT_TOKENS", "0"))
+        )
+
+        # Batch-Runner (JSONL Conversations) und Token-Preise für Kosten-Reports
+        self.batch = BatchConfig(
+            concurrency=int(os.getenv("BATCH_CONCURRENCY", "4")),
+            item_timeout_seconds=float(os.getenv("BATCH_ITEM_TIMEOUT", "300")),
+            overload_retries=int(os.getenv("BATCH_OVERLOAD_RETRIES", "3")),
+            price_prompt_per_1m=float(os.getenv("PRICE_PROMPT_PER_1M", "0")),
+            price_cached_per_1m=float(os.getenv("PRICE_CACHED_PER_1M", "0")),
+            price_completion_per_1m=float(os.getenv("PRICE_COMPLETION_PER_1M", "0")),
+            tool_workers=int(os.getenv("TOOL_BATCH_WORKERS", "0")),
+            tool_chunk_size=int(os.getenv("TOOL_BATCH_CHUNK_SIZE", "0"))
+        )
+
+        # Retries, Circuit Breaker, Turn-Deadline
+        self.retry = RetryConfig(
+            max_retries=int(os.getenv("RETRY_MAX_RETRIES", "3")),
+            base_delay=float(os.getenv("RETRY_BASE_DELAY", "0.5")),
+            max_delay=float(os.getenv("RETRY_MAX_DELAY", "20")),
+            max_retry_after=float(os.getenv("RETRY_MAX_RETRY_AFTER", "30")),
+            turn_deadline_seconds=float(os.getenv("TURN_DEADLINE_SECONDS", "120")),
+            breaker_failure_threshold=int(os.getenv("CIRCUIT_BREAKER_THRESHOLD", "5")),
+            breaker_recovery_seconds=float(os.getenv("CIRCUIT_BREAKER_RECOVERY", "30"))
+        )
+
+        # Rate Limiting (Provider-Limits des API Keys)
+        self.rate_limit = RateLimitConfig(
+            requests_per_minute=int(os.getenv("RATE_LIMIT_RPM", "0")),
+            tokens_per_minute=int(os.getenv("RATE_LIMIT_TPM", "0"))
+        )
+
+        # Performance-Metriken (Tokens, Latenzen, Tool-Laufzeiten)
+        self.metrics = MetricsConfig(
+            export_path=os.getenv("METRICS_EXPORT_PATH", "")
+        )
+
+        # Tracing (Spans pro Turn, Iteration, Model-Call, Tool)
+        self.tracing = TracingConfig(
+            enabled=os.getenv("TRACING_ENABLED", "False").lower() == "true",
+            sample_rate=float(os.getenv("TRACE_SAMPLE_RATE", "1.0")),
+            export_path=str(self._resolve_path(os.getenv("TRACE_EXPORT_PATH", "./logs/traces.jsonl")))
+        )
+
+        # Admission Control (Concurrency-Limit + Prioritäts-Queue)
+        self.admission = AdmissionConfig(
+            max_concurrent=int(os.getenv("ADMISSION_MAX_CONCURRENT", "0")),
+            max_queue=int(os.getenv("ADMISSION_MAX_QUEUE", "100")),
+            max_wait_seconds=float(os.getenv("ADMISSION_MAX_WAIT", "10"))
+        )
+
+        # Cache-Konfiguration
+        self.cache = CacheConfig(
+            tool_cache_enabled=os.getenv("TOOL_CACHE_ENABLED", "True").lower() == "true",
+            tool_cache_max_entries=int(os.getenv("TOOL_CACHE_MAX_ENTRIES", "1024")),
+            tool_cache_ttl_seconds=float(os.getenv("TOOL_CACHE_TTL", "0")),
+            tool_cache_excluded=[
+                name.strip() for name in os.getenv("TOOL_CACHE_EXCLUDE", "").split(",") if name.strip()
+            ],
+            completion_cache_mode=os.getenv("COMPLETION_CACHE_MODE", "off").lower(),
+            completion_cache_max_mb=float(os.getenv("COMPLETION_CACHE_MAX_MB", "256"))
         )
 
         # Output-Konfiguration
@@ -140,6 +499,30 @@ class DexterConfig:
         # Logging
         self.log_level: str = os.getenv("LOG_LEVEL", "INFO")
         self.debug_mode: bool = os.getenv("ENABLE_DEBUG_MODE", "False").lower() == "true"
+        self.logging = LoggingConfig(
+            level="DEBUG" if self.debug_mode else self.log_level,
+            json_format=os.getenv("LOG_FORMAT", "text").lower() == "json",
+            log_dir=str(self._resolve_path(os.getenv("LOG_DIR", "./logs"))),
+            console_enabled=os.getenv("LOG_TO_CONSOLE", "True").lower() == "true",
+            file_enabled=os.getenv("LOG_TO_FILE", "True").lower() == "true",
+            max_file_mb=float(os.getenv("LOG_MAX_FILE_MB", "10")),
+            backup_count=int(os.getenv("LOG_BACKUP_COUNT", "5")),
+            max_message_chars=int(os.getenv("LOG_MAX_MESSAGE_CHARS", "4000")),
+            debug_sample_rate=float(os.getenv("LOG_DEBUG_SAMPLE_RATE", "1.0")),
+            queue_size=int(os.getenv("LOG_QUEUE_SIZE", "10000"))
+        )
+
+    @property
+    def api_key(self) -> str:
+        """
+        OpenAI API Key.
+
+        Raises:
+            ValueError: Wenn OPENAI_API_KEY nicht gesetzt ist
+        """
+        if self._api_key is None:
+            self._api_key = self._get_required_env("OPENAI_API_KEY")
+        return self._api_key
 
     def _get_required_env(self, key: str) -> str:
         """
@@ -177,12 +560,21 @@ class DexterConfig:
             return p
         return (self.base_dir / p).resolve()
 
+    def ensure_directories(self) -> None:
+        """Erstelle Data- und Reports-Verzeichnis falls nicht vorhanden (einmalig)."""
+        if not self._directories_ready:
+            self.data_dir.mkdir(exist_ok=True, parents=True)
+            self.reports_dir.mkdir(exist_ok=True, parents=True)
+            self._directories_ready = True
+
     def get_data_file(self, filename: str) -> Path:
-        """Hole Pfad zu Datei im Data-Verzeichnis."""
+        """Hole Pfad zu Datei im Data-Verzeichnis (legt Verzeichnis an)."""
+        self.ensure_directories()
         return self.data_dir / filename
 
     def get_report_file(self, filename: str) -> Path:
-        """Hole Pfad zu Datei im Reports-Verzeichnis."""
+        """Hole Pfad zu Datei im Reports-Verzeichnis (legt Verzeichnis an)."""
+        self.ensure_directories()
         return self.reports_dir / filename
 
     def validate(self) -> bool:
@@ -195,15 +587,14 @@ class DexterConfig:
         Raises:
             ValueError: Bei ungültiger Konfiguration
         """
-        # Prüfe API Key Format (beginnt mit sk-)
-        if not self.api_key.startswith("sk-"):
+        # Prüfe API Key Format (beginnt mit sk-) - nur wenn gesetzt, Pflicht erst beim Zugriff
+        if self._api_key is not None and not self._api_key.startswith("sk-"):
             raise ValueError("OPENAI_API_KEY scheint ungültig zu sein (sollte mit 'sk-' beginnen)")
 
-        # Prüfe Verzeichnisse
-        if not self.data_dir.exists():
-            raise ValueError(f"Data-Verzeichnis existiert nicht: {self.data_dir}")
-        if not self.reports_dir.exists():
-            raise ValueError(f"Reports-Verzeichnis existiert nicht: {self.reports_dir}")
+        # Prüfe Verzeichnisse (werden bei Bedarf angelegt, dürfen aber keine Dateien sein)
+        for directory in (self.data_dir, self.reports_dir):
+            if directory.exists() and not directory.is_dir():
+                raise ValueError(f"Kein Verzeichnis: {directory}")
 
         return True
 
@@ -228,18 +619,44 @@ def get_config() -> DexterConfig:
     """
     Hole Singleton-Instanz der Konfiguration.
 
+    Beim ersten Aufruf wird die .env Datei geladen und die Konfiguration
+    validiert - nicht beim Import des Moduls.
+
     Returns:
         DexterConfig Instanz
     """
     global _config
     if _config is None:
-        _config = DexterConfig()
-        _config.validate()
+        from dotenv import load_dotenv
+
+        # Lade Environment-Variablen aus .env Datei
+        load_dotenv()
+        config = DexterConfig()
+        config.validate()
+        _config = config
     return _config
 
 
+class _LazyConfig:
+    """
+    Platzhalter für `from config import config`
+
+    Löst die Konfiguration erst beim ersten Attributzugriff auf - der Import
+    eines Tools liest damit weder Environment noch .env und legt keine
+    Verzeichnisse an.
+    """
+
+    __slots__ = ()
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(get_config(), name)
+
+    def __repr__(self) -> str:
+        return repr(get_config()) if _config is not None else "<DexterConfig (nicht geladen)>"
+
+
 # Für direkten Import: from config import config
-config = get_config()
+config = _LazyConfig()
 
 
 if __name__ == "__main__":
@@ -1,21 +1,35 @@
 """
 AI Service Layer für OpenAI Integration
+
+Re-Exports werden erst beim ersten Zugriff importiert - `import
+lib.ai.tool_registry` lädt damit nicht das openai SDK.
 """
 
-from .openai_service import (
-    generate_agent_response,
-    generate_agent_response_stream,
-    estimate_tokens,
-    trim_conversation_history,
-    ChatMessage,
-    OpenAIResponse
-)
-
-__all__ = [
-    "generate_agent_response",
-    "generate_agent_response_stream",
-    "estimate_tokens",
-    "trim_conversation_history",
-    "ChatMessage",
-    "OpenAIResponse"
-]
+import importlib
+from typing import Any
+
+_EXPORTS = {
+    "generate_agent_response": ".openai_service",
+    "generate_agent_response_stream": ".openai_service",
+    "estimate_tokens": ".openai_service",
+    "trim_conversation_history": ".openai_service",
+    "ChatMessage": ".openai_service",
+    "OpenAIResponse": ".openai_service",
+    "ToolRegistry": ".tool_registry",
+    "ToolSpec": ".tool_registry",
+    "get_tool_registry": ".tool_registry",
+}
+
+__all__ = list(_EXPORTS)
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,243 @@
+"""
+Prozessweite Admission Control für Model-Calls
+
+Begrenzt die Anzahl gleichzeitiger OpenAI Calls über alle Sessions. Calls
+über dem Limit warten in einer Prioritäts-Queue (interaktive Chats vor
+Batch-Jobs, innerhalb einer Priorität FIFO). Unter Überlast wird früh
+abgewiesen (Load Shedding) statt alle Requests gemeinsam in Timeouts laufen
+zu lassen:
+
+- Queue voll → neuer Call wird abgewiesen, oder verdrängt einen wartenden
+  Call niedrigerer Priorität
+- Erwartete Wartezeit (Position × mittlere Call-Dauer) über dem Limit →
+  sofort abweisen
+- Tatsächliche Wartezeit über dem Limit → abweisen
+"""
+
+import asyncio
+import heapq
+import itertools
+import logging
+import time
+from contextlib import asynccontextmanager
+from typing import Any, AsyncIterator, Dict, List, Optional
+
+from config import config
+from .error_handler import OverloadedError
+from .hedging import LatencyHistogram
+
+logger = logging.getLogger(__name__)
+
+PRIORITY_INTERACTIVE = 0
+PRIORITY_BATCH = 10
+
+# Glättung der mittleren Slot-Haltedauer (EWMA)
+_HOLD_SMOOTHING = 0.2
+
+
+class AdmissionController:
+    """
+    Concurrency-Limit mit Prioritäts-Queue und Load Shedding
+
+    Attributes:
+        max_concurrent: Max. gleichzeitig zugelassene Calls
+        max_queue: Max. wartende Calls
+        max_wait_seconds: Max. Wartezeit in der Queue
+    """
+
+    def __init__(self, max_concurrent: int, max_queue: int = 100, max_wait_seconds: float = 10.0):
+        """
+        Args:
+            max_concurrent: Max. gleichzeitig zugelassene Calls
+            max_queue: Max. wartende Calls (0 = nicht warten, sofort abweisen)
+            max_wait_seconds: Max. Wartezeit in der Queue in Sekunden
+        """
+        if max_concurrent < 1:
+            raise ValueError("max_concurrent muss mindestens 1 sein")
+        self.max_concurrent = max_concurrent
+        self.max_queue = max_queue
+        self.max_wait_seconds = max_wait_seconds
+
+        self.in_flight = 0
+        self._heap: List[List[Any]] = []   # [priority, seq, future] - erledigte Futures werden übersprungen
+        self._queued = 0
+        self._seq = itertools.count()
+        self._mean_hold: Optional[float] = None
+
+        self.admitted = 0
+        self.max_queue_depth = 0
+        self.shed: Dict[str, int] = {"queue_full": 0, "preempted": 0, "predicted_wait": 0, "wait_timeout": 0}
+        self.wait_histogram = LatencyHistogram(min_value=0.0001)
+
+    @property
+    def queue_depth(self) -> int:
+        """Anzahl wartender Calls"""
+        return self._queued
+
+    def _expected_wait(self, priority: int) -> Optional[float]:
+        """Geschätzte Wartezeit: Calls vor uns × mittlere Haltedauer / Slots"""
+        if self._mean_hold is None:
+            return None
+        ahead = sum(1 for entry in self._heap if entry[0] <= priority and not entry[2].done())
+        return (ahead + 1) * self._mean_hold / self.max_concurrent
+
+    def _preempt(self, priority: int) -> bool:
+        """Verdrängt den jüngsten wartenden Call mit niedrigerer Priorität"""
+        candidates = [entry for entry in self._heap if entry[0] > priority and not entry[2].done()]
+        if not candidates:
+            return False
+        victim = max(candidates, key=lambda entry: (entry[0], entry[1]))
+        victim[2].set_exception(OverloadedError(retry_after=self._mean_hold))
+        self._queued -= 1
+        self.shed["preempted"] += 1
+        return True
+
+    def try_acquire(self) -> bool:
+        """
+        Belegt einen Slot nur, wenn er sofort frei ist (ohne Warten, z.B. für Hedge-Requests)
+
+        Returns:
+            True wenn ein Slot belegt wurde (mit release() freigeben)
+        """
+        if self.in_flight < self.max_concurrent and not self._queued:
+            self.in_flight += 1
+            self.admitted += 1
+            return True
+        return False
+
+    async def acquire(self, priority: int = PRIORITY_INTERACTIVE) -> float:
+        """
+        Wartet auf einen freien Slot
+
+        Args:
+            priority: Kleinere Werte werden zuerst bedient (PRIORITY_INTERACTIVE < PRIORITY_BATCH)
+
+        Returns:
+            Wartezeit in Sekunden
+
+        Raises:
+            OverloadedError: Load Shedding (Queue voll oder Wartezeit zu lang)
+        """
+        if self.try_acquire():
+            self.wait_histogram.record(0.0)
+            return 0.0
+
+        if self._queued >= self.max_queue and not self._preempt(priority):
+            self.shed["queue_full"] += 1
+            raise OverloadedError(retry_after=self._mean_hold)
+
+        expected_wait = self._expected_wait(priority)
+        if expected_wait is not None and expected_wait > self.max_wait_seconds:
+            self.shed["predicted_wait"] += 1
+            raise OverloadedError(retry_after=expected_wait)
+
+        future = asyncio.get_running_loop().create_future()
+        heapq.heappush(self._heap, [priority, next(self._seq), future])
+        self._queued += 1
+        self.max_queue_depth = max(self.max_queue_depth, self._queued)
+
+        start = time.monotonic()
+        try:
+            async with asyncio.timeout(self.max_wait_seconds):
+                await asyncio.shield(future)
+        except TimeoutError:
+            if not future.done():
+                future.cancel()
+                self._queued -= 1
+                self.shed["wait_timeout"] += 1
+                raise OverloadedError(retry_after=self._mean_hold) from None
+        except asyncio.CancelledError:
+            if future.done() and not future.cancelled() and future.exception() is None:
+                # Slot wurde bereits übergeben → weiterreichen
+                self.release()
+            elif not future.done():
+                future.cancel()
+                self._queued -= 1
+            raise
+
+        # Verdrängt (set_exception) → OverloadedError
+        future.result()
+        waited = time.monotonic() - start
+        self.admitted += 1
+        self.wait_histogram.record(waited)
+        return waited
+
+    def release(self, held_seconds: Optional[float] = None) -> None:
+        """
+        Gibt einen Slot frei (direkt an den nächsten Wartenden weiter)
+
+        Args:
+            held_seconds: Optional - Haltedauer des Slots für die Wartezeit-Prognose
+        """
+        if held_seconds is not None:
+            self._mean_hold = held_seconds if self._mean_hold is None else (
+                (1 - _HOLD_SMOOTHING) * self._mean_hold + _HOLD_SMOOTHING * held_seconds
+            )
+
+        while self._heap:
+            _, _, future = heapq.heappop(self._heap)
+            if future.done():
+                continue
+            self._queued -= 1
+            future.set_result(None)   # in_flight bleibt gleich - Slot wechselt den Besitzer
+            return
+        self.in_flight -= 1
+
+    @asynccontextmanager
+    async def slot(self, priority: int = PRIORITY_INTERACTIVE) -> AsyncIterator[float]:
+        """
+        Async Context Manager für einen Model-Call
+
+        Yields:
+            Wartezeit in Sekunden
+        """
+        waited = await self.acquire(priority)
+        start = time.monotonic()
+        try:
+            yield waited
+        finally:
+            self.release(time.monotonic() - start)
+
+    def stats(self) -> Dict[str, Any]:
+        """Queue- und Wartezeit-Kennzahlen"""
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "max_concurrent": self.max_concurrent,
+            "in_flight": self.in_flight,
+            "queue_depth": self._queued,
+            "max_queue_depth": self.max_queue_depth,
+            "admitted": self.admitted,
+            "shed": dict(self.shed),
+            "shed_total": sum(self.shed.values()),
+            "mean_hold_ms": ms(self._mean_hold),
+            "wait_ms": {
+                "p50": ms(self.wait_histogram.percentile(50)),
+                "p95": ms(self.wait_histogram.percentile(95)),
+                "p99": ms(self.wait_histogram.percentile(99)),
+            },
+        }
+
+
+# Singleton-Instanz (Limit gilt über alle Sessions)
+_admission_controller: Optional[AdmissionController] = None
+
+
+def get_admission_controller() -> Optional[AdmissionController]:
+    """
+    Hole prozessweiten AdmissionController
+
+    Returns:
+        AdmissionController Instanz, oder None wenn ADMISSION_MAX_CONCURRENT=0
+    """
+    global _admission_controller
+    if not config.admission.enabled:
+        return None
+    if _admission_controller is None:
+        _admission_controller = AdmissionController(
+            max_concurrent=config.admission.max_concurrent,
+            max_queue=config.admission.max_queue,
+            max_wait_seconds=config.admission.max_wait_seconds
+        )
+    return _admission_controller
@@ -0,0 +1,274 @@
+"""
+Record/Replay Cache für Model-Completions
+
+Bei temperature=0.0 liefern identische Requests (Modell, Nachrichten, Tools,
+Sampling-Parameter) praktisch identische Completions. Dieser Cache speichert
+Responses unter einem stabilen SHA-256 Fingerprint des Requests auf Disk
+(unter config.data_dir) mit größenbegrenzter LRU-Verdrängung.
+
+Modi:
+- "off":    Cache deaktiviert
+- "on":     Read-Through - Treffer aus dem Cache, Misses gehen an die API und werden gespeichert
+- "record": Immer API aufrufen und Ergebnis speichern (Cache neu aufnehmen)
+- "replay": Strikt offline - nur Cache, ein Miss wirft CompletionCacheMiss
+"""
+
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import threading
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from config import config
+from .error_handler import OpenAIError
+from .openai_service import OpenAIResponse, StreamedFunction, StreamedToolCall
+
+logger = logging.getLogger(__name__)
+
+CACHE_MODES = ("off", "on", "record", "replay")
+
+# Request-Parameter, die die Completion nicht beeinflussen
+_TRANSPORT_PARAMS = frozenset({"stream", "stream_options", "timeout"})
+
+
+class CompletionCacheMiss(OpenAIError):
+    """Replay-Modus: Request ist nicht im Cache"""
+
+    def __init__(self, fingerprint: str):
+        super().__init__(
+            f"Completion nicht im Cache (Replay-Modus): {fingerprint[:16]}…",
+            retryable=False
+        )
+        self.fingerprint = fingerprint
+
+
+def _serialize_response(response: OpenAIResponse) -> Dict[str, Any]:
+    """OpenAIResponse → JSON-fähiges Dict (Tool-Calls als einfache Dicts)"""
+    # SDK-Objekte (ChatCompletionMessageToolCall) sind keine Dataclasses → explizit abbilden
+    data = {key: value for key, value in vars(response).items() if key != "tool_calls"}
+    data["tool_calls"] = [
+        {
+            "id": tool_call.id,
+            "type": "function",
+            "function": {"name": tool_call.function.name, "arguments": tool_call.function.arguments}
+        }
+        for tool_call in response.tool_calls
+    ] if response.tool_calls else None
+    return data
+
+
+def _deserialize_response(data: Dict[str, Any]) -> OpenAIResponse:
+    """JSON-Dict → OpenAIResponse (Tool-Calls als StreamedToolCall)"""
+    tool_calls = data.get("tool_calls")
+    if tool_calls:
+        data = {
+            **data,
+            "tool_calls": [
+                StreamedToolCall(
+                    id=tool_call["id"],
+                    type=tool_call.get("type", "function"),
+                    function=StreamedFunction(**tool_call["function"])
+                )
+                for tool_call in tool_calls
+            ]
+        }
+    return OpenAIResponse(**data)
+
+
+class CompletionCache:
+    """
+    Disk-basierter Completion-Cache mit Größenlimit
+
+    Eine Datei pro Fingerprint (<dir>/<ab>/<fingerprint>.json). Die Datei-mtime
+    dient als LRU-Zeitstempel (Treffer aktualisieren sie). Überschreitet der
+    Cache max_bytes, werden die ältesten Einträge bis auf 90% entfernt.
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, mode: str = "on"):
+        """
+        Args:
+            directory: Cache-Verzeichnis
+            max_bytes: Größenlimit in Bytes
+            mode: "on", "record" oder "replay"
+        """
+        if mode not in CACHE_MODES or mode == "off":
+            raise ValueError(f"Ungültiger Cache-Modus: {mode}")
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.mode = mode
+        self.hits = 0
+        self.misses = 0
+
+        self._index: Optional[Dict[Path, int]] = None   # Datei → Größe in Bytes
+        self._total_bytes = 0
+        self._index_lock = threading.Lock()
+        self._tools_digest: Tuple[Optional[object], str] = (None, "")
+
+    # ------------------------------------------------------------------
+    # Fingerprint
+    # ------------------------------------------------------------------
+
+    def _digest_tools(self, tools: Any) -> str:
+        """Hash der Tool-Schemas - für das geteilte Registry-Tupel nur einmal berechnet"""
+        cached_tools, digest = self._tools_digest
+        if tools is cached_tools:
+            return digest
+        digest = hashlib.sha256(
+            json.dumps(tools, sort_keys=True, ensure_ascii=False).encode("utf-8")
+        ).hexdigest()
+        if isinstance(tools, tuple):
+            self._tools_digest = (tools, digest)
+        return digest
+
+    def fingerprint(self, params: Dict[str, Any]) -> str:
+        """
+        Stabiler Fingerprint eines Chat-Completion-Requests
+
+        Args:
+            params: Request-Parameter (model, messages, tools, temperature, ...)
+
+        Returns:
+            SHA-256 Hex-Digest
+        """
+        relevant = {
+            key: value for key, value in params.items()
+            if key not in _TRANSPORT_PARAMS and key != "tools"
+        }
+        if params.get("tools"):
+            relevant["tools"] = self._digest_tools(params["tools"])
+        payload = json.dumps(relevant, sort_keys=True, ensure_ascii=False, default=str)
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # Disk-Zugriff (blockierend, läuft in Worker-Threads)
+    # ------------------------------------------------------------------
+
+    def _path(self, fingerprint: str) -> Path:
+        return self.directory / fingerprint[:2] / f"{fingerprint}.json"
+
+    def _load_index(self) -> None:
+        if self._index is not None:
+            return
+        self._index = {}
+        self._total_bytes = 0
+        if self.directory.exists():
+            for path in self.directory.glob("*/*.json"):
+                size = path.stat().st_size
+                self._index[path] = size
+                self._total_bytes += size
+
+    def _read(self, fingerprint: str) -> Optional[Dict[str, Any]]:
+        path = self._path(fingerprint)
+        try:
+            data = json.loads(path.read_text(encoding="utf-8"))
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+        os.utime(path)  # LRU-Zeitstempel
+        return data
+
+    def _write(self, fingerprint: str, data: Dict[str, Any]) -> None:
+        path = self._path(fingerprint)
+        payload = json.dumps(data, ensure_ascii=False).encode("utf-8")
+
+        with self._index_lock:
+            self._load_index()
+            path.parent.mkdir(parents=True, exist_ok=True)
+
+            # Atomar ersetzen, damit parallele Leser nie halbe Dateien sehen
+            tmp_path = path.with_suffix(".tmp")
+            tmp_path.write_bytes(payload)
+            os.replace(tmp_path, path)
+
+            self._total_bytes += len(payload) - self._index.get(path, 0)
+            self._index[path] = len(payload)
+
+            if self._total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self) -> None:
+        """Entfernt älteste Einträge bis der Cache bei 90% des Limits liegt"""
+        target = int(self.max_bytes * 0.9)
+        # Aktuelle mtime lesen (Treffer berühren die Dateien)
+        entries = []
+        for path, size in self._index.items():
+            try:
+                entries.append((path.stat().st_mtime, path, size))
+            except FileNotFoundError:
+                entries.append((0.0, path, size))
+        entries.sort()
+
+        removed = 0
+        for _, path, size in entries:
+            if self._total_bytes <= target:
+                break
+            path.unlink(missing_ok=True)
+            del self._index[path]
+            self._total_bytes -= size
+            removed += 1
+        logger.info(f"🗑️ Completion-Cache: {removed} Einträge verdrängt")
+
+    # ------------------------------------------------------------------
+    # Öffentliche API
+    # ------------------------------------------------------------------
+
+    async def get(self, fingerprint: str) -> Optional[OpenAIResponse]:
+        """
+        Hole gecachte Response
+
+        Raises:
+            CompletionCacheMiss: Im Replay-Modus bei fehlendem Eintrag
+        """
+        if self.mode == "record":
+            return None
+
+        data = await asyncio.to_thread(self._read, fingerprint)
+        if data is None:
+            self.misses += 1
+            if self.mode == "replay":
+                raise CompletionCacheMiss(fingerprint)
+            return None
+
+        self.hits += 1
+        return _deserialize_response(data)
+
+    async def put(self, fingerprint: str, response: OpenAIResponse) -> None:
+        """Speichert Response (im Replay-Modus ignoriert)"""
+        if self.mode == "replay":
+            return
+        await asyncio.to_thread(self._write, fingerprint, _serialize_response(response))
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache-Kennzahlen"""
+        return {
+            "mode": self.mode,
+            "hits": self.hits,
+            "misses": self.misses,
+            "entries": len(self._index) if self._index is not None else None,
+            "bytes": self._total_bytes if self._index is not None else None,
+        }
+
+
+# Singleton-Instanz
+_completion_cache: Optional[CompletionCache] = None
+
+
+def get_completion_cache() -> Optional[CompletionCache]:
+    """
+    Hole prozessweiten Completion-Cache
+
+    Returns:
+        CompletionCache Instanz, oder None wenn COMPLETION_CACHE_MODE=off
+    """
+    global _completion_cache
+    if config.cache.completion_cache_mode == "off":
+        return None
+    if _completion_cache is None:
+        _completion_cache = CompletionCache(
+            directory=config.get_data_file("completion_cache"),
+            max_bytes=int(config.cache.completion_cache_max_mb * 1024 * 1024),
+            mode=config.cache.completion_cache_mode
+        )
+    return _completion_cache
@@ -0,0 +1,179 @@
+"""
+Token-budgetierte Conversation History für den Dexter Agent
+
+Hält pro Nachricht eine Token-Schätzung und eine laufende Summe, sodass
+append() in O(1) abgerechnet wird. Überschreitet die History das Budget,
+werden die ältesten Nicht-System-Nachrichten verdrängt. Eine Assistant-
+Nachricht mit tool_calls wird dabei nie von ihren tool-Antworten getrennt,
+und der aktuelle Turn (ab der letzten User-Nachricht) bleibt immer erhalten.
+"""
+
+from collections import deque
+from typing import Deque, Iterable, Iterator, List, Optional, Tuple
+
+from .openai_service import ChatMessage
+
+
+# Pauschaler Overhead pro Nachricht (Rolle, Trennzeichen im Chat-Format)
+MESSAGE_TOKEN_OVERHEAD = 4
+
+
+def estimate_message_tokens(message: ChatMessage) -> int:
+    """
+    Schätzt Token-Count einer Chat-Nachricht
+
+    Nutzt dieselbe Faustregel wie OpenAIService.estimate_tokens (~4 Zeichen
+    pro Token) und berücksichtigt die Argumente von tool_calls.
+
+    Args:
+        message: Zu schätzende Nachricht
+
+    Returns:
+        Geschätzte Anzahl Tokens
+    """
+    chars = len(message.content or "")
+    if message.tool_calls:
+        for tool_call in message.tool_calls:
+            function = tool_call.get("function", {})
+            chars += len(function.get("name", "")) + len(function.get("arguments", ""))
+    if message.name:
+        chars += len(message.name)
+    return chars // 4 + MESSAGE_TOKEN_OVERHEAD
+
+
+class ConversationHistory:
+    """
+    Conversation History mit inkrementeller Token-Abrechnung
+
+    Verhält sich für Leser wie eine Liste von ChatMessage (Iteration, len,
+    Index-Zugriff) und kann direkt an OpenAIService übergeben werden.
+
+    Attributes:
+        max_tokens: Token-Budget für die gesamte History (None = unbegrenzt)
+        total_tokens: Aktuelle geschätzte Token-Summe
+        evicted_messages: Anzahl bisher verdrängter Nachrichten
+    """
+
+    def __init__(self, max_tokens: Optional[int] = None):
+        """
+        Args:
+            max_tokens: Optional - Token-Budget (None = keine Verdrängung)
+        """
+        self.max_tokens = max_tokens
+        self._system: List[Tuple[ChatMessage, int]] = []
+        self._messages: Deque[Tuple[ChatMessage, int]] = deque()
+        self.total_tokens = 0
+        self.evicted_messages = 0
+        # Absolute Positionen (zählen über Verdrängungen hinweg)
+        self._next_seq = 0
+        self._first_seq = 0
+        self._last_user_seq = 0
+
+    # ------------------------------------------------------------------
+    # Listen-Schnittstelle
+    # ------------------------------------------------------------------
+
+    def __len__(self) -> int:
+        return len(self._system) + len(self._messages)
+
+    def __iter__(self) -> Iterator[ChatMessage]:
+        for message, _ in self._system:
+            yield message
+        for message, _ in self._messages:
+            yield message
+
+    def __getitem__(self, index: int) -> ChatMessage:
+        return self.messages[index]
+
+    @property
+    def messages(self) -> List[ChatMessage]:
+        """Aktuelle Nachrichten (System zuerst) als neue Liste"""
+        return list(self)
+
+    def append(self, message: ChatMessage) -> None:
+        """
+        Fügt Nachricht hinzu (O(1) Abrechnung) und verdrängt ggf. alte Nachrichten
+
+        Args:
+            message: Neue Chat-Nachricht
+        """
+        tokens = estimate_message_tokens(message)
+        self.total_tokens += tokens
+
+        if message.role == "system":
+            self._system.append((message, tokens))
+        else:
+            if message.role == "user":
+                self._last_user_seq = self._next_seq
+            self._messages.append((message, tokens))
+            self._next_seq += 1
+
+        self.enforce_budget()
+
+    def extend(self, messages: Iterable[ChatMessage]) -> None:
+        """Fügt mehrere Nachrichten hinzu"""
+        for message in messages:
+            self.append(message)
+
+    def clear(self) -> None:
+        """Löscht die gesamte History"""
+        self._system.clear()
+        self._messages.clear()
+        self.total_tokens = 0
+        self.evicted_messages = 0
+        self._next_seq = 0
+        self._first_seq = 0
+        self._last_user_seq = 0
+
+    # ------------------------------------------------------------------
+    # Budget
+    # ------------------------------------------------------------------
+
+    def _evict_oldest_unit(self) -> bool:
+        """
+        Verdrängt die älteste Einheit vor dem aktuellen Turn
+
+        Eine Einheit ist eine einzelne Nachricht oder eine Assistant-Nachricht
+        mit tool_calls plus alle direkt folgenden tool-Nachrichten.
+
+        Returns:
+            True wenn etwas verdrängt wurde
+        """
+        if not self._messages or self._first_seq >= self._last_user_seq:
+            return False
+
+        message, tokens = self._messages.popleft()
+        self._first_seq += 1
+        self.total_tokens -= tokens
+        self.evicted_messages += 1
+
+        # tool-Antworten gehören zur vorherigen tool_calls-Nachricht
+        # (verwaiste tool-Nachrichten am Anfang werden ebenfalls entfernt)
+        while self._messages and self._messages[0][0].role == "tool":
+            _, tool_tokens = self._messages.popleft()
+            self._first_seq += 1
+            self.total_tokens -= tool_tokens
+            self.evicted_messages += 1
+
+        return True
+
+    def enforce_budget(self) -> int:
+        """
+        Verdrängt älteste Nicht-System-Nachrichten bis das Budget eingehalten ist
+
+        Returns:
+            Anzahl verdrängter Nachrichten
+        """
+        if self.max_tokens is None:
+            return 0
+
+        before = self.evicted_messages
+        while self.total_tokens > self.max_tokens and self._evict_oldest_unit():
+            pass
+        return self.evicted_messages - before
+
+    def __repr__(self) -> str:
+        return (
+            f"ConversationHistory(messages={len(self)}, tokens={self.total_tokens}, "
+            f"max_tokens={self.max_tokens})"
+        )
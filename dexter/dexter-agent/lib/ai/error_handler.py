@@ -2,15 +2,25 @@
 Error Handling für OpenAI API Calls
 
 Implementiert Retry-Logik, Rate-Limiting Handling und spezifische
-Error-Behandlung für verschiedene OpenAI API Fehler.
+Error-Behandlung für verschiedene OpenAI API Fehler:
+- Klassifizierung über die typisierten SDK-Exceptions und den HTTP-Status
+- Retry-Policy mit Full-Jitter Backoff und Retry-After Unterstützung
+- Prozessweiter Circuit Breaker (Fail-Fast solange Upstream gestört ist)
+- Deadline pro Agent-Turn, gegen die Retries und Tool-Calls laufen
 """
 
 import asyncio
+import random
 import time
-from typing import TypeVar, Callable, Any, Optional
+from collections import deque
+from dataclasses import dataclass
+from email.utils import parsedate_to_datetime
+from typing import TypeVar, Callable, Any, Deque, Dict, Optional
 from functools import wraps
 import logging
 
+import openai
+
 logger = logging.getLogger(__name__)
 
 T = TypeVar('T')
@@ -24,7 +34,7 @@ class OpenAIError(Exception):
         message: str,
         status_code: Optional[int] = None,
         retryable: bool = False,
-        retry_after: Optional[int] = None
+        retry_after: Optional[float] = None
     ):
         super().__init__(message)
         self.message = message
@@ -36,7 +46,7 @@ class OpenAIError(Exception):
 class RateLimitError(OpenAIError):
     """Rate Limit überschritten"""
 
-    def __init__(self, message: str, retry_after: int = 60):
+    def __init__(self, message: str, retry_after: Optional[float] = None):
         super().__init__(
             message,
             status_code=429,
@@ -48,22 +58,27 @@ class RateLimitError(OpenAIError):
 class AuthenticationError(OpenAIError):
     """Authentifizierungs-Fehler (ungültiger API Key)"""
 
-    def __init__(self, message: str = "Ungültiger API Key"):
-        super().__init__(message, status_code=401, retryable=False)
+    def __init__(self, message: str = "Ungültiger API Key", status_code: int = 401):
+        super().__init__(message, status_code=status_code, retryable=False)
 
 
 class InvalidRequestError(OpenAIError):
     """Ungültige Anfrage (fehlerhafte Parameter)"""
 
-    def __init__(self, message: str):
-        super().__init__(message, status_code=400, retryable=False)
+    def __init__(self, message: str, status_code: int = 400):
+        super().__init__(message, status_code=status_code, retryable=False)
 
 
 class ServiceUnavailableError(OpenAIError):
     """OpenAI Service vorübergehend nicht verfügbar"""
 
-    def __init__(self, message: str = "OpenAI Service nicht verfügbar"):
-        super().__init__(message, status_code=503, retryable=True, retry_after=30)
+    def __init__(
+        self,
+        message: str = "OpenAI Service nicht verfügbar",
+        status_code: Optional[int] = 503,
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message, status_code=status_code, retryable=True, retry_after=retry_after)
 
 
 class ContextLengthExceededError(OpenAIError):
@@ -73,16 +88,128 @@ class ContextLengthExceededError(OpenAIError):
         super().__init__(message, status_code=400, retryable=False)
 
 
+class CircuitOpenError(OpenAIError):
+    """Circuit Breaker offen - Upstream gestört, Request wird nicht gesendet"""
+
+    def __init__(self, retry_after: float):
+        super().__init__(
+            f"OpenAI API vorübergehend gestört, nächster Versuch in {retry_after:.0f}s",
+            status_code=503,
+            retryable=False,
+            retry_after=retry_after
+        )
+
+
+class DeadlineExceededError(OpenAIError):
+    """Zeitbudget des Agent-Turns aufgebraucht"""
+
+    def __init__(self, message: str = "Zeitbudget für diese Anfrage überschritten"):
+        super().__init__(message, status_code=None, retryable=False)
+
+
+class OverloadedError(OpenAIError):
+    """Admission Control: Prozess überlastet, Request wurde abgewiesen (Load Shedding)"""
+
+    def __init__(
+        self,
+        message: str = "Dexter ist gerade ausgelastet - bitte in Kürze erneut versuchen",
+        retry_after: Optional[float] = None
+    ):
+        super().__init__(message, status_code=503, retryable=False, retry_after=retry_after)
+
+
+# Fehler, die auf einen gestörten Upstream hindeuten (zählen für den Circuit Breaker)
+UPSTREAM_ERRORS = (ServiceUnavailableError,)
+
+
+def _parse_retry_after(headers: Any) -> Optional[float]:
+    """Liest retry-after-ms / Retry-After (Sekunden oder HTTP-Datum) aus Response-Headern"""
+    if headers is None:
+        return None
+
+    retry_after_ms = headers.get("retry-after-ms")
+    if retry_after_ms:
+        try:
+            return max(0.0, float(retry_after_ms) / 1000)
+        except ValueError:
+            pass
+
+    retry_after = headers.get("retry-after")
+    if not retry_after:
+        return None
+    try:
+        return max(0.0, float(retry_after))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(retry_after).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+def _classify_sdk_error(error: openai.OpenAIError) -> Optional[OpenAIError]:
+    """Klassifiziert typisierte Exceptions des OpenAI SDK"""
+    message = str(error)
+
+    # Timeout ist Unterklasse von APIConnectionError
+    if isinstance(error, openai.APITimeoutError):
+        return ServiceUnavailableError(f"Timeout: {message}", status_code=None)
+    if isinstance(error, openai.APIConnectionError):
+        return ServiceUnavailableError(f"Verbindungsfehler: {message}", status_code=None)
+
+    if not isinstance(error, openai.APIStatusError):
+        return None
+
+    status = error.status_code
+    code = getattr(error, "code", None)
+    retry_after = _parse_retry_after(getattr(error.response, "headers", None))
+
+    if status == 429:
+        # Aufgebrauchtes Kontingent wird durch Warten nicht besser
+        if code == "insufficient_quota":
+            return OpenAIError(message, status_code=429, retryable=False)
+        return RateLimitError(message, retry_after=retry_after)
+    if status in (401, 403):
+        return AuthenticationError(message, status_code=status)
+    if status == 400 and code == "context_length_exceeded":
+        return ContextLengthExceededError(message)
+    if status in (408, 409):
+        return OpenAIError(message, status_code=status, retryable=True, retry_after=retry_after)
+    if status >= 500:
+        return ServiceUnavailableError(message, status_code=status, retry_after=retry_after)
+    return InvalidRequestError(message, status_code=status)
+
+
 def classify_error(error: Exception) -> OpenAIError:
     """
     Klassifiziert generische Exception zu spezifischem OpenAI Error
 
+    Bevorzugt die typisierten SDK-Exceptions (auch wenn sie z.B. in einem
+    OpenAIServiceError verpackt sind) und deren HTTP-Status. Nur für
+    untypisierte Fehler wird auf die Fehlermeldung zurückgegriffen;
+    unbekannte Fehler sind nicht retryable.
+
     Args:
         error: Original Exception
 
     Returns:
         Klassifizierter OpenAI Error
     """
+    # Exception-Kette nach bereits klassifizierten bzw. SDK-Fehlern durchsuchen
+    current: Optional[BaseException] = error
+    seen = set()
+    while current is not None and id(current) not in seen:
+        seen.add(id(current))
+        if isinstance(current, OpenAIError):
+            return current
+        if isinstance(current, openai.OpenAIError):
+            classified = _classify_sdk_error(current)
+            if classified is not None:
+                return classified
+        if isinstance(current, (asyncio.TimeoutError, TimeoutError)):
+            return ServiceUnavailableError(f"Timeout: {error}", status_code=None)
+        current = current.__cause__ or current.__context__
+
     error_str = str(error).lower()
 
     # Rate Limiting
@@ -93,6 +220,10 @@ def classify_error(error: Exception) -> OpenAIError:
     if "authentication" in error_str or "401" in error_str or "api key" in error_str:
         return AuthenticationError(str(error))
 
+    # Context Length
+    if "context length" in error_str or "token limit" in error_str:
+        return ContextLengthExceededError(str(error))
+
     # Invalid Request
     if "400" in error_str or "invalid" in error_str:
         return InvalidRequestError(str(error))
@@ -101,12 +232,194 @@ def classify_error(error: Exception) -> OpenAIError:
     if "503" in error_str or "unavailable" in error_str or "timeout" in error_str:
         return ServiceUnavailableError(str(error))
 
-    # Context Length
-    if "context length" in error_str or "token limit" in error_str:
-        return ContextLengthExceededError(str(error))
+    # Unbekannter Fehler - nicht retryable (kein minutenlanges Warten auf Programmfehler)
+    return OpenAIError(str(error), retryable=False)
 
-    # Unbekannter Fehler - als retryable markieren
-    return OpenAIError(str(error), retryable=True)
+
+@dataclass
+class RetryPolicy:
+    """
+    Retry-Policy mit Full-Jitter Backoff
+
+    Wartezeit vor Retry n: uniform(0, min(max_delay, base_delay * 2^n)).
+    Der Zufallsanteil verhindert, dass viele Sessions nach einem Ausfall
+    synchron erneut anfragen. Ein Retry-After des Servers hat Vorrang
+    (begrenzt auf max_retry_after).
+    """
+    max_retries: int = 3
+    base_delay: float = 0.5
+    max_delay: float = 20.0
+    max_retry_after: float = 30.0
+    jitter: bool = True
+
+    def compute_delay(self, attempt: int, error: OpenAIError) -> float:
+        """
+        Wartezeit vor dem nächsten Versuch
+
+        Args:
+            attempt: Bisherige Fehlversuche - 1 (0 = erster Retry)
+            error: Klassifizierter Fehler
+
+        Returns:
+            Wartezeit in Sekunden
+        """
+        if error.retry_after is not None:
+            return min(float(error.retry_after), self.max_retry_after)
+        ceiling = min(self.max_delay, self.base_delay * (2 ** attempt))
+        return random.uniform(0, ceiling) if self.jitter else ceiling
+
+
+class CircuitBreaker:
+    """
+    Prozessweiter Circuit Breaker für die OpenAI API
+
+    - closed: Requests laufen normal, aufeinanderfolgende Upstream-Fehler
+      (5xx, Timeouts, Verbindungsfehler) werden gezählt
+    - open: Nach failure_threshold Fehlern schlagen Requests sofort mit
+      CircuitOpenError fehl (keine Retry-Stürme gegen einen gestörten Upstream)
+    - half_open: Nach recovery_timeout darf ein Probe-Request durch; Erfolg
+      schließt den Breaker, Fehler öffnet ihn erneut
+    """
+
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 30.0):
+        """
+        Args:
+            failure_threshold: Aufeinanderfolgende Upstream-Fehler bis zum Öffnen (0 = deaktiviert)
+            recovery_timeout: Sekunden bis zum Probe-Request
+        """
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self.opened_at = 0.0
+        self.times_opened = 0
+        self.rejected = 0
+        self._probe_in_flight = False
+
+    def before_call(self) -> None:
+        """
+        Prüft ob ein Request gesendet werden darf
+
+        Raises:
+            CircuitOpenError: Breaker offen (oder Probe läuft bereits)
+        """
+        if self.state == "closed" or not self.failure_threshold:
+            return
+
+        remaining = self.opened_at + self.recovery_timeout - time.monotonic()
+        if self.state == "open" and remaining <= 0:
+            self.state = "half_open"
+
+        if self.state == "half_open" and not self._probe_in_flight:
+            self._probe_in_flight = True
+            return
+
+        self.rejected += 1
+        raise CircuitOpenError(max(remaining, 0.0))
+
+    def record_success(self) -> None:
+        """Erfolgreicher Request schließt den Breaker"""
+        if self.state != "closed":
+            logger.info("🟢 Circuit Breaker geschlossen - OpenAI API wieder erreichbar")
+        self.state = "closed"
+        self.consecutive_failures = 0
+        self._probe_in_flight = False
+
+    def abort_call(self) -> None:
+        """Request ohne Ergebnis abgebrochen (Deadline/Cancel) - Probe-Slot freigeben"""
+        self._probe_in_flight = False
+
+    def record_failure(self, error: OpenAIError) -> None:
+        """Zählt Upstream-Fehler; andere Fehler (4xx) zeigen einen erreichbaren Upstream"""
+        if isinstance(error, OverloadedError):
+            # Lokal abgewiesen - sagt nichts über den Upstream aus
+            self.abort_call()
+            return
+        if not isinstance(error, UPSTREAM_ERRORS):
+            self.record_success()
+            return
+
+        self._probe_in_flight = False
+
+        self.consecutive_failures += 1
+        if self.state == "half_open" or (
+            self.failure_threshold and self.consecutive_failures >= self.failure_threshold
+        ):
+            if self.state != "open":
+                self.times_opened += 1
+                logger.warning(
+                    f"🔴 Circuit Breaker offen nach {self.consecutive_failures} Upstream-Fehlern "
+                    f"(Probe in {self.recovery_timeout:.0f}s)"
+                )
+            self.state = "open"
+            self.opened_at = time.monotonic()
+
+    def stats(self) -> Dict[str, Any]:
+        """Aktueller Zustand"""
+        return {
+            "state": self.state,
+            "consecutive_failures": self.consecutive_failures,
+            "times_opened": self.times_opened,
+            "rejected": self.rejected,
+        }
+
+
+class Deadline:
+    """
+    Absolute Deadline (z.B. pro Agent-Turn)
+
+    Alle Model-Calls, Retry-Wartezeiten und Tool-Calls eines Turns laufen
+    gegen dasselbe Zeitbudget.
+    """
+
+    def __init__(self, seconds: float):
+        """
+        Args:
+            seconds: Zeitbudget ab jetzt in Sekunden
+        """
+        self.budget = seconds
+        self.expires_at = time.monotonic() + seconds
+
+    def remaining(self) -> float:
+        """Verbleibende Sekunden (≥ 0)"""
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self) -> bool:
+        return time.monotonic() >= self.expires_at
+
+    def check(self) -> None:
+        """
+        Raises:
+            DeadlineExceededError: Wenn das Zeitbudget aufgebraucht ist
+        """
+        if self.expired:
+            raise DeadlineExceededError(
+                f"Zeitbudget für diese Anfrage überschritten ({self.budget:.0f}s)"
+            )
+
+    async def run(self, awaitable: Any) -> Any:
+        """Führt awaitable aus, abgebrochen bei Ablauf der Deadline"""
+        if self.expired and asyncio.iscoroutine(awaitable):
+            awaitable.close()
+        self.check()
+        try:
+            # asyncio.timeout bricht im laufenden Task ab (kein Hilfs-Task pro Aufruf wie wait_for)
+            async with asyncio.timeout(self.remaining()):
+                return await awaitable
+        except TimeoutError:
+            if self.expired:
+                raise DeadlineExceededError(
+                    f"Zeitbudget für diese Anfrage überschritten ({self.budget:.0f}s)"
+                ) from None
+            raise
+
+
+def _raise_classified(classified_error: OpenAIError, original: Exception) -> None:
+    """Wirft klassifizierten Fehler mit Original als Ursache"""
+    if classified_error is original:
+        raise original
+    raise classified_error from original
 
 
 async def with_retry(
@@ -115,6 +428,9 @@ async def with_retry(
     max_retries: int = 3,
     base_delay: float = 1.0,
     exponential_backoff: bool = True,
+    policy: Optional[RetryPolicy] = None,
+    circuit_breaker: Optional[CircuitBreaker] = None,
+    deadline: Optional[Deadline] = None,
     **kwargs: Any
 ) -> T:
     """
@@ -123,59 +439,80 @@ async def with_retry(
     Args:
         func: Auszuführende Funktion
         *args: Positionsargumente für func
-        max_retries: Maximale Anzahl Wiederholungen
-        base_delay: Basis-Wartezeit zwischen Retries (in Sekunden)
-        exponential_backoff: Verwende exponentielles Backoff
+        max_retries: Maximale Anzahl Wiederholungen (ohne policy)
+        base_delay: Basis-Wartezeit zwischen Retries in Sekunden (ohne policy)
+        exponential_backoff: Verwende exponentielles Backoff (ohne policy)
+        policy: Optional - RetryPolicy (überschreibt max_retries/base_delay)
+        circuit_breaker: Optional - Circuit Breaker (Fail-Fast bei gestörtem Upstream)
+        deadline: Optional - Gesamt-Deadline für alle Versuche und Wartezeiten
         **kwargs: Keyword-Argumente für func
 
     Returns:
         Rückgabewert von func
 
     Raises:
-        OpenAIError: Nach erschöpften Retries
+        OpenAIError: Nach erschöpften Retries, bei nicht-retryable Fehlern,
+            offenem Circuit Breaker oder abgelaufener Deadline
     """
-    last_error: Optional[Exception] = None
+    if policy is None:
+        policy = RetryPolicy(
+            max_retries=max_retries,
+            base_delay=base_delay,
+            max_delay=base_delay * (2 ** max_retries) if exponential_backoff else base_delay
+        )
+
+    for attempt in range(policy.max_retries + 1):
+        if circuit_breaker is not None:
+            circuit_breaker.before_call()
 
-    for attempt in range(max_retries + 1):
         try:
             # Versuche Funktion auszuführen
             if asyncio.iscoroutinefunction(func):
-                return await func(*args, **kwargs)
+                call = func(*args, **kwargs)
             else:
-                return await asyncio.to_thread(func, *args, **kwargs)
+                call = asyncio.to_thread(func, *args, **kwargs)
+            result = await (deadline.run(call) if deadline is not None else call)
+
+        except (DeadlineExceededError, asyncio.CancelledError):
+            if circuit_breaker is not None:
+                circuit_breaker.abort_call()
+            raise
 
         except Exception as e:
-            last_error = e
             classified_error = classify_error(e)
+            if circuit_breaker is not None:
+                circuit_breaker.record_failure(classified_error)
 
             # Nicht-retryable Fehler → sofort werfen
             if not classified_error.retryable:
                 logger.error(f"Non-retryable error: {classified_error}")
-                raise classified_error
+                _raise_classified(classified_error, e)
 
             # Letzter Versuch erreicht?
-            if attempt >= max_retries:
-                logger.error(f"Max retries ({max_retries}) exceeded")
-                raise classified_error
-
-            # Berechne Wartezeit
-            if classified_error.retry_after:
-                delay = classified_error.retry_after
-            elif exponential_backoff:
-                delay = base_delay * (2 ** attempt)
-            else:
-                delay = base_delay
+            if attempt >= policy.max_retries:
+                logger.error(f"Max retries ({policy.max_retries}) exceeded")
+                _raise_classified(classified_error, e)
+
+            delay = policy.compute_delay(attempt, classified_error)
+
+            # Retry würde die Deadline reißen → letzten Fehler melden statt zu warten
+            if deadline is not None and delay >= deadline.remaining():
+                logger.error(f"Retry in {delay:.1f}s exceeds turn deadline - giving up")
+                _raise_classified(classified_error, e)
 
             logger.warning(
-                f"Attempt {attempt + 1}/{max_retries + 1} failed: {classified_error}. "
-                f"Retrying in {delay}s..."
+                f"Attempt {attempt + 1}/{policy.max_retries + 1} failed: {classified_error}. "
+                f"Retrying in {delay:.2f}s..."
             )
 
             await asyncio.sleep(delay)
 
+        else:
+            if circuit_breaker is not None:
+                circuit_breaker.record_success()
+            return result
+
     # Sollte nie erreicht werden, aber für Type Safety
-    if last_error:
-        raise classify_error(last_error)
     raise OpenAIError("Unexpected error in retry logic")
 
 
@@ -212,73 +549,251 @@ def retry_on_error(
     return decorator
 
 
+@dataclass
+class _TokenBucket:
+    """Token Bucket mit kontinuierlichem Refill (Level darf durch Nachbelastung negativ werden)"""
+    capacity: float
+    rate: float         # Refill pro Sekunde
+    level: float
+    updated: float
+
+    def refill(self, now: float) -> None:
+        self.level = min(self.capacity, self.level + (now - self.updated) * self.rate)
+        self.updated = now
+
+    def wait_time(self, amount: float) -> float:
+        """Sekunden bis amount verfügbar ist"""
+        deficit = amount - self.level
+        return deficit / self.rate if deficit > 0 else 0.0
+
+
+@dataclass
+class RateLimitReservation:
+    """Reservierung aus RateLimiter.acquire (wird per settle()/release() abgerechnet)"""
+    tokens: int
+    waited: float = 0.0
+    settled: bool = False
+
+
 class RateLimiter:
     """
-    Simple Rate Limiter für API Calls
-
-    Limitiert Anzahl Requests pro Zeitfenster.
+    Async-sicherer Token-Bucket Rate Limiter für Requests und Tokens pro Zeitfenster
+
+    - Zwei Buckets: Requests (RPM) und Tokens (TPM), jeweils kontinuierlich aufgefüllt
+    - FIFO-Fairness: Wartende Coroutines stehen in einer Lock-Queue, nur die
+      vorderste wartet auf Refill (keine Überholer, kein Thundering Herd)
+    - Tokens werden vorab geschätzt reserviert und nach der Response mit
+      response.usage abgerechnet (settle), bei Fehlern zurückgegeben (release)
+    - Wartezeit-Statistiken über die letzten Anfragen (stats)
     """
 
-    def __init__(self, max_requests: int = 60, time_window: float = 60.0):
+    def __init__(
+        self,
+        max_requests: int = 60,
+        time_window: float = 60.0,
+        max_tokens: Optional[int] = None
+    ):
         """
         Initialisiert Rate Limiter
 
         Args:
-            max_requests: Maximale Requests pro time_window
+            max_requests: Maximale Requests pro time_window (0 = unbegrenzt)
             time_window: Zeitfenster in Sekunden
+            max_tokens: Optional - Maximale Tokens pro time_window (None/0 = unbegrenzt)
         """
+        now = time.monotonic()
         self.max_requests = max_requests
+        self.max_tokens = max_tokens
         self.time_window = time_window
-        self.requests: list[float] = []
 
-    async def acquire(self):
+        self._requests = _TokenBucket(max_requests, max_requests / time_window, max_requests, now) if max_requests else None
+        self._tokens = _TokenBucket(max_tokens, max_tokens / time_window, max_tokens, now) if max_tokens else None
+
+        self._lock = asyncio.Lock()
+        self._waiting = 0
+        self._wait_times: Deque[float] = deque(maxlen=1024)
+
+        self.acquired = 0
+        self.throttled = 0
+        self.total_wait = 0.0
+
+    def _wait_time(self, tokens: float) -> float:
+        now = time.monotonic()
+        wait = 0.0
+        if self._requests is not None:
+            self._requests.refill(now)
+            wait = self._requests.wait_time(1)
+        if self._tokens is not None:
+            self._tokens.refill(now)
+            wait = max(wait, self._tokens.wait_time(tokens))
+        return wait
+
+    async def acquire(self, tokens: int = 0) -> RateLimitReservation:
+        """
+        Warte bis Request (und geschätzte Tokens) erlaubt sind und reserviere sie
+
+        Args:
+            tokens: Geschätzte Tokens des Requests (Prompt + max_tokens)
+
+        Returns:
+            RateLimitReservation für settle()/release()
         """
-        Warte bis Request erlaubt ist (Rate Limit beachten)
+        # Mehr als die Kapazität würde nie frei → auf volle Kapazität begrenzen
+        needed = min(tokens, self._tokens.capacity) if self._tokens is not None else 0
+        start = time.monotonic()
+
+        self._waiting += 1
+        try:
+            async with self._lock:
+                wait = self._wait_time(needed)
+                if wait > 0:
+                    self.throttled += 1
+                    logger.info(f"Rate limit reached, waiting {wait:.2f}s...")
+                while wait > 0:
+                    await asyncio.sleep(wait)
+                    wait = self._wait_time(needed)
+
+                if self._requests is not None:
+                    self._requests.level -= 1
+                if self._tokens is not None:
+                    self._tokens.level -= tokens
+        finally:
+            self._waiting -= 1
+
+        waited = time.monotonic() - start
+        self.acquired += 1
+        self.total_wait += waited
+        self._wait_times.append(waited)
+        return RateLimitReservation(tokens=tokens, waited=waited)
+
+    def try_acquire(self, tokens: int = 0) -> Optional[RateLimitReservation]:
         """
-        now = time.time()
+        Reserviert nur, wenn das Budget sofort reicht und niemand wartet (z.B. Hedge-Requests)
 
-        # Entferne alte Requests außerhalb des Zeitfensters
-        cutoff = now - self.time_window
-        self.requests = [ts for ts in self.requests if ts > cutoff]
+        Args:
+            tokens: Geschätzte Tokens des Requests (Prompt + max_tokens)
+
+        Returns:
+            RateLimitReservation, None wenn gewartet werden müsste
+        """
+        if self._lock.locked():
+            return None
+        needed = min(tokens, self._tokens.capacity) if self._tokens is not None else 0
+        if self._wait_time(needed) > 0:
+            return None
+
+        if self._requests is not None:
+            self._requests.level -= 1
+        if self._tokens is not None:
+            self._tokens.level -= tokens
+        self.acquired += 1
+        self._wait_times.append(0.0)
+        return RateLimitReservation(tokens=tokens)
+
+    def settle(self, reservation: RateLimitReservation, actual_tokens: int) -> None:
+        """
+        Rechnet Reservierung mit tatsächlichem Verbrauch ab (response.usage.total_tokens)
 
-        # Warte wenn Limit erreicht
-        if len(self.requests) >= self.max_requests:
-            oldest = self.requests[0]
-            wait_time = self.time_window - (now - oldest)
-            if wait_time > 0:
-                logger.info(f"Rate limit reached, waiting {wait_time:.1f}s...")
-                await asyncio.sleep(wait_time)
-                # Rekursiver Call nach Wartezeit
-                return await self.acquire()
+        Zu viel reservierte Tokens gehen zurück in den Bucket, zu wenig
+        reservierte werden nachbelastet.
+        """
+        if reservation.settled:
+            return
+        reservation.settled = True
+        if self._tokens is not None:
+            self._tokens.refill(time.monotonic())
+            self._tokens.level = min(
+                self._tokens.capacity,
+                self._tokens.level + reservation.tokens - actual_tokens
+            )
 
-        # Registriere neuen Request
-        self.requests.append(now)
+    def release(self, reservation: RateLimitReservation) -> None:
+        """Gibt reservierte Tokens zurück (Request fehlgeschlagen, nichts verbraucht)"""
+        self.settle(reservation, 0)
 
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aktuelle Kennzahlen
 
-# Globaler Rate Limiter (60 Requests pro Minute)
+        Returns:
+            Dict mit waiting, acquired, throttled, Wartezeit-Perzentilen (ms)
+            über die letzten 1024 Requests und verfügbarem Budget
+        """
+        waits = sorted(self._wait_times)
+
+        def percentile(p: float) -> float:
+            return round(waits[min(len(waits) - 1, int(len(waits) * p))] * 1000, 2) if waits else 0.0
+
+        now = time.monotonic()
+        for bucket in (self._requests, self._tokens):
+            if bucket is not None:
+                bucket.refill(now)
+
+        return {
+            "waiting": self._waiting,
+            "acquired": self.acquired,
+            "throttled": self.throttled,
+            "wait_mean_ms": round(self.total_wait / self.acquired * 1000, 2) if self.acquired else 0.0,
+            "wait_p50_ms": percentile(0.50),
+            "wait_p95_ms": percentile(0.95),
+            "wait_max_ms": round(waits[-1] * 1000, 2) if waits else 0.0,
+            "available_requests": int(self._requests.level) if self._requests is not None else None,
+            "available_tokens": int(self._tokens.level) if self._tokens is not None else None,
+        }
+
+
+# Globaler Rate Limiter (prozessweit, von allen Sessions geteilt)
 _rate_limiter: Optional[RateLimiter] = None
 
 
 def get_rate_limiter(
-    max_requests: int = 60,
-    time_window: float = 60.0
+    max_requests: Optional[int] = None,
+    time_window: float = 60.0,
+    max_tokens: Optional[int] = None
 ) -> RateLimiter:
     """
     Hole Singleton Rate Limiter Instanz
 
     Args:
-        max_requests: Max Requests (nur beim ersten Call verwendet)
+        max_requests: Max Requests (nur beim ersten Call verwendet, Default: RATE_LIMIT_RPM)
         time_window: Zeitfenster in Sekunden
+        max_tokens: Max Tokens (nur beim ersten Call verwendet, Default: RATE_LIMIT_TPM)
 
     Returns:
         RateLimiter Instanz
     """
     global _rate_limiter
     if _rate_limiter is None:
-        _rate_limiter = RateLimiter(max_requests, time_window)
+        from config import config
+        _rate_limiter = RateLimiter(
+            config.rate_limit.requests_per_minute if max_requests is None else max_requests,
+            time_window,
+            config.rate_limit.tokens_per_minute if max_tokens is None else max_tokens
+        )
     return _rate_limiter
 
 
+# Globaler Circuit Breaker (prozessweit, Fehler aller Sessions zählen gemeinsam)
+_circuit_breaker: Optional[CircuitBreaker] = None
+
+
+def get_circuit_breaker() -> CircuitBreaker:
+    """
+    Hole Singleton Circuit Breaker Instanz
+
+    Returns:
+        CircuitBreaker Instanz (Parameter aus config.retry)
+    """
+    global _circuit_breaker
+    if _circuit_breaker is None:
+        from config import config
+        _circuit_breaker = CircuitBreaker(
+            failure_threshold=config.retry.breaker_failure_threshold,
+            recovery_timeout=config.retry.breaker_recovery_seconds
+        )
+    return _circuit_breaker
+
+
 if __name__ == "__main__":
     # Test Error Handling
     import asyncio
@@ -321,12 +836,14 @@ if __name__ == "__main__":
 
         # Test 3: Rate Limiter
         print("\n3️⃣ Rate Limiter:")
-        limiter = RateLimiter(max_requests=3, time_window=1.0)
+        limiter = RateLimiter(max_requests=3, time_window=1.0, max_tokens=3000)
 
         start = time.time()
         for i in range(5):
-            await limiter.acquire()
+            reservation = await limiter.acquire(tokens=500)
+            limiter.settle(reservation, actual_tokens=400)
             print(f"  Request {i + 1} at {time.time() - start:.2f}s")
+        print(f"  Stats: {limiter.stats()}")
 
         print("\n✅ Error Handling Tests abgeschlossen!")
 
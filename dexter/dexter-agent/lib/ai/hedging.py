@@ -0,0 +1,295 @@
+"""
+Latenz-basiertes Request Hedging für OpenAI Model-Calls
+
+Braucht ein Request länger als die aktuelle p95-Latenz des Primärmodells,
+wird ein zweiter Request an das Fallback-Modell gestartet. Die erste
+erfolgreiche Antwort gewinnt, der andere Request wird abgebrochen. Das
+kappt die Tail-Latenz (p99), ohne den Mittelwert-Traffic zu verdoppeln:
+Hedges sind auf einen Anteil des Traffics begrenzt.
+
+Die Schwelle kommt aus Live-Latenz-Histogrammen pro Modell (gleitendes
+Zeitfenster, log-skalierte Buckets).
+"""
+
+import asyncio
+import bisect
+import logging
+import math
+import time
+from typing import Any, Awaitable, Callable, Dict, List, Optional, TypeVar
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+
+class LatencyHistogram:
+    """
+    Log-skaliertes Latenz-Histogramm über ein gleitendes Zeitfenster
+
+    Zwei Generationen (aktuell + vorherige) werden alle window_seconds
+    rotiert, Perzentile laufen über beide - so altern alte Messungen aus,
+    ohne einzelne Samples zu speichern. record() ist O(log Buckets),
+    percentile() O(Buckets); Bucket-Breite ~10% (relative Genauigkeit).
+    """
+
+    def __init__(
+        self,
+        window_seconds: float = 300.0,
+        min_value: float = 0.001,
+        max_value: float = 600.0,
+        growth: float = 1.1
+    ):
+        """
+        Args:
+            window_seconds: Länge einer Generation in Sekunden
+            min_value: Kleinste unterschiedene Latenz (Sekunden)
+            max_value: Größte unterschiedene Latenz (Sekunden)
+            growth: Verhältnis benachbarter Bucket-Grenzen
+        """
+        steps = int(math.ceil(math.log(max_value / min_value, growth)))
+        self._bounds: List[float] = [min_value * growth ** i for i in range(steps + 1)]
+        self.window_seconds = window_seconds
+        self._current = [0] * (len(self._bounds) + 1)
+        self._previous = [0] * (len(self._bounds) + 1)
+        self._current_count = 0
+        self._previous_count = 0
+        self._rotated_at = time.monotonic()
+
+    def _rotate(self, now: float) -> None:
+        elapsed = now - self._rotated_at
+        if elapsed < self.window_seconds:
+            return
+        if elapsed >= 2 * self.window_seconds:
+            # Länger nichts passiert → beide Generationen veraltet
+            self._previous = [0] * len(self._current)
+            self._previous_count = 0
+        else:
+            self._previous, self._previous_count = self._current, self._current_count
+        self._current = [0] * len(self._previous)
+        self._current_count = 0
+        self._rotated_at = now
+
+    def record(self, seconds: float) -> None:
+        """Erfasst eine Latenz in Sekunden"""
+        self._rotate(time.monotonic())
+        self._current[bisect.bisect_left(self._bounds, seconds)] += 1
+        self._current_count += 1
+
+    @property
+    def count(self) -> int:
+        """Anzahl Messungen im Fenster"""
+        self._rotate(time.monotonic())
+        return self._current_count + self._previous_count
+
+    def percentile(self, p: float) -> Optional[float]:
+        """
+        Perzentil der Latenz im Fenster
+
+        Args:
+            p: Perzentil (0-100)
+
+        Returns:
+            Obere Bucket-Grenze in Sekunden, None ohne Messungen
+        """
+        total = self.count
+        if not total:
+            return None
+        rank = max(1, math.ceil(total * p / 100))
+        cumulative = 0
+        for index, (current, previous) in enumerate(zip(self._current, self._previous)):
+            cumulative += current + previous
+            if cumulative >= rank:
+                return self._bounds[min(index, len(self._bounds) - 1)]
+        return self._bounds[-1]
+
+
+class RequestHedger:
+    """
+    Hedged Requests an ein Fallback-Modell
+
+    Attributes:
+        requests: Anzahl ausgeführter Requests
+        hedged: Anzahl gestarteter Hedge-Requests
+        hedge_wins: Hedges, bei denen das Fallback-Modell zuerst antwortete
+        hedges_skipped: Hedges, die mangels Slot bzw. Rate-Limit-Budget entfielen
+    """
+
+    def __init__(
+        self,
+        fallback_model: str,
+        percentile: float = 95.0,
+        max_hedge_ratio: float = 0.05,
+        min_samples: int = 50,
+        window_seconds: float = 300.0
+    ):
+        """
+        Args:
+            fallback_model: Modell für Hedge-Requests
+            percentile: Latenz-Perzentil des Primärmodells als Hedge-Schwelle
+            max_hedge_ratio: Max. Anteil gehedgter Requests (z.B. 0.05 = 5%)
+            min_samples: Mindestanzahl Messungen bevor gehedgt wird
+            window_seconds: Zeitfenster der Latenz-Histogramme
+        """
+        self.fallback_model = fallback_model
+        self.percentile = percentile
+        self.max_hedge_ratio = max_hedge_ratio
+        self.min_samples = min_samples
+        self.window_seconds = window_seconds
+
+        self.histograms: Dict[str, LatencyHistogram] = {}
+        self.requests = 0
+        self.hedged = 0
+        self.hedge_wins = 0
+        self.hedges_skipped = 0
+
+    def histogram(self, model: str) -> LatencyHistogram:
+        """Live-Latenz-Histogramm eines Modells"""
+        histogram = self.histograms.get(model)
+        if histogram is None:
+            histogram = self.histograms[model] = LatencyHistogram(self.window_seconds)
+        return histogram
+
+    def threshold(self, model: str) -> Optional[float]:
+        """
+        Aktuelle Hedge-Schwelle für ein Modell
+
+        Returns:
+            Sekunden, None solange zu wenige Messungen vorliegen
+        """
+        histogram = self.histogram(model)
+        if histogram.count < self.min_samples:
+            return None
+        return histogram.percentile(self.percentile)
+
+    def _budget_available(self) -> bool:
+        return self.hedged < self.max_hedge_ratio * self.requests
+
+    async def _timed(self, call: Callable[[str], Awaitable[T]], model: str) -> T:
+        """
+        Führt call(model) aus und erfasst die Latenz abgeschlossener Requests
+
+        Abgebrochene Verlierer werden nicht erfasst - ihre Dauer ist nur eine
+        untere Schranke und würde p95 nach unten ziehen.
+        """
+        start = time.monotonic()
+        result = await call(model)
+        self.histogram(model).record(time.monotonic() - start)
+        return result
+
+    async def run(
+        self,
+        call: Callable[[str], Awaitable[T]],
+        primary_model: str,
+        admit_hedge: Optional[Callable[[str], bool]] = None
+    ) -> T:
+        """
+        Führt call(primary_model) aus, bei Überschreiten der Schwelle zusätzlich
+        call(fallback_model) - die erste erfolgreiche Antwort gewinnt
+
+        Args:
+            call: Führt den Request für ein Modell aus
+            primary_model: Primärmodell
+            admit_hedge: Optional - belegt Kapazität für den Hedge-Request
+                (Slot, Rate-Limit) ohne zu warten; False → nicht hedgen
+
+        Returns:
+            Ergebnis des schnelleren erfolgreichen Requests
+
+        Raises:
+            Exception: Fehler des Primär-Requests, wenn beide fehlschlagen
+        """
+        self.requests += 1
+        threshold = self.threshold(primary_model)
+        if threshold is None or primary_model == self.fallback_model:
+            return await self._timed(call, primary_model)
+
+        primary = asyncio.ensure_future(self._timed(call, primary_model))
+        hedge: Optional["asyncio.Future[T]"] = None
+        try:
+            done, _ = await asyncio.wait({primary}, timeout=threshold)
+            if done or not self._budget_available():
+                return await primary
+            if admit_hedge is not None and not admit_hedge(self.fallback_model):
+                self.hedges_skipped += 1
+                return await primary
+
+            self.hedged += 1
+            logger.info(
+                f"⏱️ Hedge: {primary_model} > {threshold * 1000:.0f}ms, starte {self.fallback_model}"
+            )
+            hedge = asyncio.ensure_future(self._timed(call, self.fallback_model))
+
+            pending = {primary, hedge}
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    if task.exception() is None:
+                        if task is hedge:
+                            self.hedge_wins += 1
+                        return task.result()
+
+            # Beide fehlgeschlagen → Fehler des Primär-Requests
+            return primary.result()
+
+        finally:
+            for task in (primary, hedge):
+                if task is not None and not task.done():
+                    task.cancel()
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Hedge-Kennzahlen
+
+        Returns:
+            Dict mit hedge_rate, win_rate, aktueller Schwelle und
+            p50/p95/p99 pro Modell (ms)
+        """
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value * 1000, 1) if value is not None else None
+
+        return {
+            "requests": self.requests,
+            "hedged": self.hedged,
+            "hedge_wins": self.hedge_wins,
+            "hedges_skipped": self.hedges_skipped,
+            "hedge_rate": round(self.hedged / self.requests, 4) if self.requests else 0.0,
+            "win_rate": round(self.hedge_wins / self.hedged, 4) if self.hedged else 0.0,
+            "latency_ms": {
+                model: {
+                    "count": histogram.count,
+                    "p50": ms(histogram.percentile(50)),
+                    "p95": ms(histogram.percentile(95)),
+                    "p99": ms(histogram.percentile(99)),
+                }
+                for model, histogram in self.histograms.items()
+            },
+        }
+
+
+# Singleton-Instanz (Latenz-Histogramme sind prozessweit)
+_hedger: Optional[RequestHedger] = None
+
+
+def get_request_hedger() -> Optional[RequestHedger]:
+    """
+    Hole prozessweiten RequestHedger
+
+    Returns:
+        RequestHedger Instanz, oder None wenn Hedging deaktiviert bzw.
+        kein Fallback-Modell konfiguriert ist
+    """
+    global _hedger
+    if not config.hedging.enabled or not config.model.fallback_model_name:
+        return None
+    if _hedger is None:
+        _hedger = RequestHedger(
+            fallback_model=config.model.fallback_model_name,
+            percentile=config.hedging.percentile,
+            max_hedge_ratio=config.hedging.max_hedge_ratio,
+            min_samples=config.hedging.min_samples,
+            window_seconds=config.hedging.window_seconds
+        )
+    return _hedger
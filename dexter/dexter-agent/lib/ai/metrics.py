@@ -0,0 +1,413 @@
+"""
+Performance-Telemetrie für Dexter (Tokens, Model-Latenz, Tool-Laufzeiten)
+
+Prozessweite Counter und Histogramme (Prometheus-Semantik: kumulative
+Buckets, _sum, _count) plus Kennzahlen pro Turn und pro Session. Export als
+Prometheus Text-Format oder JSON - ohne externe Dienste (z.B. als Datei für
+den Textfile-Collector des node_exporters).
+"""
+
+import json
+import math
+import os
+import time
+from dataclasses import asdict, dataclass, field
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+
+# Latenz-Buckets in Sekunden (Model-Calls, Tools, Turns)
+LATENCY_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0, 60.0)
+# Token-Buckets pro Turn
+TOKEN_BUCKETS = (250, 500, 1000, 2000, 4000, 8000, 16000, 32000, 64000, 128000)
+# Iterationen pro Turn
+ITERATION_BUCKETS = (1, 2, 3, 4, 5, 7, 10)
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_labels(labelnames: Sequence[str], values: Tuple[str, ...], extra: str = "") -> str:
+    """Prometheus Label-Set: {name="value",...}"""
+    parts = [f'{name}="{_escape(value)}"' for name, value in zip(labelnames, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+def _format_value(value: float) -> str:
+    if value == math.inf:
+        return "+Inf"
+    return f"{value:g}" if isinstance(value, float) else str(value)
+
+
+class Counter:
+    """Monoton steigender Zähler mit optionalen Labels"""
+
+    kind = "counter"
+
+    def __init__(self, name: str, help: str, labelnames: Sequence[str] = ()):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.values: Dict[Tuple[str, ...], float] = {}
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def inc(self, amount: float = 1, **labels: Any) -> None:
+        """Erhöht den Zähler (amount >= 0)"""
+        key = self._key(labels)
+        self.values[key] = self.values.get(key, 0) + amount
+
+    def value(self, **labels: Any) -> float:
+        """Aktueller Wert einer Label-Kombination"""
+        return self.values.get(self._key(labels), 0)
+
+    def samples(self) -> List[str]:
+        return [
+            f"{self.name}{_format_labels(self.labelnames, key)} {_format_value(value)}"
+            for key, value in sorted(self.values.items())
+        ]
+
+    def to_dict(self) -> Any:
+        if not self.labelnames:
+            return self.values.get((), 0)
+        return {",".join(key): value for key, value in sorted(self.values.items())}
+
+
+class Histogram:
+    """Histogramm mit festen, kumulativ exportierten Buckets"""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ):
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self.buckets = tuple(buckets) + (math.inf,)
+        # Label-Kombination → [Bucket-Zähler (nicht kumulativ), Summe, Anzahl]
+        self.series: Dict[Tuple[str, ...], List[Any]] = {}
+
+    def observe(self, value: float, **labels: Any) -> None:
+        """Erfasst einen Messwert"""
+        key = tuple(str(labels[name]) for name in self.labelnames)
+        series = self.series.get(key)
+        if series is None:
+            series = self.series[key] = [[0] * len(self.buckets), 0.0, 0]
+        for index, bound in enumerate(self.buckets):
+            if value <= bound:
+                series[0][index] += 1
+                break
+        series[1] += value
+        series[2] += 1
+
+    def percentile(self, p: float, **labels: Any) -> Optional[float]:
+        """Perzentil (lineare Interpolation innerhalb des Buckets), None ohne Messwerte"""
+        series = self.series.get(tuple(str(labels[name]) for name in self.labelnames))
+        return self._percentile(series, p) if series else None
+
+    def _percentile(self, series: List[Any], p: float) -> Optional[float]:
+        counts, _, total = series
+        if not total:
+            return None
+        rank = total * p / 100
+        cumulative = 0
+        for index, count in enumerate(counts):
+            if count and cumulative + count >= rank:
+                lower = self.buckets[index - 1] if index else 0.0
+                upper = self.buckets[index]
+                if upper == math.inf:
+                    return lower
+                return lower + (upper - lower) * (rank - cumulative) / count
+            cumulative += count
+        return self.buckets[-2]
+
+    def samples(self) -> List[str]:
+        lines = []
+        for key, (counts, total_sum, total_count) in sorted(self.series.items()):
+            cumulative = 0
+            for bound, count in zip(self.buckets, counts):
+                cumulative += count
+                le = f'le="{_format_value(float(bound))}"'
+                lines.append(f"{self.name}_bucket{_format_labels(self.labelnames, key, le)} {cumulative}")
+            labels = _format_labels(self.labelnames, key)
+            lines.append(f"{self.name}_sum{labels} {_format_value(float(total_sum))}")
+            lines.append(f"{self.name}_count{labels} {total_count}")
+        return lines
+
+    def to_dict(self) -> Dict[str, Any]:
+        result = {}
+        for key, series in sorted(self.series.items()):
+            counts, total_sum, total_count = series
+            result[",".join(key) or "all"] = {
+                "count": total_count,
+                "sum": round(total_sum, 6),
+                "mean": round(total_sum / total_count, 6) if total_count else None,
+                "p50": self._percentile(series, 50),
+                "p95": self._percentile(series, 95),
+                "p99": self._percentile(series, 99),
+            }
+        return result
+
+
+Metric = Union[Counter, Histogram]
+
+
+class MetricsRegistry:
+    """Sammlung von Metriken mit Prometheus- und JSON-Export"""
+
+    def __init__(self):
+        self._metrics: Dict[str, Metric] = {}
+
+    def counter(self, name: str, help: str, labelnames: Sequence[str] = ()) -> Counter:
+        """Registriert einen Counter (idempotent pro Name)"""
+        return self._register(Counter(name, help, labelnames))
+
+    def histogram(
+        self,
+        name: str,
+        help: str,
+        labelnames: Sequence[str] = (),
+        buckets: Sequence[float] = LATENCY_BUCKETS
+    ) -> Histogram:
+        """Registriert ein Histogramm (idempotent pro Name)"""
+        return self._register(Histogram(name, help, labelnames, buckets))
+
+    def _register(self, metric: Metric) -> Metric:
+        existing = self._metrics.get(metric.name)
+        if existing is not None:
+            return existing
+        self._metrics[metric.name] = metric
+        return metric
+
+    def to_prometheus(self) -> str:
+        """Export im Prometheus Text-Format (Version 0.0.4)"""
+        lines = []
+        for metric in self._metrics.values():
+            lines.append(f"# HELP {metric.name} {metric.help}")
+            lines.append(f"# TYPE {metric.name} {metric.kind}")
+            lines.extend(metric.samples())
+        return "\n".join(lines) + "\n"
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Export als JSON-fähiges Dict"""
+        return {name: metric.to_dict() for name, metric in self._metrics.items()}
+
+    def write(self, path: Union[str, Path]) -> Path:
+        """
+        Schreibt die Metriken atomar in eine Datei
+
+        Args:
+            path: Zieldatei - ".json" → JSON, sonst Prometheus Text-Format
+
+        Returns:
+            Pfad der geschriebenen Datei
+        """
+        path = Path(path)
+        if path.suffix == ".json":
+            payload = json.dumps(self.to_dict(), indent=2, ensure_ascii=False)
+        else:
+            payload = self.to_prometheus()
+        path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(path.suffix + ".tmp")
+        tmp_path.write_text(payload, encoding="utf-8")
+        os.replace(tmp_path, path)
+        return path
+
+
+@dataclass
+class TurnMetrics:
+    """Kennzahlen eines Chat-Turns"""
+    turn: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    iterations: int = 0
+    model_calls: int = 0
+    model_errors: int = 0
+    retries: int = 0
+    model_seconds: float = 0.0
+    model_latencies: List[float] = field(default_factory=list)
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    tool_seconds: Dict[str, float] = field(default_factory=dict)
+    duration_seconds: float = 0.0
+    outcome: str = "ok"            # ok | overloaded | error | max_iterations
+    error: str = ""                # Fehlermeldung bei outcome != ok
+    started_at: float = field(default_factory=time.perf_counter, repr=False)
+
+    @property
+    def total_tokens(self) -> int:
+        return self.prompt_tokens + self.completion_tokens
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = asdict(self)
+        del data["started_at"]
+        data["total_tokens"] = self.total_tokens
+        return data
+
+
+@dataclass
+class SessionMetrics:
+    """Aufsummierte Kennzahlen einer Session (über alle Turns)"""
+    turns: int = 0
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0
+    iterations: int = 0
+    model_calls: int = 0
+    model_errors: int = 0
+    retries: int = 0
+    model_seconds: float = 0.0
+    tool_calls: Dict[str, int] = field(default_factory=dict)
+    tool_seconds: Dict[str, float] = field(default_factory=dict)
+    turn_seconds: float = 0.0
+    last_turn: Optional[TurnMetrics] = None
+
+    def add(self, turn: TurnMetrics) -> None:
+        """Addiert einen abgeschlossenen Turn"""
+        self.turns += 1
+        self.prompt_tokens += turn.prompt_tokens
+        self.completion_tokens += turn.completion_tokens
+        self.cached_tokens += turn.cached_tokens
+        self.iterations += turn.iterations
+        self.model_calls += turn.model_calls
+        self.model_errors += turn.model_errors
+        self.retries += turn.retries
+        self.model_seconds += turn.model_seconds
+        for tool_name, count in turn.tool_calls.items():
+            self.tool_calls[tool_name] = self.tool_calls.get(tool_name, 0) + count
+        for tool_name, seconds in turn.tool_seconds.items():
+            self.tool_seconds[tool_name] = self.tool_seconds.get(tool_name, 0.0) + seconds
+        self.turn_seconds += turn.duration_seconds
+        self.last_turn = turn
+
+    def merge(self, other: "SessionMetrics") -> None:
+        """Addiert die Kennzahlen einer anderen Session (z.B. frühere Versuche eines Batch-Items)"""
+        self.turns += other.turns
+        self.prompt_tokens += other.prompt_tokens
+        self.completion_tokens += other.completion_tokens
+        self.cached_tokens += other.cached_tokens
+        self.iterations += other.iterations
+        self.model_calls += other.model_calls
+        self.model_errors += other.model_errors
+        self.retries += other.retries
+        self.model_seconds += other.model_seconds
+        for tool_name, count in other.tool_calls.items():
+            self.tool_calls[tool_name] = self.tool_calls.get(tool_name, 0) + count
+        for tool_name, seconds in other.tool_seconds.items():
+            self.tool_seconds[tool_name] = self.tool_seconds.get(tool_name, 0.0) + seconds
+        self.turn_seconds += other.turn_seconds
+        if other.last_turn is not None:
+            self.last_turn = other.last_turn
+
+    def to_dict(self) -> Dict[str, Any]:
+        data = {key: value for key, value in vars(self).items() if key != "last_turn"}
+        data["total_tokens"] = self.prompt_tokens + self.completion_tokens
+        data["last_turn"] = self.last_turn.to_dict() if self.last_turn else None
+        return data
+
+
+class AgentMetrics(MetricsRegistry):
+    """Prozessweite Agent-Metriken (alle Sessions)"""
+
+    def __init__(self):
+        super().__init__()
+        self.turns = self.counter("dexter_turns_total", "Abgeschlossene Chat-Turns")
+        self.turn_duration = self.histogram("dexter_turn_duration_seconds", "Dauer eines Chat-Turns")
+        self.turn_iterations = self.histogram(
+            "dexter_turn_iterations", "Loop-Iterationen pro Turn", buckets=ITERATION_BUCKETS
+        )
+        self.turn_tokens = self.histogram(
+            "dexter_turn_tokens", "Tokens (Prompt + Completion) pro Turn", buckets=TOKEN_BUCKETS
+        )
+        self.tokens = self.counter("dexter_tokens_total", "Verbrauchte Tokens", ("model", "kind"))
+        self.model_calls = self.counter("dexter_model_calls_total", "Model-Call Versuche", ("model", "outcome"))
+        self.model_latency = self.histogram(
+            "dexter_model_call_duration_seconds", "Latenz eines Model-Calls", ("model",)
+        )
+        self.retries = self.counter("dexter_model_retries_total", "Wiederholte Model-Calls")
+        self.tool_calls = self.counter("dexter_tool_calls_total", "Tool-Ausführungen", ("tool", "outcome"))
+        self.tool_duration = self.histogram(
+            "dexter_tool_duration_seconds", "Laufzeit einer Tool-Ausführung", ("tool",)
+        )
+
+    def record_model_call(
+        self,
+        turn: Optional[TurnMetrics],
+        model: str,
+        seconds: float,
+        response: Any = None,
+        retry: bool = False
+    ) -> None:
+        """
+        Erfasst einen Model-Call Versuch
+
+        Args:
+            turn: Laufender Turn (None außerhalb von chat())
+            model: Konfiguriertes Modell
+            seconds: Latenz des Versuchs
+            response: OpenAIResponse, None bei Fehler
+            retry: War der Versuch eine Wiederholung?
+        """
+        self.model_calls.inc(model=model, outcome="ok" if response is not None else "error")
+        self.model_latency.observe(seconds, model=model)
+        if retry:
+            self.retries.inc()
+        if response is not None:
+            self.tokens.inc(response.prompt_tokens, model=model, kind="prompt")
+            self.tokens.inc(response.completion_tokens, model=model, kind="completion")
+            self.tokens.inc(response.cached_tokens, model=model, kind="cached")
+
+        if turn is None:
+            return
+        turn.model_calls += 1
+        turn.model_seconds += seconds
+        turn.model_latencies.append(seconds)
+        if retry:
+            turn.retries += 1
+        if response is None:
+            turn.model_errors += 1
+        else:
+            turn.prompt_tokens += response.prompt_tokens
+            turn.completion_tokens += response.completion_tokens
+            turn.cached_tokens += response.cached_tokens
+
+    def record_tool(self, turn: Optional[TurnMetrics], tool_name: str, seconds: float, ok: bool) -> None:
+        """Erfasst eine Tool-Ausführung"""
+        self.tool_calls.inc(tool=tool_name, outcome="ok" if ok else "error")
+        self.tool_duration.observe(seconds, tool=tool_name)
+        if turn is not None:
+            turn.tool_calls[tool_name] = turn.tool_calls.get(tool_name, 0) + 1
+            turn.tool_seconds[tool_name] = turn.tool_seconds.get(tool_name, 0.0) + seconds
+
+    def record_turn(self, turn: TurnMetrics) -> None:
+        """Schließt einen Turn ab (Dauer, Iterationen, Tokens)"""
+        turn.duration_seconds = time.perf_counter() - turn.started_at
+        self.turns.inc()
+        self.turn_duration.observe(turn.duration_seconds)
+        self.turn_iterations.observe(turn.iterations)
+        self.turn_tokens.observe(turn.total_tokens)
+
+
+# Singleton-Instanz
+_metrics: Optional[AgentMetrics] = None
+
+
+def get_metrics() -> AgentMetrics:
+    """
+    Hole prozessweite Agent-Metriken
+
+    Returns:
+        AgentMetrics Instanz
+    """
+    global _metrics
+    if _metrics is None:
+        _metrics = AgentMetrics()
+    return _metrics
@@ -6,17 +6,30 @@ Dieses Modul verwaltet die gesamte OpenAI API-Integration inklusive:
 - Function Calling für Tools
 - Token-Management und Context-Trimming
 - Error-Handling und Retry-Logik
+- Prozessweiter async Client mit konfigurierbarem Connection-Pool
 """
 
 import os
 import asyncio
-from typing import List, Dict, Any, AsyncIterator, Optional, Literal
-from dataclasses import dataclass
-from openai import OpenAI, AsyncOpenAI
+import contextlib
+import json
+import logging
+import time
+from typing import List, Dict, Any, AsyncIterator, Optional, Literal, Sequence, Tuple
+from dataclasses import dataclass, field
+import httpx
+from openai import AsyncOpenAI, DefaultAsyncHttpxClient
 from openai.types.chat import ChatCompletion, ChatCompletionChunk
 from openai.types.chat.chat_completion_message_tool_call import ChatCompletionMessageToolCall
 
 from config import config
+from .admission import PRIORITY_INTERACTIVE, get_admission_controller
+from .error_handler import RateLimitReservation, get_rate_limiter
+
+logger = logging.getLogger(__name__)
+
+# Ohne Admission Control: wiederverwendbarer No-Op Context Manager
+_NO_ADMISSION = contextlib.nullcontext()
 
 
 # Type Definitions
@@ -38,6 +51,93 @@ class OpenAIResponse:
     model: str
     finish_reason: str
     tool_calls: Optional[List[ChatCompletionMessageToolCall]] = None
+    prompt_tokens: int = 0
+    completion_tokens: int = 0
+    cached_tokens: int = 0  # Prompt-Tokens aus dem Provider Prompt-Cache
+
+
+def _cached_tokens(usage: Any) -> int:
+    """Gecachte Prompt-Tokens aus usage.prompt_tokens_details (falls geliefert)"""
+    details = getattr(usage, "prompt_tokens_details", None) if usage else None
+    return (getattr(details, "cached_tokens", None) or 0) if details else 0
+
+
+@dataclass
+class StreamedFunction:
+    """Aus Stream-Deltas zusammengesetzter Function-Call"""
+    name: str = ""
+    arguments: str = ""
+
+
+@dataclass
+class StreamedToolCall:
+    """Aus Stream-Deltas zusammengesetzter Tool-Call (gleiche Attribute wie SDK Tool-Call)"""
+    id: str = ""
+    type: str = "function"
+    function: StreamedFunction = field(default_factory=StreamedFunction)
+
+
+@dataclass
+class StreamEvent:
+    """
+    Event aus generate_response_events
+
+    type="content": Text-Delta in content
+    type="done": Stream beendet, response enthält zusammengesetzte Response
+    """
+    type: Literal["content", "done"]
+    content: str = ""
+    response: Optional[OpenAIResponse] = None
+
+
+# Prozessweite async Clients (ein Connection-Pool pro API Key und Endpoint)
+_shared_clients: Dict[Tuple[str, Optional[str]], AsyncOpenAI] = {}
+
+
+def get_shared_async_client(
+    api_key: Optional[str] = None,
+    base_url: Optional[str] = None
+) -> AsyncOpenAI:
+    """
+    Hole prozessweiten AsyncOpenAI Client mit konfiguriertem Connection-Pool
+
+    Alle OpenAIService-Instanzen (und damit alle Agents/Sessions) teilen sich
+    pro API Key einen Client, sodass Keep-Alive-Verbindungen wiederverwendet
+    werden statt pro Session neue TLS-Handshakes aufzubauen.
+
+    Args:
+        api_key: Optional - OpenAI API Key (falls nicht in config)
+        base_url: Optional - Abweichender Endpoint (z.B. lokaler Mock-Server),
+            Default: OPENAI_BASE_URL bzw. api.openai.com
+
+    Returns:
+        AsyncOpenAI Instanz
+    """
+    api_key = api_key or config.api_key
+    client = _shared_clients.get((api_key, base_url))
+    if client is None:
+        transport = config.transport
+        http_client = DefaultAsyncHttpxClient(
+            limits=httpx.Limits(
+                max_connections=transport.max_connections,
+                max_keepalive_connections=transport.max_keepalive_connections,
+                keepalive_expiry=transport.keepalive_expiry
+            ),
+            timeout=httpx.Timeout(transport.request_timeout, connect=transport.connect_timeout)
+        )
+        # Retries übernimmt error_handler (Jitter, Circuit Breaker, Deadline) -
+        # SDK-interne Retries würden sich damit multiplizieren
+        client = AsyncOpenAI(api_key=api_key, base_url=base_url, http_client=http_client, max_retries=0)
+        _shared_clients[(api_key, base_url)] = client
+    return client
+
+
+async def close_shared_async_clients() -> None:
+    """Schließt alle prozessweiten Clients (z.B. beim Shutdown)"""
+    clients = list(_shared_clients.values())
+    _shared_clients.clear()
+    for client in clients:
+        await client.close()
 
 
 class OpenAIService:
@@ -45,25 +145,42 @@ class OpenAIService:
     Service-Klasse für OpenAI API Integration
 
     Attributes:
-        client: Synchroner OpenAI Client
-        async_client: Asynchroner OpenAI Client
+        async_client: Asynchroner OpenAI Client (prozessweit geteilt)
         model: Verwendetes Modell (z.B. gpt-4-turbo-preview)
+        request_timeout: Default-Timeout pro Request in Sekunden
+        completion_cache: Record/Replay Cache (None = deaktiviert)
+        rate_limiter: Prozessweiter RPM/TPM Limiter (None = deaktiviert)
+        hedger: Hedged Requests ans Fallback-Modell (None = deaktiviert)
+        admission: Prozessweite Admission Control (None = deaktiviert)
     """
 
-    def __init__(self, api_key: Optional[str] = None):
+    def __init__(
+        self,
+        api_key: Optional[str] = None,
+        async_client: Optional[AsyncOpenAI] = None
+    ):
         """
         Initialisiert OpenAI Service
 
         Args:
             api_key: Optional - OpenAI API Key (falls nicht in config)
+            async_client: Optional - eigener Client (Default: prozessweiter Client)
         """
         self.api_key = api_key or config.api_key
-        self.client = OpenAI(api_key=self.api_key)
-        self.async_client = AsyncOpenAI(api_key=self.api_key)
+        self.async_client = async_client or get_shared_async_client(self.api_key)
+        self.request_timeout = config.transport.request_timeout
         self.model = config.model.model_name
         self.temperature = config.model.temperature
         self.max_tokens = config.model.max_tokens
 
+        from .completion_cache import get_completion_cache
+        from .hedging import get_request_hedger
+        self.completion_cache = get_completion_cache()
+        self.hedger = get_request_hedger()
+        self.admission = get_admission_controller()
+        self.rate_limiter = get_rate_limiter() if config.rate_limit.enabled else None
+        self._tools_tokens: Tuple[Optional[object], int] = (None, 0)
+
     def _convert_messages(self, messages: List[ChatMessage]) -> List[Dict[str, Any]]:
         """
         Konvertiert ChatMessage-Objekte zu OpenAI API Format
@@ -89,12 +206,169 @@ class OpenAIService:
 
         return result
 
+    def _build_params(
+        self,
+        messages: List[ChatMessage],
+        tools: Optional[Sequence[Dict[str, Any]]],
+        temperature: Optional[float],
+        max_tokens: Optional[int]
+    ) -> Dict[str, Any]:
+        """Request-Parameter für chat.completions.create (ohne Streaming-Optionen)"""
+        params = {
+            "model": self.model,
+            "messages": self._convert_messages(messages),
+            "temperature": temperature or self.temperature,
+            "max_tokens": max_tokens or self.max_tokens,
+        }
+
+        # Füge tools hinzu wenn vorhanden
+        if tools:
+            params["tools"] = list(tools)
+            params["tool_choice"] = "auto"
+
+        return params
+
+    def _estimate_request_tokens(
+        self,
+        params: Dict[str, Any],
+        tools: Optional[Sequence[Dict[str, Any]]]
+    ) -> int:
+        """
+        Geschätzte Tokens eines Requests für das TPM-Budget
+
+        Prompt (Nachrichten + Tool-Schemas, ~4 Zeichen/Token) plus max_tokens,
+        da der Provider die maximale Completion-Länge vorab anrechnet.
+        """
+        chars = 0
+        for message in params["messages"]:
+            chars += len(message.get("content") or "")
+            for tool_call in message.get("tool_calls") or ():
+                chars += len(tool_call["function"]["arguments"])
+        prompt_tokens = chars // 4 + 4 * len(params["messages"])
+
+        if tools:
+            # Schema-Größe nur einmal pro (geteiltem) Tool-Tupel berechnen
+            cached_tools, schema_tokens = self._tools_tokens
+            if tools is not cached_tools:
+                schema_tokens = len(json.dumps(list(tools), ensure_ascii=False)) // 4
+                self._tools_tokens = (tools, schema_tokens)
+            prompt_tokens += schema_tokens
+
+        return prompt_tokens + params["max_tokens"]
+
+    def _admission_slot(self, priority: int):
+        """Admission-Slot für einen API Call (ohne Limit: No-Op)"""
+        if self.admission is None:
+            return _NO_ADMISSION
+        return self.admission.slot(priority)
+
+    async def _create_completion(self, params: Dict[str, Any], timeout: float) -> OpenAIResponse:
+        """Einzelner non-streaming API Call → OpenAIResponse"""
+        # Native async call über den geteilten Connection-Pool
+        response: ChatCompletion = await self.async_client.chat.completions.create(
+            **params,
+            timeout=timeout
+        )
+
+        choice = response.choices[0]
+        message = choice.message
+
+        return OpenAIResponse(
+            content=message.content or "",
+            tokens_used=response.usage.total_tokens if response.usage else 0,
+            model=response.model,
+            finish_reason=choice.finish_reason,
+            tool_calls=message.tool_calls if hasattr(message, 'tool_calls') else None,
+            prompt_tokens=response.usage.prompt_tokens if response.usage else 0,
+            completion_tokens=response.usage.completion_tokens if response.usage else 0,
+            cached_tokens=_cached_tokens(response.usage)
+        )
+
+    async def _hedged_completion(
+        self,
+        params: Dict[str, Any],
+        tools: Optional[Sequence[Dict[str, Any]]],
+        timeout: float,
+        reservation: Optional[RateLimitReservation]
+    ) -> OpenAIResponse:
+        """
+        Non-streaming API Call über den RequestHedger
+
+        Der Hedge-Request bekommt einen eigenen Admission-Slot und eine eigene
+        RPM/TPM-Reservierung - beides ohne Warten, sonst wird nicht gehedgt.
+        Jeder Request wird einzeln abgerechnet: abgeschlossene mit ihrer Usage,
+        ein abgebrochener Verlierer mit der vollen Schätzung.
+
+        Args:
+            params: Request-Parameter des Primärmodells
+            tools: Tool-Schemas (für die Token-Schätzung)
+            timeout: Timeout pro Request in Sekunden
+            reservation: Reservierung des Primär-Requests (None ohne Rate Limiter)
+        """
+        primary_model = params["model"]
+        reservations: Dict[str, Optional[RateLimitReservation]] = {primary_model: reservation}
+        hedge_slot: Dict[str, float] = {}   # {"start": monotonic} solange der Hedge-Slot belegt ist
+
+        def release_hedge_slot() -> None:
+            start = hedge_slot.pop("start", None)
+            if start is not None:
+                self.admission.release(time.monotonic() - start)
+
+        def admit_hedge(model: str) -> bool:
+            if self.admission is not None:
+                if not self.admission.try_acquire():
+                    return False
+                hedge_slot["start"] = time.monotonic()
+            if self.rate_limiter is not None:
+                hedge_reservation = self.rate_limiter.try_acquire(self._estimate_request_tokens(params, tools))
+                if hedge_reservation is None:
+                    release_hedge_slot()
+                    return False
+                reservations[model] = hedge_reservation
+            return True
+
+        async def attempt(model: str) -> OpenAIResponse:
+            try:
+                result = await self._create_completion({**params, "model": model}, timeout)
+            except asyncio.CancelledError:
+                raise
+            except Exception:
+                if reservations.get(model) is not None:
+                    self.rate_limiter.release(reservations[model])
+                raise
+            finally:
+                if model != primary_model:
+                    release_hedge_slot()
+            if reservations.get(model) is not None:
+                self.rate_limiter.settle(reservations[model], result.tokens_used)
+            return result
+
+        try:
+            result = await self.hedger.run(attempt, primary_model, admit_hedge)
+        except BaseException:
+            # Turn fehlgeschlagen oder abgebrochen → offene Reservierungen zurückgeben
+            for open_reservation in reservations.values():
+                if open_reservation is not None:
+                    self.rate_limiter.release(open_reservation)
+            raise
+        finally:
+            # Hedge-Task evtl. abgebrochen bevor er lief
+            release_hedge_slot()
+
+        # Abgebrochener Verlierer: der Provider rechnet den begonnenen Request ab
+        for open_reservation in reservations.values():
+            if open_reservation is not None:
+                self.rate_limiter.settle(open_reservation, open_reservation.tokens)
+        return result
+
     async def generate_response(
         self,
         messages: List[ChatMessage],
-        tools: Optional[List[Dict[str, Any]]] = None,
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
         temperature: Optional[float] = None,
-        max_tokens: Optional[int] = None
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_INTERACTIVE
     ) -> OpenAIResponse:
         """
         Generiert eine Response (non-streaming)
@@ -104,54 +378,190 @@ class OpenAIService:
             tools: Optional - Tool definitions für Function Calling
             temperature: Optional - Override der Konfiguration
             max_tokens: Optional - Override der Konfiguration
+            timeout: Optional - Timeout für diesen Request in Sekunden
+            priority: Admission-Priorität (PRIORITY_INTERACTIVE vor PRIORITY_BATCH)
 
         Returns:
             OpenAIResponse mit content, tokens, etc.
+
+        Raises:
+            CompletionCacheMiss: Replay-Modus und Request nicht im Cache
+            OverloadedError: Admission Control hat den Call abgewiesen
         """
-        try:
-            api_messages = self._convert_messages(messages)
-
-            params = {
-                "model": self.model,
-                "messages": api_messages,
-                "temperature": temperature or self.temperature,
-                "max_tokens": max_tokens or self.max_tokens,
-            }
-
-            # Füge tools hinzu wenn vorhanden
-            if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
-
-            # Async call
-            response: ChatCompletion = await asyncio.to_thread(
-                self.client.chat.completions.create,
-                **params
-            )
-
-            choice = response.choices[0]
-            message = choice.message
-
-            return OpenAIResponse(
-                content=message.content or "",
-                tokens_used=response.usage.total_tokens if response.usage else 0,
-                model=response.model,
-                finish_reason=choice.finish_reason,
-                tool_calls=message.tool_calls if hasattr(message, 'tool_calls') else None
-            )
+        params = self._build_params(messages, tools, temperature, max_tokens)
+
+        # Record/Replay Cache (wirft CompletionCacheMiss im Replay-Modus)
+        fingerprint = None
+        if self.completion_cache is not None:
+            fingerprint = self.completion_cache.fingerprint(params)
+            cached = await self.completion_cache.get(fingerprint)
+            if cached is not None:
+                return cached
+
+        # Admission Control: Concurrency-Limit über alle Sessions, Load Shedding bei Überlast
+        async with self._admission_slot(priority):
+            # Bursts warten FIFO auf RPM/TPM-Budget statt in 429-Fehler zu laufen
+            reservation = None
+            if self.rate_limiter is not None:
+                reservation = await self.rate_limiter.acquire(self._estimate_request_tokens(params, tools))
+
+            timeout = timeout or self.request_timeout
+            try:
+                if self.hedger is not None:
+                    # Langsame Requests nach p95-Schwelle zusätzlich ans Fallback-Modell
+                    result = await self._hedged_completion(params, tools, timeout, reservation)
+                else:
+                    result = await self._create_completion(params, timeout)
 
-        except Exception as e:
-            raise OpenAIServiceError(f"Fehler bei OpenAI API Call: {str(e)}") from e
+            except Exception as e:
+                raise OpenAIServiceError(f"Fehler bei OpenAI API Call: {str(e)}") from e
+
+            else:
+                if reservation is not None:
+                    self.rate_limiter.settle(reservation, result.tokens_used)
+
+            finally:
+                # Fehler oder Abbruch (Turn-Deadline, Batch-Timeout): nicht abgerechnete
+                # Reservierung zurückgeben (nach settle() ein No-Op)
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
+
+        if fingerprint is not None:
+            await self.completion_cache.put(fingerprint, result)
+        return result
+
+    async def generate_response_events(
+        self,
+        messages: List[ChatMessage],
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
+        temperature: Optional[float] = None,
+        max_tokens: Optional[int] = None,
+        timeout: Optional[float] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ) -> AsyncIterator[StreamEvent]:
+        """
+        Generiert eine Response mit Streaming inkl. Function Calling
+
+        Text-Deltas werden sofort geliefert. Tool-Calls werden aus den
+        gestreamten Argument-Fragmenten (pro Index) zusammengesetzt und
+        zusammen mit finish_reason und Usage im abschließenden "done"-Event
+        zurückgegeben.
+
+        Args:
+            messages: Conversation History
+            tools: Optional - Tool definitions
+            temperature: Optional - Override
+            max_tokens: Optional - Override
+            timeout: Optional - Timeout für diesen Request in Sekunden
+            priority: Admission-Priorität (PRIORITY_INTERACTIVE vor PRIORITY_BATCH)
+
+        Yields:
+            StreamEvent ("content" pro Text-Delta, zuletzt genau ein "done")
+
+        Raises:
+            CompletionCacheMiss: Replay-Modus und Request nicht im Cache
+            OverloadedError: Admission Control hat den Call abgewiesen
+        """
+        params = self._build_params(messages, tools, temperature, max_tokens)
+
+        # Gleicher Fingerprint wie non-streaming: Treffer werden als ein Chunk geliefert
+        fingerprint = None
+        if self.completion_cache is not None:
+            fingerprint = self.completion_cache.fingerprint(params)
+            cached = await self.completion_cache.get(fingerprint)
+            if cached is not None:
+                if cached.content:
+                    yield StreamEvent(type="content", content=cached.content)
+                yield StreamEvent(type="done", response=cached)
+                return
+
+        # Slot wird bis zum Ende des Streams gehalten
+        async with self._admission_slot(priority):
+            reservation = None
+            if self.rate_limiter is not None:
+                reservation = await self.rate_limiter.acquire(self._estimate_request_tokens(params, tools))
+
+            try:
+                stream = await self.async_client.chat.completions.create(
+                    **params,
+                    stream=True,
+                    stream_options={"include_usage": True},
+                    timeout=timeout or self.request_timeout
+                )
+
+                content_parts: List[str] = []
+                tool_calls: Dict[int, StreamedToolCall] = {}
+                finish_reason = ""
+                model = self.model
+                usage = None
+
+                async for chunk in stream:
+                    if chunk.model:
+                        model = chunk.model
+                    if chunk.usage:
+                        # Letzter Chunk (include_usage) hat keine choices
+                        usage = chunk.usage
+
+                    if not chunk.choices:
+                        continue
+
+                    choice = chunk.choices[0]
+                    delta = choice.delta
+
+                    if delta.content:
+                        content_parts.append(delta.content)
+                        yield StreamEvent(type="content", content=delta.content)
+
+                    for tool_delta in delta.tool_calls or []:
+                        tool_call = tool_calls.setdefault(tool_delta.index, StreamedToolCall())
+                        if tool_delta.id:
+                            tool_call.id = tool_delta.id
+                        if tool_delta.function:
+                            if tool_delta.function.name:
+                                tool_call.function.name += tool_delta.function.name
+                            if tool_delta.function.arguments:
+                                tool_call.function.arguments += tool_delta.function.arguments
+
+                    if choice.finish_reason:
+                        finish_reason = choice.finish_reason
+
+                result = OpenAIResponse(
+                    content="".join(content_parts),
+                    tokens_used=usage.total_tokens if usage else 0,
+                    model=model,
+                    finish_reason=finish_reason,
+                    tool_calls=[tool_calls[index] for index in sorted(tool_calls)] or None,
+                    prompt_tokens=usage.prompt_tokens if usage else 0,
+                    completion_tokens=usage.completion_tokens if usage else 0,
+                    cached_tokens=_cached_tokens(usage)
+                )
+
+            except Exception as e:
+                raise OpenAIServiceError(f"Fehler bei OpenAI Streaming: {str(e)}") from e
+
+            else:
+                if reservation is not None:
+                    self.rate_limiter.settle(reservation, result.tokens_used)
+
+            finally:
+                # Fehler, Abbruch oder aclose() mitten im Stream (GeneratorExit):
+                # nicht abgerechnete Reservierung zurückgeben
+                if reservation is not None:
+                    self.rate_limiter.release(reservation)
+
+        if fingerprint is not None:
+            await self.completion_cache.put(fingerprint, result)
+        yield StreamEvent(type="done", response=result)
 
     async def generate_response_stream(
         self,
         messages: List[ChatMessage],
-        tools: Optional[List[Dict[str, Any]]] = None,
+        tools: Optional[Sequence[Dict[str, Any]]] = None,
         temperature: Optional[float] = None,
         max_tokens: Optional[int] = None
     ) -> AsyncIterator[str]:
         """
-        Generiert eine Response mit Streaming
+        Generiert eine Response mit Streaming (nur Text)
 
         Args:
             messages: Conversation History
@@ -161,33 +571,39 @@ class OpenAIService:
 
         Yields:
             Content chunks als strings
+
+        Note:
+            Tool-Calls werden hier verworfen - für Function Calling
+            generate_response_events verwenden.
         """
-        try:
-            api_messages = self._convert_messages(messages)
-
-            params = {
-                "model": self.model,
-                "messages": api_messages,
-                "temperature": temperature or self.temperature,
-                "max_tokens": max_tokens or self.max_tokens,
-                "stream": True
-            }
-
-            if tools:
-                params["tools"] = tools
-                params["tool_choice"] = "auto"
-
-            # Async streaming
-            stream = await self.async_client.chat.completions.create(**params)
-
-            async for chunk in stream:
-                if chunk.choices and len(chunk.choices) > 0:
-                    delta = chunk.choices[0].delta
-                    if delta.content:
-                        yield delta.content
+        async for event in self.generate_response_events(messages, tools, temperature, max_tokens):
+            if event.type == "content":
+                yield event.content
 
-        except Exception as e:
-            raise OpenAIServiceError(f"Fehler bei OpenAI Streaming: {str(e)}") from e
+    async def warmup(self, connections: Optional[int] = None) -> int:
+        """
+        Wärmt den Connection-Pool vor (DNS, TCP, TLS) - z.B. beim Start
+
+        Nutzt den günstigen /models-Endpoint; Fehler werden nur geloggt.
+
+        Args:
+            connections: Anzahl paralleler Verbindungen (Default aus config.transport)
+
+        Returns:
+            Anzahl erfolgreich aufgebauter Verbindungen
+        """
+        count = connections if connections is not None else config.transport.warmup_connections
+        if count <= 0:
+            return 0
+
+        results = await asyncio.gather(
+            *(self.async_client.models.list(timeout=config.transport.connect_timeout * 2) for _ in range(count)),
+            return_exceptions=True
+        )
+        warmed = sum(1 for result in results if not isinstance(result, BaseException))
+        if warmed < count:
+            logger.warning(f"Connection warm-up: {warmed}/{count} Verbindungen aufgebaut")
+        return warmed
 
     def estimate_tokens(self, text: str) -> int:
         """
@@ -218,28 +634,16 @@ class OpenAIService:
             max_tokens: Maximale Token-Anzahl
 
         Returns:
-            Getrimte Message-Liste (behält system message + neueste messages)
+            Getrimte Message-Liste (behält system message + neueste messages,
+            der aktuelle Turn ab der letzten User-Nachricht bleibt immer erhalten)
         """
-        # System message behalten
-        system_messages = [m for m in messages if m.role == "system"]
-        other_messages = [m for m in messages if m.role != "system"]
-
-        # Token-Budget berechnen
-        system_tokens = sum(self.estimate_tokens(m.content) for m in system_messages)
-        remaining_tokens = max_tokens - system_tokens
-
-        # Von hinten nach vorne Messages hinzufügen
-        trimmed_other = []
-        current_tokens = 0
-
-        for message in reversed(other_messages):
-            msg_tokens = self.estimate_tokens(message.content)
-            if current_tokens + msg_tokens > remaining_tokens:
-                break
-            trimmed_other.insert(0, message)
-            current_tokens += msg_tokens
+        # Lineare Verdrängung mit inkrementeller Token-Abrechnung;
+        # tool_calls-Nachrichten bleiben mit ihren tool-Antworten zusammen
+        from .conversation_history import ConversationHistory
 
-        return system_messages + trimmed_other
+        history = ConversationHistory(max_tokens=max_tokens)
+        history.extend(messages)
+        return history.messages
 
 
 class OpenAIServiceError(Exception):
@@ -267,7 +671,7 @@ def get_service() -> OpenAIService:
 # Convenience Functions für einfachen Import
 async def generate_agent_response(
     messages: List[ChatMessage],
-    tools: Optional[List[Dict[str, Any]]] = None
+    tools: Optional[Sequence[Dict[str, Any]]] = None
 ) -> OpenAIResponse:
     """Generiere Agent Response (non-streaming)"""
     service = get_service()
@@ -276,7 +680,7 @@ async def generate_agent_response(
 
 async def generate_agent_response_stream(
     messages: List[ChatMessage],
-    tools: Optional[List[Dict[str, Any]]] = None
+    tools: Optional[Sequence[Dict[str, Any]]] = None
 ) -> AsyncIterator[str]:
     """Generiere Agent Response (streaming)"""
     service = get_service()
@@ -0,0 +1,192 @@
+"""
+Memoizing Cache für deterministische Tool-Ergebnisse
+
+Alle Dexter Financial Tools sind reine Funktionen ihrer Argumente. Der Cache
+speichert Ergebnisse unter (Tool-Name, kanonisches Argument-JSON) mit
+LRU-Größenlimit und optionaler TTL. Gleichzeitige identische Aufrufe
+(z.B. doppelte tool_calls in einer Response) werden zu einer einzigen
+Ausführung zusammengefasst (Single-Flight).
+"""
+
+import asyncio
+import json
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Iterable, Optional, Tuple
+
+from config import config
+
+
+CacheKey = Tuple[str, str]
+
+
+def canonical_arguments(arguments: Dict[str, Any]) -> str:
+    """
+    Kanonisches JSON der Tool-Argumente (sortierte Keys, keine Whitespaces)
+
+    Args:
+        arguments: Tool-Argumente
+
+    Returns:
+        Stabiler String, unabhängig von der Key-Reihenfolge des Modells
+    """
+    return json.dumps(arguments, sort_keys=True, separators=(",", ":"), ensure_ascii=False, default=str)
+
+
+class ToolResultCache:
+    """
+    LRU-Cache mit optionaler TTL und Single-Flight für Tool-Ergebnisse
+
+    Fehler-Ergebnisse ({"error": ...}) und Exceptions werden nicht gecacht.
+    Gecachte Ergebnisse werden geteilt und dürfen nicht verändert werden.
+
+    Attributes:
+        hits: Cache-Treffer (inkl. zusammengefasster In-Flight Aufrufe)
+        misses: Tatsächliche Tool-Ausführungen
+        coalesced: Davon Treffer auf laufende Ausführungen (Single-Flight)
+    """
+
+    def __init__(
+        self,
+        max_entries: int = 1024,
+        ttl_seconds: Optional[float] = None,
+        excluded_tools: Iterable[str] = ()
+    ):
+        """
+        Args:
+            max_entries: Max. Anzahl gecachter Ergebnisse (LRU)
+            ttl_seconds: Optional - Lebensdauer eines Eintrags (None = unbegrenzt)
+            excluded_tools: Tools, deren Ergebnisse nie gecacht werden
+        """
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self.excluded_tools = frozenset(excluded_tools)
+
+        self._entries: "OrderedDict[CacheKey, Tuple[float, Dict[str, Any]]]" = OrderedDict()
+        self._in_flight: Dict[CacheKey, "asyncio.Future[Dict[str, Any]]"] = {}
+
+        self.hits = 0
+        self.misses = 0
+        self.coalesced = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def _lookup(self, key: CacheKey) -> Optional[Dict[str, Any]]:
+        entry = self._entries.get(key)
+        if entry is None:
+            return None
+        stored_at, result = entry
+        if self.ttl_seconds is not None and time.monotonic() - stored_at > self.ttl_seconds:
+            del self._entries[key]
+            return None
+        self._entries.move_to_end(key)
+        return result
+
+    def _store(self, key: CacheKey, result: Dict[str, Any]) -> None:
+        self._entries[key] = (time.monotonic(), result)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    async def get_or_compute(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        compute: Callable[[], Awaitable[Dict[str, Any]]]
+    ) -> Dict[str, Any]:
+        """
+        Liefert gecachtes Ergebnis oder führt compute() genau einmal aus
+
+        Args:
+            tool_name: Name des Tools
+            arguments: Tool-Argumente
+            compute: Führt das Tool aus (nur bei Cache-Miss)
+
+        Returns:
+            Tool-Ergebnis
+        """
+        if tool_name in self.excluded_tools:
+            return await compute()
+
+        key = (tool_name, canonical_arguments(arguments))
+
+        while True:
+            cached = self._lookup(key)
+            if cached is not None:
+                self.hits += 1
+                return cached
+
+            in_flight = self._in_flight.get(key)
+            if in_flight is None:
+                break
+
+            try:
+                result = await asyncio.shield(in_flight)
+            except asyncio.CancelledError:
+                # Ausführende Session wurde abgebrochen → selbst neu ausführen
+                if in_flight.cancelled():
+                    continue
+                raise
+            self.hits += 1
+            self.coalesced += 1
+            return result
+
+        self.misses += 1
+        future: "asyncio.Future[Dict[str, Any]]" = asyncio.get_running_loop().create_future()
+        self._in_flight[key] = future
+        try:
+            result = await compute()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except Exception as e:
+            future.set_exception(e)
+            # Exception gilt als abgerufen, falls niemand wartet
+            future.exception()
+            raise
+        else:
+            if "error" not in result:
+                self._store(key, result)
+            future.set_result(result)
+            return result
+        finally:
+            del self._in_flight[key]
+
+    def clear(self) -> None:
+        """Leert den Cache (laufende Ausführungen bleiben unberührt)"""
+        self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Cache-Kennzahlen"""
+        lookups = self.hits + self.misses
+        return {
+            "entries": len(self._entries),
+            "hits": self.hits,
+            "misses": self.misses,
+            "coalesced": self.coalesced,
+            "hit_rate": round(self.hits / lookups, 4) if lookups else 0.0,
+        }
+
+
+# Singleton-Instanz (prozessweit, von allen Sessions geteilt)
+_tool_cache: Optional[ToolResultCache] = None
+
+
+def get_tool_cache() -> Optional[ToolResultCache]:
+    """
+    Hole prozessweiten Tool-Result-Cache
+
+    Returns:
+        ToolResultCache Instanz, oder None wenn per Config deaktiviert
+    """
+    global _tool_cache
+    if not config.cache.tool_cache_enabled:
+        return None
+    if _tool_cache is None:
+        _tool_cache = ToolResultCache(
+            max_entries=config.cache.tool_cache_max_entries,
+            ttl_seconds=config.cache.tool_cache_ttl_seconds or None,
+            excluded_tools=config.cache.tool_cache_excluded
+        )
+    return _tool_cache
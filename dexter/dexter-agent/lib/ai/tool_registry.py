@@ -0,0 +1,354 @@
+"""
+Tool Registry für Dexter Financial Analysis Tools
+
+Tabellengesteuerte Registry: Tool-Name → (Coroutine, OpenAI-Schema, Validator).
+Die Registry wird einmal pro Prozess aus den get_*_tool_definition()-Funktionen
+der Tool-Module aufgebaut und danach nicht mehr verändert. Alle Agents/Sessions
+teilen sich dieselben Schema-Objekte und das vorab serialisierte Schema-JSON.
+"""
+
+import json
+import math
+from dataclasses import asdict, dataclass, is_dataclass
+from types import MappingProxyType
+from typing import Any, Awaitable, Callable, Dict, List, Mapping, Optional, Sequence, Tuple
+
+from .tool_converter import convert_anthropic_tool_to_openai
+
+
+ToolHandler = Callable[..., Awaitable[Dict[str, Any]]]
+ToolValidator = Callable[[Dict[str, Any]], Dict[str, Any]]
+
+
+class ToolRegistryError(ValueError):
+    """Basis-Exception für Registry-Fehler"""
+    pass
+
+
+class UnknownToolError(ToolRegistryError):
+    """Tool ist nicht registriert"""
+
+    def __init__(self, tool_name: str):
+        super().__init__(f"Unknown tool: {tool_name}")
+        self.tool_name = tool_name
+
+
+class ToolValidationError(ToolRegistryError):
+    """Tool-Argumente entsprechen nicht dem Schema"""
+
+    def __init__(self, tool_name: str, message: str):
+        super().__init__(f"Ungültige Argumente für {tool_name}: {message}")
+        self.tool_name = tool_name
+
+
+# JSON-Schema Typ → Python-Typen (bool ist kein gültiger number/integer-Wert)
+_JSON_TYPES: Dict[str, Tuple[type, ...]] = {
+    "number": (int, float),
+    "integer": (int,),
+    "boolean": (bool,),
+    "string": (str,),
+    "array": (list, tuple),
+    "object": (dict,),
+}
+
+
+def _check_type(value: Any, json_type: Optional[str]) -> bool:
+    """Prüft einen Wert gegen einen JSON-Schema Typ"""
+    if json_type is None or json_type not in _JSON_TYPES:
+        return True
+    if isinstance(value, bool) and json_type != "boolean":
+        return False
+    if json_type == "integer" and isinstance(value, float):
+        return value.is_integer()
+    return isinstance(value, _JSON_TYPES[json_type])
+
+
+def build_schema_validator(tool_name: str, input_schema: Dict[str, Any]) -> ToolValidator:
+    """
+    Erstellt Validator für die Top-Level-Argumente eines Tools
+
+    Prüft Pflichtfelder und Typen und entfernt unbekannte Argumente, die das
+    Modell gelegentlich halluziniert (würden sonst als TypeError im Tool enden).
+    Verschachtelte Objekte validieren die Tools selbst.
+
+    Args:
+        tool_name: Name des Tools (für Fehlermeldungen)
+        input_schema: JSON-Schema der Tool-Parameter
+
+    Returns:
+        Funktion args → bereinigte kwargs (wirft ToolValidationError)
+    """
+    properties: Dict[str, Any] = input_schema.get("properties", {})
+    required: Tuple[str, ...] = tuple(input_schema.get("required", ()))
+    types = {name: prop.get("type") for name, prop in properties.items()}
+
+    def validate(arguments: Dict[str, Any]) -> Dict[str, Any]:
+        if not isinstance(arguments, dict):
+            raise ToolValidationError(tool_name, "Argumente müssen ein JSON-Objekt sein")
+
+        missing = [name for name in required if name not in arguments]
+        if missing:
+            raise ToolValidationError(tool_name, f"Fehlende Pflichtfelder: {', '.join(missing)}")
+
+        kwargs = {}
+        for name, value in arguments.items():
+            if name not in types:
+                continue
+            if value is None and name not in required:
+                continue
+            if not _check_type(value, types[name]):
+                raise ToolValidationError(
+                    tool_name,
+                    f"'{name}' muss vom Typ {types[name]} sein, erhalten: {type(value).__name__}"
+                )
+            kwargs[name] = value
+        return kwargs
+
+    return validate
+
+
+def _to_jsonable(value: Any) -> Any:
+    """Konvertiert Dataclasses rekursiv und ersetzt nicht-endliche Floats (inf/nan) durch None"""
+    if is_dataclass(value) and not isinstance(value, type):
+        return _to_jsonable(asdict(value))
+    if isinstance(value, dict):
+        return {key: _to_jsonable(item) for key, item in value.items()}
+    if isinstance(value, (list, tuple)):
+        return [_to_jsonable(item) for item in value]
+    if isinstance(value, float) and not math.isfinite(value):
+        return None
+    return value
+
+
+def build_model_payload(
+    tool_result: Dict[str, Any],
+    fields: Optional[Sequence[str]] = None
+) -> Dict[str, Any]:
+    """
+    Erstellt den kompakten, model-facing Payload eines Tool-Ergebnisses
+
+    formatted_output (Markdown-Report) geht nur an den User; das Modell erhält
+    die Kennzahlen aus tool_result["result"], optional auf eine Allow-List
+    reduziert.
+
+    Args:
+        tool_result: Rückgabe einer Tool-Funktion
+        fields: Optional - Allow-List von Ergebnis-Feldern (None = alle)
+
+    Returns:
+        JSON-serialisierbares Dict
+    """
+    if "error" in tool_result:
+        return {key: tool_result[key] for key in ("error", "tool_name") if key in tool_result}
+
+    result = tool_result.get("result")
+    if is_dataclass(result) and not isinstance(result, type):
+        result = asdict(result)
+
+    if not isinstance(result, dict):
+        return _to_jsonable({key: value for key, value in tool_result.items() if key != "formatted_output"})
+
+    if fields is not None:
+        result = {field: result[field] for field in fields if field in result}
+
+    return _to_jsonable(result)
+
+
+@dataclass(frozen=True)
+class ToolSpec:
+    """Registrierter Tool-Eintrag"""
+    name: str
+    handler: ToolHandler
+    schema: Dict[str, Any]          # OpenAI Function Calling Format
+    validator: ToolValidator
+    payload_fields: Optional[Tuple[str, ...]] = None  # Allow-List für model_payload()
+
+    async def __call__(self, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """Validiert Argumente und führt Tool aus"""
+        return await self.handler(**self.validator(arguments))
+
+    def model_payload(
+        self,
+        tool_result: Dict[str, Any],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """Kompakter Payload für die History (fields überschreibt payload_fields)"""
+        return build_model_payload(tool_result, self.payload_fields if fields is None else fields)
+
+
+class ToolRegistry:
+    """
+    Unveränderliche Tool-Registry mit O(1) Dispatch
+
+    Attributes:
+        schemas: Tool-Definitionen im OpenAI Format (geteilt, nicht verändern)
+        schemas_json: Vorab serialisiertes Schema-JSON (z.B. für Token-Schätzung
+            oder Cache-Keys)
+    """
+
+    def __init__(self, specs: List[ToolSpec]):
+        """
+        Args:
+            specs: Tool-Einträge in Registrierungs-Reihenfolge
+        """
+        by_name: Dict[str, ToolSpec] = {}
+        for spec in specs:
+            if spec.name in by_name:
+                raise ToolRegistryError(f"Tool doppelt registriert: {spec.name}")
+            by_name[spec.name] = spec
+
+        self._specs: Mapping[str, ToolSpec] = MappingProxyType(by_name)
+        self.schemas: Tuple[Dict[str, Any], ...] = tuple(spec.schema for spec in specs)
+        self.schemas_json: str = json.dumps(list(self.schemas), ensure_ascii=False, sort_keys=True)
+
+    def __contains__(self, tool_name: str) -> bool:
+        return tool_name in self._specs
+
+    def __len__(self) -> int:
+        return len(self._specs)
+
+    @property
+    def names(self) -> Tuple[str, ...]:
+        """Registrierte Tool-Namen"""
+        return tuple(self._specs)
+
+    def get(self, tool_name: str) -> ToolSpec:
+        """
+        Hole Tool-Eintrag
+
+        Raises:
+            UnknownToolError: Wenn Tool nicht registriert ist
+        """
+        try:
+            return self._specs[tool_name]
+        except KeyError:
+            raise UnknownToolError(tool_name) from None
+
+    async def execute(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Validiert Argumente und führt Tool aus
+
+        Raises:
+            UnknownToolError: Tool nicht registriert
+            ToolValidationError: Argumente ungültig
+        """
+        return await self.get(tool_name)(arguments)
+
+    def model_payload(
+        self,
+        tool_name: str,
+        tool_result: Dict[str, Any],
+        fields: Optional[Sequence[str]] = None
+    ) -> Dict[str, Any]:
+        """
+        Kompakter, model-facing Payload eines Tool-Ergebnisses
+
+        Args:
+            tool_name: Name des Tools (unbekannte Tools → alle Felder)
+            tool_result: Rückgabe des Tools
+            fields: Optional - Allow-List, überschreibt die Default-Felder des Tools
+
+        Returns:
+            JSON-serialisierbares Dict
+        """
+        if tool_name in self._specs:
+            return self._specs[tool_name].model_payload(tool_result, fields)
+        return build_model_payload(tool_result, fields)
+
+
+def make_tool_spec(
+    handler: ToolHandler,
+    definition: Dict[str, Any],
+    payload_fields: Optional[Sequence[str]] = None
+) -> ToolSpec:
+    """
+    Erstellt ToolSpec aus Tool-Funktion und Anthropic-Format Definition
+
+    Args:
+        handler: Async Tool-Funktion
+        definition: Ergebnis von get_*_tool_definition()
+        payload_fields: Optional - Default Allow-List für den model-facing Payload
+
+    Returns:
+        ToolSpec mit OpenAI-Schema und Validator
+    """
+    return ToolSpec(
+        name=definition["name"],
+        handler=handler,
+        schema=convert_anthropic_tool_to_openai(definition),
+        validator=build_schema_validator(definition["name"], definition["input_schema"]),
+        payload_fields=tuple(payload_fields) if payload_fields is not None else None
+    )
+
+
+def _build_dexter_registry() -> ToolRegistry:
+    """Baut Registry aller Dexter Financial Analysis Tools"""
+    from tools import roi_calculator, sales_forecaster, pnl_calculator
+    from tools import balance_sheet, cash_flow_statement, break_even_analysis
+
+    return ToolRegistry([
+        make_tool_spec(
+            roi_calculator.calculate_roi,
+            roi_calculator.get_roi_tool_definition(),
+            roi_calculator.MODEL_PAYLOAD_FIELDS
+        ),
+        make_tool_spec(
+            sales_forecaster.forecast_sales,
+            sales_forecaster.get_sales_forecaster_tool_definition(),
+            sales_forecaster.MODEL_PAYLOAD_FIELDS
+        ),
+        make_tool_spec(
+            pnl_calculator.calculate_pnl,
+            pnl_calculator.get_pnl_tool_definition(),
+            pnl_calculator.MODEL_PAYLOAD_FIELDS
+        ),
+        make_tool_spec(
+            balance_sheet.generate_balance_sheet,
+            balance_sheet.get_balance_sheet_tool_definition(),
+            balance_sheet.MODEL_PAYLOAD_FIELDS
+        ),
+        make_tool_spec(
+            cash_flow_statement.generate_cash_flow_statement,
+            cash_flow_statement.get_cash_flow_tool_definition(),
+            cash_flow_statement.MODEL_PAYLOAD_FIELDS
+        ),
+        make_tool_spec(
+            break_even_analysis.analyze_break_even,
+            break_even_analysis.get_break_even_tool_definition(),
+            break_even_analysis.MODEL_PAYLOAD_FIELDS
+        ),
+    ])
+
+
+# Singleton-Instanz (einmal pro Prozess)
+_registry: Optional[ToolRegistry] = None
+
+
+def get_tool_registry() -> ToolRegistry:
+    """
+    Hole Singleton-Instanz der Dexter Tool-Registry
+
+    Returns:
+        ToolRegistry Instanz
+    """
+    global _registry
+    if _registry is None:
+        _registry = _build_dexter_registry()
+    return _registry
+
+
+if __name__ == "__main__":
+    # Test der Registry
+    print("🧪 Teste Tool Registry...")
+
+    registry = get_tool_registry()
+    print(f"✓ {len(registry)} Tools registriert: {', '.join(registry.names)}")
+    print(f"✓ Schema-JSON: {len(registry.schemas_json)} Zeichen")
+    print(f"✓ Singleton: {get_tool_registry() is registry}")
+
+    try:
+        registry.get("calculate_roi").validator({"investment_cost": 1000})
+    except ToolValidationError as e:
+        print(f"✓ Validierung: {e}")
+
+    print("\n✅ Tool Registry erfolgreich!")
@@ -0,0 +1,359 @@
+"""
+Leichtgewichtiges Tracing für den Agent-Loop
+
+Ein Span pro chat()-Turn mit Child-Spans für jede Loop-Iteration, jeden
+Model-Call Versuch (inkl. Retries) und jede Tool-Ausführung. Export im
+OpenTelemetry OTLP/JSON Format als JSON Lines (eine ResourceSpans-Zeile pro
+Batch, lesbar z.B. mit dem otlpjsonfile-Receiver des OTel Collectors);
+geschrieben wird in einem Hintergrund-Thread.
+
+Sampling erfolgt pro Trace am Root-Span; Kinder erben die Entscheidung.
+Deaktiviert oder nicht gesampelt liefert start_span() einen geteilten
+No-Op Span - Kosten: ein Methodenaufruf und ein Attribut-Check.
+
+Spans werden explizit als parent übergeben (kein contextvars), da der
+Agent-Loop ein Async-Generator ist und Tools in eigenen Tasks laufen.
+"""
+
+import atexit
+import json
+import logging
+import queue
+import random
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, List, Optional, Union
+
+from config import config
+
+logger = logging.getLogger(__name__)
+
+SERVICE_NAME = "dexter-agent"
+SCOPE_NAME = "dexter.agent"
+
+
+class NoopSpan:
+    """Span ohne Aufzeichnung (Tracing aus oder Trace nicht gesampelt)"""
+
+    __slots__ = ()
+    recording = False
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        pass
+
+    def record_error(self, error: BaseException) -> None:
+        pass
+
+    def end(self) -> None:
+        pass
+
+    def __enter__(self) -> "NoopSpan":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        pass
+
+
+NOOP_SPAN = NoopSpan()
+
+
+class Span:
+    """Aufgezeichneter Span (Zeiten in Nanosekunden seit Epoch)"""
+
+    __slots__ = (
+        "tracer", "name", "trace_id", "span_id", "parent_id",
+        "start_ns", "end_ns", "attributes", "error"
+    )
+    recording = True
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        trace_id: int,
+        parent_id: Optional[int],
+        attributes: Optional[Dict[str, Any]]
+    ):
+        self.tracer = tracer
+        self.name = name
+        self.trace_id = trace_id
+        self.span_id = random.getrandbits(64) or 1
+        self.parent_id = parent_id
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def set_attributes(self, attributes: Dict[str, Any]) -> None:
+        self.attributes.update(attributes)
+
+    def record_error(self, error: BaseException) -> None:
+        """Markiert den Span als fehlgeschlagen"""
+        self.error = f"{type(error).__name__}: {error}"
+        self.attributes["exception.type"] = type(error).__name__
+
+    def end(self) -> None:
+        """Beendet den Span (mehrfaches Beenden wird ignoriert)"""
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.tracer._on_end(self)
+
+    @property
+    def duration_ms(self) -> float:
+        end_ns = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end_ns - self.start_ns) / 1e6
+
+    def __enter__(self) -> "Span":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        if exc is not None:
+            self.record_error(exc)
+        self.end()
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """Span im OTLP/JSON Format"""
+        span = {
+            "traceId": f"{self.trace_id:032x}",
+            "spanId": f"{self.span_id:016x}",
+            "name": self.name,
+            "kind": 1,  # SPAN_KIND_INTERNAL
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns),
+            "attributes": _otlp_attributes(self.attributes),
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 1},
+        }
+        if self.parent_id is not None:
+            span["parentSpanId"] = f"{self.parent_id:016x}"
+        return span
+
+
+AnySpan = Union[Span, NoopSpan]
+
+
+def _otlp_value(value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def _otlp_attributes(attributes: Dict[str, Any]) -> List[Dict[str, Any]]:
+    return [{"key": key, "value": _otlp_value(value)} for key, value in attributes.items()]
+
+
+class InMemorySpanExporter:
+    """Sammelt beendete Spans im Speicher (Tests, Debugging)"""
+
+    def __init__(self):
+        self.spans: List[Span] = []
+
+    def export(self, spans: List[Span]) -> None:
+        self.spans.extend(spans)
+
+
+class JsonlSpanExporter:
+    """
+    Schreibt Spans als OTLP/JSON Lines (eine ResourceSpans-Zeile pro Batch)
+
+    export() stellt den Batch nur in eine Queue; ein Writer-Thread
+    serialisiert und schreibt ihn, Disk-I/O blockiert damit nie den Event
+    Loop. Datei und Thread entstehen erst beim ersten Export. Volle Queue →
+    Batch wird verworfen und gezählt (nie blockieren).
+
+    Attributes:
+        dropped: Wegen voller Queue verworfene Batches
+    """
+
+    def __init__(self, path: Union[str, Path], max_queue: int = 1024):
+        """
+        Args:
+            path: Ziel-Datei (wird angehängt)
+            max_queue: Max. Batches, die auf den Writer-Thread warten
+        """
+        self.path = Path(path)
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue)
+        self._thread: Optional[threading.Thread] = None
+        self._start_lock = threading.Lock()
+        self.dropped = 0
+
+    def export(self, spans: List[Span]) -> None:
+        if self._thread is None:
+            self._ensure_thread()
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            self.dropped += 1
+
+    def flush(self) -> None:
+        """Wartet, bis alle eingereihten Batches geschrieben sind"""
+        if self._thread is not None:
+            self._queue.join()
+
+    def close(self) -> None:
+        """Schreibt die Queue leer und stoppt den Writer-Thread"""
+        with self._start_lock:
+            thread, self._thread = self._thread, None
+        if thread is not None:
+            self._queue.put(None)
+            thread.join()
+
+    def _ensure_thread(self) -> None:
+        with self._start_lock:
+            if self._thread is None:
+                self._thread = threading.Thread(target=self._run, name="dexter-span-writer", daemon=True)
+                self._thread.start()
+
+    def _run(self) -> None:
+        while True:
+            # Alle wartenden Batches mit einem Datei-Zugriff schreiben
+            batches = [self._queue.get()]
+            while True:
+                try:
+                    batches.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                lines = [_otlp_line(spans) for spans in batches if spans is not None]
+                if lines:
+                    self._write(lines)
+            except Exception as e:
+                logger.warning(f"Span-Export fehlgeschlagen: {e}")
+            finally:
+                for _ in batches:
+                    self._queue.task_done()
+            if None in batches:
+                return
+
+    def _write(self, lines: List[str]) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with open(self.path, "a", encoding="utf-8") as file:
+            file.write("".join(line + "\n" for line in lines))
+
+
+def _otlp_line(spans: List[Span]) -> str:
+    """Ein Batch als ResourceSpans JSON-Zeile"""
+    return json.dumps({
+        "resourceSpans": [{
+            "resource": {"attributes": _otlp_attributes({"service.name": SERVICE_NAME})},
+            "scopeSpans": [{
+                "scope": {"name": SCOPE_NAME},
+                "spans": [span.to_otlp() for span in spans],
+            }],
+        }]
+    }, ensure_ascii=False, default=str)
+
+
+class Tracer:
+    """
+    Erzeugt Spans und gibt beendete Spans batchweise an den Exporter
+
+    Ein Batch wird exportiert, sobald ein Root-Span endet oder max_batch
+    Spans gepuffert sind.
+    """
+
+    def __init__(
+        self,
+        exporter: Optional[Any] = None,
+        sample_rate: float = 1.0,
+        max_batch: int = 512
+    ):
+        """
+        Args:
+            exporter: Objekt mit export(spans) - None = Tracing deaktiviert
+            sample_rate: Anteil aufgezeichneter Traces (0.0-1.0)
+            max_batch: Max. gepufferte Spans vor einem Export
+        """
+        self.exporter = exporter
+        self.enabled = exporter is not None and sample_rate > 0
+        self.sample_rate = sample_rate
+        self.max_batch = max_batch
+        self._buffer: List[Span] = []
+
+    def start_span(
+        self,
+        name: str,
+        parent: Optional[AnySpan] = None,
+        attributes: Optional[Dict[str, Any]] = None
+    ) -> AnySpan:
+        """
+        Startet einen Span
+
+        Args:
+            name: Span-Name (z.B. "dexter.turn")
+            parent: Eltern-Span; None startet einen neuen Trace (Sampling-Entscheidung)
+            attributes: Optional - Start-Attribute
+
+        Returns:
+            Span, oder NOOP_SPAN wenn nicht aufgezeichnet wird
+        """
+        if not self.enabled:
+            return NOOP_SPAN
+        if parent is None:
+            if self.sample_rate < 1.0 and random.random() >= self.sample_rate:
+                return NOOP_SPAN
+            return Span(self, name, random.getrandbits(128) or 1, None, attributes)
+        if not parent.recording:
+            return NOOP_SPAN
+        return Span(self, name, parent.trace_id, parent.span_id, attributes)
+
+    def _on_end(self, span: Span) -> None:
+        self._buffer.append(span)
+        if span.parent_id is None or len(self._buffer) >= self.max_batch:
+            self.flush()
+
+    def flush(self) -> None:
+        """Exportiert alle gepufferten Spans"""
+        if not self._buffer:
+            return
+        spans, self._buffer = self._buffer, []
+        try:
+            self.exporter.export(spans)
+        except Exception as e:
+            logger.warning(f"Span-Export fehlgeschlagen: {e}")
+
+
+# Singleton-Instanz
+_tracer: Optional[Tracer] = None
+
+
+def get_tracer() -> Tracer:
+    """
+    Hole prozessweiten Tracer
+
+    Returns:
+        Tracer Instanz (deaktiviert, wenn TRACING_ENABLED nicht gesetzt ist)
+    """
+    global _tracer
+    if _tracer is None:
+        if config.tracing.enabled:
+            _tracer = Tracer(
+                exporter=JsonlSpanExporter(config.tracing.export_path),
+                sample_rate=config.tracing.sample_rate
+            )
+        else:
+            _tracer = Tracer()
+    return _tracer
+
+
+def shutdown_tracing() -> None:
+    """Exportiert gepufferte Spans und stoppt den Writer-Thread des Exporters"""
+    if _tracer is None or _tracer.exporter is None:
+        return
+    _tracer.flush()
+    close = getattr(_tracer.exporter, "close", None)
+    if close is not None:
+        close()
+
+
+atexit.register(shutdown_tracing)
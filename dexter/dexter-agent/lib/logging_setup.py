@@ -0,0 +1,197 @@
+"""
+Nicht-blockierendes Logging für Dexter
+
+Log-Records werden im Event Loop nur formatiert, gekürzt und in eine Queue
+gestellt. Ein QueueListener-Thread schreibt sie auf Konsole und in eine
+rotierende Logdatei - Disk-I/O blockiert damit nie das Streaming.
+
+- Strukturierte JSON Lines (LOG_FORMAT=json) oder Textzeilen
+- Große Payloads werden auf LOG_MAX_MESSAGE_CHARS gekürzt
+- DEBUG-Records werden gesampelt (LOG_DEBUG_SAMPLE_RATE)
+- Handler, Logdatei und Writer-Thread entstehen erst beim ersten Record
+- Volle Queue → Record wird verworfen und gezählt (nie blockieren)
+"""
+
+import atexit
+import copy
+import json
+import logging
+import logging.handlers
+import queue
+import sys
+import threading
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Any, Dict, List, Optional
+
+TEXT_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+LOG_FILE_NAME = "dexter.log"
+
+# Standard-Attribute eines LogRecords - alles andere stammt aus extra={...}
+_RECORD_ATTRIBUTES = frozenset(vars(logging.LogRecord("", 0, "", 0, "", None, None))) | {"message", "asctime"}
+
+
+class JsonFormatter(logging.Formatter):
+    """Formatiert Records als eine JSON-Zeile inkl. extra-Feldern"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        entry: Dict[str, Any] = {
+            "ts": datetime.fromtimestamp(record.created, timezone.utc).isoformat(timespec="milliseconds"),
+            "level": record.levelname,
+            "logger": record.name,
+            "message": record.getMessage(),
+        }
+        if record.exc_info and not record.exc_text:
+            record.exc_text = self.formatException(record.exc_info)
+        if record.exc_text:
+            entry["exc"] = record.exc_text
+        for key, value in vars(record).items():
+            if key not in _RECORD_ATTRIBUTES and not key.startswith("_"):
+                entry[key] = value
+        return json.dumps(entry, ensure_ascii=False, default=str)
+
+
+class DebugSampler(logging.Filter):
+    """Lässt nur jeden n-ten DEBUG-Record durch (höhere Level immer)"""
+
+    def __init__(self, rate: float):
+        super().__init__()
+        self.every = max(1, round(1 / rate)) if rate > 0 else 0
+        self._count = 0
+        self.dropped = 0
+
+    def filter(self, record: logging.LogRecord) -> bool:
+        if record.levelno > logging.DEBUG:
+            return True
+        self._count += 1
+        if self.every and self._count % self.every == 0:
+            return True
+        self.dropped += 1
+        return False
+
+
+class AsyncQueueHandler(logging.handlers.QueueHandler):
+    """
+    QueueHandler mit Kürzung, Drop bei voller Queue und verzögertem Start
+
+    Der QueueListener samt Ziel-Handlern wird erst beim ersten Record
+    erzeugt (keine Logdatei / kein Thread für Prozesse, die nie loggen).
+    """
+
+    def __init__(self, settings: Any):
+        super().__init__(queue.Queue(maxsize=settings.queue_size))
+        self.settings = settings
+        self.max_chars = settings.max_message_chars
+        self.listener: Optional[logging.handlers.QueueListener] = None
+        self.dropped = 0
+        self._start_lock = threading.Lock()
+        self._exception_formatter = logging.Formatter()
+
+    def _target_handlers(self) -> List[logging.Handler]:
+        formatter = JsonFormatter() if self.settings.json_format else logging.Formatter(TEXT_FORMAT)
+        handlers: List[logging.Handler] = []
+        if self.settings.console_enabled:
+            handlers.append(logging.StreamHandler(sys.stderr))
+        if self.settings.file_enabled:
+            log_dir = Path(self.settings.log_dir)
+            log_dir.mkdir(parents=True, exist_ok=True)
+            handlers.append(logging.handlers.RotatingFileHandler(
+                log_dir / LOG_FILE_NAME,
+                maxBytes=int(self.settings.max_file_mb * 1024 * 1024),
+                backupCount=self.settings.backup_count,
+                encoding="utf-8",
+                delay=True
+            ))
+        for handler in handlers:
+            handler.setFormatter(formatter)
+        return handlers
+
+    def _ensure_listener(self) -> None:
+        with self._start_lock:
+            if self.listener is None:
+                self.listener = logging.handlers.QueueListener(self.queue, *self._target_handlers())
+                self.listener.start()
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        """Nachricht auflösen und kürzen; Args/Exception nicht über Threads teilen"""
+        message = record.getMessage()
+        if len(message) > self.max_chars:
+            message = f"{message[:self.max_chars]}… [+{len(message) - self.max_chars} Zeichen]"
+        record = copy.copy(record)
+        record.msg = message
+        record.message = message
+        record.args = None
+        if record.exc_info:
+            record.exc_text = self._exception_formatter.formatException(record.exc_info)
+            record.exc_info = None
+        return record
+
+    def enqueue(self, record: logging.LogRecord) -> None:
+        if self.listener is None:
+            self._ensure_listener()
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+
+    def close(self) -> None:
+        """Stoppt den Writer-Thread (schreibt die Queue vorher leer)"""
+        with self._start_lock:
+            listener, self.listener = self.listener, None
+        if listener is not None:
+            listener.stop()
+            for handler in listener.handlers:
+                handler.close()
+        super().close()
+
+
+_queue_handler: Optional[AsyncQueueHandler] = None
+
+
+def configure_logging(settings: Optional[Any] = None, force: bool = False) -> Optional[AsyncQueueHandler]:
+    """
+    Installiert den Queue-Handler am Root-Logger
+
+    Wie logging.basicConfig: ohne force passiert nichts, wenn der Root-Logger
+    bereits Handler hat. Günstig beim Import - Dateien und Writer-Thread
+    entstehen erst beim ersten Record.
+
+    Args:
+        settings: LoggingConfig (Default: config.logging)
+        force: Vorhandene Root-Handler ersetzen
+
+    Returns:
+        Installierter Handler, oder None wenn bereits konfiguriert
+    """
+    global _queue_handler
+    root = logging.getLogger()
+    if root.handlers and not force:
+        return None
+    if settings is None:
+        from config import config
+        settings = config.logging
+
+    shutdown_logging()
+    for handler in root.handlers[:]:
+        root.removeHandler(handler)
+        handler.close()
+
+    handler = AsyncQueueHandler(settings)
+    if settings.debug_sample_rate < 1.0:
+        handler.addFilter(DebugSampler(settings.debug_sample_rate))
+    root.addHandler(handler)
+    root.setLevel(settings.level.upper())
+    _queue_handler = handler
+    return handler
+
+
+def shutdown_logging() -> None:
+    """Schreibt ausstehende Records und stoppt den Writer-Thread"""
+    global _queue_handler
+    handler, _queue_handler = _queue_handler, None
+    if handler is not None:
+        logging.getLogger().removeHandler(handler)
+        handler.close()
+
+
+atexit.register(shutdown_logging)
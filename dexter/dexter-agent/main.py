@@ -16,46 +16,43 @@ Version: 4.0.0 (OpenAI Migration)
 import asyncio
 import sys
 import json
-from pathlib import Path
-from typing import AsyncIterator, Dict, Any, List
-from datetime import datetime
-
-# OpenAI Integration
-from openai import AsyncOpenAI
+import time
+from typing import AsyncIterator, Dict, Any, List, Optional, Tuple
 
 # Lokale Imports
-from config import get_config
+from config import config
 from prompts.system_prompts import DEXTER_SYSTEM_PROMPT
-from tools.roi_calculator import calculate_roi
-from tools.sales_forecaster import forecast_sales
-from tools.pnl_calculator import calculate_pnl
-from tools.balance_sheet import generate_balance_sheet
-from tools.cash_flow_statement import generate_cash_flow_statement
-from tools.break_even_analysis import analyze_break_even
 
 # AI Service Layer
-from lib.ai.openai_service import ChatMessage, OpenAIService
-from lib.ai.tool_converter import register_dexter_tools
-from lib.ai.error_handler import retry_on_error, OpenAIError
-
-# Konfiguration laden
-config = get_config()
+from lib.ai.openai_service import (
+    ChatMessage,
+    OpenAIService,
+    OpenAIResponse,
+    StreamEvent,
+    close_shared_async_clients
+)
+from lib.ai.conversation_history import ConversationHistory
+from lib.ai.tool_registry import get_tool_registry
+from lib.ai.tool_cache import get_tool_cache
+from lib.ai.admission import PRIORITY_INTERACTIVE
+from lib.ai.metrics import SessionMetrics, TurnMetrics, get_metrics
+from lib.ai.tracing import NOOP_SPAN, AnySpan, get_tracer
+from lib.logging_setup import configure_logging
+from lib.ai.error_handler import (
+    with_retry,
+    classify_error,
+    get_circuit_breaker,
+    Deadline,
+    DeadlineExceededError,
+    OpenAIError,
+    OverloadedError,
+    RetryPolicy
+)
 
-# Logging Setup
+# Logging: Handler werden in main() installiert (configure_logging), Records
+# gehen über eine Queue an einen Hintergrund-Writer
 import logging
 
-# Logs Directory erstellen
-logs_dir = Path(__file__).parent / "logs"
-logs_dir.mkdir(exist_ok=True)
-
-logging.basicConfig(
-    level=logging.INFO,
-    format='%(asctime)s - %(name)s - %(levelname)s - %(message)s',
-    handlers=[
-        logging.FileHandler(logs_dir / f'dexter_{datetime.now().strftime("%Y%m%d")}.log'),
-        logging.StreamHandler()
-    ]
-)
 logger = logging.getLogger(__name__)
 
 
@@ -71,15 +68,79 @@ class DexterAgent:
     Implementiert Function Calling Pattern für strukturierte Financial Analysis.
     """
 
-    def __init__(self):
-        """Initialisiert Dexter Agent mit OpenAI SDK"""
-        self.openai_service = OpenAIService(api_key=config.api_key)
+    def __init__(
+        self,
+        openai_service: Optional[OpenAIService] = None,
+        parallel_tool_calls: Optional[bool] = None,
+        max_concurrent_tools: Optional[int] = None,
+        history_max_tokens: Optional[int] = None,
+        stream: Optional[bool] = None,
+        priority: int = PRIORITY_INTERACTIVE
+    ):
+        """
+        Initialisiert Dexter Agent mit OpenAI SDK
+
+        Args:
+            openai_service: Optional - geteilter OpenAIService (z.B. vom SessionManager)
+            parallel_tool_calls: Optional - Tool-Calls einer Response parallel ausführen
+                (Default aus config.agent)
+            max_concurrent_tools: Optional - Max. gleichzeitig laufende Tools
+                (Default aus config.agent, muss positiv sein)
+            history_max_tokens: Optional - Token-Budget der Conversation History
+                (Default aus config.agent)
+            stream: Optional - Model-Responses token-weise streamen
+                (Default aus config.agent)
+            priority: Admission-Priorität der Model-Calls
+                (PRIORITY_INTERACTIVE für Chats, PRIORITY_BATCH für Batch-Jobs)
+
+        Raises:
+            ValueError: max_concurrent_tools ist nicht positiv
+        """
+        if max_concurrent_tools is not None and max_concurrent_tools <= 0:
+            raise ValueError("max_concurrent_tools muss positiv sein")
+        self.openai_service = openai_service or OpenAIService(api_key=config.api_key)
         self.model = config.model.model_name
-        self.conversation_history: List[ChatMessage] = []
-        self.tools = register_dexter_tools()  # OpenAI Format
+        self.conversation_history = ConversationHistory(
+            max_tokens=history_max_tokens or config.agent.history_max_tokens
+        )
+        self.tool_registry = get_tool_registry()  # Einmal pro Prozess aufgebaut
+        self.tools = self.tool_registry.schemas  # OpenAI Format (geteilt)
+        self.tool_cache = get_tool_cache()  # Prozessweit, None wenn deaktiviert
         self.system_prompt = DEXTER_SYSTEM_PROMPT
         self.turn_count = 0
 
+        self.max_iterations = config.agent.max_iterations
+        self.parallel_tool_calls = (
+            config.agent.parallel_tool_calls if parallel_tool_calls is None else parallel_tool_calls
+        )
+        self.max_concurrent_tools = (
+            config.agent.max_concurrent_tools if max_concurrent_tools is None else max_concurrent_tools
+        )
+        self.tool_payload_fields = config.agent.tool_payload_fields
+        self.stream = config.agent.stream_responses if stream is None else stream
+        self.priority = priority
+
+        # Retries mit Full-Jitter, prozessweiter Circuit Breaker, Zeitbudget pro Turn
+        self.retry_policy = RetryPolicy(
+            max_retries=config.retry.max_retries,
+            base_delay=config.retry.base_delay,
+            max_delay=config.retry.max_delay,
+            max_retry_after=config.retry.max_retry_after
+        )
+        self.circuit_breaker = get_circuit_breaker()
+        self.turn_deadline_seconds = config.retry.turn_deadline_seconds
+        self._deadline: Optional[Deadline] = None  # Deadline des laufenden Turns
+
+        # Telemetrie: prozessweite Metriken + Kennzahlen dieser Session
+        self.metrics = get_metrics()
+        self.session_metrics = SessionMetrics()
+        self._turn_metrics: Optional[TurnMetrics] = None  # Kennzahlen des laufenden Turns
+
+        # Tracing: Spans des laufenden Turns / der laufenden Iteration (No-Op wenn aus)
+        self.tracer = get_tracer()
+        self._turn_span: AnySpan = NOOP_SPAN
+        self._iteration_span: AnySpan = NOOP_SPAN
+
         logger.info(f"🤖 Dexter Agent initialisiert mit Model: {self.model}")
         logger.info(f"🔧 {len(self.tools)} Tools registriert (OpenAI Function Calling)")
 
@@ -95,38 +156,93 @@ class DexterAgent:
             Tool-Ergebnis als dict
         """
         logger.info(f"🔧 Executing Tool: {tool_name}")
-        logger.debug(f"Tool Input: {tool_input}")
+        logger.debug("Tool Input: %s", tool_input)  # Formatierung nur wenn DEBUG aktiv
 
+        start = time.perf_counter()
+        ok = False
+        span = self.tracer.start_span("dexter.tool", self._iteration_span, {"tool.name": tool_name})
+        if span.recording:
+            span.set_attribute("tool.args_bytes", len(json.dumps(tool_input, ensure_ascii=False, default=str)))
         try:
-            if tool_name == "calculate_roi":
-                result = await calculate_roi(**tool_input)
-            elif tool_name == "forecast_sales":
-                result = await forecast_sales(**tool_input)
-            elif tool_name == "calculate_pnl":
-                result = await calculate_pnl(**tool_input)
-            elif tool_name == "generate_balance_sheet":
-                result = await generate_balance_sheet(**tool_input)
-            elif tool_name == "generate_cash_flow_statement":
-                result = await generate_cash_flow_statement(**tool_input)
-            elif tool_name == "analyze_break_even":
-                result = await analyze_break_even(**tool_input)
+            # O(1) Dispatch inkl. Schema-Validierung der Argumente;
+            # identische Aufrufe werden aus dem Cache bedient bzw. zusammengefasst
+            if self.tool_cache is not None:
+                execution = self.tool_cache.get_or_compute(
+                    tool_name,
+                    tool_input,
+                    lambda: self.tool_registry.execute(tool_name, tool_input)
+                )
             else:
-                raise ValueError(f"Unknown tool: {tool_name}")
+                execution = self.tool_registry.execute(tool_name, tool_input)
+
+            # Tool-Laufzeit zählt gegen das Zeitbudget des Turns
+            result = await (self._deadline.run(execution) if self._deadline is not None else execution)
 
             logger.info(f"✅ Tool {tool_name} erfolgreich ausgeführt")
+            ok = "error" not in result
+            if span.recording:
+                span.set_attribute("tool.result_bytes", len(json.dumps(result, ensure_ascii=False, default=str)))
             return result
 
         except Exception as e:
             logger.error(f"❌ Tool Execution Error: {str(e)}", exc_info=True)
+            span.record_error(e)
             return {
                 "error": str(e),
                 "tool_name": tool_name
             }
 
-    @retry_on_error(max_retries=3, base_delay=1.0)
+        finally:
+            self.metrics.record_tool(self._turn_metrics, tool_name, time.perf_counter() - start, ok)
+            if span.recording:
+                span.set_attribute("tool.ok", ok)
+            span.end()
+
+    async def _run_tool_calls(
+        self,
+        calls: List[Tuple[str, str, Dict[str, Any]]]
+    ) -> AsyncIterator[Tuple[int, Dict[str, Any]]]:
+        """
+        Führt die Tool-Calls einer Model-Response aus
+
+        Im parallelen Modus laufen alle Tools gleichzeitig (begrenzt durch
+        max_concurrent_tools); Ergebnisse werden in Fertigstellungs-Reihenfolge
+        geliefert. Sequentiell wird in Original-Reihenfolge ausgeführt.
+
+        Args:
+            calls: Liste von (tool_call_id, tool_name, tool_input)
+
+        Yields:
+            (Index in calls, Tool-Ergebnis) sobald ein Tool fertig ist
+        """
+        if not self.parallel_tool_calls or len(calls) <= 1:
+            for index, (_, tool_name, tool_input) in enumerate(calls):
+                yield index, await self._execute_tool(tool_name, tool_input)
+            return
+
+        semaphore = asyncio.Semaphore(self.max_concurrent_tools)
+
+        async def run(index: int, tool_name: str, tool_input: Dict[str, Any]) -> Tuple[int, Dict[str, Any]]:
+            async with semaphore:
+                return index, await self._execute_tool(tool_name, tool_input)
+
+        tasks = [
+            asyncio.create_task(run(index, tool_name, tool_input))
+            for index, (_, tool_name, tool_input) in enumerate(calls)
+        ]
+
+        try:
+            for next_done in asyncio.as_completed(tasks):
+                yield await next_done
+        finally:
+            # Bei Abbruch (z.B. Client disconnect) keine verwaisten Tasks zurücklassen
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+
     async def _call_openai(self, messages: List[ChatMessage]) -> Any:
         """
-        OpenAI API Call mit Retry-Logik
+        OpenAI API Call mit Retry-Logik (Retry-Policy, Circuit Breaker, Turn-Deadline)
 
         Args:
             messages: Chat messages
@@ -134,11 +250,142 @@ class DexterAgent:
         Returns:
             OpenAI Response
         """
-        return await self.openai_service.generate_response(
+        attempts = 0
+
+        async def attempt(**kwargs: Any) -> OpenAIResponse:
+            # Latenz, Tokens und Retries jedes Versuchs erfassen
+            nonlocal attempts
+            attempts += 1
+            start = time.perf_counter()
+            response = None
+            span = self._start_model_span(attempts, len(messages))
+            try:
+                response = await self.openai_service.generate_response(**kwargs)
+                return response
+            except BaseException as e:
+                span.record_error(e)
+                raise
+            finally:
+                self.metrics.record_model_call(
+                    self._turn_metrics, self.model, time.perf_counter() - start, response, retry=attempts > 1
+                )
+                self._end_model_span(span, response)
+
+        return await with_retry(
+            attempt,
             messages=messages,
-            tools=self.tools
+            tools=self.tools,
+            priority=self.priority,
+            policy=self.retry_policy,
+            circuit_breaker=self.circuit_breaker,
+            deadline=self._deadline
         )
 
+    async def _stream_openai(self, messages: List[ChatMessage]) -> AsyncIterator[StreamEvent]:
+        """
+        Streaming OpenAI API Call mit Retry-Logik
+
+        Retries nur solange noch kein Text-Delta ausgeliefert wurde - danach
+        würde ein Retry bereits gezeigten Text duplizieren. Jeder Chunk wird
+        gegen die Turn-Deadline gewartet.
+
+        Args:
+            messages: Chat messages
+
+        Yields:
+            StreamEvents (Text-Deltas, zuletzt "done" mit zusammengesetzter Response)
+        """
+        policy = self.retry_policy
+        for attempt in range(policy.max_retries + 1):
+            # Offener Circuit → CircuitOpenError noch vor Span und Metriken (wie with_retry)
+            self.circuit_breaker.before_call()
+            emitted = False
+            start = time.perf_counter()
+            response = None
+            span = self._start_model_span(attempt + 1, len(messages), stream=True)
+            events = self.openai_service.generate_response_events(
+                messages=messages,
+                tools=self.tools,
+                priority=self.priority
+            )
+            try:
+                while True:
+                    next_event = events.__anext__()
+                    try:
+                        event = await (
+                            self._deadline.run(next_event) if self._deadline is not None else next_event
+                        )
+                    except StopAsyncIteration:
+                        break
+                    emitted = emitted or event.type == "content"
+                    if event.type == "done":
+                        response = event.response
+                    yield event
+                self.circuit_breaker.record_success()
+                return
+
+            except (DeadlineExceededError, asyncio.CancelledError, GeneratorExit) as e:
+                self.circuit_breaker.abort_call()
+                span.record_error(e)
+                raise
+
+            except Exception as e:
+                span.record_error(e)
+                classified_error = classify_error(e)
+                self.circuit_breaker.record_failure(classified_error)
+                give_up = emitted or not classified_error.retryable or attempt >= policy.max_retries
+
+                delay = 0.0 if give_up else policy.compute_delay(attempt, classified_error)
+                if self._deadline is not None and delay >= self._deadline.remaining():
+                    give_up = True
+                if give_up:
+                    if classified_error is e:
+                        raise
+                    raise classified_error from e
+
+                logger.warning(
+                    f"Stream attempt {attempt + 1}/{policy.max_retries + 1} failed: {classified_error}. "
+                    f"Retrying in {delay:.2f}s..."
+                )
+                await asyncio.sleep(delay)
+
+            finally:
+                await events.aclose()
+                self.metrics.record_model_call(
+                    self._turn_metrics, self.model, time.perf_counter() - start, response, retry=attempt > 0
+                )
+                self._end_model_span(span, response)
+
+    def _start_model_span(self, attempt: int, message_count: int, stream: bool = False) -> AnySpan:
+        """Span für einen Model-Call Versuch (Child der laufenden Iteration)"""
+        return self.tracer.start_span("dexter.model_call", self._iteration_span, {
+            "gen_ai.request.model": self.model,
+            "attempt": attempt,
+            "messages": message_count,
+            "stream": stream,
+        })
+
+    def _end_model_span(self, span: AnySpan, response: Optional[OpenAIResponse]) -> None:
+        """Beendet einen Model-Call Span mit Token-Zahlen der Response"""
+        if span.recording and response is not None:
+            span.set_attributes({
+                "gen_ai.response.model": response.model,
+                "gen_ai.response.finish_reason": response.finish_reason,
+                "gen_ai.usage.input_tokens": response.prompt_tokens,
+                "gen_ai.usage.output_tokens": response.completion_tokens,
+                "gen_ai.usage.cached_tokens": response.cached_tokens,
+                "tool_calls": len(response.tool_calls or ()),
+            })
+        span.end()
+
+    async def _model_events(self, messages: List[ChatMessage]) -> AsyncIterator[StreamEvent]:
+        """Liefert Model-Response als StreamEvents (streaming oder non-streaming)"""
+        if self.stream:
+            async for event in self._stream_openai(messages):
+                yield event
+        else:
+            yield StreamEvent(type="done", response=await self._call_openai(messages))
+
     async def chat(self, user_message: str) -> AsyncIterator[str]:
         """
         Hauptmethode für Chat mit Dexter (OpenAI Function Calling)
@@ -150,13 +397,44 @@ class DexterAgent:
         4. Function Results → OpenAI
         5. OpenAI generiert finale Antwort
 
+        Im Streaming-Modus werden Text-Tokens sofort weitergereicht; Tool-Calls
+        werden aus den gestreamten Fragmenten zusammengesetzt.
+
         Args:
             user_message: User-Nachricht
 
         Yields:
             Response chunks als String
         """
+        turn = TurnMetrics(turn=self.turn_count + 1)
+        self._turn_metrics = turn
+        self._turn_span = self.tracer.start_span("dexter.turn", attributes={"turn": turn.turn})
+        try:
+            async for chunk in self._chat_turn(user_message):
+                yield chunk
+        finally:
+            # Auch bei Abbruch (z.B. Client disconnect) zählt der Turn
+            self._turn_metrics = None
+            self.metrics.record_turn(turn)
+            self.session_metrics.add(turn)
+            self._iteration_span.end()
+            if self._turn_span.recording:
+                self._turn_span.set_attributes({
+                    "iterations": turn.iterations,
+                    "model_calls": turn.model_calls,
+                    "retries": turn.retries,
+                    "gen_ai.usage.input_tokens": turn.prompt_tokens,
+                    "gen_ai.usage.output_tokens": turn.completion_tokens,
+                    "gen_ai.usage.cached_tokens": turn.cached_tokens,
+                })
+            self._turn_span.end()
+            self._turn_span = self._iteration_span = NOOP_SPAN
+
+    async def _chat_turn(self, user_message: str) -> AsyncIterator[str]:
+        """Function-Calling Loop eines Turns (siehe chat)"""
+        turn = self._turn_metrics
         self.turn_count += 1
+        self._deadline = Deadline(self.turn_deadline_seconds) if self.turn_deadline_seconds else None
         logger.info(f"\n{'='*60}")
         logger.info(f"Turn {self.turn_count} - User: {user_message[:100]}...")
         logger.info(f"{'='*60}")
@@ -173,15 +451,27 @@ class DexterAgent:
         )
 
         # Haupt-Loop für Function Calling
-        max_iterations = 10  # Verhindere Endlos-Schleifen
+        max_iterations = self.max_iterations  # Verhindere Endlos-Schleifen
         iteration = 0
 
         while iteration < max_iterations:
             iteration += 1
+            turn.iterations = iteration
+            self._iteration_span.end()
+            self._iteration_span = self.tracer.start_span(
+                "dexter.iteration", self._turn_span, {"iteration": iteration}
+            )
 
             try:
-                # OpenAI Request
-                response = await self._call_openai(self.conversation_history)
+                # OpenAI Request (History hält ihr Token-Budget bei jedem append ein)
+                response: Optional[OpenAIResponse] = None
+                streamed = False
+                async for event in self._model_events(self.conversation_history.messages):
+                    if event.type == "content":
+                        streamed = True
+                        yield event.content
+                    else:
+                        response = event.response
 
                 # Prüfe finish_reason
                 if response.finish_reason == "stop":
@@ -190,7 +480,8 @@ class DexterAgent:
                         self.conversation_history.append(
                             ChatMessage(role="assistant", content=response.content)
                         )
-                        yield response.content
+                        if not streamed:
+                            yield response.content
                     break
 
                 elif response.finish_reason == "tool_calls" and response.tool_calls:
@@ -214,15 +505,15 @@ class DexterAgent:
                     self.conversation_history.append(
                         ChatMessage(
                             role="assistant",
-                            content="",  # Bei tool_calls ist content oft leer
+                            content=response.content or "",  # Bei tool_calls oft leer
                             tool_calls=tool_calls_dict
                         )
                     )
 
-                    # Führe alle Tool-Calls aus
+                    # Parse alle Tool-Calls (Reihenfolge der tool_call_ids bleibt erhalten)
+                    parsed_calls = []
                     for tool_call in tool_calls:
                         tool_name = tool_call.function.name
-                        tool_call_id = tool_call.id
 
                         # Parse Arguments (sind als JSON-String)
                         try:
@@ -233,20 +524,28 @@ class DexterAgent:
 
                         logger.info(f"🔧 Tool Call: {tool_name}")
                         yield f"\n\n[Verwende Tool: {tool_name}]\n\n"
+                        parsed_calls.append((tool_call.id, tool_name, tool_input))
 
-                        # Tool ausführen
-                        tool_result = await self._execute_tool(tool_name, tool_input)
-
-                        # Zeige formatted output wenn vorhanden
+                    # Tools ausführen - formatted output sobald ein Tool fertig ist
+                    tool_results: Dict[int, Dict[str, Any]] = {}
+                    async for index, tool_result in self._run_tool_calls(parsed_calls):
+                        tool_results[index] = tool_result
                         if "formatted_output" in tool_result:
                             yield tool_result["formatted_output"]
 
-                        # Tool Result zur History (im OpenAI Format)
-                        # OpenAI erwartet: role="tool", content=result_string, tool_call_id=id
+                    # Tool Results zur History (im OpenAI Format, Original-Reihenfolge)
+                    # OpenAI erwartet: role="tool", content=result_string, tool_call_id=id
+                    # Nur der kompakte Payload - der Markdown-Report ging bereits an den User
+                    for index, (tool_call_id, tool_name, _) in enumerate(parsed_calls):
+                        model_payload = self.tool_registry.model_payload(
+                            tool_name,
+                            tool_results[index],
+                            self.tool_payload_fields.get(tool_name)
+                        )
                         self.conversation_history.append(
                             ChatMessage(
                                 role="tool",
-                                content=json.dumps(tool_result, ensure_ascii=False),
+                                content=json.dumps(model_payload, ensure_ascii=False, default=str),
                                 tool_call_id=tool_call_id,
                                 name=tool_name
                             )
@@ -258,28 +557,40 @@ class DexterAgent:
                 else:
                     # Unerwarteter finish_reason
                     logger.warning(f"Unexpected finish_reason: {response.finish_reason}")
-                    if response.content:
+                    if response.content and not streamed:
                         yield response.content
                     break
 
+            except OverloadedError as e:
+                # Load Shedding: schnelle "ausgelastet"-Antwort statt Timeout
+                logger.warning(f"Overloaded: {e}")
+                turn.outcome, turn.error = "overloaded", e.message
+                yield f"\n\n⏳ {e.message}\n\n"
+                break
+
             except OpenAIError as e:
                 logger.error(f"OpenAI Error: {e}")
+                turn.outcome, turn.error = "error", e.message
                 yield f"\n\n❌ Ein Fehler ist aufgetreten: {e.message}\n\n"
                 break
 
             except Exception as e:
                 logger.error(f"Unexpected Error: {e}", exc_info=True)
+                turn.outcome, turn.error = "error", str(e)
                 yield f"\n\n❌ Ein unerwarteter Fehler ist aufgetreten: {str(e)}\n\n"
                 break
 
-        if iteration >= max_iterations:
+        else:
+            # Schleife ohne break beendet: letzte Iteration wollte weitere Tools
             logger.warning(f"Max iterations ({max_iterations}) reached")
+            turn.outcome = "max_iterations"
             yield "\n\n⚠️ Maximale Anzahl an Iterationen erreicht.\n\n"
 
     def reset_conversation(self):
         """Startet neue Conversation (löscht History)"""
-        self.conversation_history = []
+        self.conversation_history.clear()
         self.turn_count = 0
+        self.session_metrics = SessionMetrics()
         logger.info("🔄 Conversation zurückgesetzt")
 
 
@@ -289,6 +600,7 @@ class DexterAgent:
 
 async def main():
     """Haupt-CLI für Dexter Agent"""
+    configure_logging()
 
     # ASCII Art Banner
     print("""
@@ -322,6 +634,7 @@ async def main():
     print("\nBefehle:")
     print("  'exit' oder 'quit' - Beenden")
     print("  'new' - Neue Session starten")
+    print("  'metrics' - Tokens, Latenzen und Tool-Laufzeiten dieser Session")
     print("  'help' - Hilfe anzeigen")
     print(f"{'='*60}\n")
 
@@ -333,6 +646,9 @@ async def main():
         print("Bitte überprüfe deinen OPENAI_API_KEY in .env")
         return
 
+    # Connection-Pool vorwärmen (HTTP_WARMUP_CONNECTIONS)
+    await agent.openai_service.warmup()
+
     # Main Loop
     while True:
         try:
@@ -352,6 +668,11 @@ async def main():
                 print("\n✨ Neue Session gestartet. Conversation-History gelöscht.")
                 continue
 
+            if user_input.lower() == "metrics":
+                print("\n📊 Session-Metriken:")
+                print(json.dumps(agent.session_metrics.to_dict(), indent=2, ensure_ascii=False))
+                continue
+
             if user_input.lower() == "help":
                 print("\n📚 Hilfe:")
                 print("\nBeispiel-Anfragen:")
@@ -378,6 +699,12 @@ async def main():
             print(f"\n❌ Ein Fehler ist aufgetreten: {e}")
             print("Versuche es erneut oder nutze 'new' für eine neue Session.")
 
+    if config.metrics.export_path:
+        path = agent.metrics.write(config.metrics.export_path)
+        logger.info(f"📊 Metriken exportiert: {path}")
+
+    await close_shared_async_clients()
+
 
 if __name__ == "__main__":
     try:
@@ -0,0 +1,479 @@
+"""
+Lokaler Mock-Server für die OpenAI Chat Completions API
+
+Ersetzt api.openai.com für Offline-Tests und Benchmarks (CI ohne Netzwerk):
+- POST /v1/chat/completions (JSON und SSE-Streaming inkl. Tool-Call Deltas und Usage)
+- GET  /v1/models (für OpenAIService.warmup)
+- Skriptbare Antworten: Text, Tool-Calls, Latenzverteilungen, Fehler-Injection
+
+Die Antworten kommen aus einem Responder (Request-Body → MockReply). Der
+Server spricht echtes HTTP/1.1 mit Keep-Alive, sodass der produktive
+Client-Stack (httpx Pool, OpenAI SDK) unverändert mitgemessen wird.
+
+Verwendung:
+    async with MockOpenAIServer(responder) as server:
+        service = server.make_service()
+
+Standalone:
+    python mock_openai_server.py --port 8089 --latency-ms 200
+    OPENAI_BASE_URL=http://127.0.0.1:8089/v1 python main.py
+
+Author: Dexter Agent Development Team
+"""
+
+import argparse
+import asyncio
+import json
+import math
+import random
+import time
+import uuid
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any, Callable, Dict, List, Literal, Optional
+
+if TYPE_CHECKING:
+    from lib.ai.openai_service import OpenAIService
+
+
+@dataclass
+class LatencyProfile:
+    """
+    Latenzverteilung in Sekunden
+
+    kind="fixed":     immer value
+    kind="uniform":   gleichverteilt in [value, spread]
+    kind="normal":    Mittelwert value, Standardabweichung spread (≥ 0 abgeschnitten)
+    kind="lognormal": Median value, sigma spread (realistischer Long Tail)
+    """
+    kind: Literal["fixed", "uniform", "normal", "lognormal"] = "fixed"
+    value: float = 0.0
+    spread: float = 0.0
+
+    def sample(self, rng: random.Random) -> float:
+        """Zieht eine Latenz in Sekunden"""
+        if self.kind == "uniform":
+            return rng.uniform(self.value, self.spread)
+        if self.kind == "normal":
+            return max(0.0, rng.gauss(self.value, self.spread))
+        if self.kind == "lognormal":
+            return self.value * math.exp(rng.gauss(0.0, self.spread)) if self.value > 0 else 0.0
+        return self.value
+
+
+@dataclass
+class MockToolCall:
+    """Tool-Call in einer Mock-Antwort"""
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+
+
+@dataclass
+class MockReply:
+    """
+    Skriptbare Antwort des Mock-Servers
+
+    Attributes:
+        content: Antwort-Text
+        tool_calls: Tool-Calls (finish_reason="tool_calls" wenn vorhanden)
+        latency: Optional - Zeit bis zur Antwort bzw. zum ersten Chunk
+            (Default: Server-Latenz)
+        error_status: Optional - HTTP-Fehler statt Antwort (z.B. 429, 500, 503)
+        retry_after: Optional - Retry-After Header in Sekunden (bei Fehlern)
+    """
+    content: str = ""
+    tool_calls: List[MockToolCall] = field(default_factory=list)
+    latency: Optional[LatencyProfile] = None
+    error_status: Optional[int] = None
+    retry_after: Optional[float] = None
+
+
+Responder = Callable[[Dict[str, Any]], MockReply]
+
+
+def text_responder(content: str = "Mock-Antwort") -> Responder:
+    """Responder, der immer denselben Text liefert"""
+    return lambda request: MockReply(content=content)
+
+
+def scripted_responder(steps: List[List[MockToolCall]], final_content: str) -> Responder:
+    """
+    Zustandsloser Responder für Multi-Tool Conversations
+
+    Die aktuelle Runde ergibt sich aus der Anzahl der assistant-Messages mit
+    tool_calls seit der letzten User-Message. Dadurch funktioniert derselbe
+    Responder für beliebig viele parallele Conversations.
+
+    Args:
+        steps: Tool-Calls pro Iteration (eine Liste = parallele Tool-Calls)
+        final_content: Abschließende Text-Antwort nach allen Tool-Runden
+
+    Returns:
+        Responder
+    """
+    def respond(request: Dict[str, Any]) -> MockReply:
+        step = 0
+        for message in reversed(request.get("messages", [])):
+            if message.get("role") == "user":
+                break
+            if message.get("role") == "assistant" and message.get("tool_calls"):
+                step += 1
+        if step < len(steps):
+            return MockReply(tool_calls=steps[step])
+        return MockReply(content=final_content)
+
+    return respond
+
+
+def _estimate_tokens(text: str) -> int:
+    """Grobe Token-Schätzung wie OpenAIService.estimate_tokens (~4 Zeichen/Token)"""
+    return max(1, len(text) // 4)
+
+
+_STATUS_TEXT = {
+    200: "OK", 400: "Bad Request", 404: "Not Found", 429: "Too Many Requests",
+    500: "Internal Server Error", 502: "Bad Gateway", 503: "Service Unavailable",
+}
+
+
+class MockOpenAIServer:
+    """
+    HTTP/1.1 Mock der Chat Completions API auf asyncio-Basis
+
+    Attributes:
+        base_url: Basis-URL für den OpenAI Client (http://host:port/v1)
+        requests: Anzahl empfangener Completion-Requests
+        injected_errors: Anzahl injizierter Fehler-Responses
+    """
+
+    def __init__(
+        self,
+        responder: Optional[Responder] = None,
+        host: str = "127.0.0.1",
+        port: int = 0,
+        latency: Optional[LatencyProfile] = None,
+        chunk_delay: Optional[LatencyProfile] = None,
+        error_rate: float = 0.0,
+        error_status: int = 503,
+        retry_after: Optional[float] = None,
+        seed: Optional[int] = None
+    ):
+        """
+        Args:
+            responder: Request-Body → MockReply (Default: fester Text)
+            host: Bind-Adresse
+            port: Port (0 = freier Port)
+            latency: Default-Latenz bis zur Antwort / zum ersten Chunk
+            chunk_delay: Latenz zwischen Stream-Chunks
+            error_rate: Anteil zufällig injizierter Fehler (0.0 - 1.0)
+            error_status: HTTP-Status injizierter Fehler
+            retry_after: Optional - Retry-After Header injizierter Fehler
+            seed: Optional - Seed für reproduzierbare Latenzen/Fehler
+        """
+        self.responder = responder or text_responder()
+        self.host = host
+        self.port = port
+        self.latency = latency or LatencyProfile()
+        self.chunk_delay = chunk_delay or LatencyProfile()
+        self.error_rate = error_rate
+        self.error_status = error_status
+        self.retry_after = retry_after
+        self._rng = random.Random(seed)
+        self._server: Optional[asyncio.AbstractServer] = None
+        self._connections: Dict["asyncio.Task[None]", asyncio.StreamWriter] = {}
+
+        self.requests = 0
+        self.injected_errors = 0
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{self.host}:{self.port}/v1"
+
+    def make_service(self, max_retries: Optional[int] = None) -> "OpenAIService":
+        """
+        OpenAIService, dessen Calls an diesen Server gehen
+
+        Nutzt den prozessweiten Client für base_url und schaltet den
+        Completion-Cache ab, damit jeder Call den Server erreicht.
+
+        Args:
+            max_retries: Optional - Überschreibt die SDK-Retries des Clients
+
+        Returns:
+            OpenAIService
+        """
+        # Lazy: der Standalone-Server braucht den Service-Stack nicht
+        from lib.ai.openai_service import OpenAIService, get_shared_async_client
+
+        client = get_shared_async_client("sk-mock", base_url=self.base_url)
+        if max_retries is not None:
+            client = client.with_options(max_retries=max_retries)
+        service = OpenAIService(api_key="sk-mock", async_client=client)
+        service.completion_cache = None
+        return service
+
+    async def start(self) -> "MockOpenAIServer":
+        """Startet den Server (port=0 → tatsächlich gebundener Port)"""
+        self._server = await asyncio.start_server(self._handle_connection, self.host, self.port)
+        self.port = self._server.sockets[0].getsockname()[1]
+        return self
+
+    async def stop(self) -> None:
+        """Stoppt den Server und schließt offene Keep-Alive Verbindungen"""
+        if self._server is not None:
+            self._server.close()
+            for writer in self._connections.values():
+                writer.close()
+            if self._connections:
+                await asyncio.gather(*self._connections, return_exceptions=True)
+            await self._server.wait_closed()
+            self._server = None
+
+    async def __aenter__(self) -> "MockOpenAIServer":
+        return await self.start()
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.stop()
+
+    # ------------------------------------------------------------------
+    # HTTP
+    # ------------------------------------------------------------------
+
+    async def _handle_connection(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        """Bearbeitet Requests einer Keep-Alive Verbindung nacheinander"""
+        task = asyncio.current_task()
+        self._connections[task] = writer
+        try:
+            while True:
+                request_line = await reader.readline()
+                if not request_line:
+                    break
+                method, path, _ = request_line.decode("latin-1").split(" ", 2)
+
+                headers: Dict[str, str] = {}
+                while True:
+                    line = await reader.readline()
+                    if line in (b"\r\n", b"\n", b""):
+                        break
+                    name, _, value = line.decode("latin-1").partition(":")
+                    headers[name.strip().lower()] = value.strip()
+
+                body = await reader.readexactly(int(headers.get("content-length", "0")))
+                await self._dispatch(method, path.split("?", 1)[0], body, writer)
+
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            self._connections.pop(task, None)
+            writer.close()
+
+    async def _dispatch(self, method: str, path: str, body: bytes, writer: asyncio.StreamWriter) -> None:
+        if method == "GET" and path == "/v1/models":
+            await self._send_json(writer, 200, {"object": "list", "data": [{"id": "mock-model", "object": "model"}]})
+        elif method == "POST" and path == "/v1/chat/completions":
+            await self._chat_completions(json.loads(body or b"{}"), writer)
+        else:
+            await self._send_json(writer, 404, {"error": {"message": f"Unknown route: {method} {path}"}})
+
+    def _write_head(self, writer: asyncio.StreamWriter, status: int, headers: Dict[str, str]) -> None:
+        lines = [f"HTTP/1.1 {status} {_STATUS_TEXT.get(status, 'Error')}"]
+        lines += [f"{name}: {value}" for name, value in headers.items()]
+        writer.write(("\r\n".join(lines) + "\r\n\r\n").encode("latin-1"))
+
+    async def _send_json(
+        self,
+        writer: asyncio.StreamWriter,
+        status: int,
+        payload: Dict[str, Any],
+        extra_headers: Optional[Dict[str, str]] = None
+    ) -> None:
+        data = json.dumps(payload).encode("utf-8")
+        self._write_head(writer, status, {
+            "Content-Type": "application/json",
+            "Content-Length": str(len(data)),
+            **(extra_headers or {}),
+        })
+        writer.write(data)
+        await writer.drain()
+
+    # ------------------------------------------------------------------
+    # Chat Completions
+    # ------------------------------------------------------------------
+
+    async def _chat_completions(self, request: Dict[str, Any], writer: asyncio.StreamWriter) -> None:
+        self.requests += 1
+        reply = self.responder(request)
+
+        latency = (reply.latency or self.latency).sample(self._rng)
+        if latency > 0:
+            await asyncio.sleep(latency)
+
+        error_status = reply.error_status
+        retry_after = reply.retry_after
+        if error_status is None and self.error_rate and self._rng.random() < self.error_rate:
+            error_status, retry_after = self.error_status, self.retry_after
+        if error_status is not None:
+            self.injected_errors += 1
+            headers = {"Retry-After": f"{retry_after:g}"} if retry_after is not None else {}
+            await self._send_json(writer, error_status, {
+                "error": {"message": f"Mock error {error_status}", "type": "mock_error", "code": str(error_status)}
+            }, headers)
+            return
+
+        completion_id = f"chatcmpl-mock-{uuid.uuid4().hex[:12]}"
+        model = request.get("model", "mock-model")
+        tool_calls = [
+            {
+                "id": f"call_{uuid.uuid4().hex[:12]}",
+                "type": "function",
+                "function": {"name": call.name, "arguments": json.dumps(call.arguments, ensure_ascii=False)}
+            }
+            for call in reply.tool_calls
+        ]
+        finish_reason = "tool_calls" if tool_calls else "stop"
+        prompt_tokens = _estimate_tokens(json.dumps(request.get("messages", []), ensure_ascii=False))
+        completion_tokens = _estimate_tokens(reply.content + "".join(
+            call["function"]["arguments"] for call in tool_calls
+        ))
+        usage = {
+            "prompt_tokens": prompt_tokens,
+            "completion_tokens": completion_tokens,
+            "total_tokens": prompt_tokens + completion_tokens,
+            # Wie der Provider Prompt-Cache: ab 1024 Tokens in 128er-Blöcken
+            "prompt_tokens_details": {
+                "cached_tokens": prompt_tokens // 128 * 128 if prompt_tokens >= 1024 else 0
+            },
+        }
+
+        if request.get("stream"):
+            include_usage = bool((request.get("stream_options") or {}).get("include_usage"))
+            await self._stream_completion(
+                writer, completion_id, model, reply.content, tool_calls,
+                finish_reason, usage if include_usage else None
+            )
+            return
+
+        message: Dict[str, Any] = {"role": "assistant", "content": reply.content or None}
+        if tool_calls:
+            message["tool_calls"] = tool_calls
+        await self._send_json(writer, 200, {
+            "id": completion_id,
+            "object": "chat.completion",
+            "created": int(time.time()),
+            "model": model,
+            "choices": [{"index": 0, "message": message, "finish_reason": finish_reason}],
+            "usage": usage,
+        })
+
+    async def _stream_completion(
+        self,
+        writer: asyncio.StreamWriter,
+        completion_id: str,
+        model: str,
+        content: str,
+        tool_calls: List[Dict[str, Any]],
+        finish_reason: str,
+        usage: Optional[Dict[str, int]]
+    ) -> None:
+        """SSE-Stream mit Chunked Transfer-Encoding (Verbindung bleibt Keep-Alive)"""
+        self._write_head(writer, 200, {
+            "Content-Type": "text/event-stream",
+            "Transfer-Encoding": "chunked",
+        })
+
+        created = int(time.time())
+        first = True
+
+        async def send(data: str) -> None:
+            nonlocal first
+            if not first:
+                delay = self.chunk_delay.sample(self._rng)
+                if delay > 0:
+                    await asyncio.sleep(delay)
+            first = False
+            payload = f"data: {data}\n\n".encode("utf-8")
+            writer.write(f"{len(payload):x}\r\n".encode("latin-1") + payload + b"\r\n")
+            await writer.drain()
+
+        def chunk(delta: Dict[str, Any], finish: Optional[str] = None) -> str:
+            return json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [{"index": 0, "delta": delta, "finish_reason": finish}],
+            }, ensure_ascii=False)
+
+        await send(chunk({"role": "assistant", "content": ""}))
+
+        # Text in Wort-Gruppen streamen
+        words = content.split(" ")
+        for start in range(0, len(words) if content else 0, 4):
+            piece = " ".join(words[start:start + 4])
+            if start + 4 < len(words):
+                piece += " "
+            await send(chunk({"content": piece}))
+
+        # Tool-Calls: erst id + Name, dann Argument-Fragmente pro Index
+        for index, tool_call in enumerate(tool_calls):
+            await send(chunk({"tool_calls": [{
+                "index": index,
+                "id": tool_call["id"],
+                "type": "function",
+                "function": {"name": tool_call["function"]["name"], "arguments": ""},
+            }]}))
+            arguments = tool_call["function"]["arguments"]
+            for start in range(0, len(arguments), 32):
+                await send(chunk({"tool_calls": [{
+                    "index": index,
+                    "function": {"arguments": arguments[start:start + 32]},
+                }]}))
+
+        await send(chunk({}, finish_reason))
+        if usage is not None:
+            await send(json.dumps({
+                "id": completion_id,
+                "object": "chat.completion.chunk",
+                "created": created,
+                "model": model,
+                "choices": [],
+                "usage": usage,
+            }))
+        await send("[DONE]")
+
+        writer.write(b"0\r\n\r\n")
+        await writer.drain()
+
+
+async def _serve_forever(args: argparse.Namespace) -> None:
+    server = MockOpenAIServer(
+        responder=text_responder(args.text),
+        host=args.host,
+        port=args.port,
+        latency=LatencyProfile("lognormal", args.latency_ms / 1000, args.sigma) if args.sigma
+        else LatencyProfile("fixed", args.latency_ms / 1000),
+        error_rate=args.error_rate,
+        error_status=args.error_status,
+        seed=args.seed
+    )
+    async with server:
+        print(f"🧪 Mock OpenAI Server läuft auf {server.base_url}")
+        await asyncio.Event().wait()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Lokaler Mock-Server für die OpenAI Chat Completions API")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8089)
+    parser.add_argument("--text", default="Mock-Antwort", help="Antwort-Text")
+    parser.add_argument("--latency-ms", type=float, default=0.0, help="(Median-)Latenz bis zur Antwort")
+    parser.add_argument("--sigma", type=float, default=0.0, help="Lognormal-Sigma (0 = feste Latenz)")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Anteil injizierter Fehler")
+    parser.add_argument("--error-status", type=int, default=503)
+    parser.add_argument("--seed", type=int, default=None)
+
+    try:
+        asyncio.run(_serve_forever(parser.parse_args()))
+    except KeyboardInterrupt:
+        pass
@@ -0,0 +1,238 @@
+"""
+Dexter Session Manager - Multi-User Betrieb
+
+Verwaltet viele DexterAgent-Instanzen nach Session-ID:
+- Anlegen/Nachschlagen von Sessions, serialisierte chat()-Aufrufe pro Session
+- Verdrängung idle Sessions per TTL und LRU (max. Anzahl, globales Token-Budget)
+- Kennzahlen: Session-Anzahl, residente Nachrichten/Tokens, Evictions
+
+Unveränderliche Teile (Tool-Schemas, System Prompt, OpenAI Client) werden
+über einen gemeinsamen OpenAIService und die prozessweite Tool-Registry
+von allen Sessions geteilt.
+
+Author: Dexter Agent Development Team
+"""
+
+import asyncio
+import logging
+import time
+from collections import OrderedDict
+from dataclasses import dataclass, field
+from typing import Any, AsyncIterator, Callable, Dict, Optional
+
+from config import config
+from lib.ai.openai_service import OpenAIService
+from main import DexterAgent
+
+logger = logging.getLogger(__name__)
+
+
+@dataclass
+class Session:
+    """Residente Session mit eigenem Agent"""
+    session_id: str
+    agent: DexterAgent
+    created_at: float = field(default_factory=time.monotonic)
+    last_used: float = field(default_factory=time.monotonic)
+    lock: asyncio.Lock = field(default_factory=asyncio.Lock)
+    resident_tokens: int = 0   # Zuletzt abgerechneter Token-Stand der History
+
+    @property
+    def busy(self) -> bool:
+        """Läuft gerade ein chat()-Aufruf?"""
+        return self.lock.locked()
+
+
+class SessionManager:
+    """
+    Verwaltet DexterAgent-Sessions mit TTL- und LRU-Verdrängung
+
+    Sessions liegen in einem OrderedDict in LRU-Reihenfolge (älteste zuerst),
+    dadurch sind Nachschlagen, Touch und Verdrängung O(1) pro Session.
+    Sessions mit laufendem chat()-Aufruf werden nie verdrängt; sind alle
+    belegt, liegt der Pool kurzzeitig über max_sessions.
+    """
+
+    def __init__(
+        self,
+        max_sessions: Optional[int] = None,
+        idle_ttl_seconds: Optional[float] = None,
+        max_resident_tokens: Optional[int] = None,
+        agent_factory: Optional[Callable[[], DexterAgent]] = None
+    ):
+        """
+        Args:
+            max_sessions: Optional - Max. residente Sessions (Default aus config.sessions)
+            idle_ttl_seconds: Optional - Idle-TTL in Sekunden (Default aus config.sessions)
+            max_resident_tokens: Optional - Globales Token-Budget, 0 = unbegrenzt
+                (Default aus config.sessions)
+            agent_factory: Optional - Erzeugt neue Agents (Default: DexterAgent mit
+                geteiltem OpenAIService)
+        """
+        self.max_sessions = max_sessions or config.sessions.max_sessions
+        self.idle_ttl_seconds = idle_ttl_seconds or config.sessions.idle_ttl_seconds
+        self.max_resident_tokens = (
+            config.sessions.max_resident_tokens if max_resident_tokens is None else max_resident_tokens
+        )
+
+        if agent_factory is None:
+            shared_service = OpenAIService(api_key=config.api_key)
+            agent_factory = lambda: DexterAgent(openai_service=shared_service)
+        self._agent_factory = agent_factory
+
+        self._sessions: "OrderedDict[str, Session]" = OrderedDict()
+        self._resident_tokens = 0
+        self.evictions = {"ttl": 0, "lru": 0, "tokens": 0}
+
+    def __len__(self) -> int:
+        return len(self._sessions)
+
+    def __contains__(self, session_id: str) -> bool:
+        return session_id in self._sessions
+
+    def get_or_create(self, session_id: str) -> Session:
+        """
+        Hole Session (und markiere als zuletzt benutzt) oder lege sie an
+
+        Args:
+            session_id: Eindeutige Session-ID
+
+        Returns:
+            Session
+        """
+        self.evict_expired()
+
+        session = self._sessions.get(session_id)
+        if session is not None:
+            session.last_used = time.monotonic()
+            self._sessions.move_to_end(session_id)
+            return session
+
+        session = Session(session_id=session_id, agent=self._agent_factory())
+        self._sessions[session_id] = session
+        logger.info(f"🆕 Session angelegt: {session_id} ({len(self._sessions)} aktiv)")
+
+        self._enforce_limits(keep=session_id)
+        return session
+
+    async def chat(self, session_id: str, user_message: str) -> AsyncIterator[str]:
+        """
+        Chat innerhalb einer Session (gleichzeitige Aufrufe derselben Session
+        werden serialisiert)
+
+        Args:
+            session_id: Session-ID
+            user_message: User-Nachricht
+
+        Yields:
+            Response chunks als String
+        """
+        session = self.get_or_create(session_id)
+
+        async with session.lock:
+            try:
+                async for chunk in session.agent.chat(user_message):
+                    yield chunk
+            finally:
+                session.last_used = time.monotonic()
+                # Während des Chats verdrängt/geschlossen: nicht mehr abrechnen
+                if self._sessions.get(session_id) is session:
+                    self._sessions.move_to_end(session_id)
+                    self._account(session)
+
+        self._enforce_limits()
+
+    def close(self, session_id: str) -> bool:
+        """
+        Verwirft Session explizit
+
+        Returns:
+            True wenn Session existierte
+        """
+        session = self._sessions.pop(session_id, None)
+        if session is None:
+            return False
+        self._resident_tokens -= session.resident_tokens
+        return True
+
+    # ------------------------------------------------------------------
+    # Verdrängung
+    # ------------------------------------------------------------------
+
+    def _account(self, session: Session) -> None:
+        """Aktualisiert das globale Token-Konto um die Änderung dieser Session (O(1))"""
+        tokens = session.agent.conversation_history.total_tokens
+        self._resident_tokens += tokens - session.resident_tokens
+        session.resident_tokens = tokens
+
+    def _evict(self, session_id: str, reason: str) -> None:
+        session = self._sessions.pop(session_id)
+        self._resident_tokens -= session.resident_tokens
+        self.evictions[reason] += 1
+        logger.info(f"🗑️ Session verdrängt ({reason}): {session_id}")
+
+    def evict_expired(self, now: Optional[float] = None) -> int:
+        """
+        Verdrängt Sessions, die länger als idle_ttl_seconds unbenutzt sind
+
+        Returns:
+            Anzahl verdrängter Sessions
+        """
+        now = time.monotonic() if now is None else now
+        evicted = 0
+        # LRU-Reihenfolge: sobald eine Session frisch genug ist, sind es alle danach auch
+        for session_id, session in list(self._sessions.items()):
+            if now - session.last_used <= self.idle_ttl_seconds:
+                break
+            if session.busy:
+                continue
+            self._evict(session_id, "ttl")
+            evicted += 1
+        return evicted
+
+    def _over_limits(self) -> Optional[str]:
+        if len(self._sessions) > self.max_sessions:
+            return "lru"
+        if self.max_resident_tokens and self._resident_tokens > self.max_resident_tokens:
+            return "tokens"
+        return None
+
+    def _enforce_limits(self, keep: Optional[str] = None) -> None:
+        """
+        Verdrängt LRU-Sessions bis Anzahl und Token-Budget eingehalten sind
+
+        Args:
+            keep: Optional - Session-ID, die nie verdrängt wird (z.B. die gerade
+                von get_or_create angelegte Session)
+        """
+        reason = self._over_limits()
+        if reason is None:
+            return
+
+        for session_id, session in list(self._sessions.items()):
+            if reason is None:
+                break
+            if session.busy or session_id == keep:
+                continue
+            self._evict(session_id, reason)
+            reason = self._over_limits()
+
+    # ------------------------------------------------------------------
+    # Kennzahlen
+    # ------------------------------------------------------------------
+
+    def stats(self) -> Dict[str, Any]:
+        """
+        Aktuelle Kennzahlen des Session-Pools
+
+        Returns:
+            Dict mit session_count, busy_sessions, resident_messages,
+            resident_tokens und evictions
+        """
+        return {
+            "session_count": len(self._sessions),
+            "busy_sessions": sum(1 for session in self._sessions.values() if session.busy),
+            "resident_messages": sum(len(session.agent.conversation_history) for session in self._sessions.values()),
+            "resident_tokens": self._resident_tokens,
+            "evictions": dict(self.evictions),
+        }
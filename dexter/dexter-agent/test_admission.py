@@ -0,0 +1,122 @@
+"""
+Test-Script für die prozessweite Admission Control (Concurrency-Limit,
+Prioritäts-Queue, Load Shedding).
+Läuft offline, API Calls gehen an den lokalen Mock OpenAI Server.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.admission import PRIORITY_BATCH, PRIORITY_INTERACTIVE, AdmissionController
+from lib.ai.error_handler import OverloadedError
+from lib.ai.openai_service import close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import LatencyProfile, MockOpenAIServer
+
+
+async def run_tests():
+    """Führt alle Admission Control Tests aus."""
+
+    # Test 1: Concurrency-Limit wird eingehalten
+    controller = AdmissionController(max_concurrent=2, max_queue=10, max_wait_seconds=5.0)
+    running = {"now": 0, "peak": 0}
+
+    async def call():
+        async with controller.slot():
+            running["now"] += 1
+            running["peak"] = max(running["peak"], running["now"])
+            await asyncio.sleep(0.02)
+            running["now"] -= 1
+
+    await asyncio.gather(*(call() for _ in range(8)))
+    stats = controller.stats()
+    assert running["peak"] == 2, running
+    assert stats["admitted"] == 8 and stats["in_flight"] == 0 and stats["queue_depth"] == 0
+    assert stats["max_queue_depth"] >= 5
+    print("  - Test 1: Concurrency limit is enforced - PASSED")
+
+    # Test 2: Interaktive Calls überholen wartende Batch-Calls
+    controller = AdmissionController(max_concurrent=1, max_queue=10, max_wait_seconds=5.0)
+    order = []
+
+    async def tagged(name, priority):
+        async with controller.slot(priority):
+            order.append(name)
+            await asyncio.sleep(0.01)
+
+    blocker = asyncio.create_task(tagged("blocker", PRIORITY_BATCH))
+    await asyncio.sleep(0)
+    tasks = [asyncio.create_task(tagged(f"batch{i}", PRIORITY_BATCH)) for i in range(3)]
+    await asyncio.sleep(0)
+    tasks.append(asyncio.create_task(tagged("chat", PRIORITY_INTERACTIVE)))
+    await asyncio.gather(blocker, *tasks)
+    assert order == ["blocker", "chat", "batch0", "batch1", "batch2"], order
+    print("  - Test 2: Interactive calls outrank batch calls - PASSED")
+
+    # Test 3: Load Shedding - volle Queue, Verdrängung, Wartezeit-Limit
+    controller = AdmissionController(max_concurrent=1, max_queue=1, max_wait_seconds=0.1)
+    hold = asyncio.Event()
+
+    async def holder():
+        async with controller.slot():
+            await hold.wait()
+
+    holder_task = asyncio.create_task(holder())
+    await asyncio.sleep(0)
+    batch_waiter = asyncio.create_task(controller.acquire(PRIORITY_BATCH))
+    await asyncio.sleep(0)
+
+    start = time.monotonic()
+    try:
+        await controller.acquire(PRIORITY_BATCH)          # Queue voll → sofort abgewiesen
+        raise AssertionError("OverloadedError erwartet")
+    except OverloadedError:
+        assert time.monotonic() - start < 0.01
+
+    chat_waiter = asyncio.create_task(controller.acquire(PRIORITY_INTERACTIVE))
+    await asyncio.sleep(0)
+    try:
+        await batch_waiter                                # vom Chat verdrängt
+        raise AssertionError("OverloadedError erwartet")
+    except OverloadedError:
+        pass
+    try:
+        await chat_waiter                                 # Holder gibt nicht frei → Wartezeit-Limit
+        raise AssertionError("OverloadedError erwartet")
+    except OverloadedError:
+        pass
+    hold.set()
+    await holder_task
+    stats = controller.stats()
+    assert stats["shed"] == {"queue_full": 1, "preempted": 1, "predicted_wait": 0, "wait_timeout": 1}, stats
+    assert stats["in_flight"] == 0 and stats["queue_depth"] == 0
+    print("  - Test 3: Queue-full, preemption and wait-time shedding - PASSED")
+
+    # Test 4: Agent liefert unter Überlast schnell eine "ausgelastet"-Antwort
+    async with MockOpenAIServer(latency=LatencyProfile("fixed", 0.5)) as server:
+        service = server.make_service()
+        service.admission = AdmissionController(max_concurrent=1, max_queue=0, max_wait_seconds=1.0)
+
+        busy_agent = DexterAgent(openai_service=service, stream=False)
+        busy_task = asyncio.create_task(busy_agent.chat("Hallo").__anext__())
+        await asyncio.sleep(0.1)
+
+        start = time.monotonic()
+        chunks = [chunk async for chunk in DexterAgent(openai_service=service, stream=True).chat("Hallo")]
+        assert time.monotonic() - start < 0.1
+        assert "ausgelastet" in "".join(chunks), chunks
+        await busy_task
+        assert service.admission.stats()["shed_total"] == 1
+    print("  - Test 4: Agent returns a fast busy response when shedding - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Admission control tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,167 @@
+"""
+Test-Script für den Batch Runner (JSONL Conversations, Timeouts, Resume).
+Die Conversations laufen offline gegen skriptbare Mock-Antworten.
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from batch_runner import (
+    BatchInputError, BatchItem, BatchRunner, ResultWriter,
+    load_checkpoint, load_items, run_batch
+)
+from config import BatchConfig
+from lib.ai.admission import PRIORITY_BATCH
+from lib.ai.metrics import SessionMetrics, TurnMetrics
+from lib.ai.openai_service import close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import LatencyProfile, MockOpenAIServer, MockReply, MockToolCall, scripted_responder
+
+_ROI = MockToolCall("calculate_roi", {
+    "investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12
+})
+_PRICES = BatchConfig(price_prompt_per_1m=10.0, price_cached_per_1m=1.0, price_completion_per_1m=30.0)
+
+
+def responder(request):
+    """ROI-Tool bei "ROI", langsame Antwort bei "langsam", sonst Text"""
+    last_user = next(m["content"] for m in reversed(request["messages"]) if m["role"] == "user")
+    if "langsam" in last_user:
+        return MockReply(content="spät", latency=LatencyProfile("fixed", 1.0))
+    if "ROI" in last_user:
+        return scripted_responder([[_ROI]], "ROI berechnet.")(request)
+    return MockReply(content=f"Antwort auf: {last_user}")
+
+
+def agent_factory(server: MockOpenAIServer):
+    service = server.make_service()
+
+    def create() -> DexterAgent:
+        agent = DexterAgent(openai_service=service, stream=False, priority=PRIORITY_BATCH)
+        agent.tool_cache = None
+        return agent
+    return create
+
+
+def write_jsonl(path: Path, rows) -> None:
+    path.write_text("".join(json.dumps(row, ensure_ascii=False) + "\n" for row in rows), encoding="utf-8")
+
+
+class OverloadedOnceAgent:
+    """Fake-Agent: erster Versuch wird abgewiesen (Load Shedding), danach ok"""
+    attempts = 0
+
+    def __init__(self):
+        self.session_metrics = SessionMetrics()
+
+    async def chat(self, user_message: str):
+        OverloadedOnceAgent.attempts += 1
+        turn = TurnMetrics(turn=1, prompt_tokens=10, completion_tokens=5)
+        if OverloadedOnceAgent.attempts == 1:
+            turn.outcome, turn.error = "overloaded", "ausgelastet"
+        self.session_metrics.add(turn)
+        yield "ok"
+
+
+async def run_tests():
+    """Führt alle Batch Runner Tests aus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # Test 1: Eingabeformate und Validierung
+        source = tmp / "in.jsonl"
+        write_jsonl(source, [
+            {"id": "a", "messages": ["Frage 1", {"role": "user", "content": "Frage 2"}]},
+            {"prompt": "Einzelne Frage", "kunde": "K-7"},
+        ])
+        items = load_items(source)
+        assert [item.messages for item in items] == [["Frage 1", "Frage 2"], ["Einzelne Frage"]]
+        assert items[1].item_id == "line-2" and items[1].metadata == {"kunde": "K-7"}
+        for bad in ([{"id": "x", "prompt": "a"}, {"id": "x", "prompt": "b"}], [{"id": "y"}]):
+            write_jsonl(source, bad)
+            try:
+                load_items(source)
+                raise AssertionError("BatchInputError erwartet")
+            except BatchInputError:
+                pass
+        print("  - Test 1: Input formats and validation - PASSED")
+
+        async with MockOpenAIServer(responder) as server:
+            # Test 2: Parallele, isolierte Conversations mit Tokens, Kosten und Streaming-Ausgabe
+            items = [BatchItem(f"k-{i}", [f"ROI für Kunde {i}", "Danke"]) for i in range(6)]
+            items.insert(0, BatchItem("slow", ["bitte langsam"]))
+            runner = BatchRunner(
+                concurrency=3, item_timeout_seconds=5, agent_factory=agent_factory(server), settings=_PRICES
+            )
+            output = tmp / "out.jsonl"
+            seen = []
+            with ResultWriter(output) as writer:
+                summary = await runner.run(items, writer, on_result=lambda r: seen.append(r.id))
+
+            rows = [json.loads(line) for line in output.read_text(encoding="utf-8").splitlines()]
+            assert [row["id"] for row in rows] == seen and seen[-1] == "slow"   # Fertigstellungs-Reihenfolge
+            assert all(row["status"] == "ok" for row in rows)
+            first = next(row for row in rows if row["id"] == "k-0")
+            assert first["turns"] == 2 and first["model_calls"] == 3
+            assert first["tool_calls"] == {"calculate_roi": 1}
+            assert "ROI berechnet." in first["responses"][0] and first["responses"][1] == "Antwort auf: Danke"
+            expected_cost = _PRICES.token_cost(first["prompt_tokens"], first["completion_tokens"], first["cached_tokens"])
+            assert first["cost"] == round(expected_cost, 6) and first["cost"] > 0
+            report = summary.to_dict()
+            assert report["completed"] == 7 and report["failed"] == 0
+            assert report["total_tokens"] == sum(row["prompt_tokens"] + row["completion_tokens"] for row in rows)
+            assert 1.0 <= report["wall_seconds"] < 2.0      # parallel: langsames Item blockiert die anderen nicht
+            print(f"  - Test 2: Concurrent isolated conversations ({report['items_per_second']} items/s) - PASSED")
+
+            # Test 3: Zeitbudget pro Conversation
+            runner = BatchRunner(
+                concurrency=2, item_timeout_seconds=0.2, agent_factory=agent_factory(server), settings=_PRICES
+            )
+            with ResultWriter(tmp / "timeout.jsonl") as writer:
+                summary = await runner.run([BatchItem("slow", ["langsam"]), BatchItem("fast", ["schnell"])], writer)
+            statuses = load_checkpoint(tmp / "timeout.jsonl")
+            assert statuses == {"slow": "timeout", "fast": "ok"}
+            assert summary.failed == 1
+            print("  - Test 3: Per-item timeout - PASSED")
+
+            # Test 4: Resume - nur nicht erfolgreiche IDs werden erneut ausgeführt
+            source = tmp / "resume.jsonl"
+            write_jsonl(source, [{"id": f"r-{i}", "prompt": f"Frage {i}"} for i in range(4)])
+            output = tmp / "resume.results.jsonl"
+            write_jsonl(output, [{"id": "r-0", "status": "ok"}, {"id": "r-1", "status": "timeout"}])
+            with open(output, "a", encoding="utf-8") as file:
+                file.write('{"id": "r-2", "sta')          # abgebrochene Zeile
+            args = argparse.Namespace(input=source, output=None, resume=True, overwrite=False, quiet=True)
+            runner = BatchRunner(concurrency=2, item_timeout_seconds=5, agent_factory=agent_factory(server))
+            report = await run_batch(args, runner)
+            assert report["skipped"] == 1 and report["completed"] == 3 and report["failed"] == 0
+            assert load_checkpoint(output) == {f"r-{i}": "ok" for i in range(4)}
+            lines = output.read_text(encoding="utf-8").splitlines()
+            assert lines[2] == '{"id": "r-2", "sta' and len(lines) == 6    # neue Zeilen bleiben gültig
+            assert all(json.loads(line) for line in lines[3:])
+            print("  - Test 4: Checkpoint/resume skips completed items - PASSED")
+
+        # Test 5: Load Shedding → Neuversuch mit frischem Agent
+        runner = BatchRunner(concurrency=1, overload_retries=2, agent_factory=OverloadedOnceAgent, settings=_PRICES)
+        with ResultWriter(tmp / "overload.jsonl") as writer:
+            await runner.run([BatchItem("o", ["Frage"])], writer)
+        row = json.loads((tmp / "overload.jsonl").read_text(encoding="utf-8"))
+        assert row["status"] == "ok" and row["attempts"] == 2
+        # Tokens und Kosten summieren auch den abgewiesenen Versuch
+        assert row["prompt_tokens"] == 20 and row["completion_tokens"] == 10 and row["turns"] == 2
+        assert row["cost"] == round(_PRICES.token_cost(20, 10, 0), 6) > 0
+        print("  - Test 5: Overloaded items are retried, usage of all attempts is summed - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Batch runner tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,96 @@
+"""
+Test-Script für den Record/Replay Completion-Cache.
+Läuft offline mit einem Fake-Client (kein API Call).
+"""
+
+import asyncio
+import sys
+import tempfile
+from pathlib import Path
+from types import SimpleNamespace
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.openai_service import OpenAIService, ChatMessage
+from lib.ai.completion_cache import CompletionCache, CompletionCacheMiss
+from lib.ai.tool_registry import get_tool_registry
+
+
+class FakeCompletions:
+    """Liefert immer dieselbe Tool-Call Response und zählt API Calls"""
+
+    def __init__(self):
+        self.calls = 0
+
+    async def create(self, **params):
+        self.calls += 1
+        tool_call = SimpleNamespace(
+            id="call_1",
+            type="function",
+            function=SimpleNamespace(name="calculate_roi", arguments='{"investment_cost": 1000}')
+        )
+        message = SimpleNamespace(content="", tool_calls=[tool_call])
+        return SimpleNamespace(
+            choices=[SimpleNamespace(message=message, finish_reason="tool_calls")],
+            usage=SimpleNamespace(total_tokens=120, prompt_tokens=100, completion_tokens=20),
+            model="gpt-test"
+        )
+
+
+async def run_tests():
+    """Führt alle Completion-Cache Tests aus."""
+
+    cache_dir = tempfile.mkdtemp()
+    completions = FakeCompletions()
+    service = OpenAIService(
+        api_key="sk-test",
+        async_client=SimpleNamespace(chat=SimpleNamespace(completions=completions))
+    )
+    tools = get_tool_registry().schemas
+    messages = [ChatMessage(role="user", content="ROI für 1000€?")]
+
+    # Test 1: Read-Through - zweiter identischer Request kommt aus dem Cache
+    service.completion_cache = CompletionCache(cache_dir, max_bytes=1024 * 1024, mode="on")
+    await service.generate_response(messages, tools=tools)
+    cached = await service.generate_response(messages, tools=tools)
+    assert completions.calls == 1
+    assert cached.tool_calls[0].function.name == "calculate_roi"
+    assert cached.prompt_tokens == 100
+    print("  - Test 1: Identical requests are served from cache - PASSED")
+
+    # Test 2: Streaming nutzt denselben Fingerprint
+    events = [event async for event in service.generate_response_events(messages, tools=tools)]
+    assert completions.calls == 1
+    assert events[-1].type == "done" and events[-1].response.finish_reason == "tool_calls"
+    print("  - Test 2: Streaming replays cached completions - PASSED")
+
+    # Test 3: Andere Sampling-Parameter ergeben einen anderen Fingerprint
+    await service.generate_response(messages, tools=tools, temperature=0.7)
+    assert completions.calls == 2
+    print("  - Test 3: Sampling parameters are part of the fingerprint - PASSED")
+
+    # Test 4: Strikter Replay-Modus wirft bei Miss
+    service.completion_cache = CompletionCache(cache_dir, max_bytes=1024 * 1024, mode="replay")
+    await service.generate_response(messages, tools=tools)
+    try:
+        await service.generate_response([ChatMessage(role="user", content="Neu")], tools=tools)
+        raise AssertionError("CompletionCacheMiss erwartet")
+    except CompletionCacheMiss as e:
+        assert not e.retryable
+    assert completions.calls == 2
+    print("  - Test 4: Strict replay fails on cache miss - PASSED")
+
+    # Test 5: Größenlimit verdrängt älteste Einträge
+    service.completion_cache = CompletionCache(tempfile.mkdtemp(), max_bytes=2000, mode="on")
+    for i in range(20):
+        await service.generate_response([ChatMessage(role="user", content=f"Frage {i}")])
+    stats = service.completion_cache.stats()
+    assert stats["bytes"] <= 2000 and stats["entries"] < 20
+    print("  - Test 5: Size-bounded eviction - PASSED")
+
+    print("\n[OK] Completion cache tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,92 @@
+"""
+Test-Script für die token-budgetierte Conversation History.
+Läuft offline (kein API Call).
+"""
+
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.openai_service import ChatMessage
+from lib.ai.conversation_history import ConversationHistory, estimate_message_tokens
+
+
+def _tool_call_message(call_id: str) -> ChatMessage:
+    return ChatMessage(
+        role="assistant",
+        content="",
+        tool_calls=[{
+            "id": call_id,
+            "type": "function",
+            "function": {"name": "calculate_roi", "arguments": '{"investment_cost": 1000}'}
+        }]
+    )
+
+
+def run_tests():
+    """Führt alle Conversation History Tests aus."""
+
+    # Test 1: Inkrementelle Abrechnung
+    history = ConversationHistory()
+    messages = [
+        ChatMessage(role="system", content="System Prompt " * 10),
+        ChatMessage(role="user", content="Hallo"),
+        ChatMessage(role="assistant", content="Hallo! Wie kann ich helfen?"),
+    ]
+    history.extend(messages)
+    assert history.total_tokens == sum(estimate_message_tokens(m) for m in messages)
+    assert [m.role for m in history] == ["system", "user", "assistant"]
+    print("  - Test 1: Incremental token accounting - PASSED")
+
+    # Test 2: Verdrängung hält Budget ein, System Prompt bleibt
+    history = ConversationHistory(max_tokens=200)
+    history.append(ChatMessage(role="system", content="S" * 200))
+    for i in range(20):
+        history.append(ChatMessage(role="user", content=f"Frage {i} " + "x" * 100))
+        history.append(ChatMessage(role="assistant", content=f"Antwort {i} " + "y" * 100))
+    assert history.total_tokens <= 200
+    assert history[0].role == "system"
+    assert history.total_tokens == sum(estimate_message_tokens(m) for m in history)
+    assert history.evicted_messages > 0
+    print("  - Test 2: Eviction respects budget and keeps system prompt - PASSED")
+
+    # Test 3: tool_calls werden nie von tool-Antworten getrennt
+    history = ConversationHistory(max_tokens=150)
+    history.append(ChatMessage(role="system", content="System"))
+    for i in range(10):
+        history.append(ChatMessage(role="user", content=f"ROI {i}"))
+        history.append(_tool_call_message(f"call_{i}"))
+        history.append(ChatMessage(role="tool", content="r" * 120, tool_call_id=f"call_{i}", name="calculate_roi"))
+        history.append(ChatMessage(role="assistant", content="Fertig"))
+
+    seen_calls = set()
+    for message in history:
+        if message.tool_calls:
+            seen_calls.update(tc["id"] for tc in message.tool_calls)
+        if message.role == "tool":
+            assert message.tool_call_id in seen_calls, "tool message without its tool_calls"
+    non_system = [m for m in history if m.role != "system"]
+    assert non_system[0].role != "tool"
+    print("  - Test 3: Tool-call groups are evicted atomically - PASSED")
+
+    # Test 4: Aktueller Turn wird nie verdrängt
+    history = ConversationHistory(max_tokens=10)
+    history.append(ChatMessage(role="system", content="System"))
+    history.append(ChatMessage(role="user", content="u" * 400))
+    history.append(_tool_call_message("call_x"))
+    history.append(ChatMessage(role="tool", content="t" * 400, tool_call_id="call_x"))
+    assert [m.role for m in history] == ["system", "user", "assistant", "tool"]
+    print("  - Test 4: Current turn is never evicted - PASSED")
+
+    # Test 5: clear()
+    history.clear()
+    assert len(history) == 0 and history.total_tokens == 0 and history.evicted_messages == 0
+    print("  - Test 5: clear() resets history - PASSED")
+
+    print("\n[OK] Conversation History tests completed successfully!")
+
+
+if __name__ == "__main__":
+    run_tests()
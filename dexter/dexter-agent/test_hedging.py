@@ -0,0 +1,166 @@
+"""
+Test-Script für Hedged Requests ans Fallback-Modell.
+Primär- und Fallback-Modell antworten offline mit gesteuerter Mock-Latenz.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.admission import AdmissionController
+from lib.ai.error_handler import RateLimiter
+from lib.ai.hedging import LatencyHistogram, RequestHedger
+from lib.ai.openai_service import ChatMessage, OpenAIService, close_shared_async_clients
+from mock_openai_server import LatencyProfile, MockOpenAIServer, MockReply
+
+
+def make_service(server: MockOpenAIServer, hedger: RequestHedger) -> OpenAIService:
+    service = server.make_service()
+    service.model = "primary-model"
+    service.hedger = hedger
+    return service
+
+
+async def run_tests():
+    """Führt alle Hedging Tests aus."""
+
+    # Test 1: Histogramm-Perzentile mit ~10% Genauigkeit
+    histogram = LatencyHistogram()
+    for i in range(1, 101):
+        histogram.record(i / 1000)                # 1ms … 100ms
+    assert histogram.count == 100
+    assert 0.045 <= histogram.percentile(50) <= 0.056, histogram.percentile(50)
+    assert 0.090 <= histogram.percentile(95) <= 0.105, histogram.percentile(95)
+    assert LatencyHistogram().percentile(95) is None
+    print("  - Test 1: Latency histogram percentiles - PASSED")
+
+    # Test 2: Langsamer Primär-Request → Fallback gewinnt, Primär wird abgebrochen
+    slow_calls = {"primary": 0}
+
+    def responder(request):
+        if request["model"] == "primary-model":
+            slow_calls["primary"] += 1
+            # Jeder 5. Request hängt (Tail-Latenz)
+            delay = 1.0 if slow_calls["primary"] % 5 == 0 else 0.02
+            return MockReply(content="primary", latency=LatencyProfile("fixed", delay))
+        return MockReply(content="fallback", latency=LatencyProfile("fixed", 0.02))
+
+    async with MockOpenAIServer(responder) as server:
+        hedger = RequestHedger("fallback-model", percentile=75, max_hedge_ratio=0.5, min_samples=3)
+        service = make_service(server, hedger)
+        messages = [ChatMessage(role="user", content="Hallo")]
+
+        for _ in range(4):                        # Histogramm füllen
+            assert (await service.generate_response(messages)).content == "primary"
+
+        start = time.monotonic()
+        response = await service.generate_response(messages)   # 5. Request hängt
+        elapsed = time.monotonic() - start
+        assert response.content == "fallback", response.content
+        assert elapsed < 0.5, elapsed
+        stats = hedger.stats()
+        assert stats["hedged"] == 1 and stats["hedge_wins"] == 1 and stats["win_rate"] == 1.0
+        assert stats["latency_ms"]["fallback-model"]["count"] == 1
+        # Abgebrochener Primär-Request zählt nicht als (zu kurze) Latenz-Messung
+        assert stats["latency_ms"]["primary-model"]["count"] == 4
+    print("  - Test 2: Slow primary is hedged and fallback wins - PASSED")
+
+    # Test 3: Hedge-Budget begrenzt den Anteil gehedgter Requests
+    async with MockOpenAIServer(
+        lambda request: MockReply(content=request["model"]),
+        latency=LatencyProfile("uniform", 0.01, 0.02), seed=7
+    ) as server:
+        hedger = RequestHedger("fallback-model", percentile=50, max_hedge_ratio=0.1, min_samples=5)
+        service = make_service(server, hedger)
+        messages = [ChatMessage(role="user", content="Hallo")]
+        for _ in range(60):
+            await service.generate_response(messages)
+        stats = hedger.stats()
+        assert stats["hedged"] > 0
+        assert stats["hedge_rate"] <= 0.1, stats
+    print("  - Test 3: Hedge rate stays within the budget - PASSED")
+
+    # Test 4: Fehler eines Requests → der andere gewinnt; Abbruch bricht beide ab
+    async def call(model):
+        if model == "primary-model":
+            await asyncio.sleep(0.05)
+            raise RuntimeError("primary kaputt")
+        await asyncio.sleep(0.1)
+        return model
+
+    hedger = RequestHedger("fallback-model", percentile=50, max_hedge_ratio=1.0, min_samples=1)
+    hedger.histogram("primary-model").record(0.01)
+    assert await hedger.run(call, "primary-model") == "fallback-model"
+
+    started = []
+
+    async def hanging(model):
+        started.append(model)
+        await asyncio.sleep(10)
+
+    task = asyncio.create_task(hedger.run(hanging, "primary-model"))
+    await asyncio.sleep(0.1)
+    task.cancel()
+    try:
+        await task
+    except asyncio.CancelledError:
+        pass
+    await asyncio.sleep(0)
+    assert started == ["primary-model", "fallback-model"]
+    assert not [t for t in asyncio.all_tasks() if t is not asyncio.current_task()]
+    print("  - Test 4: Failed request falls back, cancellation cancels both - PASSED")
+
+    # Test 5: Hedge braucht eigenen Slot und eigenes Budget, jeder Request wird abgerechnet
+    def tail(request):
+        if request["model"] == "primary-model":
+            return MockReply(content="primary", latency=LatencyProfile("fixed", 0.3))
+        return MockReply(content="fallback", latency=LatencyProfile("fixed", 0.02))
+
+    async with MockOpenAIServer(tail) as server:
+        messages = [ChatMessage(role="user", content="Hallo")]
+
+        # Admission voll (Primär hält den einzigen Slot) → kein Hedge
+        hedger = RequestHedger("fallback-model", percentile=50, max_hedge_ratio=1.0, min_samples=1)
+        hedger.histogram("primary-model").record(0.01)
+        service = make_service(server, hedger)
+        service.rate_limiter = None
+        service.admission = AdmissionController(max_concurrent=1, max_queue=0)
+        assert (await service.generate_response(messages)).content == "primary"
+        assert hedger.stats()["hedged"] == 0 and hedger.stats()["hedges_skipped"] == 1
+        assert service.admission.in_flight == 0
+
+        # Freier Slot und Budget → Hedge mit eigenem Slot und eigener Reservierung
+        hedger = RequestHedger("fallback-model", percentile=50, max_hedge_ratio=1.0, min_samples=1)
+        hedger.histogram("primary-model").record(0.01)
+        service = make_service(server, hedger)
+        service.admission = AdmissionController(max_concurrent=2, max_queue=0)
+        service.rate_limiter = RateLimiter(max_requests=0, time_window=1e6, max_tokens=100000)
+        estimate = service._estimate_request_tokens(service._build_params(messages, None, None, None), None)
+        response = await service.generate_response(messages)
+        assert response.content == "fallback"
+        assert service.admission.in_flight == 0 and service.admission.stats()["admitted"] == 2
+        assert service.rate_limiter.stats()["acquired"] == 2
+        # Gewinner mit Usage, abgebrochener Primär-Request mit voller Schätzung
+        used = 100000 - service.rate_limiter.stats()["available_tokens"]
+        assert estimate + response.tokens_used - 1 <= used <= estimate + response.tokens_used + 1, used
+
+        # Kein Budget für den Hedge → kein Hedge
+        hedger = RequestHedger("fallback-model", percentile=50, max_hedge_ratio=1.0, min_samples=1)
+        hedger.histogram("primary-model").record(0.01)
+        service = make_service(server, hedger)
+        service.admission = None
+        service.rate_limiter = RateLimiter(max_requests=0, time_window=3600.0, max_tokens=estimate + 10)
+        assert (await service.generate_response(messages)).content == "primary"
+        assert hedger.stats()["hedges_skipped"] == 1
+    print("  - Test 5: Hedges use their own admission slot and rate-limit reservation - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Hedging tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
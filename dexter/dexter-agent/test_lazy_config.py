@@ -0,0 +1,103 @@
+"""
+Test-Script für die Lazy-Konfiguration und schnelle Tool-Imports.
+Jeder Test läuft in einem frischen Interpreter ohne OPENAI_API_KEY.
+"""
+
+import json
+import os
+import subprocess
+import sys
+import tempfile
+from pathlib import Path
+
+PROJECT_DIR = Path(__file__).parent
+
+
+def run_isolated(code: str, **env_overrides: str) -> dict:
+    """Führt Code in frischem Interpreter aus und liefert dessen JSON-Ausgabe"""
+    env = {key: value for key, value in os.environ.items() if key != "OPENAI_API_KEY"}
+    env.update(env_overrides)
+    completed = subprocess.run(
+        [sys.executable, "-c", code],
+        cwd=PROJECT_DIR, env=env, capture_output=True, text=True, check=False
+    )
+    assert completed.returncode == 0, completed.stderr
+    return json.loads(completed.stdout.strip().splitlines()[-1])
+
+
+def run_tests():
+    """Führt alle Lazy-Config Tests aus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        data_dir = Path(tmp) / "data"
+        reports_dir = Path(tmp) / "reports"
+        dirs = {"DATA_DIR": str(data_dir), "REPORTS_DIR": str(reports_dir)}
+
+        # Test 1: Tool-Import und -Aufruf ohne API Key, ohne numpy und ohne Verzeichnisse
+        result = run_isolated("""
+import asyncio, json, sys
+import config
+from tools.roi_calculator import calculate_roi
+resolved_on_import = config._config is not None
+output = asyncio.run(calculate_roi(investment_cost=50000, revenue_generated=72000, timeframe_months=12))
+print(json.dumps({
+    "resolved_on_import": resolved_on_import,
+    "resolved_on_call": config._config is not None,
+    "roi": output["result"]["roi_percentage"],
+    "heavy": [m for m in ("numpy", "openai", "dotenv") if m in sys.modules],
+}))
+""", **dirs)
+        assert result["resolved_on_import"] is False and result["resolved_on_call"] is True
+        assert result["roi"] == 44.0
+        assert result["heavy"] == ["dotenv"], result["heavy"]    # dotenv erst mit der Config
+        assert not data_dir.exists() and not reports_dir.exists()
+        print("  - Test 1: Tool runs without API key, numpy or directories - PASSED")
+
+        # Test 2: API Key wird erst beim Zugriff verlangt, Verzeichnisse bei Bedarf angelegt
+        result = run_isolated("""
+import json
+from config import config, get_config
+try:
+    config.api_key
+    error = None
+except ValueError as e:
+    error = str(e)
+path = config.get_report_file("x.md")
+print(json.dumps({"error": error, "same": get_config() is get_config(), "path": str(path)}))
+""", **dirs)
+        if not (PROJECT_DIR / ".env").exists():     # lokale .env liefert ggf. einen Key
+            assert result["error"] and "OPENAI_API_KEY" in result["error"]
+        assert result["same"] and result["path"] == str(reports_dir / "x.md")
+        assert data_dir.is_dir() and reports_dir.is_dir()
+        print("  - Test 2: API key required on access, directories created on demand - PASSED")
+
+        # Test 3: Ungültiger Key fällt weiterhin bei der Validierung auf
+        result = run_isolated("""
+import json
+from config import config
+try:
+    config.model
+    error = None
+except ValueError as e:
+    error = str(e)
+print(json.dumps({"error": error}))
+""", OPENAI_API_KEY="invalid", **dirs)
+        assert result["error"] and "sk-" in result["error"]
+        print("  - Test 3: Invalid API key still fails validation - PASSED")
+
+    # Test 4: Forecaster lädt numpy erst beim ersten Forecast
+    result = run_isolated("""
+import asyncio, json, sys
+from tools import forecast_sales
+before = "numpy" in sys.modules
+sales = [{"date": f"2024-{m:02d}", "amount": 1000 + m * 50} for m in range(1, 7)]
+output = asyncio.run(forecast_sales(sales, forecast_months=2))
+print(json.dumps({"before": before, "after": "numpy" in sys.modules, "ok": "result" in output}))
+""")
+    assert result == {"before": False, "after": True, "ok": True}, result
+    print("  - Test 4: numpy is imported on first forecast - PASSED")
+
+    print("\n[OK] Lazy config tests completed successfully!")
+
+
+if __name__ == "__main__":
+    run_tests()
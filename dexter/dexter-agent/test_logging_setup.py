@@ -0,0 +1,92 @@
+"""
+Test-Script für das nicht-blockierende Logging (Queue, JSON Lines,
+Kürzung, DEBUG-Sampling, verzögerter Handler-Start).
+Läuft offline, ohne API Call.
+"""
+
+import json
+import logging
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from config import LoggingConfig
+from lib.logging_setup import LOG_FILE_NAME, configure_logging, shutdown_logging
+
+
+def read_lines(path: Path):
+    return [json.loads(line) for line in path.read_text(encoding="utf-8").splitlines()]
+
+
+def run_tests():
+    """Führt alle Logging Tests aus."""
+    root = logging.getLogger()
+    saved_handlers, saved_level = root.handlers[:], root.level
+    logger = logging.getLogger("dexter.test")
+
+    try:
+        with tempfile.TemporaryDirectory() as tmp:
+            log_dir = Path(tmp) / "logs"
+            settings = LoggingConfig(
+                level="DEBUG", json_format=True, log_dir=str(log_dir), console_enabled=False,
+                max_message_chars=200, debug_sample_rate=0.25
+            )
+
+            # Test 1: Handler-Setup ist verzögert - keine Datei, kein Thread vor dem ersten Record
+            threads_before = threading.active_count()
+            handler = configure_logging(settings, force=True)
+            assert handler is not None and handler.listener is None
+            assert not log_dir.exists()
+            assert configure_logging(settings) is None          # bereits konfiguriert
+            print("  - Test 1: Handlers and log file are created lazily - PASSED")
+
+            # Test 2: Emit blockiert nicht, JSON Lines inkl. extra-Feldern und Exceptions
+            start = time.perf_counter()
+            for i in range(1000):
+                logger.info("Record %d", i, extra={"session_id": "s-1"})
+            per_record_us = (time.perf_counter() - start) / 1000 * 1e6
+            try:
+                raise ValueError("kaputt")
+            except ValueError:
+                logger.error("Fehler im Tool", exc_info=True)
+            assert handler.listener is not None and threading.active_count() == threads_before + 1
+            shutdown_logging()
+
+            records = read_lines(log_dir / LOG_FILE_NAME)
+            assert records[0]["message"] == "Record 0" and records[0]["session_id"] == "s-1"
+            assert records[0]["level"] == "INFO" and records[0]["logger"] == "dexter.test"
+            assert len(records) == 1001
+            assert "ValueError: kaputt" in records[-1]["exc"]
+            assert per_record_us < 200, per_record_us
+            print(f"  - Test 2: Queued JSON lines ({per_record_us:.1f}µs/record on the caller) - PASSED")
+
+            # Test 3: Große Payloads werden gekürzt, DEBUG wird gesampelt
+            (log_dir / LOG_FILE_NAME).unlink()
+            handler = configure_logging(settings, force=True)
+            logger.info("Tool Input: %s", {"rows": ["x" * 50] * 100})
+            for i in range(100):
+                logger.debug("debug %d", i)
+            shutdown_logging()
+
+            records = read_lines(log_dir / LOG_FILE_NAME)
+            assert len(records[0]["message"]) < 260 and "Zeichen]" in records[0]["message"]
+            debug_records = [record for record in records if record["level"] == "DEBUG"]
+            assert len(debug_records) == 25, len(debug_records)
+            print("  - Test 3: Payload truncation and debug sampling - PASSED")
+
+    finally:
+        shutdown_logging()
+        for handler in saved_handlers:
+            root.addHandler(handler)
+        root.setLevel(saved_level)
+
+    print("\n[OK] Logging setup tests completed successfully!")
+
+
+if __name__ == "__main__":
+    run_tests()
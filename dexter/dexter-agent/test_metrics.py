@@ -0,0 +1,110 @@
+"""
+Test-Script für die Performance-Telemetrie (Tokens, Model-Latenz, Tool-Laufzeiten).
+Usage und Latenzen stammen offline aus den Mock-Responses.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.metrics import AgentMetrics, MetricsRegistry
+from lib.ai.openai_service import close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import MockOpenAIServer, MockReply, MockToolCall, scripted_responder
+
+_ROI = MockToolCall("calculate_roi", {
+    "investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12
+})
+_BREAK_EVEN = MockToolCall("analyze_break_even", {
+    "fixed_costs": 25000, "variable_cost_per_unit": 12.5,
+    "selling_price_per_unit": 39.9, "current_sales_units": 1400
+})
+
+
+def make_agent(server: MockOpenAIServer, stream: bool) -> DexterAgent:
+    service = server.make_service()
+    agent = DexterAgent(openai_service=service, stream=stream)
+    agent.tool_cache = None
+    agent.metrics = AgentMetrics()
+    agent.retry_policy.base_delay = 0.01
+    return agent
+
+
+async def run_tests():
+    """Führt alle Metrik Tests aus."""
+
+    # Test 1: Prometheus Text-Format und JSON-Export
+    registry = MetricsRegistry()
+    requests = registry.counter("demo_requests_total", "Requests", ("route",))
+    latency = registry.histogram("demo_latency_seconds", "Latenz", buckets=(0.1, 1.0))
+    requests.inc(route="/a")
+    requests.inc(2, route='/b"x')
+    for value in (0.05, 0.5, 0.7, 3.0):
+        latency.observe(value)
+    text = registry.to_prometheus()
+    assert "# TYPE demo_requests_total counter" in text
+    assert 'demo_requests_total{route="/b\\"x"} 2' in text
+    assert 'demo_latency_seconds_bucket{le="0.1"} 1' in text
+    assert 'demo_latency_seconds_bucket{le="1"} 3' in text
+    assert 'demo_latency_seconds_bucket{le="+Inf"} 4' in text
+    assert "demo_latency_seconds_count 4" in text
+    data = json.loads(json.dumps(registry.to_dict()))
+    assert data["demo_requests_total"] == {"/a": 1, '/b"x': 2}
+    assert data["demo_latency_seconds"]["all"]["count"] == 4
+    assert 0.1 <= data["demo_latency_seconds"]["all"]["p50"] <= 1.0
+    print("  - Test 1: Prometheus and JSON export - PASSED")
+
+    # Test 2: Turn mit zwei Tool-Runden → Iterationen, Tokens, Tool-Zeiten
+    responder = scripted_responder([[_ROI, _BREAK_EVEN], [_ROI]], "Fertig.")
+    async with MockOpenAIServer(responder) as server:
+        for stream in (False, True):
+            agent = make_agent(server, stream)
+            chunks = [chunk async for chunk in agent.chat("Analyse bitte")]
+            assert "Fertig." in "".join(chunks)
+
+            turn = agent.session_metrics.last_turn
+            assert turn.iterations == 3 and turn.model_calls == 3 and turn.retries == 0
+            assert turn.prompt_tokens > 0 and turn.completion_tokens > 0
+            assert turn.tool_calls == {"calculate_roi": 2, "analyze_break_even": 1}
+            assert all(seconds > 0 for seconds in turn.tool_seconds.values())
+            assert len(turn.model_latencies) == 3 and turn.duration_seconds >= turn.model_seconds
+
+            metrics = agent.metrics
+            assert metrics.turns.value() == 1
+            assert metrics.tool_calls.value(tool="calculate_roi", outcome="ok") == 2
+            assert metrics.tokens.value(model=agent.model, kind="prompt") == turn.prompt_tokens
+            assert 'dexter_tool_duration_seconds_count{tool="calculate_roi"} 2' in metrics.to_prometheus()
+    print("  - Test 2: Per-turn tokens, iterations and tool timings (stream + non-stream) - PASSED")
+
+    # Test 3: Retries und Fehler werden gezählt, Session summiert Turns
+    calls = {"count": 0}
+
+    def flaky(request):
+        calls["count"] += 1
+        if calls["count"] == 1:
+            return MockReply(error_status=503)
+        return MockReply(content="ok")
+
+    async with MockOpenAIServer(flaky) as server:
+        agent = make_agent(server, stream=False)
+        [chunk async for chunk in agent.chat("Hallo")]
+        [chunk async for chunk in agent.chat("Nochmal")]
+        session = agent.session_metrics.to_dict()
+        assert session["turns"] == 2
+        assert session["model_calls"] == 3 and session["model_errors"] == 1 and session["retries"] == 1
+        assert session["last_turn"]["retries"] == 0
+        assert agent.metrics.retries.value() == 1
+        assert agent.metrics.model_calls.value(model=agent.model, outcome="error") == 1
+        json.dumps(session)
+    print("  - Test 3: Retries and errors are counted per session - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Metrics tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
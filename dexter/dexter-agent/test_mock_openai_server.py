@@ -0,0 +1,61 @@
+"""
+Test-Script für den lokalen Mock OpenAI Server.
+Läuft offline: DexterAgent spricht über den echten HTTP-Client mit dem Mock.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.openai_service import ChatMessage, close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import MockOpenAIServer, MockReply, MockToolCall, scripted_responder
+
+
+async def run_tests():
+    """Führt alle Mock-Server Tests aus."""
+
+    responder = scripted_responder(
+        [[MockToolCall("calculate_roi", {"investment_cost": 1000, "revenue_generated": 1500, "timeframe_months": 12})]],
+        "ROI beträgt 50%."
+    )
+
+    async with MockOpenAIServer(responder) as server:
+        service = server.make_service()
+
+        # Test 1: Multi-Tool Conversation (non-streaming)
+        agent = DexterAgent(openai_service=service, stream=False)
+        chunks = [chunk async for chunk in agent.chat("Berechne den ROI")]
+        assert any("calculate_roi" in chunk for chunk in chunks)
+        assert chunks[-1] == "ROI beträgt 50%."
+        assert server.requests == 2
+        print("  - Test 1: Tool-call conversation via mock server - PASSED")
+
+        # Test 2: Streaming liefert Text-Deltas und setzt Tool-Calls zusammen
+        agent = DexterAgent(openai_service=service, stream=True)
+        chunks = [chunk async for chunk in agent.chat("Berechne den ROI")]
+        assert "".join(chunks).endswith("ROI beträgt 50%.")
+        tool_messages = [m for m in agent.conversation_history if m.role == "tool"]
+        assert len(tool_messages) == 1 and "roi_percentage" in tool_messages[0].content
+        print("  - Test 2: Streaming with tool-call deltas - PASSED")
+
+    # Test 3: Fehler-Injection liefert HTTP-Status an den Client
+    async with MockOpenAIServer(lambda request: MockReply(error_status=503, retry_after=1)) as server:
+        service = server.make_service(max_retries=0)
+        try:
+            await service.generate_response([ChatMessage(role="user", content="Hallo")])
+            raise AssertionError("Fehler erwartet")
+        except Exception as e:
+            assert "503" in str(e)
+        assert server.injected_errors == 1
+        print("  - Test 3: Error injection - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Mock OpenAI server tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
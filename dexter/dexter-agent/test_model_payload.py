@@ -0,0 +1,107 @@
+"""
+Test-Script für den kompakten, model-facing Payload der Tool-Ergebnisse.
+Läuft offline, ohne API Call.
+"""
+
+import asyncio
+import json
+import math
+import os
+import sys
+from dataclasses import dataclass
+from pathlib import Path
+from typing import List
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from config import AgentConfig, DexterConfig
+from lib.ai.tool_registry import build_model_payload, get_tool_registry
+
+_HISTORY = [{"date": f"2024-{month:02d}", "amount": 1000 + month * 100} for month in range(1, 7)]
+
+
+@dataclass
+class Period:
+    label: str
+    values: List[float]
+
+
+async def run_tests():
+    """Führt alle Model-Payload Tests aus."""
+    registry = get_tool_registry()
+
+    # Test 1: Default-Felder pro Tool, formatted_output geht nicht ans Modell
+    roi = await registry.execute(
+        "calculate_roi", {"investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12}
+    )
+    payload = registry.model_payload("calculate_roi", roi)
+    assert "formatted_output" not in payload and "success" not in payload
+    assert set(payload) == set(registry.get("calculate_roi").payload_fields) & set(roi["result"])
+    assert payload["roi_percentage"] == 44.0
+    assert len(json.dumps(payload)) < len(json.dumps(roi, default=str)) / 2
+    print("  - Test 1: Per-tool default fields, no formatted_output - PASSED")
+
+    # Test 2: Allow-List überschreibt die Default-Felder, unbekannte Felder werden ignoriert
+    payload = registry.model_payload("calculate_roi", roi, ["net_profit", "gibt_es_nicht"])
+    assert payload == {"net_profit": 22000.0}
+    assert registry.model_payload("calculate_roi", roi, []) == {}
+    assert registry.model_payload("unbekanntes_tool", {"result": {"a": 1, "b": 2}}) == {"a": 1, "b": 2}
+    print("  - Test 2: Field allow-list overrides the tool defaults - PASSED")
+
+    # Test 3: Verschachtelte Ergebnisse bleiben erhalten und sind JSON-serialisierbar
+    forecast = await registry.execute("forecast_sales", {"historical_sales": _HISTORY, "forecast_months": 3})
+    payload = registry.model_payload("forecast_sales", forecast, ["forecasts", "trend_direction"])
+    assert list(payload) == ["forecasts", "trend_direction"]
+    assert len(payload["forecasts"]) == 3 and payload["forecasts"][0]["date"] == "2024-07"
+
+    nested = build_model_payload({
+        "result": {"period": Period("Q1", [1.0, math.inf]), "ratios": (math.nan, 2.5), "meta": {"x": -math.inf}},
+        "formatted_output": "# Report",
+    })
+    assert nested == {"period": {"label": "Q1", "values": [1.0, None]}, "ratios": [None, 2.5], "meta": {"x": None}}
+    json.dumps(nested, allow_nan=False)
+
+    # Ergebnis ohne result-Dict: alles außer formatted_output
+    assert build_model_payload({"value": 3, "formatted_output": "# Report"}) == {"value": 3}
+    assert build_model_payload({"result": Period("Q2", [2.0])}, ["label"]) == {"label": "Q2"}
+    print("  - Test 3: Nested results are converted to plain JSON - PASSED")
+
+    # Test 4: Fehler werden unverändert (ohne weitere Felder) durchgereicht
+    error = {"error": "Ungültige Eingabe", "tool_name": "calculate_roi", "details": {"x": 1}}
+    assert registry.model_payload("calculate_roi", error) == {"error": "Ungültige Eingabe", "tool_name": "calculate_roi"}
+    assert build_model_payload({"error": "kaputt"}, ["roi_percentage"]) == {"error": "kaputt"}
+    print("  - Test 4: Errors pass through - PASSED")
+
+    # Test 5: TOOL_PAYLOAD_FIELDS aus der Umgebung
+    previous = os.environ.get("TOOL_PAYLOAD_FIELDS")
+    try:
+        os.environ["TOOL_PAYLOAD_FIELDS"] = '{"forecast_sales": ["forecast_average", "warnings"]}'
+        assert DexterConfig().agent.tool_payload_fields == {"forecast_sales": ["forecast_average", "warnings"]}
+
+        os.environ.pop("TOOL_PAYLOAD_FIELDS")
+        assert DexterConfig().agent.tool_payload_fields == {}
+
+        for value in ('{"forecast_sales": "warnings"}', '["warnings"]', '{"forecast_sales": [1]}', "{kein json"):
+            os.environ["TOOL_PAYLOAD_FIELDS"] = value
+            try:
+                DexterConfig()
+                raise AssertionError(f"ValueError erwartet für {value}")
+            except ValueError:
+                pass
+    finally:
+        if previous is None:
+            os.environ.pop("TOOL_PAYLOAD_FIELDS", None)
+        else:
+            os.environ["TOOL_PAYLOAD_FIELDS"] = previous
+
+    fields = AgentConfig(tool_payload_fields={"forecast_sales": ["forecast_average"]}).tool_payload_fields
+    payload = registry.model_payload("forecast_sales", forecast, fields.get("forecast_sales"))
+    assert payload == {"forecast_average": forecast["result"]["forecast_average"]}
+    print("  - Test 5: TOOL_PAYLOAD_FIELDS is parsed and validated - PASSED")
+
+    print("\n[OK] Model payload tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
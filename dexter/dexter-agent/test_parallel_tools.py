@@ -0,0 +1,118 @@
+"""
+Test-Script für die parallele Ausführung der Tool-Calls einer Model-Response.
+Tools sind verzögerte Fakes, Model-Calls laufen offline gegen den Mock.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from config import AgentConfig
+from lib.ai.openai_service import close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import MockOpenAIServer, MockToolCall, scripted_responder
+
+# Laufzeit der Fake-Tools: das erste Tool ist am langsamsten
+_DELAYS = {"calculate_roi": 0.06, "analyze_break_even": 0.03, "calculate_pnl": 0.0}
+
+
+def make_agent(server: MockOpenAIServer, max_concurrent_tools: int = 4) -> DexterAgent:
+    service = server.make_service()
+    agent = DexterAgent(openai_service=service, parallel_tool_calls=True, max_concurrent_tools=max_concurrent_tools)
+    agent.tool_cache = None
+    return agent
+
+
+class FakeTools:
+    """Ersetzt _execute_tool: verzögert pro Tool-Name und misst die Parallelität"""
+
+    def __init__(self):
+        self.active = 0
+        self.max_active = 0
+        self.started = []
+        self.cancelled = []
+
+    async def __call__(self, tool_name, tool_input):
+        self.active += 1
+        self.max_active = max(self.max_active, self.active)
+        self.started.append(tool_input.get("n", tool_name))
+        try:
+            await asyncio.sleep(tool_input.get("delay", _DELAYS.get(tool_name, 0.0)))
+            return {"tool": tool_name, "n": tool_input.get("n")}
+        except asyncio.CancelledError:
+            self.cancelled.append(tool_input.get("n", tool_name))
+            raise
+        finally:
+            self.active -= 1
+
+
+async def run_tests():
+    """Führt alle Tests der parallelen Tool-Ausführung aus."""
+
+    async with MockOpenAIServer(scripted_responder([], "Fertig.")) as server:
+
+        # Test 1: max_concurrent_tools begrenzt die Parallelität, Ergebnisse in Fertigstellungs-Reihenfolge
+        agent = make_agent(server, max_concurrent_tools=2)
+        fake = FakeTools()
+        agent._execute_tool = fake
+        calls = [(f"call_{n}", "tool", {"n": n, "delay": 0.05 - n * 0.01}) for n in range(5)]
+        results = [item async for item in agent._run_tool_calls(calls)]
+        assert fake.max_active == 2, fake.max_active
+        assert sorted(index for index, _ in results) == list(range(5))
+        assert all(result["n"] == index for index, result in results)
+        assert [index for index, _ in results][:2] == [1, 0]
+        print("  - Test 1: Concurrency is bounded by max_concurrent_tools - PASSED")
+
+        # Test 2: Consumer bricht ab → laufende und wartende Tools werden abgebrochen
+        agent = make_agent(server, max_concurrent_tools=2)
+        fake = FakeTools()
+        agent._execute_tool = fake
+        calls = [(f"call_{n}", "tool", {"n": n, "delay": 0.01 if n == 0 else 1.0}) for n in range(4)]
+        iterator = agent._run_tool_calls(calls)
+        index, _ = await iterator.__anext__()
+        assert index == 0
+        await iterator.aclose()
+        await asyncio.sleep(0.01)
+        assert fake.active == 0 and 1 in fake.cancelled
+        assert 3 not in fake.started
+        print("  - Test 2: Stopping the consumer cancels remaining tools - PASSED")
+
+    # Test 3: Tool-Antworten in der History folgen der tool_call_id-Reihenfolge
+    responder = scripted_responder(
+        [[MockToolCall("calculate_roi"), MockToolCall("analyze_break_even"), MockToolCall("calculate_pnl")]],
+        "Fertig."
+    )
+    async with MockOpenAIServer(responder) as server:
+        agent = make_agent(server)
+        fake = FakeTools()
+        agent._execute_tool = fake
+        chunks = [chunk async for chunk in agent.chat("Analyse bitte")]
+        assert "Fertig." in "".join(chunks)
+
+        messages = agent.conversation_history.messages
+        assistant = next(message for message in messages if message.tool_calls)
+        tool_messages = [message for message in messages if message.role == "tool"]
+        assert [message.tool_call_id for message in tool_messages] == [call["id"] for call in assistant.tool_calls]
+        assert [message.name for message in tool_messages] == ["calculate_roi", "analyze_break_even", "calculate_pnl"]
+        assert fake.max_active == 3
+    print("  - Test 3: Tool results keep the tool_call_id order - PASSED")
+
+    # Test 4: Nicht-positive Parallelität wird früh abgewiesen
+    for value in (0, -1):
+        for factory in (lambda: DexterAgent(max_concurrent_tools=value), lambda: AgentConfig(max_concurrent_tools=value)):
+            try:
+                factory()
+                raise AssertionError(f"ValueError erwartet für {value}")
+            except ValueError as e:
+                assert "max_concurrent_tools" in str(e)
+    print("  - Test 4: Non-positive max_concurrent_tools is rejected - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Parallel tool tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,110 @@
+"""
+Test-Script für den Token-Bucket Rate Limiter (RPM + TPM).
+Läuft offline, ohne API Call.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.error_handler import RateLimiter
+from lib.ai.openai_service import ChatMessage, close_shared_async_clients
+from mock_openai_server import LatencyProfile, MockOpenAIServer, MockReply
+
+
+async def run_tests():
+    """Führt alle Rate Limiter Tests aus."""
+
+    # Test 1: Burst bis zur Kapazität ohne Wartezeit, danach gleichmäßiger Refill
+    limiter = RateLimiter(max_requests=5, time_window=0.5)
+    start = time.monotonic()
+    await asyncio.gather(*(limiter.acquire() for _ in range(10)))
+    elapsed = time.monotonic() - start
+    # 5 sofort, 5 weitere mit 10 Requests/s → ~0.5s
+    assert 0.4 <= elapsed < 0.8, elapsed
+    assert limiter.stats()["throttled"] >= 1
+    print("  - Test 1: Concurrent burst is throttled to the request budget - PASSED")
+
+    # Test 2: FIFO-Fairness - Reihenfolge der Freigabe = Reihenfolge des Wartens
+    limiter = RateLimiter(max_requests=1, time_window=0.05)
+    order = []
+
+    async def request(i):
+        await limiter.acquire()
+        order.append(i)
+
+    tasks = []
+    for i in range(8):
+        tasks.append(asyncio.create_task(request(i)))
+        await asyncio.sleep(0)
+    await asyncio.gather(*tasks)
+    assert order == list(range(8)), order
+    print("  - Test 2: Waiters are served in FIFO order - PASSED")
+
+    # Test 3: Token-Budget mit Reservierung und Abrechnung
+    limiter = RateLimiter(max_requests=0, time_window=1.0, max_tokens=1000)
+    reservation = await limiter.acquire(tokens=800)
+    assert limiter.stats()["available_tokens"] <= 200
+    limiter.settle(reservation, actual_tokens=300)       # 500 Tokens zurück
+    assert limiter.stats()["available_tokens"] >= 700
+    limiter.settle(reservation, actual_tokens=0)         # Doppelte Abrechnung ignoriert
+    assert limiter.stats()["available_tokens"] < 1000
+    print("  - Test 3: Reserved tokens are settled from usage - PASSED")
+
+    # Test 4: Fehlgeschlagene Requests geben Tokens zurück, große Requests blockieren nicht ewig
+    limiter = RateLimiter(max_requests=0, time_window=0.2, max_tokens=100)
+    reservation = await limiter.acquire(tokens=100)
+    limiter.release(reservation)
+    assert limiter.stats()["available_tokens"] == 100
+    start = time.monotonic()
+    await limiter.acquire(tokens=5000)                   # > Kapazität → volle Kapazität genügt
+    assert time.monotonic() - start < 0.1
+    print("  - Test 4: Release and oversize requests - PASSED")
+
+    # Test 5: Wartezeit-Statistiken
+    stats = RateLimiter(max_requests=2, time_window=0.1)
+    for _ in range(6):
+        await stats.acquire()
+    result = stats.stats()
+    assert result["acquired"] == 6 and result["waiting"] == 0
+    assert result["wait_max_ms"] >= result["wait_p95_ms"] >= result["wait_p50_ms"] >= 0
+    assert result["wait_max_ms"] > 0
+    print("  - Test 5: Wait-time statistics - PASSED")
+
+    # Test 6: Abgebrochene Calls (Deadline, aclose() mitten im Stream) geben die Reservierung zurück
+    async with MockOpenAIServer(
+        lambda request: MockReply(content="Eins zwei drei vier", latency=LatencyProfile("fixed", 0.05))
+    ) as server:
+        service = server.make_service()
+        service.hedger = None
+        service.admission = None
+        service.rate_limiter = RateLimiter(max_requests=0, time_window=3600.0, max_tokens=100000)
+        messages = [ChatMessage(role="user", content="Hallo")]
+
+        try:
+            async with asyncio.timeout(0.01):
+                await service.generate_response(messages)
+        except TimeoutError:
+            pass
+        assert service.rate_limiter.stats()["available_tokens"] == 100000
+
+        events = service.generate_response_events(messages)
+        event = await events.__anext__()
+        assert event.type == "content"
+        await events.aclose()
+        assert service.rate_limiter.stats()["available_tokens"] == 100000
+
+        await service.generate_response(messages)
+        assert 0 < 100000 - service.rate_limiter.stats()["available_tokens"] < 1000
+    await close_shared_async_clients()
+    print("  - Test 6: Cancelled and closed calls release their reservation - PASSED")
+
+    print("\n[OK] Rate limiter tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
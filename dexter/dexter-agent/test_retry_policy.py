@@ -0,0 +1,134 @@
+"""
+Test-Script für Retry-Policy, Circuit Breaker und Turn-Deadline.
+Fehler und Retry-After Header werden offline vom Mock injiziert.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.error_handler import (
+    CircuitBreaker,
+    CircuitOpenError,
+    Deadline,
+    InvalidRequestError,
+    RateLimitError,
+    RetryPolicy,
+    ServiceUnavailableError,
+    classify_error,
+    with_retry,
+)
+from lib.ai.openai_service import ChatMessage, close_shared_async_clients
+from main import DexterAgent
+from mock_openai_server import LatencyProfile, MockOpenAIServer, MockReply
+
+
+async def sdk_error(status: int, retry_after=None) -> Exception:
+    """Echte SDK-Exception (verpackt in OpenAIServiceError) vom Mock-Server"""
+    async with MockOpenAIServer(lambda request: MockReply(error_status=status, retry_after=retry_after)) as server:
+        try:
+            await server.make_service().generate_response([ChatMessage(role="user", content="Hallo")])
+        except Exception as e:
+            return e
+    raise AssertionError("Fehler erwartet")
+
+
+async def run_tests():
+    """Führt alle Retry-Tests aus."""
+
+    # Test 1: Klassifizierung über SDK-Exceptions und HTTP-Status
+    error = classify_error(await sdk_error(429, retry_after=0.2))
+    assert isinstance(error, RateLimitError) and error.retry_after == 0.2
+    error = classify_error(await sdk_error(502))
+    assert isinstance(error, ServiceUnavailableError) and error.status_code == 502 and error.retryable
+    error = classify_error(await sdk_error(400))
+    assert isinstance(error, InvalidRequestError) and not error.retryable
+    assert not classify_error(ValueError("kaputt")).retryable
+    print("  - Test 1: Typed classification with Retry-After - PASSED")
+
+    # Test 2: Full-Jitter Backoff
+    policy = RetryPolicy(base_delay=1.0, max_delay=4.0)
+    delays = [policy.compute_delay(3, ServiceUnavailableError()) for _ in range(200)]
+    assert all(0 <= delay <= 4.0 for delay in delays)
+    assert len(set(delays)) > 100
+    assert policy.compute_delay(0, RateLimitError("429", retry_after=120)) == policy.max_retry_after
+    print("  - Test 2: Full-jitter backoff and capped Retry-After - PASSED")
+
+    # Test 3: Retries bis zum Erfolg
+    attempts = {"count": 0}
+
+    def flaky(request):
+        attempts["count"] += 1
+        return MockReply(error_status=503) if attempts["count"] <= 2 else MockReply(content="ok")
+
+    async with MockOpenAIServer(flaky) as server:
+        service = server.make_service()
+        response = await with_retry(
+            service.generate_response,
+            messages=[ChatMessage(role="user", content="Hallo")],
+            policy=RetryPolicy(max_retries=3, base_delay=0.01, max_delay=0.05)
+        )
+        assert response.content == "ok" and attempts["count"] == 3
+    print("  - Test 3: Retryable errors are retried - PASSED")
+
+    # Test 4: Circuit Breaker öffnet, lehnt ab, schließt nach erfolgreicher Probe
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=0.1)
+    breaker.record_failure(ServiceUnavailableError())
+    breaker.record_failure(InvalidRequestError("400"))          # 4xx zählt nicht
+    breaker.record_failure(ServiceUnavailableError())
+    assert breaker.state == "closed"
+    breaker.record_failure(ServiceUnavailableError())
+    assert breaker.state == "open"
+    try:
+        breaker.before_call()
+        raise AssertionError("CircuitOpenError erwartet")
+    except CircuitOpenError:
+        pass
+    await asyncio.sleep(0.12)
+    breaker.before_call()                                       # Probe erlaubt
+    try:
+        breaker.before_call()                                   # nur eine Probe gleichzeitig
+        raise AssertionError("CircuitOpenError erwartet")
+    except CircuitOpenError:
+        pass
+    breaker.record_success()
+    assert breaker.state == "closed"
+    print("  - Test 4: Circuit breaker open/half-open/closed - PASSED")
+
+    # Test 5: Retry-After jenseits der Deadline → sofort aufgeben
+    async with MockOpenAIServer(lambda request: MockReply(error_status=429, retry_after=5)) as server:
+        service = server.make_service()
+        start = time.monotonic()
+        try:
+            await with_retry(
+                service.generate_response,
+                messages=[ChatMessage(role="user", content="Hallo")],
+                policy=RetryPolicy(max_retries=3),
+                deadline=Deadline(1.0)
+            )
+            raise AssertionError("RateLimitError erwartet")
+        except RateLimitError:
+            pass
+        assert time.monotonic() - start < 0.5 and server.requests == 1
+    print("  - Test 5: Retries never sleep past the deadline - PASSED")
+
+    # Test 6: Turn-Deadline bricht langsamen Model-Call ab
+    async with MockOpenAIServer(latency=LatencyProfile("fixed", 2.0)) as server:
+        agent = DexterAgent(openai_service=server.make_service())
+        agent.turn_deadline_seconds = 0.3
+        start = time.monotonic()
+        chunks = [chunk async for chunk in agent.chat("Hallo")]
+        assert time.monotonic() - start < 1.0
+        assert "Zeitbudget" in "".join(chunks)
+    print("  - Test 6: Turn deadline aborts slow model calls - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Retry policy tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
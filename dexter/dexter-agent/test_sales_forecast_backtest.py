@@ -0,0 +1,90 @@
+"""
+Test-Script für den Rolling-Origin-Backtest des Sales Forecasters.
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+# Füge tools zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from tools.sales_forecast_backtest import backtest_columns, backtest_sales
+from tools.sales_forecaster import forecast_sales, sales_columns
+from test_sales_forecast_batch import make_catalogue
+
+
+async def run_tests():
+    """Führt alle Backtest Tests aus."""
+    history = make_catalogue(1, seed=7)["SKU-00000"]
+    dates, amounts = sales_columns(history)
+
+    # Test 1: Strided Windows liefern dieselben Prognosen wie ein Refit pro Origin
+    for method, window, include_seasonality in (
+        ("linear", "expanding", True), ("double", "expanding", False),
+        ("triple", "expanding", False), ("linear", "rolling", False),
+    ):
+        report = backtest_columns(dates, amounts, 4, (method,), window, 18, include_seasonality)
+        item = report.metrics[0]
+        errors, origins = [], range(max(18, len(history) - 24), len(history))
+        for origin in origins:
+            start = origin - 18 if window == "rolling" else 0
+            output = await forecast_sales(history[start:origin], 4, include_seasonality, render=False, method=method)
+            if "error" in output:       # Holt-Winters erst ab 24 Trainingspunkten
+                continue
+            predicted = np.array([f["predicted_amount"] for f in output["result"]["forecasts"]])
+            actual = amounts[origin:origin + 4]
+            errors.append(np.abs(actual - predicted[:len(actual)]) / actual * 100)
+        expected = np.concatenate(errors).mean()
+        assert abs(item.mape - expected) < 0.01, (method, window, item.mape, expected)
+        assert item.origins == len(errors)
+    print("  - Test 1: Vectorized windows match per-origin refits - PASSED")
+
+    # Test 2: Kennzahlen von Hand nachgerechnet
+    days = np.arange("2024-01", "2024-07", dtype="datetime64[M]").astype("datetime64[D]")
+    exact = backtest_columns(days, np.array([10.0, 20, 30, 40, 50, 60]), 2, ("linear",), min_train=3)
+    assert exact.metrics[0].mape == 0 and exact.metrics[0].rmse == 0 and exact.metrics[0].coverage == 100
+    # Ein Origin, ein Schritt: Prognose 60, Ist 100, Intervall 60 ± 1.96 * 14.14 * 1.1
+    jump = backtest_columns(days, np.array([10.0, 20, 30, 40, 50, 100]), 1, ("linear",), min_train=5)
+    item = jump.metrics[0]
+    assert (item.origins, item.mape, item.smape, item.rmse, item.coverage) == (1, 40.0, 50.0, 40.0, 0.0)
+    assert item.mape_by_horizon == [40.0]
+    print("  - Test 2: MAPE, sMAPE, RMSE and coverage by hand - PASSED")
+
+    # Test 3: Methodenvergleich - Holt-Winters gewinnt bei klarer Saison auf gemeinsamen Origins
+    report = backtest_columns(dates, amounts, 6, min_train=12)
+    assert [item.method for item in report.metrics] == ["linear", "simple", "double", "triple"]
+    assert report.metrics[3].origins == 12 and report.metrics[0].origins == 24
+    assert report.best_method == "triple"
+    assert all(0 <= item.coverage <= 100 for item in report.metrics)
+    print("  - Test 3: Side-by-side comparison on common origins - PASSED")
+
+    # Test 4: forecast_sales(backtest=True) - günstig genug für jede Anfrage
+    started = time.perf_counter()
+    for _ in range(20):
+        output = await forecast_sales(history, 6, render=False, method="auto", backtest=True)
+    elapsed = (time.perf_counter() - started) / 20
+    backtest = output["result"]["backtest"]
+    assert [item["method"] for item in backtest["metrics"]][-1] == "auto"
+    assert elapsed < 0.1, f"Forecast + Backtest dauerte {elapsed * 1000:.1f} ms"
+    rendered = await forecast_sales(history, 6, backtest=True)
+    assert "Backtest (Out-of-Sample)" in rendered["formatted_output"]
+    short = await forecast_sales(history[:3], 2, backtest=True, render=False)
+    assert short["result"]["backtest"] is None
+    print(f"  - Test 4: Forecast with backtest in {elapsed * 1000:.1f} ms - PASSED")
+
+    # Test 5: Eingabefehler
+    assert "error" in await backtest_sales(history, 6, methods=["arima"])
+    assert "error" in await backtest_sales(history, 6, window="sliding")
+    assert "error" in await backtest_sales(history[:3], 2)
+    assert "error" in await backtest_sales([], 2)
+    print("  - Test 5: Input errors - PASSED")
+
+    print("\n[OK] Sales forecast backtest tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,101 @@
+"""
+Test-Script für den Batch-Forecast (viele Serien, gemeinsamer Kalender).
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+# Füge tools zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from tools.sales_forecast_batch import build_batch_forecast, forecast_sales_batch
+from tools.sales_forecaster import forecast_sales
+
+MONTHS = [f"{year}-{month:02d}" for year in (2022, 2023, 2024) for month in range(1, 13)]
+
+
+def make_catalogue(count: int, seed: int = 11) -> dict:
+    """Synthetische SKU-Serien mit Trend, Saison und Rauschen"""
+    rng = np.random.default_rng(seed)
+    t = np.arange(len(MONTHS))
+    base = rng.uniform(2000, 4000, (count, 1))
+    slope = rng.normal(0, 20, (count, 1))
+    season = 300 * np.sin(t / 12 * 2 * np.pi)
+    amounts = np.maximum(base + slope * t + season + rng.normal(0, 80, (count, len(MONTHS))), 0)
+    return {
+        f"SKU-{i:05d}": [{"date": date, "amount": float(amount)} for date, amount in zip(MONTHS, row)]
+        for i, row in enumerate(amounts)
+    }
+
+
+async def run_tests():
+    """Führt alle Batch-Forecast Tests aus."""
+
+    # Test 1: Identische Kennzahlen wie forecast_sales (lückenlose Monatsreihen)
+    catalogue = make_catalogue(40)
+    for seasonality in (False, True):
+        batch = (await forecast_sales_batch(catalogue, forecast_months=8, include_seasonality=seasonality))["result"]
+        assert batch.predicted.shape == (40, 8) and batch.series_ids == list(catalogue)
+        for i in (0, 17, 39):
+            single = (await forecast_sales(catalogue[batch.series_ids[i]], 8, seasonality, render=False))["result"]
+            assert asdict(batch.series_result(i)) == single, batch.series_ids[i]
+    print("  - Test 1: Batch results match forecast_sales per series - PASSED")
+
+    # Test 2: Gemeinsamer Kalender mit Lücken, Aggregation pro Monat und Fehler pro Serie
+    result = build_batch_forecast(
+        series_ids=["A"] * 4 + ["B"] * 3 + ["C"] * 2 + ["D"] * 3,
+        dates=["2024-01", "2024-02", "2024-04", "2024-04-20",       # A: Lücke im März, April doppelt
+               "2024-02", "2024-03", "2024-04",
+               "2024-01", "2024-02",                                # C: zu kurz
+               "2024-01", "2024-02", "2024-03"],                    # D: negativer Betrag
+        amounts=[100, 200, 250, 150, 10, 20, 30, 5, 5, 1, -2, 3],
+        forecast_months=2
+    )
+    assert result.series_ids == ["A", "B"] and result.data_points.tolist() == [3, 3]
+    assert result.forecast_dates == ["2024-05", "2024-06"]
+    assert result.trend_slope[0] == 100.0 and result.r_squared[0] == 1.0   # x = 0, 1, 3 → 100, 200, 400
+    assert result.predicted[0].tolist() == [500.0, 600.0]
+    assert result.predicted[1].tolist() == [40.0, 50.0]
+    assert result.errors["C"].startswith("Mindestens 3") and "negativ" in result.errors["D"]
+    print("  - Test 2: Shared calendar with masks, monthly aggregation and per-series errors - PASSED")
+
+    # Test 3: Tausende SKUs in einem Aufruf, Markdown optional
+    catalogue = make_catalogue(5000)
+    started = time.perf_counter()
+    output = await forecast_sales_batch(catalogue, forecast_months=6, include_seasonality=True)
+    elapsed = time.perf_counter() - started
+    batch = output["result"]
+    assert "formatted_output" not in output and len(batch) == 5000 and not batch.errors
+    assert batch.seasonality_detected.all() and batch.confidence_score.dtype.kind == "i"
+    assert elapsed < 5.0, f"5000 Serien dauerten {elapsed:.2f}s"
+    columns = batch.to_dict()
+    assert len(columns["r_squared"]) == 5000 and len(columns["predicted"][0]) == 6
+
+    rendered = await forecast_sales_batch(dict(list(catalogue.items())[:30]), forecast_months=3, render=True)
+    assert "Verkaufsprognose (Batch)" in rendered["formatted_output"]
+    print(f"  - Test 3: 5000 SKUs in {elapsed * 1000:.0f} ms, optional markdown - PASSED")
+
+    # Test 4: Eingabefehler
+    assert "error" in await forecast_sales_batch({}, forecast_months=3)
+    assert "error" in await forecast_sales_batch({"A": []}, forecast_months=30)
+    broken = await forecast_sales_batch({"A": [{"date": "2024-01"}], "B": []}, forecast_months=3)
+    assert set(broken["result"].errors) == {"A", "B"}
+    history = [{"date": f"2024-0{month}", "amount": 100 * month} for month in range(1, 5)]
+    text = await forecast_sales_batch(
+        {"A": history, "B": history[:2] + [{"date": "2024-03", "amount": "viel"}] + history[3:]},
+        forecast_months=3
+    )
+    assert text["result"].series_ids == ["A"]
+    assert text["result"].errors["B"] == "Ungültiger Verkaufsbetrag: 'viel'"
+    print("  - Test 4: Input errors - PASSED")
+
+    print("\n[OK] Sales forecast batch tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
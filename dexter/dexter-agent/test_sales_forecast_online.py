@@ -0,0 +1,117 @@
+"""
+Test-Script für den inkrementellen Online Sales Forecaster.
+"""
+
+import asyncio
+import sys
+import tempfile
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+# Füge tools zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from tools.sales_forecast_online import OnlineSalesForecaster
+from tools.sales_forecaster import SalesDataError, forecast_sales
+
+
+def make_history(count: int, seed: int = 5) -> list:
+    """Tägliche Verkäufe mit Trend und Rauschen, endend am 31.12.2024"""
+    rng = np.random.default_rng(seed)
+    days = np.datetime64("2024-12-31") - np.arange(count)[::-1]
+    amounts = 1000 + np.arange(count) * 0.02 + rng.normal(0, 40, count)
+    return [{"date": str(day), "amount": float(amount)} for day, amount in zip(days, amounts)]
+
+
+async def run_tests():
+    """Führt alle Online-Forecaster Tests aus."""
+
+    # Test 1: Punktweise Updates liefern dasselbe Ergebnis wie forecast_sales
+    history = make_history(3000)
+    online = OnlineSalesForecaster()
+    for point in history:
+        online.add(point["date"], point["amount"])
+    for seasonality in (False, True):
+        expected = (await forecast_sales(history, 12, seasonality, render=False))["result"]
+        assert asdict(online.forecast(12, seasonality)) == expected
+    print("  - Test 1: Incremental result equals forecast_sales - PASSED")
+
+    # Test 2: Block-Updates (extend) und Einzel-Updates ergeben denselben Zustand
+    blocks = OnlineSalesForecaster()
+    blocks.extend(history[:1000])
+    blocks.extend(history[1000:2999])
+    blocks.add(history[-1]["date"], history[-1]["amount"])
+    assert blocks.n == online.n and blocks.month_counts == online.month_counts
+    for name in ("mean_y", "m2_y", "c_xy", "m2_x"):
+        assert abs(getattr(blocks, name) - getattr(online, name)) <= 1e-9 * abs(getattr(online, name))
+    print("  - Test 2: Block merge matches point-wise updates - PASSED")
+
+    # Test 3: O(1) pro Beobachtung - Kosten unabhängig von der Historienlänge
+    long_stream = OnlineSalesForecaster()
+    long_stream.extend(make_history(100_000))
+    started = time.perf_counter()
+    for day in range(1, 1001):
+        long_stream.add("2025-01-01", 1000 + day)
+        long_stream.forecast(3)
+    per_update = (time.perf_counter() - started) / 1000
+    assert per_update < 0.005, f"{per_update * 1000:.2f} ms pro Update + Forecast"
+    print(f"  - Test 3: Update + forecast in {per_update * 1e6:.0f} µs at 100k points - PASSED")
+
+    # Test 4: Serialisierung
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "state.json"
+        online.save(path)
+        restored = OnlineSalesForecaster.load(path)
+        assert asdict(restored.forecast(6, True)) == asdict(online.forecast(6, True))
+        restored.add("2025-01-02", 1500)
+        assert restored.n == online.n + 1
+    print("  - Test 4: State round-trips through JSON - PASSED")
+
+    # Test 5: Validierung
+    stream = OnlineSalesForecaster()
+    stream.add("2024-03", 100)
+    for date, amount, expected in (
+        ("2024-02", 100, "chronologisch"),
+        ("2024-04", -1, "negativ"),
+        ("morgen", 1, "Datumsformat"),
+        ("2999-01", 1, "Zukunft"),
+    ):
+        try:
+            stream.add(date, amount)
+            raise AssertionError("SalesDataError erwartet")
+        except SalesDataError as e:
+            assert expected in str(e), str(e)
+
+    # Blöcke werden vollständig validiert, bevor sie den Zustand verändern
+    for block, expected in (
+        ([{"date": "2024-05", "amount": 1}, {"date": "2024-06", "amount": float("nan")}], "Ungültiger"),
+        ([{"date": "2024-05", "amount": 1}, {"date": "2024-06", "amount": -5}], "negativ"),
+        ([{"date": "2024-05", "amount": 1}, {"date": "2999-01", "amount": 1}], "Zukunft"),
+        ([{"date": "2024-01", "amount": 1}, {"date": "2024-05", "amount": 1}], "chronologisch"),
+    ):
+        state = stream.to_dict()
+        try:
+            stream.extend(block)
+            raise AssertionError("SalesDataError erwartet")
+        except SalesDataError as e:
+            assert expected in str(e), str(e)
+        assert stream.to_dict() == state
+    stream.extend([{"date": "2024-06", "amount": 3}, {"date": "2024-05", "amount": 2}])   # intern unsortiert
+    assert stream.n == 3 and stream.last_date == "2024-06-01"
+    assert not hasattr(stream, "extend_columns")
+
+    try:
+        OnlineSalesForecaster().forecast(3)
+        raise AssertionError("ValueError erwartet")
+    except ValueError as e:
+        assert "Mindestens 3" in str(e)
+    print("  - Test 5: Validation and ordering - PASSED")
+
+    print("\n[OK] Online sales forecaster tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
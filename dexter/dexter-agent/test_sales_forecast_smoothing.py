@@ -0,0 +1,101 @@
+"""
+Test-Script für die exponentielle Glättung (Holt-Winters) im Sales Forecaster.
+"""
+
+import asyncio
+import sys
+import time
+from dataclasses import asdict
+from pathlib import Path
+
+import numpy as np
+
+# Füge tools zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from tools.sales_forecast_batch import build_batch_forecast, forecast_sales_batch
+from tools.sales_forecast_smoothing import fit_smoothing
+from tools.sales_forecaster import forecast_sales
+from test_sales_forecast_batch import MONTHS, make_catalogue
+
+
+def as_history(amounts) -> list:
+    """Monatliche Verkaufsdaten ab 2022-01"""
+    return [{"date": date, "amount": float(amount)} for date, amount in zip(MONTHS, amounts)]
+
+
+async def run_tests():
+    """Führt alle Glättungs-Tests aus."""
+
+    # Test 1: Rauschfreie Reihen werden vom passenden Modell exakt fortgeschrieben
+    t = np.arange(36)
+    season = 200 * np.sin(t / 12 * 2 * np.pi)
+    cases = {
+        "simple": (np.full(36, 500.0), [500.0] * 3),
+        "double": (1000 + 25.0 * t, [1900.0, 1925.0, 1950.0]),
+        "triple": (1000 + 25.0 * t + season, list(np.round(1000 + 25.0 * np.arange(36, 39) + season[:3], 2))),
+    }
+    for model, (amounts, expected) in cases.items():
+        output = await forecast_sales(as_history(amounts), 3, method=model, render=False)
+        result = output["result"]
+        assert result["forecast_method"] == model
+        assert [f["predicted_amount"] for f in result["forecasts"]] == expected, (model, result["forecasts"])
+        assert result["seasonality_detected"] == (model == "triple")
+    print("  - Test 1: Exact continuation of level, trend and season - PASSED")
+
+    # Test 2: auto wählt per Holdout - Saison-Reihen → Holt-Winters, Zufallsrauschen → kein Trend/Saison-Modell
+    rng = np.random.default_rng(3)
+    seasonal = rng.uniform(2000, 3000, (200, 1)) + 10 * t + 4 * season + rng.normal(0, 40, (200, 36))
+    noise = rng.uniform(2000, 3000, (200, 1)) + rng.normal(0, 150, (200, 36))
+    fit = fit_smoothing(np.vstack([seasonal, noise]), np.ones((400, 36), dtype=bool), 6, "auto")
+    assert (fit.model[:200] == "triple").mean() > 0.9
+    assert (fit.model[200:] == "triple").mean() < 0.5
+    assert fit.holdout_rmse.shape == (400, 3)
+    assert (fit.model == np.array(["simple", "double", "triple"])[fit.holdout_rmse.argmin(axis=1)]).all()
+    print("  - Test 2: Auto selection by holdout error - PASSED")
+
+    # Test 3: Batch-Ergebnisse identisch mit forecast_sales pro Serie
+    catalogue = make_catalogue(30)
+    for model in ("simple", "double", "triple", "auto"):
+        batch = (await forecast_sales_batch(catalogue, forecast_months=6, method=model))["result"]
+        for i in (0, 29):
+            single = (await forecast_sales(catalogue[batch.series_ids[i]], 6, method=model, render=False))["result"]
+            assert asdict(batch.series_result(i)) == single, (model, batch.series_ids[i])
+    print("  - Test 3: Batch results match forecast_sales per series - PASSED")
+
+    # Test 4: Gemeinsamer Kalender mit Lücken und unterschiedlichem Start/Ende
+    result = build_batch_forecast(
+        series_ids=["A"] * 4 + ["B"] * 3,
+        dates=["2024-01", "2024-02", "2024-04", "2024-05", "2024-03", "2024-04", "2024-05"],
+        amounts=[100, 200, 400, 500, 10, 20, 30],
+        forecast_months=2,
+        method="double"
+    )
+    assert result.forecast_dates == ["2024-06", "2024-07"]
+    assert result.predicted.tolist() == [[600.0, 700.0], [40.0, 50.0]]
+    assert result.forecast_method.tolist() == ["double", "double"]
+    short = build_batch_forecast(["A"] * 5, MONTHS[:5], [1, 2, 3, 4, 5], 3, method="triple")
+    assert short.errors["A"].startswith("Mindestens 24")
+    print("  - Test 4: Masked calendar gaps and per-series minimum data - PASSED")
+
+    # Test 5: Tausende SKUs mit Modellauswahl in einem Aufruf
+    catalogue = make_catalogue(5000)
+    started = time.perf_counter()
+    batch = (await forecast_sales_batch(catalogue, forecast_months=6, method="auto"))["result"]
+    elapsed = time.perf_counter() - started
+    assert len(batch) == 5000 and np.isfinite(batch.predicted).all()
+    assert elapsed < 5.0, f"5000 Serien (auto) dauerten {elapsed:.2f}s"
+    print(f"  - Test 5: 5000 SKUs with auto selection in {elapsed * 1000:.0f} ms - PASSED")
+
+    # Test 6: Eingabefehler
+    history = as_history(np.arange(20) + 100.0)
+    assert "24 Datenpunkte" in (await forecast_sales(history, 3, method="triple"))["error"]
+    assert "error" in await forecast_sales(history, 3, method="arima")
+    assert "error" in await forecast_sales_batch({"A": history}, 3, method="arima")
+    print("  - Test 6: Input errors - PASSED")
+
+    print("\n[OK] Sales forecast smoothing tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -5,12 +5,15 @@ Schreibt Output in Datei um Encoding-Probleme zu vermeiden.
 
 import asyncio
 import sys
+import time
 from pathlib import Path
 
+import numpy as np
+
 # Füge tools zu Path hinzu
 sys.path.append(str(Path(__file__).parent))
 
-from tools.sales_forecaster import forecast_sales
+from tools.sales_forecaster import _calculate_trend, forecast_sales, sales_columns
 
 
 async def run_tests():
@@ -93,6 +96,49 @@ async def run_tests():
         f.write(result4['formatted_output'])
         f.write("\n\n" + "=" * 80 + "\n\n")
 
+        # Test 5: Lange Tageshistorie (Spalten-Pfad, Datumswerte einmal geparst)
+        f.write("## TEST 5: 100k Tageswerte\n\n")
+        days = np.datetime64("2024-12-31") - np.arange(100_000)[::-1]
+        amounts = 1000 + np.arange(100_000) * 0.01 + np.random.default_rng(7).normal(0, 50, 100_000)
+        history = [{"date": str(day), "amount": float(amount)} for day, amount in zip(days, amounts)]
+        history[10], history[20] = history[20], history[10]         # unsortiert
+        started = time.perf_counter()
+        result5 = await forecast_sales(history, forecast_months=12, include_seasonality=True, render=False)
+        elapsed = time.perf_counter() - started
+        slope, intercept = np.polyfit(np.arange(100_000), amounts, 1)
+        assert result5["result"]["trend_slope"] == round(slope, 2)
+        assert abs(_calculate_trend(amounts)[1] - intercept) < 1e-6
+        assert result5["result"]["seasonality_detected"] is True
+        assert [fc["date"] for fc in result5["result"]["forecasts"][:2]] == ["2025-01", "2025-02"]
+        f.write(f"- Dauer: {elapsed * 1000:.0f} ms, Slope: {result5['result']['trend_slope']}\n\n")
+
+        # Test 6: Vektorisierte Validierung meldet den ersten ungültigen Datenpunkt
+        dates, values = sales_columns([
+            {"date": "2024-03-01", "amount": 3}, {"date": "15.01.2024", "amount": 1}, {"date": "Feb 2024", "amount": 2}
+        ])
+        assert dates.astype(str).tolist() == ["2024-01-15", "2024-02-01", "2024-03-01"] and values.tolist() == [1, 2, 3]
+        invalid = [
+            ([{"date": "2024-01", "amount": 1}, {"date": "2024-02", "amount": -5}, {"date": "morgen", "amount": 1}],
+             "Verkaufsbetrag kann nicht negativ sein: -5.0"),
+            ([{"date": "2024-01", "amount": 1}, {"date": "morgen", "amount": 1}, {"date": "2024-03", "amount": -5}],
+             "Ungültiges Datumsformat: morgen"),
+            ([{"date": "2024-01", "amount": 1}, {"date": "2999-01", "amount": 1}, {"date": "2024-03", "amount": 1}],
+             "Datum liegt in der Zukunft: 2999-01"),
+            ([{"date": "2024-01", "amount": 1}, {"date": "2024-02", "amount": None}, {"date": "2024-03", "amount": 1}],
+             "Ungültiger Verkaufsbetrag in Datenpunkt 2"),
+        ]
+        for sales, expected in invalid:
+            error = (await forecast_sales(sales, forecast_months=3))["error"]
+            assert error.startswith(expected), error
+
+        # Numerische Strings werden akzeptiert, Report und Chart nutzen die validierten Spalten
+        mixed = await forecast_sales(
+            [{"date": "2024-03", "amount": 120}, {"date": "2024-01", "amount": "100"}, {"date": "2024-02", "amount": "110"}],
+            forecast_months=2
+        )
+        assert mixed["success"] and mixed["result"]["historical_average"] == 110
+        assert "**Zeitraum**: 2024-01 bis 2024-03" in mixed["formatted_output"]
+
         f.write("\n## TESTS COMPLETED SUCCESSFULLY\n")
 
     print("[OK] Tests completed successfully!")
@@ -102,6 +148,8 @@ async def run_tests():
     print("  - Test 2: Stable Trend (minimal change) - PASSED")
     print("  - Test 3: Downward Trend (crisis intervention) - PASSED")
     print("  - Test 4: Seasonality Detection (12+ months) - PASSED")
+    print(f"  - Test 5: 100k daily points via columnar core ({elapsed * 1000:.0f} ms) - PASSED")
+    print("  - Test 6: Vectorized validation reports first invalid point - PASSED")
     print(f"\nOpen file to see detailed results: {output_file}")
 
 
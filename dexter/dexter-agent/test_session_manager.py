@@ -0,0 +1,119 @@
+"""
+Test-Script für den Session Manager.
+Läuft offline mit einem Fake-Agent (kein API Call).
+"""
+
+import asyncio
+import sys
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.openai_service import ChatMessage
+from lib.ai.conversation_history import ConversationHistory
+from session_manager import SessionManager
+
+
+class FakeAgent:
+    """Minimaler Agent: schreibt User/Assistant-Nachrichten in die History"""
+
+    def __init__(self):
+        self.conversation_history = ConversationHistory()
+        self.active_calls = 0
+        self.max_active_calls = 0
+
+    async def chat(self, user_message: str):
+        self.active_calls += 1
+        self.max_active_calls = max(self.max_active_calls, self.active_calls)
+        self.conversation_history.append(ChatMessage(role="user", content=user_message))
+        await asyncio.sleep(0.01)
+        self.conversation_history.append(ChatMessage(role="assistant", content="ok " * 50))
+        self.active_calls -= 1
+        yield "ok"
+
+
+async def run_tests():
+    """Führt alle Session Manager Tests aus."""
+
+    # Test 1: Sessions anlegen und wiederverwenden
+    manager = SessionManager(max_sessions=10, idle_ttl_seconds=60, max_resident_tokens=0, agent_factory=FakeAgent)
+    first = manager.get_or_create("a")
+    assert manager.get_or_create("a") is first
+    assert len(manager) == 1
+    print("  - Test 1: Session lookup reuses agents - PASSED")
+
+    # Test 2: Gleichzeitige Chats einer Session werden serialisiert
+    async def consume(session_id, message):
+        return [chunk async for chunk in manager.chat(session_id, message)]
+
+    await asyncio.gather(*(consume("a", f"frage {i}") for i in range(5)))
+    assert first.agent.max_active_calls == 1
+    assert len(first.agent.conversation_history) == 10
+    print("  - Test 2: Concurrent chats within a session are serialized - PASSED")
+
+    # Test 3: LRU-Verdrängung bei max_sessions
+    manager = SessionManager(max_sessions=3, idle_ttl_seconds=60, max_resident_tokens=0, agent_factory=FakeAgent)
+    for session_id in ["a", "b", "c"]:
+        manager.get_or_create(session_id)
+    manager.get_or_create("a")          # a wird zuletzt benutzt
+    manager.get_or_create("d")          # verdrängt b (LRU)
+    assert "b" not in manager and "a" in manager and "d" in manager
+    assert manager.stats()["evictions"]["lru"] == 1
+    print("  - Test 3: LRU eviction at max_sessions - PASSED")
+
+    # Test 4: TTL-Verdrängung
+    removed = manager.evict_expired(now=time.monotonic() + 120)
+    assert removed == 3 and len(manager) == 0
+    print("  - Test 4: Idle TTL eviction - PASSED")
+
+    # Test 5: Globales Token-Budget
+    manager = SessionManager(max_sessions=100, idle_ttl_seconds=60, max_resident_tokens=200, agent_factory=FakeAgent)
+    for i in range(10):
+        await consume(f"s{i}", "hallo")
+    stats = manager.stats()
+    assert stats["resident_tokens"] <= 200
+    assert stats["evictions"]["tokens"] > 0
+    assert "s9" in manager
+    print("  - Test 5: Global token budget evicts LRU sessions - PASSED")
+
+    # Test 6: Ende eines Chats hält die LRU-Reihenfolge für den TTL-Sweep
+    manager = SessionManager(max_sessions=10, idle_ttl_seconds=60, max_resident_tokens=0, agent_factory=FakeAgent)
+    manager.get_or_create("b")
+    running = asyncio.create_task(consume("a", "lange frage"))
+    await asyncio.sleep(0)
+    b = manager.get_or_create("b")      # b wird während des Chats von a benutzt
+    await running
+    a = manager._sessions["a"]
+    assert list(manager._sessions) == ["b", "a"] and a.last_used > b.last_used
+    removed = manager.evict_expired(now=(a.last_used + b.last_used) / 2 + 60)
+    assert removed == 1 and "b" not in manager and "a" in manager
+    print("  - Test 6: Finished chats move their session to the LRU end - PASSED")
+
+    # Test 7: Gleichzeitige Chats am Session-Limit, close() während eines Chats
+    def tracked_tokens(manager):
+        return sum(session.agent.conversation_history.total_tokens for session in manager._sessions.values())
+
+    manager = SessionManager(max_sessions=1, idle_ttl_seconds=60, max_resident_tokens=0, agent_factory=FakeAgent)
+    running = asyncio.create_task(consume("a", "frage a"))
+    await asyncio.sleep(0)
+    manager.get_or_create("b")          # a ist belegt → b bleibt trotz Limit erhalten
+    assert "b" in manager and "a" in manager
+    await asyncio.gather(running, consume("b", "frage b"))
+    assert len(manager) == 1 and manager.stats()["evictions"]["lru"] == 1
+    assert manager.stats()["resident_tokens"] == tracked_tokens(manager) > 0
+
+    running = asyncio.create_task(consume("c", "frage c"))
+    await asyncio.sleep(0)
+    assert manager.close("c")
+    await running
+    assert "c" not in manager
+    assert manager.stats()["resident_tokens"] == tracked_tokens(manager)
+    print("  - Test 7: Concurrent chats at the session limit keep the token account - PASSED")
+
+    print("\n[OK] Session Manager tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,115 @@
+"""
+Test-Script für den direkten Tool Batch (CSV/JSONL → Prozess-Pool → Tabelle).
+Läuft komplett offline, ohne LLM.
+"""
+
+import asyncio
+import csv
+import json
+import sys
+import tempfile
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from tool_batch import (
+    ToolBatchInputError, ToolRow, load_rows, main, run_tool_batch, to_columns, write_records
+)
+from tools.roi_calculator import calculate_roi
+
+
+def run_tests():
+    """Führt alle Tool Batch Tests aus."""
+    with tempfile.TemporaryDirectory() as tmp:
+        tmp = Path(tmp)
+
+        # Test 1: CSV mit Schema-Typen und verschachtelten Spalten, JSONL flach und mit "arguments"
+        source = tmp / "rows.csv"
+        source.write_text(
+            "id,tool,revenue,cost_of_goods_sold,operating_expenses.Miete,operating_expenses.Personal,period\n"
+            "p-1,calculate_pnl,100000,40000,5000,20000,Q1 2024\n",
+            encoding="utf-8"
+        )
+        rows = load_rows(source)
+        assert rows[0].arguments == {
+            "revenue": 100000.0, "cost_of_goods_sold": 40000.0,
+            "operating_expenses": {"Miete": 5000, "Personal": 20000}, "period": "Q1 2024"
+        }
+        source = tmp / "rows.jsonl"
+        source.write_text(
+            '{"investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12}\n'
+            '{"id": "b", "tool": "analyze_break_even", "arguments": {"fixed_costs": 10000, '
+            '"variable_cost_per_unit": 20, "selling_price_per_unit": 45}}\n',
+            encoding="utf-8"
+        )
+        rows = load_rows(source, tool="calculate_roi")
+        assert [(row.row_id, row.tool) for row in rows] == [("row-1", "calculate_roi"), ("b", "analyze_break_even")]
+        for content in ("id,tool\nx,unbekannt\n", "id,investment_cost\nx,viel\n"):
+            (tmp / "bad.csv").write_text(content, encoding="utf-8")
+            try:
+                load_rows(tmp / "bad.csv", tool="calculate_roi")
+                raise AssertionError("ToolBatchInputError erwartet")
+            except ToolBatchInputError:
+                pass
+        print("  - Test 1: CSV/JSONL parsing and type coercion - PASSED")
+
+        # Test 2: render=False liefert Kennzahlen ohne Markdown
+        output = asyncio.run(calculate_roi(50000, 72000, 12, render=False))
+        assert "formatted_output" not in output and output["result"]["roi_percentage"] == 44.0
+        print("  - Test 2: Tools skip markdown with render=False - PASSED")
+
+        # Test 3: Prozess-Pool = gleiche Ergebnisse wie In-Process, Eingabe-Reihenfolge, Fehlerzeilen
+        rows = [
+            ToolRow(f"r-{i}", "calculate_roi", {"investment_cost": 1000 + i, "revenue_generated": 2000, "timeframe_months": 12})
+            for i in range(40)
+        ]
+        rows[7] = ToolRow("r-7", "calculate_roi", {"investment_cost": -5, "revenue_generated": 1, "timeframe_months": 12})
+        rows[9] = ToolRow("r-9", "calculate_roi", {"investment_cost": 1000})
+        serial, serial_stats = run_tool_batch(rows, workers=1, chunk_size=0)
+        pooled, pooled_stats = run_tool_batch(rows, workers=2, chunk_size=6)
+        assert [record["id"] for record in pooled] == [row.row_id for row in rows]
+        assert pooled == serial
+        assert pooled_stats.chunks == 7 and pooled_stats.workers == 2
+        assert serial_stats.ok == 38 and serial_stats.errors == 2
+        assert serial[7]["status"] == "error" and serial[7]["error"]
+        assert serial[9]["status"] == "error" and "revenue_generated" in serial[9]["error"]
+        assert serial[0]["roi_percentage"] == 100.0 and "formatted_output" not in serial[0]
+        print(f"  - Test 3: Chunked process pool ({pooled_stats.rows_per_second:.0f} rows/s) - PASSED")
+
+        # Test 4: Spaltenweise Ausgabe, gemischte Tools (fehlende Felder = None)
+        records, _ = run_tool_batch([
+            ToolRow("a", "calculate_roi", {"investment_cost": 100, "revenue_generated": 150, "timeframe_months": 6}),
+            ToolRow("b", "analyze_break_even", {"fixed_costs": 10000, "variable_cost_per_unit": 20, "selling_price_per_unit": 45}),
+        ], workers=1)
+        columns = to_columns(records)
+        assert list(columns)[:4] == ["id", "tool", "status", "error"]
+        assert columns["roi_percentage"][1] is None and columns["break_even_units"][1] == 400
+        write_records(records, tmp / "out.json")
+        assert json.loads((tmp / "out.json").read_text(encoding="utf-8")) == columns
+        write_records(records, tmp / "out.csv")
+        with open(tmp / "out.csv", encoding="utf-8", newline="") as file:
+            table = list(csv.DictReader(file))
+        assert [row["id"] for row in table] == ["a", "b"] and table[0]["roi_percentage"] == "50.0"
+        print("  - Test 4: Columnar output without markdown - PASSED")
+
+        # Test 5: CLI mit Markdown-Verzeichnis und Zusammenfassung
+        (tmp / "cli.csv").write_text(
+            "id,investment_cost,revenue_generated,timeframe_months\nx,100,150,6\ny,200,150,6\n", encoding="utf-8"
+        )
+        exit_code = main([
+            str(tmp / "cli.csv"), "--tool", "calculate_roi", "--output", str(tmp / "cli.jsonl"),
+            "--workers", "1", "--markdown-dir", str(tmp / "md"), "--summary-json", str(tmp / "summary.json"), "--quiet"
+        ])
+        summary = json.loads((tmp / "summary.json").read_text(encoding="utf-8"))
+        lines = [json.loads(line) for line in (tmp / "cli.jsonl").read_text(encoding="utf-8").splitlines()]
+        assert exit_code == 0 and summary["rows"] == 2 and summary["markdown_reports"] == 2
+        assert all("formatted_output" not in line for line in lines)
+        assert sorted(path.name for path in (tmp / "md").iterdir()) == ["x.md", "y.md"]
+        print("  - Test 5: CLI with markdown directory and summary - PASSED")
+
+    print("\n[OK] Tool batch tests completed successfully!")
+
+
+if __name__ == "__main__":
+    run_tests()
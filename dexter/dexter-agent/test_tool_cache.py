@@ -0,0 +1,159 @@
+"""
+Test-Script für den Tool-Result-Cache (LRU, TTL, Single-Flight).
+Läuft offline, ohne API Call.
+"""
+
+import asyncio
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.tool_cache import ToolResultCache, canonical_arguments
+
+
+class CountingTool:
+    """Fake-Tool, das Aufrufe zählt und optional verzögert"""
+
+    def __init__(self, result=None, delay: float = 0.0):
+        self.calls = 0
+        self.result = result if result is not None else {"roi_percentage": 44.0}
+        self.delay = delay
+
+    async def __call__(self):
+        self.calls += 1
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        return self.result
+
+
+async def run_tests():
+    """Führt alle Tool-Cache Tests aus."""
+
+    # Test 1: Treffer unabhängig von der Key-Reihenfolge der Argumente
+    cache = ToolResultCache()
+    tool = CountingTool()
+    first = await cache.get_or_compute("calculate_roi", {"a": 1, "b": 2}, tool)
+    second = await cache.get_or_compute("calculate_roi", {"b": 2, "a": 1}, tool)
+    assert first is second and tool.calls == 1
+    assert canonical_arguments({"b": 2, "a": 1}) == '{"a":1,"b":2}'
+    await cache.get_or_compute("analyze_break_even", {"a": 1, "b": 2}, tool)
+    assert tool.calls == 2
+    assert cache.stats() == {"entries": 2, "hits": 1, "misses": 2, "coalesced": 0, "hit_rate": 0.3333}
+    print("  - Test 1: Hits on canonical arguments per tool - PASSED")
+
+    # Test 2: LRU-Verdrängung - zuletzt benutzte Einträge bleiben
+    cache = ToolResultCache(max_entries=2)
+    tool = CountingTool()
+    await cache.get_or_compute("t", {"x": 1}, tool)
+    await cache.get_or_compute("t", {"x": 2}, tool)
+    await cache.get_or_compute("t", {"x": 1}, tool)     # x=1 wird zuletzt benutzt
+    await cache.get_or_compute("t", {"x": 3}, tool)     # verdrängt x=2
+    assert len(cache) == 2 and tool.calls == 3
+    await cache.get_or_compute("t", {"x": 1}, tool)
+    assert tool.calls == 3
+    await cache.get_or_compute("t", {"x": 2}, tool)
+    assert tool.calls == 4
+    print("  - Test 2: LRU eviction keeps recently used entries - PASSED")
+
+    # Test 3: TTL - abgelaufene Einträge werden neu berechnet
+    cache = ToolResultCache(ttl_seconds=0.05)
+    tool = CountingTool()
+    await cache.get_or_compute("t", {"x": 1}, tool)
+    await cache.get_or_compute("t", {"x": 1}, tool)
+    assert tool.calls == 1
+    await asyncio.sleep(0.1)
+    await cache.get_or_compute("t", {"x": 1}, tool)
+    assert tool.calls == 2 and len(cache) == 1
+    print("  - Test 3: Expired entries are recomputed - PASSED")
+
+    # Test 4: Fehler-Ergebnisse und Exceptions werden nicht gecacht
+    cache = ToolResultCache()
+    failing = CountingTool(result={"error": "Ungültige Eingabe"})
+    for _ in range(2):
+        assert await cache.get_or_compute("t", {"x": 1}, failing) == {"error": "Ungültige Eingabe"}
+    assert failing.calls == 2 and len(cache) == 0
+
+    raises = {"calls": 0}
+
+    async def broken():
+        raises["calls"] += 1
+        raise ValueError("kaputt")
+
+    for _ in range(2):
+        try:
+            await cache.get_or_compute("t", {"x": 2}, broken)
+            raise AssertionError("ValueError erwartet")
+        except ValueError:
+            pass
+    assert raises["calls"] == 2 and len(cache) == 0
+    print("  - Test 4: Error results and exceptions are not cached - PASSED")
+
+    # Test 5: Ausgeschlossene Tools werden immer ausgeführt
+    cache = ToolResultCache(excluded_tools=["generate_scenarios"])
+    tool = CountingTool()
+    for _ in range(3):
+        await cache.get_or_compute("generate_scenarios", {"x": 1}, tool)
+    assert tool.calls == 3 and len(cache) == 0
+    assert cache.stats()["hits"] == 0 and cache.stats()["misses"] == 0
+    print("  - Test 5: Excluded tools bypass the cache - PASSED")
+
+    # Test 6: Single-Flight - gleichzeitige identische Aufrufe laufen einmal
+    cache = ToolResultCache()
+    tool = CountingTool(delay=0.05)
+    results = await asyncio.gather(*(cache.get_or_compute("t", {"x": 1}, tool) for _ in range(5)))
+    assert tool.calls == 1 and all(result is results[0] for result in results)
+    assert cache.stats()["coalesced"] == 4 and cache.stats()["hits"] == 4
+
+    # Exception des Ausführenden erreicht auch die Wartenden, danach wird neu ausgeführt
+    attempts = {"calls": 0}
+
+    async def slow_broken():
+        attempts["calls"] += 1
+        await asyncio.sleep(0.05)
+        raise ValueError("kaputt")
+
+    outcomes = await asyncio.gather(
+        *(cache.get_or_compute("t", {"x": 2}, slow_broken) for _ in range(3)),
+        return_exceptions=True
+    )
+    assert attempts["calls"] == 1 and all(isinstance(outcome, ValueError) for outcome in outcomes)
+    assert not cache._in_flight
+    print("  - Test 6: Concurrent identical calls are coalesced - PASSED")
+
+    # Test 7: Abgebrochener Ausführender → Wartender führt selbst erneut aus
+    cache = ToolResultCache()
+    tool = CountingTool(delay=0.05)
+    leader = asyncio.create_task(cache.get_or_compute("t", {"x": 1}, tool))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_compute("t", {"x": 1}, tool))
+    await asyncio.sleep(0.01)
+    leader.cancel()
+    try:
+        await leader
+    except asyncio.CancelledError:
+        pass
+    assert await follower == tool.result
+    assert tool.calls == 2 and len(cache) == 1 and not cache._in_flight
+
+    # Abgebrochener Wartender lässt den Ausführenden unberührt
+    cache = ToolResultCache()
+    tool = CountingTool(delay=0.05)
+    leader = asyncio.create_task(cache.get_or_compute("t", {"x": 1}, tool))
+    await asyncio.sleep(0)
+    follower = asyncio.create_task(cache.get_or_compute("t", {"x": 1}, tool))
+    await asyncio.sleep(0.01)
+    follower.cancel()
+    try:
+        await follower
+    except asyncio.CancelledError:
+        pass
+    assert await leader == tool.result and tool.calls == 1 and len(cache) == 1
+    print("  - Test 7: Retry after a cancelled leader - PASSED")
+
+    print("\n[OK] Tool cache tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,143 @@
+"""
+Test-Script für die Tool-Registry (Dispatch und Schema-Validierung).
+Läuft offline, ohne API Call.
+"""
+
+import asyncio
+import json
+import sys
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from lib.ai.tool_registry import (
+    ToolRegistry,
+    ToolRegistryError,
+    ToolValidationError,
+    UnknownToolError,
+    build_schema_validator,
+    get_tool_registry,
+    make_tool_spec,
+)
+
+_ROI_ARGS = {"investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12}
+
+_SCHEMA = {
+    "type": "object",
+    "properties": {
+        "amount": {"type": "number"},
+        "months": {"type": "integer"},
+        "label": {"type": "string"},
+        "flag": {"type": "boolean"},
+        "items": {"type": "array"},
+        "options": {"type": "object"},
+    },
+    "required": ["amount", "months"],
+}
+
+
+def expect_error(error_type, func, *args):
+    """Führt func aus und liefert die erwartete Exception"""
+    try:
+        func(*args)
+    except error_type as e:
+        return e
+    raise AssertionError(f"{error_type.__name__} erwartet")
+
+
+async def run_tests():
+    """Führt alle Tool-Registry Tests aus."""
+
+    # Test 1: Alle sechs Tools registriert, Dispatch über den Namen
+    registry = get_tool_registry()
+    assert registry is get_tool_registry()
+    assert registry.names == (
+        "calculate_roi", "forecast_sales", "calculate_pnl",
+        "generate_balance_sheet", "generate_cash_flow_statement", "analyze_break_even",
+    )
+    assert [schema["function"]["name"] for schema in registry.schemas] == list(registry.names)
+    assert json.loads(registry.schemas_json) == json.loads(json.dumps(list(registry.schemas)))
+    result = await registry.execute("calculate_roi", _ROI_ARGS)
+    assert result["success"] and result["result"]["roi_percentage"] == 44.0
+    print("  - Test 1: Registry dispatches all six tools by name - PASSED")
+
+    # Test 2: Unbekanntes Tool
+    assert "calculate_tax" not in registry
+    error = expect_error(UnknownToolError, registry.get, "calculate_tax")
+    assert error.tool_name == "calculate_tax" and isinstance(error, ValueError)
+    try:
+        await registry.execute("calculate_tax", {})
+        raise AssertionError("UnknownToolError erwartet")
+    except UnknownToolError:
+        pass
+    print("  - Test 2: Unknown tools raise UnknownToolError - PASSED")
+
+    # Test 3: Fehlende Pflichtfelder
+    validate = build_schema_validator("demo", _SCHEMA)
+    error = expect_error(ToolValidationError, validate, {"amount": 1})
+    assert error.tool_name == "demo" and "months" in str(error)
+    error = expect_error(ToolValidationError, validate, {})
+    assert "amount, months" in str(error)
+    expect_error(ToolValidationError, validate, ["amount", "months"])
+    try:
+        await registry.execute("calculate_roi", {"investment_cost": 50000})
+        raise AssertionError("ToolValidationError erwartet")
+    except ToolValidationError as e:
+        assert "revenue_generated" in str(e) and "timeframe_months" in str(e)
+    for name, schema in zip(registry.names, registry.schemas):
+        error = expect_error(ToolValidationError, registry.get(name).validator, {})
+        assert all(field in str(error) for field in schema["function"]["parameters"]["required"])
+    print("  - Test 3: Missing required fields are rejected - PASSED")
+
+    # Test 4: Typprüfung (bool ist keine Zahl, ganzzahlige Floats sind integer)
+    for arguments in (
+        {"amount": "100", "months": 12},
+        {"amount": True, "months": 12},
+        {"amount": 1.0, "months": 1.5},
+        {"amount": 1.0, "months": 12, "label": 5},
+        {"amount": 1.0, "months": 12, "flag": "ja"},
+        {"amount": 1.0, "months": 12, "items": {"a": 1}},
+        {"amount": 1.0, "months": 12, "options": [1]},
+    ):
+        error = expect_error(ToolValidationError, validate, arguments)
+        assert "muss vom Typ" in str(error), str(error)
+    kwargs = validate({
+        "amount": 10, "months": 12.0, "label": "x", "flag": False,
+        "items": [1], "options": {"a": 1}
+    })
+    assert kwargs["amount"] == 10 and kwargs["months"] == 12.0 and kwargs["flag"] is False
+    print("  - Test 4: Argument types are checked against the schema - PASSED")
+
+    # Test 5: Unbekannte Argumente werden entfernt, optionale None-Werte ausgelassen
+    assert validate({"amount": 1, "months": 2, "halluziniert": 3, "label": None}) == {"amount": 1, "months": 2}
+    expect_error(ToolValidationError, validate, {"amount": None, "months": 2})
+    result = await registry.execute("calculate_roi", {**_ROI_ARGS, "currency": "EUR"})
+    assert result["success"]
+    print("  - Test 5: Unknown arguments are dropped - PASSED")
+
+    # Test 6: Registry ist schreibgeschützt, doppelte Namen werden abgewiesen
+    try:
+        registry._specs["calculate_roi"] = None
+        raise AssertionError("TypeError erwartet")
+    except TypeError:
+        pass
+    assert registry.get("calculate_roi").name == "calculate_roi"
+
+    async def handler(**kwargs):
+        return {"result": kwargs}
+
+    definition = {"name": "demo", "description": "Demo", "input_schema": _SCHEMA}
+    error = expect_error(ToolRegistryError, ToolRegistry, [make_tool_spec(handler, definition)] * 2)
+    assert "demo" in str(error)
+    demo = ToolRegistry([make_tool_spec(handler, definition)])
+    assert len(demo) == 1 and await demo.execute("demo", {"amount": 1, "months": 2, "x": 0}) == {
+        "result": {"amount": 1, "months": 2}
+    }
+    print("  - Test 6: Registry is read-only and rejects duplicates - PASSED")
+
+    print("\n[OK] Tool registry tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,191 @@
+"""
+Test-Script für Tracing-Spans (Turn, Iteration, Model-Call, Tool).
+Spans gehen an In-Memory/JSONL-Exporter, Model-Calls offline an den Mock.
+"""
+
+import asyncio
+import json
+import os
+import sys
+import tempfile
+import threading
+import time
+from pathlib import Path
+
+# Füge Projekt-Root zu Path hinzu
+sys.path.append(str(Path(__file__).parent))
+
+from config import DexterConfig
+from lib.ai.error_handler import CircuitBreaker
+from lib.ai.openai_service import close_shared_async_clients
+from lib.ai.tracing import NOOP_SPAN, InMemorySpanExporter, JsonlSpanExporter, Tracer
+from main import DexterAgent
+from mock_openai_server import MockOpenAIServer, MockReply, MockToolCall, scripted_responder
+
+_ROI = MockToolCall("calculate_roi", {
+    "investment_cost": 50000, "revenue_generated": 72000, "timeframe_months": 12
+})
+
+
+def make_agent(server: MockOpenAIServer, tracer: Tracer, stream: bool = False) -> DexterAgent:
+    service = server.make_service()
+    agent = DexterAgent(openai_service=service, stream=stream)
+    agent.tool_cache = None
+    agent.tracer = tracer
+    agent.retry_policy.base_delay = 0.01
+    return agent
+
+
+async def run_tests():
+    """Führt alle Tracing Tests aus."""
+
+    # Test 1: Span-Baum eines Turns mit Tool-Runde und Retry
+    calls = {"count": 0}
+    scripted = scripted_responder([[_ROI, _ROI]], "Fertig.")
+
+    def responder(request):
+        calls["count"] += 1
+        if calls["count"] == 2:
+            return MockReply(error_status=503)      # zweiter Model-Call schlägt einmal fehl
+        return scripted(request)
+
+    async with MockOpenAIServer(responder) as server:
+        for stream in (False, True):
+            calls["count"] = 0
+            exporter = InMemorySpanExporter()
+            agent = make_agent(server, Tracer(exporter), stream)
+            [chunk async for chunk in agent.chat("Analyse bitte")]
+
+            spans = exporter.spans
+            by_name = {}
+            for span in spans:
+                by_name.setdefault(span.name, []).append(span)
+            turn = by_name["dexter.turn"][0]
+            iterations = by_name["dexter.iteration"]
+            model_calls = by_name["dexter.model_call"]
+            tools = by_name["dexter.tool"]
+
+            assert len(by_name["dexter.turn"]) == 1 and turn.parent_id is None
+            assert len(iterations) == 2 and all(span.parent_id == turn.span_id for span in iterations)
+            assert [span.attributes["attempt"] for span in model_calls] == [1, 1, 2]
+            assert model_calls[1].error and not model_calls[2].error
+            assert model_calls[2].parent_id == iterations[1].span_id
+            assert model_calls[0].attributes["gen_ai.usage.input_tokens"] > 0
+            assert len(tools) == 2 and all(span.parent_id == iterations[0].span_id for span in tools)
+            assert tools[0].attributes["tool.name"] == "calculate_roi"
+            assert tools[0].attributes["tool.args_bytes"] > 0 and tools[0].attributes["tool.result_bytes"] > 0
+            assert turn.attributes["iterations"] == 2 and turn.attributes["retries"] == 1
+            assert len({span.trace_id for span in spans}) == 1
+            assert all(span.end_ns >= span.start_ns for span in spans)
+    print("  - Test 1: Turn/iteration/model-call/tool span tree - PASSED")
+
+    # Test 2: OTLP/JSON Lines Export
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "traces.jsonl"
+        tracer = Tracer(JsonlSpanExporter(path))
+        with tracer.start_span("root", attributes={"n": 1}) as root:
+            with tracer.start_span("child", root, {"ok": True, "ratio": 0.5}):
+                pass
+        tracer.exporter.flush()
+        lines = path.read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 1
+        batch = json.loads(lines[0])["resourceSpans"][0]
+        assert batch["resource"]["attributes"][0] == {"key": "service.name", "value": {"stringValue": "dexter-agent"}}
+        child, parent = batch["scopeSpans"][0]["spans"]
+        assert len(parent["traceId"]) == 32 and len(parent["spanId"]) == 16
+        assert child["parentSpanId"] == parent["spanId"] and "parentSpanId" not in parent
+        assert {"key": "n", "value": {"intValue": "1"}} in parent["attributes"]
+        assert {"key": "ok", "value": {"boolValue": True}} in child["attributes"]
+        tracer.exporter.close()
+    print("  - Test 2: OTLP/JSON lines export - PASSED")
+
+    # Test 3: Sampling - ganze Traces werden verworfen, Kinder erben die Entscheidung
+    exporter = InMemorySpanExporter()
+    tracer = Tracer(exporter, sample_rate=0.25)
+    for _ in range(400):
+        root = tracer.start_span("root")
+        tracer.start_span("child", root).end()
+        root.end()
+    roots = sum(1 for span in exporter.spans if span.name == "root")
+    assert 50 <= roots <= 150, roots
+    assert len(exporter.spans) == 2 * roots
+    print("  - Test 3: Head sampling per trace - PASSED")
+
+    # Test 4: Deaktiviert kostet nur wenige Mikrosekunden pro Span
+    tracer = Tracer()
+    iterations = 100_000
+    start = time.perf_counter()
+    for _ in range(iterations):
+        span = tracer.start_span("dexter.tool", NOOP_SPAN, {"tool.name": "x"})
+        if span.recording:
+            span.set_attribute("tool.args_bytes", 1)
+        span.end()
+    per_span_us = (time.perf_counter() - start) / iterations * 1e6
+    assert per_span_us < 2.0, per_span_us
+    print(f"  - Test 4: Disabled tracing overhead {per_span_us:.2f}µs/span - PASSED")
+
+    # Test 5: JSONL-Export blockiert den Event Loop nicht (Writer-Thread, Drop bei voller Queue)
+    with tempfile.TemporaryDirectory() as tmp:
+        exporter = JsonlSpanExporter(Path(tmp) / "traces.jsonl", max_queue=2)
+        write = exporter._write
+        release = threading.Event()
+
+        def slow_write(lines):
+            release.wait(5)
+            write(lines)
+
+        exporter._write = slow_write
+        tracer = Tracer(exporter)
+        start = time.perf_counter()
+        for _ in range(20):
+            tracer.start_span("root").end()
+        assert time.perf_counter() - start < 0.5
+        assert exporter.dropped > 0
+        release.set()
+        exporter.close()
+        lines = (Path(tmp) / "traces.jsonl").read_text(encoding="utf-8").splitlines()
+        assert len(lines) == 20 - exporter.dropped
+    print("  - Test 5: JSONL export runs on a background thread - PASSED")
+
+    # Test 6: Offener Circuit Breaker (Streaming) hinterlässt keine offenen Spans
+    async with MockOpenAIServer(lambda request: MockReply(content="ok")) as server:
+        exporter = InMemorySpanExporter()
+        tracer = Tracer(exporter)
+        started = []
+        start_span = tracer.start_span
+
+        def tracking_start_span(*args, **kwargs):
+            span = start_span(*args, **kwargs)
+            started.append(span)
+            return span
+
+        tracer.start_span = tracking_start_span
+        agent = make_agent(server, tracer, stream=True)
+        agent.circuit_breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=60)
+        agent.circuit_breaker.state = "open"
+        agent.circuit_breaker.opened_at = time.monotonic()
+        [chunk async for chunk in agent.chat("Hallo")]
+        assert started and all(span.end_ns is not None for span in started)
+        assert not [span for span in exporter.spans if span.name == "dexter.model_call"]
+        assert agent.session_metrics.last_turn.model_calls == 0
+    print("  - Test 6: Open circuit does not leak model-call spans - PASSED")
+
+    # Test 7: TRACE_EXPORT_PATH wird wie LOG_DIR relativ zum Projektverzeichnis aufgelöst
+    previous = os.environ.get("TRACE_EXPORT_PATH")
+    try:
+        os.environ["TRACE_EXPORT_PATH"] = "./logs/test-traces.jsonl"
+        settings = DexterConfig()
+        assert Path(settings.tracing.export_path) == settings.base_dir.resolve() / "logs" / "test-traces.jsonl"
+    finally:
+        if previous is None:
+            os.environ.pop("TRACE_EXPORT_PATH", None)
+        else:
+            os.environ["TRACE_EXPORT_PATH"] = previous
+    print("  - Test 7: Trace export path is resolved against the project directory - PASSED")
+
+    await close_shared_async_clients()
+    print("\n[OK] Tracing tests completed successfully!")
+
+
+if __name__ == "__main__":
+    asyncio.run(run_tests())
@@ -0,0 +1,489 @@
+"""
+Dexter Tool Batch - Finanz-Tools direkt auf vielen Zeilen ausführen
+
+Für Massenrechnungen (z.B. ROI für tausende Projekte, Break-Even pro
+Produkt) ohne LLM-Roundtrip:
+- Jede Zeile der Eingabe (CSV oder JSONL) ist ein Tool-Aufruf
+- Argumente werden wie bei Function Calling vom Registry-Validator geprüft
+- Ausführung in einem Prozess-Pool, Zeilen werden in Chunks verteilt
+  (ein Event Loop pro Chunk statt pro Zeile)
+- Markdown-Reports werden standardmäßig nicht erzeugt (render=False),
+  optional als Dateien in --markdown-dir
+- Ergebnisse als Tabelle: CSV, JSONL, spaltenweises JSON oder Parquet
+  (pyarrow optional), eine Zeile pro Aufruf in Eingabe-Reihenfolge
+- Zusammenfassung mit Durchsatz (Zeilen/s)
+
+Eingabe CSV (Spalten = Tool-Argumente, verschachtelte Argumente mit Punkt):
+    id,investment_cost,revenue_generated,timeframe_months
+    p-1,50000,72000,12
+
+    id,current_assets.cash,current_assets.inventory,equity.share_capital,...
+
+Eingabe JSONL (flach oder mit "arguments"):
+    {"id": "p-1", "tool": "calculate_roi", "investment_cost": 50000, "revenue_generated": 72000}
+    {"id": "p-2", "tool": "analyze_break_even", "arguments": {"fixed_costs": 10000, ...}}
+
+Verwendung:
+    python tool_batch.py rows.csv --tool calculate_roi --output roi.csv
+    python tool_batch.py rows.jsonl --output results.json --workers 8 --chunk-size 500
+
+Author: Dexter Agent Development Team
+"""
+
+import argparse
+import asyncio
+import csv
+import json
+import math
+import os
+import sys
+import time
+from collections import Counter
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence, Tuple
+
+from config import config
+from lib.ai.tool_registry import ToolRegistryError, build_model_payload, get_tool_registry
+
+# Status einer Zeile im Ergebnis
+STATUS_OK = "ok"
+STATUS_ERROR = "error"
+
+# Feste Spalten vor den Ergebnis-Feldern
+BASE_COLUMNS = ("id", "tool", "status", "error")
+
+MAX_AUTO_CHUNK_SIZE = 1000
+OUTPUT_FORMATS = ("csv", "jsonl", "json", "parquet")
+
+
+class ToolBatchInputError(ValueError):
+    """Ungültige Zeile in der Tool-Batch-Eingabe"""
+
+
+@dataclass
+class ToolRow:
+    """Ein Tool-Aufruf der Eingabe"""
+    row_id: str
+    tool: str
+    arguments: Dict[str, Any]
+
+
+@dataclass
+class ToolBatchStats:
+    """Zusammenfassung eines Tool-Batch-Laufs"""
+    rows: int = 0
+    ok: int = 0
+    errors: int = 0
+    workers: int = 1
+    chunk_size: int = 0
+    chunks: int = 0
+    wall_seconds: float = 0.0
+    tools: Counter = field(default_factory=Counter)
+
+    @property
+    def rows_per_second(self) -> float:
+        return self.rows / self.wall_seconds if self.wall_seconds > 0 else 0.0
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {
+            "rows": self.rows,
+            "ok": self.ok,
+            "errors": self.errors,
+            "tools": dict(self.tools),
+            "workers": self.workers,
+            "chunk_size": self.chunk_size,
+            "chunks": self.chunks,
+            "wall_seconds": round(self.wall_seconds, 3),
+            "rows_per_second": round(self.rows_per_second, 1),
+        }
+
+
+# ============================================================================
+# Eingabe
+# ============================================================================
+
+def _schema_types(tool: str) -> Dict[str, str]:
+    """JSON-Schema Typen der Top-Level Argumente eines Tools"""
+    schema = get_tool_registry().get(tool).schema["function"]["parameters"]
+    return {name: prop.get("type", "string") for name, prop in schema.get("properties", {}).items()}
+
+
+def _parse_scalar(text: str) -> Any:
+    """CSV-Zelle in verschachteltem Argument: Zahl/Bool/JSON wenn möglich, sonst String"""
+    try:
+        return json.loads(text)
+    except ValueError:
+        return text
+
+
+def _coerce(value: str, json_type: str, column: str) -> Any:
+    """Wandelt eine CSV-Zelle anhand des Schema-Typs um"""
+    try:
+        if json_type == "number":
+            return float(value)
+        if json_type == "integer":
+            return int(float(value)) if float(value).is_integer() else float(value)
+        if json_type == "boolean":
+            lowered = value.strip().lower()
+            if lowered in ("true", "1", "ja", "yes"):
+                return True
+            if lowered in ("false", "0", "nein", "no"):
+                return False
+            raise ValueError(value)
+        if json_type in ("array", "object"):
+            return json.loads(value)
+    except ValueError:
+        raise ToolBatchInputError(f"Spalte '{column}': '{value}' ist kein gültiger Wert vom Typ {json_type}") from None
+    return value
+
+
+def coerce_csv_row(cells: Dict[str, str], types: Dict[str, str]) -> Dict[str, Any]:
+    """
+    Baut Tool-Argumente aus einer CSV-Zeile
+
+    Leere Zellen werden ausgelassen (Tool-Default greift), Spalten mit Punkt
+    ("current_assets.cash") ergeben verschachtelte Dicts.
+
+    Args:
+        cells: Spalte → Zelle (ohne id/tool)
+        types: Schema-Typen der Top-Level Argumente
+
+    Returns:
+        Argumente für den Registry-Validator
+    """
+    arguments: Dict[str, Any] = {}
+    for column, value in cells.items():
+        if value is None or value == "":
+            continue
+        if "." not in column:
+            arguments[column] = _coerce(value, types.get(column, "string"), column)
+            continue
+        *parents, leaf = column.split(".")
+        node = arguments
+        for part in parents:
+            node = node.setdefault(part, {})
+            if not isinstance(node, dict):
+                raise ToolBatchInputError(f"Spalte '{column}' kollidiert mit '{part}'")
+        node[leaf] = _parse_scalar(value)
+    return arguments
+
+
+def _resolve_tool(data: Dict[str, Any], tool: Optional[str], where: str) -> str:
+    name = data.pop("tool", None) or tool
+    if not name:
+        raise ToolBatchInputError(f"{where}: kein Tool angegeben (Spalte 'tool' oder --tool)")
+    if name not in get_tool_registry():
+        raise ToolBatchInputError(f"{where}: unbekanntes Tool '{name}'")
+    return name
+
+
+def load_rows(path: Path, tool: Optional[str] = None) -> List[ToolRow]:
+    """
+    Liest CSV (.csv) oder JSONL (sonst) mit einem Tool-Aufruf pro Zeile
+
+    Args:
+        path: Eingabedatei
+        tool: Tool für Zeilen ohne 'tool' Spalte/Feld
+
+    Raises:
+        ToolBatchInputError: Ungültige Zeile oder doppelte ID
+    """
+    rows: List[ToolRow] = []
+    types_cache: Dict[str, Dict[str, str]] = {}
+
+    with open(path, encoding="utf-8", newline="") as file:
+        if path.suffix.lower() == ".csv":
+            for number, cells in enumerate(csv.DictReader(file), start=2):
+                where = f"Zeile {number}"
+                row_id = cells.pop("id", None) or f"row-{len(rows) + 1}"
+                name = _resolve_tool(cells, tool, where)
+                types = types_cache.get(name) or types_cache.setdefault(name, _schema_types(name))
+                try:
+                    arguments = coerce_csv_row(cells, types)
+                except ToolBatchInputError as e:
+                    raise ToolBatchInputError(f"{where}: {e}") from None
+                rows.append(ToolRow(str(row_id), name, arguments))
+        else:
+            for number, line in enumerate(file, start=1):
+                if not line.strip():
+                    continue
+                where = f"Zeile {number}"
+                try:
+                    data = json.loads(line)
+                except json.JSONDecodeError as e:
+                    raise ToolBatchInputError(f"{where}: kein gültiges JSON ({e.msg})") from None
+                if not isinstance(data, dict):
+                    raise ToolBatchInputError(f"{where}: JSON-Objekt erwartet")
+                row_id = data.pop("id", None) or f"row-{len(rows) + 1}"
+                name = _resolve_tool(data, tool, where)
+                arguments = data.pop("arguments", None)
+                if arguments is None:
+                    arguments = data
+                elif not isinstance(arguments, dict) or data:
+                    raise ToolBatchInputError(f"{where}: 'arguments' muss ein Objekt sein und allein stehen")
+                rows.append(ToolRow(str(row_id), name, arguments))
+
+    seen = set()
+    for row in rows:
+        if row.row_id in seen:
+            raise ToolBatchInputError(f"Doppelte ID: {row.row_id}")
+        seen.add(row.row_id)
+    return rows
+
+
+# ============================================================================
+# Ausführung
+# ============================================================================
+
+def flatten_record(payload: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """Verschachtelte Dicts → Spalten mit Punkt-Namen (Listen bleiben Werte)"""
+    flat: Dict[str, Any] = {}
+    for key, value in payload.items():
+        name = f"{prefix}{key}"
+        if isinstance(value, dict):
+            flat.update(flatten_record(value, f"{name}."))
+        else:
+            flat[name] = value
+    return flat
+
+
+async def _run_rows(rows: Sequence[ToolRow], render: bool) -> List[Dict[str, Any]]:
+    """Führt Zeilen nacheinander in einem Event Loop aus"""
+    registry = get_tool_registry()
+    records = []
+    for row in rows:
+        record: Dict[str, Any] = {"id": row.row_id, "tool": row.tool, "status": STATUS_OK, "error": ""}
+        try:
+            spec = registry.get(row.tool)
+            tool_result = await spec.handler(**spec.validator(row.arguments), render=render)
+        except (ToolRegistryError, TypeError, ValueError, ArithmeticError) as e:
+            record.update(status=STATUS_ERROR, error=str(e))
+            records.append(record)
+            continue
+
+        payload = build_model_payload(tool_result)
+        if "error" in payload:
+            record.update(status=STATUS_ERROR, error=str(payload["error"]))
+        else:
+            record.update(flatten_record(payload))
+        if render and "formatted_output" in tool_result:
+            record["formatted_output"] = tool_result["formatted_output"]
+        records.append(record)
+    return records
+
+
+def _run_chunk(rows: Sequence[ToolRow], render: bool) -> List[Dict[str, Any]]:
+    """Einstiegspunkt im Worker-Prozess (muss picklebar auf Modulebene liegen)"""
+    return asyncio.run(_run_rows(rows, render))
+
+
+def _auto_chunk_size(rows: int, workers: int) -> int:
+    """~4 Chunks pro Worker: gleicht ungleiche Laufzeiten aus, ohne IPC-Overhead pro Zeile"""
+    return max(1, min(MAX_AUTO_CHUNK_SIZE, math.ceil(rows / (workers * 4))))
+
+
+def run_tool_batch(
+    rows: Sequence[ToolRow],
+    workers: Optional[int] = None,
+    chunk_size: Optional[int] = None,
+    render: bool = False,
+    on_chunk: Optional[Callable[[int, int], None]] = None
+) -> Tuple[List[Dict[str, Any]], ToolBatchStats]:
+    """
+    Führt Tool-Aufrufe direkt (ohne LLM) aus
+
+    Args:
+        rows: Tool-Aufrufe
+        workers: Prozesse (None = TOOL_BATCH_WORKERS, 0 = CPU-Anzahl, 1 = im aktuellen Prozess)
+        chunk_size: Zeilen pro Chunk (None = TOOL_BATCH_CHUNK_SIZE, 0 = automatisch)
+        render: Markdown-Reports erzeugen (Spalte formatted_output)
+        on_chunk: Optional - Callback(fertige Zeilen, Gesamtzahl) nach jedem Chunk
+
+    Returns:
+        (Ergebnis-Records in Eingabe-Reihenfolge, Statistik)
+    """
+    settings = config.batch
+    workers = settings.tool_workers if workers is None else workers
+    workers = workers or os.cpu_count() or 1
+    chunk_size = settings.tool_chunk_size if chunk_size is None else chunk_size
+    chunk_size = chunk_size or _auto_chunk_size(len(rows), workers)
+    chunks = [rows[start:start + chunk_size] for start in range(0, len(rows), chunk_size)]
+    workers = max(1, min(workers, len(chunks)))
+
+    stats = ToolBatchStats(rows=len(rows), workers=workers, chunk_size=chunk_size, chunks=len(chunks))
+    results: List[Optional[List[Dict[str, Any]]]] = [None] * len(chunks)
+    done = 0
+    started = time.perf_counter()
+
+    if workers == 1:
+        for index, chunk in enumerate(chunks):
+            results[index] = _run_chunk(chunk, render)
+            done += len(chunk)
+            if on_chunk:
+                on_chunk(done, len(rows))
+    else:
+        with ProcessPoolExecutor(max_workers=workers) as pool:
+            futures = {pool.submit(_run_chunk, chunk, render): index for index, chunk in enumerate(chunks)}
+            for future in as_completed(futures):
+                index = futures[future]
+                results[index] = future.result()
+                done += len(chunks[index])
+                if on_chunk:
+                    on_chunk(done, len(rows))
+
+    stats.wall_seconds = time.perf_counter() - started
+    records = [record for chunk_records in results for record in chunk_records]
+    for record in records:
+        stats.tools[record["tool"]] += 1
+        if record["status"] == STATUS_OK:
+            stats.ok += 1
+        else:
+            stats.errors += 1
+    return records, stats
+
+
+# ============================================================================
+# Ausgabe
+# ============================================================================
+
+def to_columns(records: Iterable[Dict[str, Any]]) -> Dict[str, List[Any]]:
+    """Records → Spalten (fehlende Felder = None), feste Spalten zuerst"""
+    records = list(records)
+    names: Dict[str, None] = dict.fromkeys(BASE_COLUMNS)
+    for record in records:
+        names.update(dict.fromkeys(key for key in record if key != "formatted_output"))
+    return {name: [record.get(name) for record in records] for name in names}
+
+
+def _cell(value: Any) -> Any:
+    """Listen/Dicts als JSON-String für flache Formate"""
+    if isinstance(value, (list, dict)):
+        return json.dumps(value, ensure_ascii=False)
+    return value
+
+
+def write_records(records: List[Dict[str, Any]], path: Path, fmt: Optional[str] = None) -> None:
+    """
+    Schreibt Ergebnis-Records als Tabelle (ohne Markdown)
+
+    Args:
+        records: Ergebnis von run_tool_batch
+        path: Zieldatei
+        fmt: csv | jsonl | json (spaltenweise) | parquet (Default: Dateiendung)
+    """
+    fmt = fmt or path.suffix.lower().lstrip(".")
+    if fmt not in OUTPUT_FORMATS:
+        raise ValueError(f"Unbekanntes Ausgabeformat '{fmt}' (erlaubt: {', '.join(OUTPUT_FORMATS)})")
+    columns = to_columns(records)
+
+    if fmt == "parquet":
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise ImportError(
+                "pyarrow ist für Parquet-Ausgabe erforderlich. Installieren Sie es mit: pip install pyarrow"
+            ) from None
+        pq.write_table(pa.table({name: [_cell(v) for v in values] for name, values in columns.items()}), path)
+        return
+
+    with open(path, "w", encoding="utf-8", newline="") as file:
+        if fmt == "csv":
+            writer = csv.writer(file)
+            writer.writerow(columns)
+            writer.writerows(zip(*([_cell(v) for v in values] for values in columns.values())))
+        elif fmt == "jsonl":
+            for record in records:
+                row = {key: value for key, value in record.items() if key != "formatted_output"}
+                file.write(json.dumps(row, ensure_ascii=False) + "\n")
+        else:
+            json.dump(columns, file, ensure_ascii=False)
+
+
+def write_markdown(records: List[Dict[str, Any]], directory: Path) -> int:
+    """Schreibt formatted_output pro Zeile als <id>.md, gibt Anzahl zurück"""
+    directory.mkdir(parents=True, exist_ok=True)
+    written = 0
+    for record in records:
+        if record.get("formatted_output"):
+            safe_id = "".join(c if c.isalnum() or c in "-_." else "_" for c in record["id"])
+            (directory / f"{safe_id}.md").write_text(record["formatted_output"], encoding="utf-8")
+            written += 1
+    return written
+
+
+# ============================================================================
+# CLI
+# ============================================================================
+
+def print_summary(summary: Dict[str, Any], output: Path) -> None:
+    """Gibt die Zusammenfassung aus"""
+    tools = ", ".join(f"{name}: {count}" for name, count in sorted(summary["tools"].items())) or "-"
+    print(f"\n🧮 Dexter Tool Batch abgeschlossen → {output}")
+    print(f"   Zeilen: {summary['rows']} (ok: {summary['ok']}, Fehler: {summary['errors']}) | {tools}")
+    print(f"   Wall: {summary['wall_seconds']}s | {summary['rows_per_second']} Zeilen/s | "
+          f"{summary['workers']} Worker, {summary['chunks']} Chunks à {summary['chunk_size']}")
+
+
+def parse_args(argv=None) -> argparse.Namespace:
+    parser = argparse.ArgumentParser(description="Dexter Finanz-Tools direkt (ohne LLM) auf CSV/JSONL ausführen")
+    parser.add_argument("input", type=Path, help="CSV oder JSONL mit einem Tool-Aufruf pro Zeile")
+    parser.add_argument("--tool", help="Tool für Zeilen ohne 'tool' Spalte (z.B. calculate_roi)")
+    parser.add_argument("--output", type=Path, help="Ergebnisdatei .csv/.jsonl/.json/.parquet (Default: <input>.results.csv)")
+    parser.add_argument("--format", choices=OUTPUT_FORMATS, help="Ausgabeformat (Default: Dateiendung)")
+    parser.add_argument("--workers", type=int, help="Prozesse, 0 = CPU-Anzahl, 1 = ohne Pool (Default: TOOL_BATCH_WORKERS)")
+    parser.add_argument("--chunk-size", type=int, help="Zeilen pro Chunk, 0 = automatisch (Default: TOOL_BATCH_CHUNK_SIZE)")
+    parser.add_argument("--markdown-dir", type=Path, help="Markdown-Reports pro Zeile in dieses Verzeichnis schreiben")
+    parser.add_argument("--summary-json", type=Path, help="Zusammenfassung zusätzlich als JSON speichern")
+    parser.add_argument("--quiet", action="store_true", help="Kein Fortschritt pro Chunk")
+    return parser.parse_args(argv)
+
+
+def run_from_args(args: argparse.Namespace) -> Dict[str, Any]:
+    """
+    Liest Eingabe, führt alle Zeilen aus und schreibt die Ergebnisse
+
+    Returns:
+        Zusammenfassung inkl. Pfad der Ausgabe
+    """
+    output = args.output or args.input.with_suffix(".results.csv")
+    rows = load_rows(args.input, args.tool)
+
+    def report(done: int, total: int) -> None:
+        if not args.quiet:
+            print(f"[{done}/{total}] Zeilen fertig", file=sys.stderr)
+
+    records, stats = run_tool_batch(
+        rows, workers=args.workers, chunk_size=args.chunk_size,
+        render=args.markdown_dir is not None, on_chunk=report
+    )
+    write_records(records, output, args.format)
+    summary = {"output": str(output), **stats.to_dict()}
+    if args.markdown_dir is not None:
+        summary["markdown_reports"] = write_markdown(records, args.markdown_dir)
+    return summary
+
+
+def main(argv=None) -> int:
+    args = parse_args(argv)
+
+    try:
+        summary = run_from_args(args)
+    except (ToolBatchInputError, FileNotFoundError, ImportError) as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 2
+    except KeyboardInterrupt:
+        print("\n⏹️ Abgebrochen", file=sys.stderr)
+        return 130
+
+    print_summary(summary, Path(summary["output"]))
+    if args.summary_json:
+        args.summary_json.write_text(json.dumps(summary, indent=2, ensure_ascii=False), encoding="utf-8")
+        print(f"\n💾 Zusammenfassung gespeichert: {args.summary_json}")
+    return 1 if summary["errors"] else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
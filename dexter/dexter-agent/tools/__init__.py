@@ -4,51 +4,74 @@ Financial Analysis Tools für den Dexter Agent.
 Dieses Modul enthält alle spezialisierten Finanzanalyse-Tools:
 - ROI Calculator: Return on Investment Berechnungen ✅ IMPLEMENTED
 - Sales Forecaster: Verkaufsprognosen mit Trend-Analyse ✅ IMPLEMENTED
+- Sales Forecast Smoothing: Exponentielle Glättung (Holt-Winters) mit Modellauswahl ✅ IMPLEMENTED
+- Sales Forecast Backtest: Out-of-Sample-Genauigkeit per Rolling-Origin-Backtest ✅ IMPLEMENTED
+- Sales Forecast Batch: Prognosen für viele Serien (SKUs) in einem Aufruf ✅ IMPLEMENTED
+- Online Sales Forecaster: Inkrementelle Prognose für Datenströme ✅ IMPLEMENTED
 - P&L Calculator: Gewinn- und Verlustrechnungen ✅ IMPLEMENTED
 - Balance Sheet Generator: Bilanz-Generierung und Kennzahlen-Analyse ✅ IMPLEMENTED
 - Cash Flow Statement: Kapitalflussrechnung mit OCF/ICF/FCF ✅ IMPLEMENTED
 - Break-Even Analysis: Gewinnschwellen-Analyse mit Scenario Planning ✅ IMPLEMENTED
 """
 
-# Tools werden hier importiert sobald implementiert
-from .roi_calculator import calculate_roi, ROIInput, ROIResult, get_roi_tool_definition
-from .sales_forecaster import forecast_sales, SalesDataPoint, ForecastDataPoint, SalesForecastResult, get_sales_forecaster_tool_definition
-from .pnl_calculator import calculate_pnl, OperatingExpenses, PnLResult, get_pnl_tool_definition
-from .balance_sheet import generate_balance_sheet, Assets, Liabilities, Equity, BalanceSheetResult, get_balance_sheet_tool_definition
-from .cash_flow_statement import generate_cash_flow_statement, OperatingActivities, InvestingActivities, FinancingActivities, CashFlowResult, get_cash_flow_tool_definition
-from .break_even_analysis import analyze_break_even, BreakEvenInput, ScenarioAnalysis, BreakEvenResult, get_break_even_tool_definition
-
-__all__ = [
-    "calculate_roi",
-    "ROIInput",
-    "ROIResult",
-    "get_roi_tool_definition",
-    "forecast_sales",
-    "SalesDataPoint",
-    "ForecastDataPoint",
-    "SalesForecastResult",
-    "get_sales_forecaster_tool_definition",
-    "calculate_pnl",
-    "OperatingExpenses",
-    "PnLResult",
-    "get_pnl_tool_definition",
-    "generate_balance_sheet",
-    "Assets",
-    "Liabilities",
-    "Equity",
-    "BalanceSheetResult",
-    "get_balance_sheet_tool_definition",
-    "generate_cash_flow_statement",
-    "OperatingActivities",
-    "InvestingActivities",
-    "FinancingActivities",
-    "CashFlowResult",
-    "get_cash_flow_tool_definition",
-    "analyze_break_even",
-    "BreakEvenInput",
-    "ScenarioAnalysis",
-    "BreakEvenResult",
-    "get_break_even_tool_definition",
-]
+import importlib
+from typing import Any
+
+# Tools werden erst beim ersten Zugriff importiert (schneller Start, numpy
+# etc. nur wenn das jeweilige Tool genutzt wird)
+_EXPORTS = {
+    "calculate_roi": ".roi_calculator",
+    "ROIInput": ".roi_calculator",
+    "ROIResult": ".roi_calculator",
+    "get_roi_tool_definition": ".roi_calculator",
+    "forecast_sales": ".sales_forecaster",
+    "SalesDataPoint": ".sales_forecaster",
+    "ForecastDataPoint": ".sales_forecaster",
+    "SalesForecastResult": ".sales_forecaster",
+    "get_sales_forecaster_tool_definition": ".sales_forecaster",
+    "forecast_sales_batch": ".sales_forecast_batch",
+    "build_batch_forecast": ".sales_forecast_batch",
+    "BatchForecastResult": ".sales_forecast_batch",
+    "OnlineSalesForecaster": ".sales_forecast_online",
+    "fit_smoothing": ".sales_forecast_smoothing",
+    "SmoothingFit": ".sales_forecast_smoothing",
+    "backtest_sales": ".sales_forecast_backtest",
+    "BacktestReport": ".sales_forecast_backtest",
+    "calculate_pnl": ".pnl_calculator",
+    "OperatingExpenses": ".pnl_calculator",
+    "PnLResult": ".pnl_calculator",
+    "get_pnl_tool_definition": ".pnl_calculator",
+    "generate_balance_sheet": ".balance_sheet",
+    "Assets": ".balance_sheet",
+    "Liabilities": ".balance_sheet",
+    "Equity": ".balance_sheet",
+    "BalanceSheetResult": ".balance_sheet",
+    "get_balance_sheet_tool_definition": ".balance_sheet",
+    "generate_cash_flow_statement": ".cash_flow_statement",
+    "OperatingActivities": ".cash_flow_statement",
+    "InvestingActivities": ".cash_flow_statement",
+    "FinancingActivities": ".cash_flow_statement",
+    "CashFlowResult": ".cash_flow_statement",
+    "get_cash_flow_tool_definition": ".cash_flow_statement",
+    "analyze_break_even": ".break_even_analysis",
+    "BreakEvenInput": ".break_even_analysis",
+    "ScenarioAnalysis": ".break_even_analysis",
+    "BreakEvenResult": ".break_even_analysis",
+    "get_break_even_tool_definition": ".break_even_analysis",
+}
+
+__all__ = list(_EXPORTS)
 
 __version__ = "6.0.0"
+
+
+def __getattr__(name: str) -> Any:
+    if name not in _EXPORTS:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(importlib.import_module(_EXPORTS[name], __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    return sorted(set(globals()) | set(__all__))
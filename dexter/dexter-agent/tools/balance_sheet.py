@@ -22,10 +22,7 @@ import json
 from dataclasses import dataclass, asdict
 from datetime import datetime
 from typing import Any, Dict, List, Tuple
-from config import get_config
-
-# Konfiguration laden
-config = get_config()
+from config import config  # Lazy - wird erst beim ersten Zugriff geladen
 
 
 # ============================================================================
@@ -1121,7 +1118,8 @@ async def generate_balance_sheet(
     assets: Dict[str, float],
     liabilities: Dict[str, float],
     equity: Dict[str, float],
-    date: str
+    date: str,
+    render: bool = True
 ) -> Dict[str, Any]:
     """
     Generiert vollständige Bilanz (Balance Sheet) mit Financial Health Analyse.
@@ -1167,6 +1165,7 @@ async def generate_balance_sheet(
             }
 
         date: Bilanzstichtag im Format "YYYY-MM-DD" (z.B. "2025-06-30")
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
 
     Returns:
         Dict mit:
@@ -1385,11 +1384,8 @@ async def generate_balance_sheet(
         )
 
         # 12. Output formatieren
-        formatted_output = _format_balance_sheet_output(result)
-
-        return {
+        response = {
             "result": result,
-            "formatted_output": formatted_output,
             "raw_data": {
                 "date": date,
                 "total_assets": total_assets,
@@ -1399,11 +1395,34 @@ async def generate_balance_sheet(
                 "financial_health_score": financial_health_score
             }
         }
+        if render:
+            response["formatted_output"] = _format_balance_sheet_output(result)
+        return response
 
     except Exception as e:
         raise ValueError(f"Balance Sheet Generierung fehlgeschlagen: {str(e)}")
 
 
+# Bilanz-Summen und Ratios für den model-facing Payload
+MODEL_PAYLOAD_FIELDS = (
+    "date",
+    "total_assets",
+    "total_liabilities",
+    "total_equity",
+    "is_balanced",
+    "current_ratio",
+    "quick_ratio",
+    "debt_to_equity_ratio",
+    "debt_to_assets_ratio",
+    "equity_ratio",
+    "working_capital",
+    "financial_health_score",
+    "liquidity_status",
+    "leverage_status",
+    "warnings",
+)
+
+
 def get_balance_sheet_tool_definition() -> dict:
     """
     Gibt Tool-Definition für Claude Agent SDK zurück.
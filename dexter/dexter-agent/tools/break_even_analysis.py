@@ -19,7 +19,6 @@ Version: 1.0.0
 
 from dataclasses import dataclass
 from typing import Any, Optional, Dict, List
-import asyncio
 
 
 # ============================================================================
@@ -108,7 +107,8 @@ async def analyze_break_even(
     variable_cost_per_unit: float,
     selling_price_per_unit: float,
     current_sales_units: Optional[int] = None,
-    target_profit: Optional[float] = None
+    target_profit: Optional[float] = None,
+    render: bool = True
 ) -> Dict[str, Any]:
     """
     Führt vollständige Break-Even Analyse durch.
@@ -119,6 +119,7 @@ async def analyze_break_even(
         selling_price_per_unit: Verkaufspreis pro Einheit
         current_sales_units: Optional - Aktuelle Verkaufsmenge (für MoS)
         target_profit: Optional - Gewinnziel (für Target Profit Analysis)
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
 
     Returns:
         Dict mit BreakEvenResult und formatted_output
@@ -289,13 +290,13 @@ async def analyze_break_even(
         warnings=warnings
     )
 
+    response = {"result": result.__dict__}
+
     # 13. Formatted Output
-    formatted_output = _format_break_even_output(result)
+    if render:
+        response["formatted_output"] = _format_break_even_output(result)
 
-    return {
-        "result": result.__dict__,
-        "formatted_output": formatted_output
-    }
+    return response
 
 
 # ============================================================================
@@ -791,6 +792,23 @@ def _format_scenario_table(scenarios: List[ScenarioAnalysis], base_be: float) ->
     return "\n".join(lines)
 
 
+# Break-Even-Kennzahlen für den model-facing Payload
+MODEL_PAYLOAD_FIELDS = (
+    "contribution_margin",
+    "contribution_margin_ratio",
+    "break_even_units",
+    "break_even_revenue",
+    "margin_of_safety_units",
+    "margin_of_safety_percent",
+    "target_profit_units",
+    "scenarios",
+    "business_viability_score",
+    "risk_level",
+    "pricing_power",
+    "warnings",
+)
+
+
 def get_break_even_tool_definition() -> dict:
     """
     Gibt Tool-Definition für Claude Agent SDK zurück
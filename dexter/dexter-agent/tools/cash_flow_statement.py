@@ -21,10 +21,7 @@ Version: 1.0.0
 import json
 from dataclasses import dataclass, asdict
 from typing import Any, Dict, List, Tuple, Optional
-from config import get_config
-
-# Konfiguration laden
-config = get_config()
+from config import config  # Lazy - wird erst beim ersten Zugriff geladen
 
 
 # ============================================================================
@@ -864,7 +861,8 @@ async def generate_cash_flow_statement(
     financing_activities: Dict[str, float],
     beginning_cash: float,
     period: str,
-    revenue: Optional[float] = None
+    revenue: Optional[float] = None,
+    render: bool = True
 ) -> Dict[str, Any]:
     """
     Generiert vollständige Kapitalflussrechnung (Cash Flow Statement).
@@ -906,6 +904,7 @@ async def generate_cash_flow_statement(
         beginning_cash: Cash-Position zu Periodenanfang
         period: Periode (z.B. "Q1 2025", "FY 2024")
         revenue: Optional - Revenue für Cash Flow Margin Berechnung
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
 
     Returns:
         Dict mit:
@@ -1031,11 +1030,8 @@ async def generate_cash_flow_statement(
         )
 
         # 13. Output formatieren
-        formatted_output = _format_cash_flow_output(result)
-
-        return {
+        response = {
             "result": result,
-            "formatted_output": formatted_output,
             "raw_data": {
                 "period": period,
                 "operating_cash_flow": ocf,
@@ -1046,11 +1042,32 @@ async def generate_cash_flow_statement(
                 "quality_score": quality_score
             }
         }
+        if render:
+            response["formatted_output"] = _format_cash_flow_output(result)
+        return response
 
     except Exception as e:
         raise ValueError(f"Cash Flow Statement Generierung fehlgeschlagen: {str(e)}")
 
 
+# Cash-Flow-Summen und Scores für den model-facing Payload
+MODEL_PAYLOAD_FIELDS = (
+    "period",
+    "operating_cash_flow",
+    "investing_cash_flow",
+    "financing_cash_flow",
+    "net_cash_flow",
+    "beginning_cash",
+    "ending_cash",
+    "free_cash_flow",
+    "cash_flow_margin",
+    "cash_flow_quality_score",
+    "liquidity_trend",
+    "cash_generation_strength",
+    "warnings",
+)
+
+
 def get_cash_flow_tool_definition() -> dict:
     """
     Gibt Tool-Definition für Claude Agent SDK zurück.
@@ -15,8 +15,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 try:
-    from config import get_config
-    config = get_config()
+    from config import config  # Lazy - wird erst beim ersten Zugriff geladen
 except ImportError:
     config = None
 
@@ -557,7 +556,8 @@ async def calculate_pnl(
     cost_of_goods_sold: float,
     operating_expenses: Dict[str, float],
     period: str,
-    tax_rate: float = 0.25
+    tax_rate: float = 0.25,
+    render: bool = True
 ) -> dict[str, Any]:
     """
     Erstellt vollständige Gewinn- und Verlustrechnung.
@@ -575,6 +575,7 @@ async def calculate_pnl(
         operating_expenses: Dict mit Betriebsausgaben nach Kategorien
         period: Periode (z.B. "Q1 2025", "FY 2025")
         tax_rate: Steuersatz (0.25 = 25%)
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
 
     Returns:
         Dictionary mit P&L-Result und formatiertem Output
@@ -673,14 +674,32 @@ async def calculate_pnl(
     result.recommendation = _generate_pnl_recommendation(result)
     result.warnings = _check_pnl_warnings(result)
 
-    # 11. Output formatieren
-    markdown_output = _format_pnl_output(result)
+    response = {"result": asdict(result), "success": True}
 
-    return {
-        "result": asdict(result),
-        "formatted_output": markdown_output,
-        "success": True
-    }
+    # 11. Output formatieren
+    if render:
+        response["formatted_output"] = _format_pnl_output(result)
+
+    return response
+
+
+# P&L-Felder für den model-facing Payload
+MODEL_PAYLOAD_FIELDS = (
+    "period",
+    "revenue",
+    "gross_profit",
+    "gross_margin_percent",
+    "total_operating_expenses",
+    "operating_profit",
+    "operating_margin_percent",
+    "net_profit",
+    "net_margin_percent",
+    "profitability_score",
+    "profitability_category",
+    "largest_expense_category",
+    "break_even_revenue",
+    "warnings",
+)
 
 
 # Tool-Definition für Claude Agent SDK
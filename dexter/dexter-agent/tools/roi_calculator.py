@@ -15,8 +15,7 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 try:
-    from config import get_config
-    config = get_config()
+    from config import config  # Lazy - wird erst beim ersten Zugriff geladen
 except ImportError:
     # Fallback für Tests ohne Config
     config = None
@@ -583,7 +582,8 @@ async def calculate_roi(
     investment_cost: float,
     revenue_generated: float,
     timeframe_months: int,
-    recurring_costs: float = 0.0
+    recurring_costs: float = 0.0,
+    render: bool = True
 ) -> dict[str, Any]:
     """
     Berechnet Return on Investment (ROI) mit vollständiger Finanzanalyse.
@@ -600,6 +600,7 @@ async def calculate_roi(
         revenue_generated: Generierte Einnahmen in € über den Zeitraum
         timeframe_months: Betrachtungszeitraum in Monaten
         recurring_costs: Optional - Monatliche laufende Kosten in €
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
 
     Returns:
         Dictionary mit:
@@ -700,14 +701,26 @@ async def calculate_roi(
     # 7. Warnings prüfen
     result.warnings = _check_warnings(result)
 
-    # 8. Formatiertes Output erstellen
-    markdown_output = _format_roi_output(result)
+    response = {"result": asdict(result), "success": True}
 
-    return {
-        "result": asdict(result),
-        "formatted_output": markdown_output,
-        "success": True
-    }
+    # 8. Formatiertes Output erstellen
+    if render:
+        response["formatted_output"] = _format_roi_output(result)
+
+    return response
+
+
+# Kennzahlen, die das Modell als kompakten Payload erhält (Markdown-Report nur für den User)
+MODEL_PAYLOAD_FIELDS = (
+    "roi_percentage",
+    "net_profit",
+    "total_investment",
+    "payback_period_months",
+    "monthly_profit",
+    "profitability_score",
+    "category",
+    "warnings",
+)
 
 
 # Tool-Registrierung für Claude Agent SDK
@@ -0,0 +1,343 @@
+"""
+Sales Forecast Backtest - Out-of-Sample-Genauigkeit per Rolling-Origin-Evaluation.
+
+Statt die Prognosegüte nur heuristisch zu schätzen (Datenpunkte, R², CoV),
+wird jede Methode an vielen historischen Ursprüngen (Origins) so getestet,
+als wäre die Zukunft unbekannt:
+- expanding: Training auf allen Daten vor dem Origin
+- rolling:   Training auf einem festen Fenster vor dem Origin
+
+Alle Trainingsfenster eines Laufs liegen als Matrix vor (Strided Views auf
+die Serie, keine Kopie pro Origin) und werden in einem Schritt gefittet:
+lineare Regression in geschlossener Form, exponentielle Glättung über die
+Matrix-Rekursion aus sales_forecast_smoothing.
+
+Kennzahlen pro Methode: MAPE, sMAPE, RMSE und Abdeckung der 95%-Intervalle.
+Annahme wie beim Forecast selbst: ein Datenpunkt pro Periode (Monat).
+"""
+
+from dataclasses import asdict, dataclass
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from tools.sales_forecaster import (
+    FORECAST_METHODS,
+    METHOD_LABELS,
+    SalesDataError,
+    _numpy,
+    sales_columns,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+# Standard-Vergleich (auto nur auf Anfrage - verschachtelter Holdout pro Origin)
+BACKTEST_METHODS = ("linear", "simple", "double", "triple")
+BACKTEST_WINDOWS = ("expanding", "rolling")
+
+# Höchstens so viele (jüngste) Origins pro Lauf
+MAX_ORIGINS = 24
+
+
+@dataclass
+class BacktestMetrics:
+    """Out-of-Sample-Kennzahlen einer Methode (über alle Origins und Horizonte)."""
+
+    method: str                         # "linear", "simple", "double", "triple", "auto"
+    origins: int                        # Origins mit auswertbarer Prognose
+    mape: Optional[float]               # Mean Absolute Percentage Error in %
+    smape: Optional[float]              # Symmetrischer MAPE in % (0-200)
+    rmse: Optional[float]               # Root Mean Squared Error (Währung)
+    coverage: Optional[float]           # Anteil Ist-Werte im 95%-Intervall in %
+    mape_by_horizon: List[Optional[float]]  # MAPE pro Prognose-Schritt (1..h)
+
+
+@dataclass
+class BacktestReport:
+    """Ergebnis eines Backtests mit allen Methoden nebeneinander."""
+
+    horizon: int                        # Prognose-Schritte pro Origin
+    window: str                         # "expanding" oder "rolling"
+    min_train: int                      # Trainingspunkte am ersten Origin (rolling: Fenstergröße)
+    origins: int                        # Anzahl Origins
+    metrics: List[BacktestMetrics]      # Eine Zeile pro Methode
+    best_method: Optional[str]          # Kleinster sMAPE auf gemeinsam auswertbaren Punkten
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisierbare Darstellung."""
+        return asdict(self)
+
+
+def _metric(values: "np.ndarray", valid: "np.ndarray", axis: Optional[int] = None) -> Any:
+    """Mittelwert über gültige Einträge, None (bzw. None pro Spalte) ohne Daten."""
+    np = _numpy()
+    count = valid.sum(axis=axis)
+    total = np.where(valid, values, 0.0).sum(axis=axis)
+    if axis is None:
+        return round(float(total / count), 2) if count else None
+    return [round(float(t / c), 2) if c else None for t, c in zip(total, count)]
+
+
+def _linear_forecasts(
+    values: "np.ndarray",
+    mask: "np.ndarray",
+    months: "np.ndarray",
+    last_month: "np.ndarray",
+    horizon: int,
+    include_seasonality: bool
+) -> Dict[str, "np.ndarray"]:
+    """
+    Lineare Trendprognosen für alle Trainingsfenster (wie build_sales_forecast).
+
+    Geschlossene, maskierte Least-Squares-Formel über die Spaltenposition;
+    Saisonfaktoren aus Monatsdurchschnitten, wenn alle 12 Monate vorkommen.
+    """
+    np = _numpy()
+    n_rows, n_columns = values.shape
+    w = mask.astype(np.float64)
+    n = w.sum(axis=1)
+    x = np.arange(n_columns, dtype=np.float64)
+
+    y_mean = (w * values).sum(axis=1) / n
+    x_mean = (w @ x) / n
+    xc = np.where(mask, x[None, :] - x_mean[:, None], 0.0)
+    yc = np.where(mask, values - y_mean[:, None], 0.0)
+    sxx = (xc * xc).sum(axis=1)
+    slope = np.where(sxx > 0, (xc * yc).sum(axis=1) / np.where(sxx > 0, sxx, 1.0), 0.0)
+    intercept = y_mean - slope * x_mean
+    std_dev = np.sqrt((yc * yc).sum(axis=1) / n)
+
+    steps = np.arange(1, horizon + 1)
+    predicted = slope[:, None] * (n_columns - 1 + steps) + intercept[:, None]
+
+    if include_seasonality:
+        flat = (np.arange(n_rows)[:, None] * 12 + months)[mask]
+        sums = np.bincount(flat, weights=values[mask], minlength=n_rows * 12).reshape(n_rows, 12)
+        counts = np.bincount(flat, minlength=n_rows * 12).reshape(n_rows, 12)
+        averages = sums / np.maximum(counts, 1)
+        overall = averages.mean(axis=1)
+        usable = (counts > 0).all(axis=1) & (n >= 12) & (overall != 0)
+        factors = np.ones((n_rows, 12))
+        factors[usable] = averages[usable] / overall[usable, None]
+        predicted = predicted * np.take_along_axis(factors, (last_month[:, None] + steps) % 12, axis=1)
+
+    return {"predicted": predicted, "interval_std": std_dev}
+
+
+def backtest_columns(
+    dates: "np.ndarray",
+    amounts: "np.ndarray",
+    horizon: int,
+    methods: Sequence[str] = BACKTEST_METHODS,
+    window: str = "expanding",
+    min_train: Optional[int] = None,
+    include_seasonality: bool = False
+) -> BacktestReport:
+    """
+    Rolling-Origin-Backtest für validierte, chronologisch sortierte Spalten.
+
+    Origin o bedeutet: Training auf den Punkten vor o, Vergleich der
+    Prognose-Schritte 1..horizon mit den Punkten o..o+horizon-1 (am Ende der
+    Historie entsprechend weniger). Getestet werden die jüngsten
+    MAX_ORIGINS Origins.
+
+    Args:
+        dates: Datumswerte als datetime64[D]-Array (siehe sales_columns)
+        amounts: Verkaufsbeträge als float64-Array
+        horizon: Prognose-Schritte pro Origin (1-24)
+        methods: Zu vergleichende Methoden (siehe FORECAST_METHODS)
+        window: "expanding" oder "rolling"
+        min_train: Trainingspunkte am ersten Origin bzw. Fenstergröße bei
+            rolling (Default: ein Drittel der Historie, mindestens 3)
+        include_seasonality: Saisonfaktoren für "linear"
+
+    Returns:
+        BacktestReport mit einer Kennzahlen-Zeile pro Methode
+
+    Raises:
+        ValueError: Ungültige Methode, Fensterart, Horizont oder zu wenig Daten
+    """
+    np = _numpy()
+    from numpy.lib.stride_tricks import sliding_window_view
+
+    unknown = [method for method in methods if method not in FORECAST_METHODS]
+    if unknown:
+        raise ValueError(f"Unbekannte Prognose-Methode: {', '.join(unknown)}")
+    if window not in BACKTEST_WINDOWS:
+        raise ValueError(f"Unbekannte Fensterart: {window} (erlaubt: {', '.join(BACKTEST_WINDOWS)})")
+    if not 1 <= horizon <= 24:
+        raise ValueError("Forecast-Horizont muss zwischen 1 und 24 Monaten liegen")
+
+    n = len(amounts)
+    if min_train is None:
+        min_train = max(3, n // 3)
+    if min_train < 3 or min_train >= n:
+        raise ValueError(
+            f"Backtest benötigt mindestens {max(min_train, 3) + 1} Datenpunkte "
+            f"(erhalten: {n}, Training: {min_train})"
+        )
+
+    origins = np.arange(max(min_train, n - MAX_ORIGINS), n)
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12
+
+    # Trainingsfenster als Strided Views: expanding = rechtsbündig mit Maske davor
+    if window == "expanding":
+        width = int(origins[-1])
+        padded = np.concatenate([np.zeros(width), amounts])
+        padded_mask = np.concatenate([np.zeros(width, dtype=bool), np.ones(n, dtype=bool)])
+        padded_months = np.concatenate([np.zeros(width, dtype=np.int64), months])
+        rows = origins
+    else:
+        width, padded, padded_mask, padded_months = min_train, amounts, np.ones(n, dtype=bool), months
+        rows = origins - min_train
+    train = sliding_window_view(padded, width)[rows]
+    train_mask = sliding_window_view(padded_mask, width)[rows]
+    train_months = sliding_window_view(padded_months, width)[rows]
+
+    # Ist-Werte pro Origin und Schritt (nach dem Ende der Historie: NaN)
+    actual = sliding_window_view(np.concatenate([amounts, np.full(horizon, np.nan)]), horizon)[origins]
+    observed = np.isfinite(actual)
+    steps = np.arange(1, horizon + 1)
+
+    metrics = []
+    scored = {}
+    for method in methods:
+        if method == "linear":
+            fitted = _linear_forecasts(
+                train, train_mask, train_months, months[origins - 1], horizon, include_seasonality
+            )
+            predicted, interval_std = fitted["predicted"], fitted["interval_std"]
+        else:
+            from tools.sales_forecast_smoothing import fit_smoothing
+            fit = fit_smoothing(train, train_mask, horizon, method)
+            predicted, interval_std = fit.predicted, fit.residual_std
+
+        # Intervalle wie _calculate_confidence_intervals
+        margin = 1.96 * interval_std[:, None] * (1.0 + steps * 0.1)
+        lower, upper = np.maximum(0, predicted - margin), predicted + margin
+
+        valid = observed & np.isfinite(predicted)
+        error = np.where(valid, actual - predicted, 0.0)
+        absolute = np.abs(error)
+        magnitude = np.abs(np.where(valid, actual, 0.0))
+        denominator = magnitude + np.abs(np.where(valid, predicted, 0.0))
+        with np.errstate(divide="ignore", invalid="ignore"):
+            ape = absolute / magnitude * 100
+            sape = 2 * absolute / denominator * 100
+        rmse = _metric(error * error, valid)
+        if valid.any():
+            scored[method] = (sape, valid & (denominator > 0))
+
+        metrics.append(BacktestMetrics(
+            method=method,
+            origins=int(valid.any(axis=1).sum()),
+            mape=_metric(ape, valid & (magnitude > 0)),
+            smape=_metric(sape, valid & (denominator > 0)),
+            rmse=round(rmse ** 0.5, 2) if rmse is not None else None,
+            coverage=_metric(((actual >= lower) & (actual <= upper)) * 100.0, valid),
+            mape_by_horizon=_metric(ape, valid & (magnitude > 0), axis=0)
+        ))
+
+    # Methoden mit mehr Datenbedarf (Holt-Winters) haben weniger Origins -
+    # verglichen wird daher nur auf den Punkten, die alle Methoden prognostizieren
+    best_method = None
+    if scored:
+        common = np.logical_and.reduce([valid for _, valid in scored.values()])
+        if common.any():
+            errors = {method: _metric(sape, common) for method, (sape, _) in scored.items()}
+            best_method = min(errors, key=errors.get)
+
+    return BacktestReport(
+        horizon=horizon,
+        window=window,
+        min_train=min_train,
+        origins=len(origins),
+        metrics=metrics,
+        best_method=best_method
+    )
+
+
+def _format_backtest_output(report: BacktestReport, current_method: Optional[str] = None) -> str:
+    """
+    Formatiert den Methodenvergleich als Markdown-Abschnitt.
+
+    Args:
+        report: Backtest-Ergebnis
+        current_method: Für die Prognose verwendete Methode (wird markiert)
+
+    Returns:
+        Formatierter Markdown-String
+    """
+    def fmt(value: Optional[float], suffix: str = "%") -> str:
+        return "-" if value is None else f"{value:,.1f}{suffix}"
+
+    output = "## 🧪 Backtest (Out-of-Sample)\n\n"
+    output += (
+        f"{report.origins} Origins ({report.window}, Training ab {report.min_train} Datenpunkten), "
+        f"je bis zu {report.horizon} Monate voraus.\n\n"
+    )
+    output += "| Methode | Origins | MAPE | sMAPE | RMSE | Abdeckung 95%-Intervall |\n"
+    output += "|---------|---------|------|-------|------|-------------------------|\n"
+    for item in report.metrics:
+        label = METHOD_LABELS[item.method]
+        if item.method == current_method:
+            label = f"**{label}** ←"
+        output += (
+            f"| {label} | {item.origins} | {fmt(item.mape)} | {fmt(item.smape)} | "
+            f"{fmt(item.rmse, '')} | {fmt(item.coverage)} |\n"
+        )
+    if report.best_method:
+        output += f"\nGeringster sMAPE: **{METHOD_LABELS[report.best_method]}**.\n"
+    return output + "\n"
+
+
+async def backtest_sales(
+    historical_sales: List[dict],
+    forecast_months: int,
+    methods: Optional[Sequence[str]] = None,
+    window: str = "expanding",
+    min_train: Optional[int] = None,
+    include_seasonality: bool = False,
+    render: bool = True
+) -> Dict[str, Any]:
+    """
+    Vergleicht Prognose-Methoden per Rolling-Origin-Backtest.
+
+    Args:
+        historical_sales: Verkaufsdaten im forecast_sales Format
+            Format: [{"date": "2025-01", "amount": 120000}, ...]
+        forecast_months: Prognose-Schritte pro Origin (1-24)
+        methods: Methoden (Default: BACKTEST_METHODS)
+        window: "expanding" oder "rolling"
+        min_train: Trainingspunkte am ersten Origin bzw. Fenstergröße
+        include_seasonality: Saisonfaktoren für "linear"
+        render: Markdown-Abschnitt erstellen
+
+    Returns:
+        Dictionary mit:
+        - result: BacktestReport als Dictionary
+        - formatted_output: Markdown (nur mit render=True)
+    """
+    if not historical_sales:
+        return {
+            "error": "Keine historischen Daten angegeben",
+            "formatted_output": "# ❌ Backtest-Fehler\n\nKeine historischen Verkaufsdaten vorhanden."
+        }
+
+    try:
+        dates, amounts = sales_columns(historical_sales)
+        report = backtest_columns(
+            dates, amounts, forecast_months,
+            methods=tuple(methods or BACKTEST_METHODS),
+            window=window,
+            min_train=min_train,
+            include_seasonality=include_seasonality
+        )
+    except SalesDataError as e:
+        return {"error": str(e), "formatted_output": e.formatted_output}
+    except ValueError as e:
+        return {"error": str(e), "formatted_output": f"# ❌ Backtest-Fehler\n\n{e}"}
+
+    response: Dict[str, Any] = {"result": report.to_dict(), "success": True}
+    if render:
+        response["formatted_output"] = _format_backtest_output(report)
+    return response
@@ -0,0 +1,495 @@
+"""
+Sales Forecast Batch - Verkaufsprognosen für viele Serien in einem Aufruf.
+
+Für Produktkataloge (tausende SKUs) statt tausender einzelner forecast_sales
+Aufrufe:
+- Serien werden per ID übergeben und auf einen gemeinsamen Monatskalender
+  ausgerichtet (Maske für fehlende Monate, mehrere Werte im selben Monat
+  werden summiert)
+- Alle linearen Trends werden gemeinsam mit gestapelten, geschlossenen
+  Least-Squares-Formeln gefittet (keine Schleife über np.polyfit)
+- Ergebnisse (Prognosen, R², Volatilität, Konfidenz) liegen als Arrays vor,
+  eine Zeile pro Serie; SalesForecastResult pro Serie nur bei Bedarf
+- Alternativ exponentielle Glättung (method="simple"/"double"/"triple"/"auto"),
+  ebenfalls als Matrix-Rekursion über alle Serien (siehe sales_forecast_smoothing)
+- Markdown-Übersicht optional
+
+Für lückenlose Monatsreihen, die im letzten Kalendermonat enden, sind die
+Kennzahlen identisch mit forecast_sales.
+"""
+
+from dataclasses import dataclass, field
+from datetime import datetime
+from typing import TYPE_CHECKING, Any, Dict, List, Mapping, Sequence
+
+from tools.sales_forecaster import (
+    FORECAST_METHODS,
+    METHOD_LABELS,
+    ForecastDataPoint,
+    SalesForecastResult,
+    _check_forecast_warnings,
+    _format_currency,
+    _generate_forecast_recommendation,
+    _numpy,
+    _to_float,
+    parse_sales_dates,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+
+@dataclass
+class BatchForecastResult:
+    """
+    Prognosen vieler Serien als Arrays (Zeile i gehört zu series_ids[i]).
+
+    Serien mit ungültigen Daten stehen nur in errors, nicht in den Arrays.
+    """
+
+    series_ids: List[str]               # Zeilen-Reihenfolge aller Arrays
+    forecast_dates: List[str]           # Gemeinsamer Prognose-Kalender ("YYYY-MM")
+    predicted: "np.ndarray"             # (Serien, Monate) Prognosen
+    lower_bound: "np.ndarray"           # (Serien, Monate) 95%-Untergrenze
+    upper_bound: "np.ndarray"           # (Serien, Monate) 95%-Obergrenze
+    data_points: "np.ndarray"           # Beobachtete Monate pro Serie
+    historical_average: "np.ndarray"
+    historical_min: "np.ndarray"
+    historical_max: "np.ndarray"
+    forecast_average: "np.ndarray"
+    growth_rate_percentage: "np.ndarray"
+    volatility_percentage: "np.ndarray"
+    trend_slope: "np.ndarray"
+    r_squared: "np.ndarray"
+    trend_direction: "np.ndarray"       # "upward", "stable", "downward"
+    trend_strength: "np.ndarray"        # "strong", "moderate", "weak"
+    confidence_score: "np.ndarray"      # 0-100
+    seasonality_detected: "np.ndarray"  # bool
+    forecast_method: "np.ndarray"       # "linear", "simple", "double", "triple"
+    errors: Dict[str, str] = field(default_factory=dict)
+
+    def __len__(self) -> int:
+        return len(self.series_ids)
+
+    def series_result(self, index: int) -> SalesForecastResult:
+        """SalesForecastResult (inkl. Empfehlung und Warnungen) für eine Serie."""
+        forecasts = [
+            ForecastDataPoint(
+                date=date,
+                predicted_amount=float(self.predicted[index, m]),
+                confidence_level="high" if m < 3 else "medium" if m < 6 else "low",
+                lower_bound=float(self.lower_bound[index, m]),
+                upper_bound=float(self.upper_bound[index, m])
+            )
+            for m, date in enumerate(self.forecast_dates)
+        ]
+        result = SalesForecastResult(
+            forecasts=forecasts,
+            historical_average=float(self.historical_average[index]),
+            forecast_average=float(self.forecast_average[index]),
+            growth_rate_percentage=float(self.growth_rate_percentage[index]),
+            trend_direction=str(self.trend_direction[index]),
+            trend_strength=str(self.trend_strength[index]),
+            confidence_score=int(self.confidence_score[index]),
+            seasonality_detected=bool(self.seasonality_detected[index]),
+            recommendation="",
+            warnings=[],
+            historical_min=float(self.historical_min[index]),
+            historical_max=float(self.historical_max[index]),
+            volatility_percentage=float(self.volatility_percentage[index]),
+            trend_slope=float(self.trend_slope[index]),
+            r_squared=float(self.r_squared[index]),
+            forecast_method=str(self.forecast_method[index])
+        )
+        result.recommendation = _generate_forecast_recommendation(result)
+        result.warnings = _check_forecast_warnings(
+            result, int(self.data_points[index]), result.volatility_percentage
+        )
+        return result
+
+    def to_results(self) -> Dict[str, SalesForecastResult]:
+        """Alle Serien als SalesForecastResult (Python-Objekte, für kleinere Batches)."""
+        return {series_id: self.series_result(i) for i, series_id in enumerate(self.series_ids)}
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisierbare, spaltenweise Darstellung."""
+        columns = {
+            name: getattr(self, name).tolist()
+            for name in (
+                "predicted", "lower_bound", "upper_bound", "data_points", "historical_average",
+                "historical_min", "historical_max", "forecast_average", "growth_rate_percentage",
+                "volatility_percentage", "trend_slope", "r_squared", "trend_direction",
+                "trend_strength", "confidence_score", "seasonality_detected", "forecast_method",
+            )
+        }
+        return {
+            "series_ids": list(self.series_ids),
+            "forecast_dates": list(self.forecast_dates),
+            **columns,
+            "errors": dict(self.errors),
+        }
+
+
+def _confidence_scores(data_points: "np.ndarray", r_squared: "np.ndarray", volatility: "np.ndarray") -> "np.ndarray":
+    """Array-Variante von _calculate_forecast_confidence (gleiche Gewichtung und Schwellen)."""
+    np = _numpy()
+    data_score = np.select(
+        [data_points >= 12, data_points >= 6],
+        [30.0, 20 + ((data_points - 6) / 6) * 10],
+        (data_points / 6) * 20
+    )
+    vol_score = np.select(
+        [volatility <= 10, volatility <= 20, volatility <= 30, volatility <= 50],
+        [30, 25, 15, 5],
+        0
+    )
+    total = np.trunc(data_score + r_squared * 40 + vol_score)
+    return np.clip(total, 0, 100).astype(np.int64)
+
+
+def _round(values: "np.ndarray", digits: int) -> "np.ndarray":
+    """
+    Rundet wie round() in build_sales_forecast (np.round weicht bei
+    Grenzfällen wie x.xx5 ab) - damit sind Batch- und Einzel-Kennzahlen gleich.
+    """
+    np = _numpy()
+    return np.array([round(value, digits) for value in values.tolist()], dtype=np.float64)
+
+
+def _first_errors(series_index: "np.ndarray", invalid: "np.ndarray", message) -> Dict[int, str]:
+    """Erster ungültiger Punkt pro Serie → {Serien-Index: Meldung}."""
+    np = _numpy()
+    points = np.flatnonzero(invalid)
+    series, first = np.unique(series_index[points], return_index=True)
+    return {int(s): message(int(points[i])) for s, i in zip(series, first)}
+
+
+def build_batch_forecast(
+    series_ids: Sequence[Any],
+    dates: Sequence[Any],
+    amounts: Sequence[Any],
+    forecast_months: int,
+    include_seasonality: bool = False,
+    method: str = "linear"
+) -> BatchForecastResult:
+    """
+    Erstellt Prognosen für viele Serien aus Spalten im Long-Format.
+
+    Jede Zeile ist eine Beobachtung (Serie, Datum, Betrag). Datumswerte
+    werden einmal für alle Serien geparst, danach läuft alles als
+    Matrix-Operation über (Serien × Kalendermonate).
+
+    Args:
+        series_ids: Serien-ID pro Beobachtung
+        dates: Datum pro Beobachtung ("YYYY-MM", "YYYY-MM-DD" oder datetime64)
+        amounts: Betrag pro Beobachtung (nicht-numerische Werte machen die Serie ungültig)
+        forecast_months: Anzahl Monate für Prognose (1-24)
+        include_seasonality: Saisonalität pro Serie (benötigt alle 12 Monate, nur "linear")
+        method: "linear" oder Glättungsmodell ("simple", "double", "triple", "auto")
+
+    Returns:
+        BatchForecastResult (ungültige Serien in errors)
+
+    Raises:
+        ValueError: Ungültiger Prognose-Horizont, unbekannte Methode oder Spalten ungleicher Länge
+    """
+    np = _numpy()
+
+    if not 1 <= forecast_months <= 24:
+        raise ValueError("Forecast-Horizont muss zwischen 1 und 24 Monaten liegen")
+    if method not in FORECAST_METHODS:
+        raise ValueError(f"Unbekannte Prognose-Methode: {method}")
+    if not len(series_ids) == len(dates) == len(amounts):
+        raise ValueError("series_ids, dates und amounts müssen gleich lang sein")
+
+    # Serien in Reihenfolge des ersten Auftretens nummerieren
+    labels, first_seen, series_index = np.unique(
+        np.asarray(series_ids, dtype=str), return_index=True, return_inverse=True
+    )
+    order = np.argsort(first_seen, kind="stable")
+    rank = np.empty_like(order)
+    rank[order] = np.arange(len(order))
+    labels, series_index = labels[order], rank[series_index.ravel()]
+
+    days = parse_sales_dates(dates)
+    try:
+        values = np.asarray(amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        values = np.array([_to_float(amount) for amount in amounts], dtype=np.float64)
+
+    # 1. Validierung pro Beobachtung, gemeldet wird der erste ungültige Punkt je Serie
+    not_finite = ~np.isfinite(values)
+    negative = values < 0
+    bad_date = np.isnat(days)
+    future = days > np.datetime64(datetime.now().date(), "D")
+
+    def describe(i: int) -> str:
+        if not_finite[i]:
+            return f"Ungültiger Verkaufsbetrag: {amounts[i]!r}"
+        if negative[i]:
+            return f"Verkaufsbetrag kann nicht negativ sein: {float(values[i])}"
+        if bad_date[i]:
+            return f"Ungültiges Datumsformat: {dates[i]}"
+        return f"Datum liegt in der Zukunft: {dates[i]}"
+
+    invalid = not_finite | negative | bad_date | future
+    errors = _first_errors(series_index, invalid, describe) if invalid.any() else {}
+    valid_point = ~np.isin(series_index, list(errors))
+
+    # 2. Gemeinsamer Monatskalender, Aggregation pro (Serie, Monat)
+    months = days.astype("datetime64[M]").astype(np.int64)
+    if valid_point.any():
+        start, end = months[valid_point].min(), months[valid_point].max()
+    else:
+        start = end = 0
+    n_series, n_periods = len(labels), int(end - start + 1)
+
+    flat = series_index[valid_point] * n_periods + (months[valid_point] - start)
+    y = np.bincount(flat, weights=values[valid_point], minlength=n_series * n_periods).reshape(n_series, n_periods)
+    mask = np.bincount(flat, minlength=n_series * n_periods).reshape(n_series, n_periods) > 0
+    w = mask.astype(np.float64)
+    n = w.sum(axis=1)
+
+    min_points = 3
+    if method in ("simple", "double", "triple"):
+        from tools.sales_forecast_smoothing import MIN_OBSERVATIONS
+        min_points = MIN_OBSERVATIONS[method]
+    too_short = (n < min_points) & ~np.isin(np.arange(n_series), list(errors))
+    for s in np.flatnonzero(too_short):
+        errors[int(s)] = f"Mindestens {min_points} historische Datenpunkte erforderlich (erhalten: {int(n[s])})"
+
+    keep = np.setdiff1d(np.arange(n_series), list(errors))
+    y, mask, w, n = y[keep], mask[keep], w[keep], n[keep]
+
+    # 3. Statistiken (nur beobachtete Monate)
+    y_mean = (w * y).sum(axis=1) / n
+    yc = np.where(mask, y - y_mean[:, None], 0.0)
+    ss_tot = (yc * yc).sum(axis=1)
+    std_dev = np.sqrt(ss_tot / n)
+    historical_min = np.where(mask, y, np.inf).min(axis=1)
+    historical_max = np.where(mask, y, -np.inf).max(axis=1)
+    nonzero_mean = y_mean != 0
+    safe_mean = np.where(nonzero_mean, y_mean, 1.0)
+    volatility = np.where(nonzero_mean, std_dev / safe_mean * 100, 0.0)
+
+    # 4. Gestapelte lineare Regression über Kalender-Positionen
+    x = np.arange(n_periods, dtype=np.float64)
+    x_mean = (w @ x) / n
+    xc = np.where(mask, x[None, :] - x_mean[:, None], 0.0)
+    sxx = (xc * xc).sum(axis=1)
+    sxy = (xc * yc).sum(axis=1)
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = np.where(ss_tot != 0, 1 - (ss_tot - slope * sxy) / ss_tot, 0.0)
+    r_squared = np.clip(r_squared, 0, 1)
+
+    # 5. Saisonalität: Monatsdurchschnitte pro Serie über One-Hot-Kalender
+    calendar_month = (start + np.arange(n_periods)) % 12
+    forecast_index = np.arange(1, forecast_months + 1)
+    forecast_month = (end + forecast_index) % 12
+    seasonality = np.zeros(len(keep), dtype=bool)
+    factors = np.ones((len(keep), 12))
+    if include_seasonality and len(keep):
+        one_hot = np.eye(12)[calendar_month]
+        counts = w @ one_hot
+        seasonality = (counts > 0).all(axis=1) & (n >= 12)
+        averages = (w * y) @ one_hot / np.where(counts > 0, counts, 1)
+        overall = averages.mean(axis=1)
+        usable = seasonality & (overall != 0)
+        factors[usable] = averages[usable] / overall[usable, None]
+
+    # 6. Prognosen (Serien × Monate)
+    if method == "linear":
+        positions = (n_periods - 1) + forecast_index
+        predicted = slope[:, None] * positions + intercept[:, None]
+        predicted = predicted * factors[:, forecast_month]
+        interval_std = std_dev
+        forecast_method = np.full(len(keep), "linear")
+    else:
+        # Exponentielle Glättung über denselben Kalender (fehlende Monate maskiert)
+        from tools.sales_forecast_smoothing import fit_smoothing
+        fit = fit_smoothing(y, mask, forecast_months, method)
+        predicted, interval_std = fit.predicted, fit.residual_std
+        slope, r_squared = fit.trend, fit.r_squared
+        forecast_method = fit.model
+        seasonality = forecast_method == "triple"
+    margin = 1.96 * interval_std[:, None] * (1.0 + forecast_index * 0.1)
+    lower = np.maximum(0, predicted - margin)
+    upper = predicted + margin
+    predicted = np.round(predicted, 2)
+
+    forecast_average = predicted.mean(axis=1)
+    growth = np.where(nonzero_mean, (forecast_average - y_mean) / safe_mean * 100, 0.0)
+
+    # 7. Klassifikation wie in build_sales_forecast
+    normalized_slope = np.where(nonzero_mean, slope / safe_mean * 100, 0.0)
+    trend_direction = np.select([normalized_slope > 0.5, normalized_slope < -0.5], ["upward", "downward"], "stable")
+    trend_strength = np.select([r_squared > 0.7, r_squared > 0.4], ["strong", "moderate"], "weak")
+
+    return BatchForecastResult(
+        series_ids=labels[keep].tolist(),
+        forecast_dates=np.datetime_as_string(
+            np.datetime64(int(end), "M") + forecast_index, unit="M"
+        ).tolist(),
+        predicted=predicted,
+        lower_bound=np.round(lower, 2),
+        upper_bound=np.round(upper, 2),
+        data_points=n.astype(np.int64),
+        historical_average=_round(y_mean, 2),
+        historical_min=_round(historical_min, 2),
+        historical_max=_round(historical_max, 2),
+        forecast_average=_round(forecast_average, 2),
+        growth_rate_percentage=_round(growth, 2),
+        volatility_percentage=_round(volatility, 2),
+        trend_slope=_round(slope, 2),
+        r_squared=_round(r_squared, 3),
+        trend_direction=trend_direction,
+        trend_strength=trend_strength,
+        confidence_score=_confidence_scores(n, r_squared, volatility),
+        seasonality_detected=seasonality,
+        forecast_method=forecast_method,
+        errors={str(labels[s]): message for s, message in sorted(errors.items())}
+    )
+
+
+def _format_batch_output(result: BatchForecastResult, limit: int = 20) -> str:
+    """
+    Formatiert eine Batch-Übersicht als Markdown.
+
+    Args:
+        result: Batch-Ergebnis
+        limit: Anzahl Serien in den Top/Flop-Tabellen
+
+    Returns:
+        Formatierter Markdown-String
+    """
+    np = _numpy()
+    output = "# 📈 Verkaufsprognose (Batch)\n\n"
+
+    directions = {name: int((result.trend_direction == name).sum()) for name in ("upward", "stable", "downward")}
+    output += "## Executive Summary\n\n"
+    output += (
+        f"**{len(result)} Serien** prognostiziert für {result.forecast_dates[0]} bis "
+        f"{result.forecast_dates[-1]}. Trends: 📈 {directions['upward']} | 📊 {directions['stable']} | "
+        f"📉 {directions['downward']}. "
+    )
+    if len(result):
+        output += (
+            f"Ø Konfidenz: **{result.confidence_score.mean():.0f}/100**, "
+            f"Median-Wachstum: **{np.median(result.growth_rate_percentage):+.1f}%**."
+        )
+        methods, counts = np.unique(result.forecast_method, return_counts=True)
+        if methods.tolist() != ["linear"]:
+            output += " Methoden: " + " | ".join(
+                f"{METHOD_LABELS[name]} {count}" for name, count in zip(methods.tolist(), counts.tolist())
+            ) + "."
+    output += "\n\n"
+
+    order = np.argsort(-result.growth_rate_percentage, kind="stable")
+    for title, rows in (("🚀 Stärkstes Wachstum", order[:limit]), ("📉 Stärkster Rückgang", order[::-1][:limit])):
+        if not len(rows):
+            continue
+        output += f"## {title}\n\n"
+        output += "| Serie | Ø Historisch | Ø Prognose | Wachstum | R² | Konfidenz |\n"
+        output += "|-------|--------------|------------|----------|----|-----------|\n"
+        for i in rows:
+            output += (
+                f"| {result.series_ids[i]} | {_format_currency(float(result.historical_average[i]))} | "
+                f"{_format_currency(float(result.forecast_average[i]))} | "
+                f"{result.growth_rate_percentage[i]:+.1f}% | {result.r_squared[i]:.2f} | "
+                f"{result.confidence_score[i]}/100 |\n"
+            )
+        output += "\n"
+
+    if result.errors:
+        output += f"## ⚠️ Nicht prognostiziert ({len(result.errors)})\n\n"
+        for series_id, message in list(result.errors.items())[:limit]:
+            output += f"- **{series_id}**: {message}\n"
+        output += "\n"
+
+    return output
+
+
+async def forecast_sales_batch(
+    series: Mapping[str, Sequence[dict]],
+    forecast_months: int,
+    include_seasonality: bool = False,
+    render: bool = False,
+    method: str = "linear"
+) -> Dict[str, Any]:
+    """
+    Erstellt Verkaufsprognosen für viele Serien in einem Aufruf.
+
+    Args:
+        series: Serien-ID → Verkaufsdaten im forecast_sales Format
+            Format: {"SKU-1": [{"date": "2025-01", "amount": 1200}, ...], ...}
+        forecast_months: Anzahl Monate für Prognose (1-24)
+        include_seasonality: Saisonalitäts-Adjustment pro Serie
+        render: Markdown-Übersicht erstellen
+        method: "linear" oder Glättungsmodell ("simple", "double", "triple", "auto")
+
+    Returns:
+        Dictionary mit:
+        - result: BatchForecastResult (Arrays, eine Zeile pro Serie)
+        - formatted_output: Markdown-Übersicht (nur mit render=True)
+
+    Example:
+        >>> batch = await forecast_sales_batch(
+        ...     {"SKU-1": [{"date": "2024-01", "amount": 100}, ...], "SKU-2": [...]},
+        ...     forecast_months=3
+        ... )
+        >>> batch["result"].predicted.shape
+        (2, 3)
+    """
+    if not series:
+        return {
+            "error": "Keine Serien angegeben",
+            "formatted_output": "# ❌ Forecast-Fehler\n\nKeine Verkaufsserien vorhanden."
+        }
+    if not 1 <= forecast_months <= 24:
+        return {
+            "error": "Forecast-Horizont muss zwischen 1 und 24 Monaten liegen",
+            "formatted_output": "# ❌ Forecast-Fehler\n\nForecast-Horizont muss zwischen 1 und 24 Monaten liegen."
+        }
+    if method not in FORECAST_METHODS:
+        return {
+            "error": f"Unbekannte Prognose-Methode: {method}",
+            "formatted_output": f"# ❌ Forecast-Fehler\n\nUnbekannte Prognose-Methode **{method}**."
+        }
+
+    # Long-Format: eine Zeile pro Beobachtung
+    ids: List[str] = []
+    dates: List[Any] = []
+    amounts: List[Any] = []
+    malformed: Dict[str, str] = {}
+    for series_id, points in series.items():
+        try:
+            series_dates = [point['date'] for point in points]
+            series_amounts = [point['amount'] for point in points]
+        except (KeyError, TypeError):
+            index = next(
+                i for i, point in enumerate(points)
+                if not isinstance(point, dict) or 'date' not in point or 'amount' not in point
+            )
+            malformed[str(series_id)] = f"Datenpunkt {index+1} fehlen 'date' oder 'amount'"
+            continue
+        ids.extend([str(series_id)] * len(series_dates))
+        dates.extend(series_dates)
+        amounts.extend(series_amounts)
+
+    # Rohwerte durchreichen - Fehlermeldungen zeigen den Originalbetrag
+    result = build_batch_forecast(ids, dates, amounts, forecast_months, include_seasonality, method)
+    forecasted = set(result.series_ids)
+    for series_id in series:
+        series_id = str(series_id)
+        if series_id in malformed:
+            result.errors[series_id] = malformed[series_id]
+        elif series_id not in result.errors and series_id not in forecasted:
+            result.errors[series_id] = "Mindestens 3 historische Datenpunkte erforderlich (erhalten: 0)"
+
+    response: Dict[str, Any] = {"result": result, "success": True}
+    if render:
+        response["formatted_output"] = _format_batch_output(result)
+    return response
+
@@ -0,0 +1,262 @@
+"""
+Online Sales Forecaster - inkrementelle Verkaufsprognose für Datenströme.
+
+Statt bei jedem Aufruf den Trend über die komplette Historie neu zu fitten,
+hält der OnlineSalesForecaster nur verdichtete Kennzahlen:
+- Anzahl, Mittelwerte und zentrierte (Ko-)Momente für x (Zeitindex) und
+  y (Betrag) - die numerisch stabile Form von Σx, Σy, Σxy, Σx², Σy²
+  (Welford-Updates, für Blöcke die Formel von Chan et al.)
+- Minimum, Maximum, letztes Datum
+- Summe und Anzahl pro Kalendermonat für die Saisonalität
+
+Neue Beobachtungen werden in O(1) ergänzt, forecast() liefert dieselben
+SalesForecastResult-Felder wie forecast_sales, ohne die Historie zu speichern.
+Der Zustand ist JSON-serialisierbar (save/load).
+"""
+
+import json
+import math
+import os
+from dataclasses import asdict, dataclass, field, fields
+from datetime import datetime
+from pathlib import Path
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence
+
+from tools.sales_forecaster import (
+    SalesDataError,
+    SalesForecastResult,
+    _numpy,
+    _seasonality_from_monthly_sums,
+    _to_float,
+    forecast_from_statistics,
+    parse_sales_dates,
+    sales_columns,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+STATE_VERSION = 1
+
+
+@dataclass
+class OnlineSalesForecaster:
+    """
+    Zustand eines inkrementellen Forecasts (x = 0, 1, 2, ... in Eingangsreihenfolge).
+
+    Beobachtungen müssen chronologisch eintreffen (gleiches Datum erlaubt).
+    """
+
+    n: int = 0
+    mean_x: float = 0.0
+    mean_y: float = 0.0
+    m2_x: float = 0.0                   # Σ(x - x̄)²
+    m2_y: float = 0.0                   # Σ(y - ȳ)² (Welford)
+    c_xy: float = 0.0                   # Σ(x - x̄)(y - ȳ)
+    minimum: Optional[float] = None
+    maximum: Optional[float] = None
+    month_sums: List[float] = field(default_factory=lambda: [0.0] * 12)
+    month_counts: List[int] = field(default_factory=lambda: [0] * 12)
+    last_date: Optional[str] = None     # "YYYY-MM-DD"
+
+    # ------------------------------------------------------------------
+    # Updates
+    # ------------------------------------------------------------------
+
+    def add(self, date: Any, amount: float) -> None:
+        """
+        Ergänzt eine Beobachtung in O(1).
+
+        Args:
+            date: Datum ("YYYY-MM", "YYYY-MM-DD", ...)
+            amount: Verkaufsbetrag (>= 0)
+
+        Raises:
+            SalesDataError: Ungültiger Betrag/Datum oder nicht chronologisch
+        """
+        day = self._parse_day(date)
+        y = float(amount) if isinstance(amount, (int, float)) else _to_float(amount)
+        if not math.isfinite(y):
+            raise SalesDataError(f"Ungültiger Verkaufsbetrag: {amount!r}")
+        if y < 0:
+            raise SalesDataError(f"Verkaufsbetrag kann nicht negativ sein: {y}")
+        self._check_order(day, date)
+
+        x = float(self.n)
+        self.n += 1
+        dx = x - self.mean_x
+        self.mean_x += dx / self.n
+        dy = y - self.mean_y
+        self.mean_y += dy / self.n
+        self.m2_x += dx * (x - self.mean_x)
+        self.m2_y += dy * (y - self.mean_y)
+        self.c_xy += dx * (y - self.mean_y)
+
+        self.minimum = y if self.minimum is None else min(self.minimum, y)
+        self.maximum = y if self.maximum is None else max(self.maximum, y)
+        month = int(day[5:7]) - 1
+        self.month_sums[month] += y
+        self.month_counts[month] += 1
+        self.last_date = day
+
+    def extend(self, historical_sales: Sequence[dict]) -> None:
+        """
+        Ergänzt viele Beobachtungen auf einmal (z.B. initiale Historie).
+
+        Args:
+            historical_sales: [{"date": "2025-01", "amount": 120000}, ...]
+
+        Raises:
+            SalesDataError: Ungültige Daten oder älter als das letzte Datum
+        """
+        if not historical_sales:
+            return
+        dates, amounts = sales_columns(historical_sales)
+        self._extend_columns(dates, amounts)
+
+    def _extend_columns(self, dates: "np.ndarray", amounts: "np.ndarray") -> None:
+        """
+        Ergänzt einen chronologisch sortierten Block (datetime64[D], float64).
+
+        Die Kennzahlen des Blocks werden vektorisiert berechnet und mit dem
+        bisherigen Zustand kombiniert (parallele Varianz-Formel). Nur über
+        extend() - der Block muss von sales_columns() validiert und sortiert sein.
+        """
+        np = _numpy()
+        k = len(amounts)
+        if k == 0:
+            return
+        self._check_order(str(dates[0]), str(dates[0]))
+
+        # Kennzahlen des Blocks, x läuft ab dem aktuellen n weiter
+        x = np.arange(self.n, self.n + k, dtype=np.float64)
+        mean_x_b = float(x.mean())
+        mean_y_b = float(amounts.mean())
+        xc, yc = x - mean_x_b, amounts - mean_y_b
+        m2_x_b, m2_y_b, c_xy_b = float(xc @ xc), float(yc @ yc), float(xc @ yc)
+
+        # Kombination (Chan et al.)
+        n_a, n = self.n, self.n + k
+        delta_x, delta_y = mean_x_b - self.mean_x, mean_y_b - self.mean_y
+        weight = n_a * k / n
+        self.m2_x += m2_x_b + delta_x * delta_x * weight
+        self.m2_y += m2_y_b + delta_y * delta_y * weight
+        self.c_xy += c_xy_b + delta_x * delta_y * weight
+        self.mean_x += delta_x * k / n
+        self.mean_y += delta_y * k / n
+        self.n = n
+
+        block_min, block_max = float(amounts.min()), float(amounts.max())
+        self.minimum = block_min if self.minimum is None else min(self.minimum, block_min)
+        self.maximum = block_max if self.maximum is None else max(self.maximum, block_max)
+        months = dates.astype("datetime64[M]").astype(np.int64) % 12
+        sums = np.bincount(months, weights=amounts, minlength=12)
+        counts = np.bincount(months, minlength=12)
+        self.month_sums = [a + float(b) for a, b in zip(self.month_sums, sums)]
+        self.month_counts = [a + int(b) for a, b in zip(self.month_counts, counts)]
+        self.last_date = str(dates[-1])
+
+    def _parse_day(self, date: Any) -> str:
+        """Datum als "YYYY-MM-DD" (ISO direkt, sonst über parse_sales_dates)."""
+        np = _numpy()
+        try:
+            if not isinstance(date, (str, np.datetime64)):
+                raise TypeError(date)
+            day = np.datetime64(date, "D")
+        except (ValueError, TypeError):
+            day = parse_sales_dates([date])[0]
+        if np.isnat(day):
+            raise SalesDataError(f"Ungültiges Datumsformat: {date}")
+        if day > np.datetime64(datetime.now().date(), "D"):
+            raise SalesDataError(f"Datum liegt in der Zukunft: {date}")
+        return str(day)
+
+    def _check_order(self, day: str, original: Any) -> None:
+        # ISO-Datumsstrings sind lexikografisch chronologisch sortiert
+        if self.last_date is not None and day < self.last_date:
+            raise SalesDataError(
+                f"Datum {original} liegt vor dem letzten Datenpunkt ({self.last_date}) - "
+                f"Beobachtungen müssen chronologisch eintreffen"
+            )
+
+    # ------------------------------------------------------------------
+    # Prognose
+    # ------------------------------------------------------------------
+
+    def trend(self) -> Dict[str, float]:
+        """Aktuelle Regression aus den Kennzahlen: slope, intercept, r_squared."""
+        slope = self.c_xy / self.m2_x if self.m2_x > 0 else 0.0
+        intercept = self.mean_y - slope * self.mean_x
+        ss_res = self.m2_y - slope * self.c_xy
+        r_squared = 1 - (ss_res / self.m2_y) if self.m2_y != 0 else 0
+        return {"slope": slope, "intercept": intercept, "r_squared": max(0, min(1, r_squared))}
+
+    def forecast(self, forecast_months: int = 3, include_seasonality: bool = False) -> SalesForecastResult:
+        """
+        Erstellt die Prognose aus dem aktuellen Zustand (O(Prognosemonate)).
+
+        Args:
+            forecast_months: Anzahl Monate für Prognose (1-24)
+            include_seasonality: Saisonalitäts-Adjustment (benötigt >= 12 Datenpunkte)
+
+        Returns:
+            SalesForecastResult wie bei forecast_sales
+
+        Raises:
+            ValueError: Weniger als 3 Datenpunkte oder ungültiger Horizont
+        """
+        if self.n < 3:
+            raise ValueError("Mindestens 3 historische Datenpunkte erforderlich")
+        if not 1 <= forecast_months <= 24:
+            raise ValueError("Forecast-Horizont muss zwischen 1 und 24 Monaten liegen")
+
+        np = _numpy()
+        seasonality_factors = None
+        if include_seasonality and self.n >= 12:
+            seasonality_factors = _seasonality_from_monthly_sums(
+                np.array(self.month_sums), np.array(self.month_counts)
+            )
+
+        trend = self.trend()
+        return forecast_from_statistics(
+            data_points=self.n,
+            historical_avg=self.mean_y,
+            historical_min=self.minimum,
+            historical_max=self.maximum,
+            std_dev=math.sqrt(max(self.m2_y, 0.0) / self.n),
+            slope=trend["slope"],
+            intercept=trend["intercept"],
+            r_squared=trend["r_squared"],
+            seasonality_factors=seasonality_factors,
+            last_date=np.datetime64(self.last_date, "D"),
+            forecast_months=forecast_months
+        )
+
+    # ------------------------------------------------------------------
+    # Serialisierung
+    # ------------------------------------------------------------------
+
+    def to_dict(self) -> Dict[str, Any]:
+        """JSON-serialisierbarer Zustand."""
+        return {"version": STATE_VERSION, **asdict(self)}
+
+    @classmethod
+    def from_dict(cls, data: Dict[str, Any]) -> "OnlineSalesForecaster":
+        """Stellt einen Zustand aus to_dict() wieder her."""
+        if data.get("version") != STATE_VERSION:
+            raise ValueError(f"Unbekannte Zustands-Version: {data.get('version')}")
+        names = {item.name for item in fields(cls)}
+        return cls(**{key: value for key, value in data.items() if key in names})
+
+    def save(self, path: Path) -> None:
+        """Speichert den Zustand atomar als JSON."""
+        path = Path(path)
+        tmp = path.with_name(path.name + ".tmp")
+        tmp.write_text(json.dumps(self.to_dict()), encoding="utf-8")
+        os.replace(tmp, path)
+
+    @classmethod
+    def load(cls, path: Path) -> "OnlineSalesForecaster":
+        """Lädt einen mit save() gespeicherten Zustand."""
+        return cls.from_dict(json.loads(Path(path).read_text(encoding="utf-8")))
+
@@ -0,0 +1,360 @@
+"""
+Sales Forecast Smoothing - exponentielle Glättung (Holt-Winters) für Verkaufsprognosen.
+
+Alternative zur linearen Regression in sales_forecaster:
+- simple: Einfache exponentielle Glättung (Niveau)
+- double: Holt (Niveau + Trend)
+- triple: Holt-Winters additiv (Niveau + Trend + 12-Monats-Saison)
+- auto:   Wählt pro Serie das Modell mit dem kleinsten Holdout-Fehler (RMSE)
+
+Die Zustandsrekursion läuft als Array-Operation über alle Serien und alle
+Parameter-Kandidaten gleichzeitig (eine Python-Schleife nur über die Zeit).
+Die Glättungsparameter werden per Grid Search mit anschließender lokaler
+Verfeinerung (halbierte Schrittweite) auf den 1-Schritt-Fehler gefittet.
+
+Eingabe ist eine Matrix (Serien × Perioden) mit Maske: fehlende Perioden
+schreiben den Zustand ohne Korrektur fort, damit funktioniert dieselbe
+Engine für Einzelserien und den gemeinsamen Kalender im Batch-Forecast.
+"""
+
+from dataclasses import dataclass
+from itertools import product
+from typing import TYPE_CHECKING, Dict, Optional, Tuple
+
+from tools.sales_forecaster import (
+    METHOD_LABELS,
+    SalesDataError,
+    SalesForecastResult,
+    _numpy,
+    forecast_from_predictions,
+)
+
+if TYPE_CHECKING:
+    import numpy as np
+
+SMOOTHING_MODELS = ("simple", "double", "triple")
+SEASON_LENGTH = 12
+
+# Mindestanzahl beobachteter Perioden pro Modell (Holt-Winters: zwei volle Saisons)
+MIN_OBSERVATIONS = {"simple": 3, "double": 3, "triple": 2 * SEASON_LENGTH}
+
+# Grobes Raster für (alpha, beta, gamma) und Startschrittweite der Verfeinerung
+_GRIDS = ((0.1, 0.3, 0.5, 0.7, 0.9), (0.05, 0.15, 0.3), (0.05, 0.2, 0.4))
+_STEPS = (0.1, 0.05, 0.1)
+_REFINE_ROUNDS = 2
+_PARAM_BOUNDS = (0.01, 0.99)
+
+# Serien pro Rechenblock (begrenzt den Speicher für Serien × Kandidaten × Saison)
+_CHUNK_SERIES = 2048
+
+
+@dataclass
+class SmoothingFit:
+    """
+    Gefittete Glättungsmodelle für mehrere Serien (Zeile i = Serie i).
+
+    Zeilen ohne passendes Modell (zu wenig Daten) haben model == "".
+    """
+
+    model: "np.ndarray"                 # "simple", "double", "triple" oder ""
+    alpha: "np.ndarray"                 # Glättung Niveau
+    beta: "np.ndarray"                  # Glättung Trend (0 bei simple)
+    gamma: "np.ndarray"                 # Glättung Saison (0 ohne Saison)
+    level: "np.ndarray"                 # Niveau nach der letzten Periode
+    trend: "np.ndarray"                 # Trend pro Periode nach der letzten Periode
+    seasonal: "np.ndarray"              # (Serien, 12) Saison-Komponenten
+    residual_std: "np.ndarray"          # RMSE der 1-Schritt-Prognosen
+    r_squared: "np.ndarray"             # 1 - SSE/SST der 1-Schritt-Prognosen
+    predicted: "np.ndarray"             # (Serien, Monate) Prognosen
+    holdout_rmse: Optional["np.ndarray"] = None  # (Serien, 3) nur bei model="auto"
+
+
+def _initial_states(values: "np.ndarray", mask: "np.ndarray", model: str) -> Dict[str, "np.ndarray"]:
+    """
+    Startwerte aus den ersten zwei Saisons ab der ersten Beobachtung jeder Serie.
+
+    simple: Niveau = Mittelwert. double: Niveau und Trend aus einer Regression
+    über das Fenster. triple: Trend aus den Mittelwerten der beiden Saisons
+    (saisonneutral), Saison aus den mittleren Abweichungen von dieser Linie
+    pro Kalenderposition (Summe 0). Das Niveau wird auf die Zeit vor Spalte 0
+    zurückgerechnet, weil fehlende Perioden vor dem Start den Trend fortschreiben.
+    """
+    np = _numpy()
+    n_periods = values.shape[1]
+    columns = np.arange(n_periods)
+    start = mask.argmax(axis=1)
+    relative = columns[None, :] - start[:, None]
+    window = mask & (relative < 2 * SEASON_LENGTH)
+
+    def masked_means(part: "np.ndarray") -> Tuple["np.ndarray", "np.ndarray", "np.ndarray"]:
+        w = part.astype(np.float64)
+        count = w.sum(axis=1)
+        safe = np.maximum(count, 1)
+        return count, (w * relative).sum(axis=1) / safe, (w * values).sum(axis=1) / safe
+
+    count, x_mean, y_mean = masked_means(window)
+    if model == "simple":
+        slope = np.zeros(len(values))
+    elif model == "double":
+        xc = np.where(window, relative - x_mean[:, None], 0.0)
+        sxx = (xc * xc).sum(axis=1)
+        sxy = (xc * (values - y_mean[:, None])).sum(axis=1)
+        slope = np.where(sxx > 0, sxy / np.where(sxx > 0, sxx, 1.0), 0.0)
+    else:
+        count_1, x_1, y_1 = masked_means(window & (relative < SEASON_LENGTH))
+        count_2, x_2, y_2 = masked_means(window & (relative >= SEASON_LENGTH))
+        both = (count_1 > 0) & (count_2 > 0)
+        slope = np.where(both, (y_2 - y_1) / np.where(both, x_2 - x_1, 1.0), 0.0)
+    intercept = y_mean - slope * x_mean
+
+    states = {"level": intercept - slope * (start + 1), "trend": slope}
+    if model == "triple":
+        residuals = np.where(window, values - (intercept[:, None] + slope[:, None] * relative), 0.0)
+        one_hot = np.eye(SEASON_LENGTH)[columns % SEASON_LENGTH]
+        counts = window.astype(np.float64) @ one_hot
+        seen = counts > 0
+        averages = (residuals @ one_hot) / np.where(seen, counts, 1.0)
+        centre = (averages * seen).sum(axis=1) / seen.sum(axis=1)
+        states["seasonal"] = np.where(seen, averages - centre[:, None], 0.0)
+    return states
+
+
+def _smooth(
+    values: "np.ndarray",
+    mask: "np.ndarray",
+    params: "np.ndarray",
+    states: Dict[str, "np.ndarray"],
+    model: str
+) -> Dict[str, "np.ndarray"]:
+    """
+    Vektorisierte Zustandsrekursion (Fehlerkorrektur-Form) für alle Kandidaten.
+
+    Args:
+        values: (S, T) Beobachtungen
+        mask: (S, T) beobachtet?
+        params: (S, G, k) Kandidaten für alpha[, beta[, gamma]]
+        states: Startwerte pro Serie (siehe _initial_states)
+        model: "simple", "double" oder "triple"
+
+    Returns:
+        sse, level, trend (S, G) und seasonal (12, S, G)
+    """
+    np = _numpy()
+    n_series, n_candidates = params.shape[:2]
+    shape = (n_series, n_candidates)
+    alpha = params[..., 0]
+    level = np.repeat(states["level"][:, None], n_candidates, axis=1)
+    trend = np.repeat(states["trend"][:, None], n_candidates, axis=1)
+    sse = np.zeros(shape)
+    has_trend, has_season = model != "simple", model == "triple"
+    if has_trend:
+        trend_gain = alpha * params[..., 1]
+    if has_season:
+        season_gain = params[..., 2] * (1 - alpha)
+        seasonal = np.repeat(states["seasonal"].T[:, :, None], n_candidates, axis=2)
+
+    for t in range(values.shape[1]):
+        forecast = level + trend
+        if has_season:
+            season = seasonal[t % SEASON_LENGTH]
+            error = np.where(mask[:, t, None], values[:, t, None] - (forecast + season), 0.0)
+            season += season_gain * error
+        else:
+            error = np.where(mask[:, t, None], values[:, t, None] - forecast, 0.0)
+        sse += error * error
+        level = forecast + alpha * error
+        if has_trend:
+            trend = trend + trend_gain * error
+
+    result = {"sse": sse, "level": level, "trend": trend}
+    result["seasonal"] = seasonal if has_season else np.zeros((SEASON_LENGTH,) + shape)
+    return result
+
+
+def _fit_model(values: "np.ndarray", mask: "np.ndarray", model: str) -> Dict[str, "np.ndarray"]:
+    """Grid Search + lokale Verfeinerung der Glättungsparameter für ein Modell."""
+    np = _numpy()
+    k = SMOOTHING_MODELS.index(model) + 1
+    n_series = len(values)
+    rows = np.arange(n_series)
+    states = _initial_states(values, mask, model)
+
+    grid = np.array(list(product(*_GRIDS[:k])))
+    candidates = np.broadcast_to(grid[None], (n_series,) + grid.shape)
+    step = np.array(_STEPS[:k])
+    offsets = np.array(list(product((-1, 0, 1), repeat=k)), dtype=np.float64)
+
+    for round_ in range(_REFINE_ROUNDS + 1):
+        if round_:
+            candidates = np.clip(best[:, None, :] + offsets[None] * step, *_PARAM_BOUNDS)
+            step = step / 2
+        fitted = _smooth(values, mask, candidates, states, model)
+        choice = fitted["sse"].argmin(axis=1)
+        best = candidates[rows, choice]
+
+    params = np.zeros((n_series, 3))
+    params[:, :k] = best
+    return {
+        "params": params,
+        "sse": fitted["sse"][rows, choice],
+        "level": fitted["level"][rows, choice],
+        "trend": fitted["trend"][rows, choice],
+        "seasonal": fitted["seasonal"][:, rows, choice].T,
+    }
+
+
+def _fit_chunked(values: "np.ndarray", mask: "np.ndarray", model: str) -> Dict[str, "np.ndarray"]:
+    """_fit_model blockweise über die Serien (Speicher bleibt begrenzt)."""
+    np = _numpy()
+    parts = [
+        _fit_model(values[i:i + _CHUNK_SERIES], mask[i:i + _CHUNK_SERIES], model)
+        for i in range(0, len(values), _CHUNK_SERIES)
+    ]
+    return {key: np.concatenate([part[key] for part in parts]) for key in parts[0]}
+
+
+def _project(fitted: Dict[str, "np.ndarray"], n_periods: int, horizon: int) -> "np.ndarray":
+    """Prognosen (S, horizon) ab dem Zustand nach n_periods Perioden."""
+    np = _numpy()
+    steps = np.arange(1, horizon + 1)
+    positions = (n_periods - 1 + steps) % SEASON_LENGTH
+    return fitted["level"][:, None] + fitted["trend"][:, None] * steps + fitted["seasonal"][:, positions]
+
+
+def fit_smoothing(
+    values: "np.ndarray",
+    mask: "np.ndarray",
+    forecast_months: int,
+    model: str = "auto"
+) -> SmoothingFit:
+    """
+    Fittet exponentielle Glättung für alle Serien einer Matrix.
+
+    Bei model="auto" werden alle Modelle auf den Daten ohne die letzten
+    Perioden (Holdout = Prognose-Horizont, höchstens ein Viertel der Historie)
+    gefittet; gewählt wird pro Serie das Modell mit dem kleinsten Holdout-RMSE,
+    bei Gleichstand das einfachere. Ohne bewertbaren Holdout fällt die Wahl
+    auf "double". Das gewählte Modell wird danach auf der ganzen Historie gefittet.
+
+    Args:
+        values: (Serien, Perioden) Beträge, Spalten = aufeinanderfolgende Monate
+        mask: (Serien, Perioden) beobachtet? (jede Serie mind. eine Beobachtung)
+        forecast_months: Anzahl Monate für Prognose
+        model: "simple", "double", "triple" oder "auto"
+
+    Returns:
+        SmoothingFit (Serien mit zu wenig Daten: model == "")
+
+    Raises:
+        ValueError: Unbekanntes Modell
+    """
+    np = _numpy()
+    if model not in SMOOTHING_MODELS + ("auto",):
+        raise ValueError(f"Unbekanntes Glättungsmodell: {model} (erlaubt: {', '.join(SMOOTHING_MODELS)}, auto)")
+
+    values = np.where(mask, np.asarray(values, dtype=np.float64), 0.0)
+    n_series, n_periods = values.shape
+    counts = mask.sum(axis=1)
+
+    holdout_rmse = None
+    if model == "auto":
+        holdout = min(forecast_months, max(1, n_periods // 4))
+        train, train_mask, test_mask = values[:, :-holdout], mask[:, :-holdout], mask[:, -holdout:]
+        train_counts, test_counts = train_mask.sum(axis=1), test_mask.sum(axis=1)
+        holdout_rmse = np.full((n_series, len(SMOOTHING_MODELS)), np.inf)
+        for k, name in enumerate(SMOOTHING_MODELS):
+            rows = np.flatnonzero((train_counts >= MIN_OBSERVATIONS[name]) & (test_counts > 0))
+            if not len(rows):
+                continue
+            fitted = _fit_chunked(train[rows], train_mask[rows], name)
+            error = np.where(test_mask[rows], values[rows, -holdout:] - _project(fitted, n_periods - holdout, holdout), 0.0)
+            holdout_rmse[rows, k] = np.sqrt((error * error).sum(axis=1) / test_counts[rows])
+        choice = holdout_rmse.argmin(axis=1)
+        choice[~np.isfinite(holdout_rmse.min(axis=1))] = SMOOTHING_MODELS.index("double")
+        choice[counts < MIN_OBSERVATIONS["double"]] = -1
+    else:
+        choice = np.where(counts >= MIN_OBSERVATIONS[model], SMOOTHING_MODELS.index(model), -1)
+
+    params = np.zeros((n_series, 3))
+    level, trend, sse = np.zeros(n_series), np.zeros(n_series), np.zeros(n_series)
+    seasonal = np.zeros((n_series, SEASON_LENGTH))
+    predicted = np.full((n_series, forecast_months), np.nan)
+    for k, name in enumerate(SMOOTHING_MODELS):
+        rows = np.flatnonzero(choice == k)
+        if not len(rows):
+            continue
+        fitted = _fit_chunked(values[rows], mask[rows], name)
+        params[rows], sse[rows] = fitted["params"], fitted["sse"]
+        level[rows], trend[rows], seasonal[rows] = fitted["level"], fitted["trend"], fitted["seasonal"]
+        predicted[rows] = _project(fitted, n_periods, forecast_months)
+
+    # Güte der 1-Schritt-Prognosen
+    safe_counts = np.maximum(counts, 1)
+    y_mean = values.sum(axis=1) / safe_counts
+    centred = np.where(mask, values - y_mean[:, None], 0.0)
+    ss_tot = (centred * centred).sum(axis=1)
+    with np.errstate(divide="ignore", invalid="ignore"):
+        r_squared = np.where(ss_tot > 0, 1 - sse / ss_tot, 0.0)
+
+    return SmoothingFit(
+        model=np.array(SMOOTHING_MODELS + ("",))[choice],
+        alpha=params[:, 0],
+        beta=params[:, 1],
+        gamma=params[:, 2],
+        level=level,
+        trend=trend,
+        seasonal=seasonal,
+        residual_std=np.sqrt(sse / safe_counts),
+        r_squared=np.clip(r_squared, 0, 1),
+        predicted=predicted,
+        holdout_rmse=holdout_rmse
+    )
+
+
+def build_smoothing_forecast(
+    dates: "np.ndarray",
+    amounts: "np.ndarray",
+    forecast_months: int,
+    model: str = "auto"
+) -> SalesForecastResult:
+    """
+    Erstellt die Prognose einer Serie mit exponentieller Glättung.
+
+    Wie beim linearen Trend ist jeder Datenpunkt eine Periode; Prognosen
+    gelten für die Kalendermonate nach dem letzten Datum. Die
+    Konfidenzintervalle basieren auf der Streuung der 1-Schritt-Fehler.
+
+    Args:
+        dates: Datumswerte als datetime64[D]-Array (siehe sales_columns)
+        amounts: Verkaufsbeträge als float64-Array
+        forecast_months: Anzahl Monate für Prognose
+        model: "simple", "double", "triple" oder "auto"
+
+    Returns:
+        SalesForecastResult (forecast_method = gewähltes Modell)
+
+    Raises:
+        SalesDataError: Zu wenig Datenpunkte für das Modell
+    """
+    np = _numpy()
+    n = len(amounts)
+    fit = fit_smoothing(amounts[None, :], np.ones((1, n), dtype=bool), forecast_months, model)
+    chosen = str(fit.model[0])
+    if not chosen:
+        message = f"{METHOD_LABELS[model]} benötigt mindestens {MIN_OBSERVATIONS[model]} Datenpunkte (erhalten: {n})"
+        raise SalesDataError(message, f"# ❌ Forecast-Fehler\n\n**Zu wenig Daten**: {message}.")
+
+    return forecast_from_predictions(
+        data_points=n,
+        historical_avg=float(amounts.mean()),
+        historical_min=float(amounts.min()),
+        historical_max=float(amounts.max()),
+        std_dev=float(amounts.std()),
+        slope=float(fit.trend[0]),
+        r_squared=float(fit.r_squared[0]),
+        predicted=fit.predicted[0],
+        last_date=dates[-1],
+        seasonality_detected=chosen == "triple",
+        interval_std=float(fit.residual_std[0]),
+        forecast_method=chosen
+    )
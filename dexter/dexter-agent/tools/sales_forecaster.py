@@ -3,14 +3,14 @@ Sales Forecaster Tool - Verkaufsprognosen mit Trend-Analyse.
 
 Dieses Tool erstellt Verkaufsprognosen basierend auf historischen Daten
 mit linearer Regression, Konfidenzintervallen und optionaler Saisonalitäts-Anpassung.
+Alternativ: exponentielle Glättung (Holt-Winters, siehe sales_forecast_smoothing).
 """
 
 import math
 import json
 from dataclasses import dataclass, asdict
-from typing import Any, Tuple, List, Optional
-from datetime import datetime, timedelta
-from dateutil import parser as date_parser
+from typing import TYPE_CHECKING, Any, Dict, List, Optional, Sequence, Tuple
+from datetime import datetime
 import sys
 from pathlib import Path
 
@@ -18,19 +18,170 @@ from pathlib import Path
 sys.path.append(str(Path(__file__).parent.parent))
 
 try:
-    import numpy as np
-except ImportError:
-    raise ImportError(
-        "numpy ist erforderlich für Sales Forecaster. "
-        "Installiere mit: pip install numpy"
-    )
-
-try:
-    from config import get_config
-    config = get_config()
+    from config import config  # Lazy - wird erst beim ersten Zugriff geladen
 except ImportError:
     config = None
 
+if TYPE_CHECKING:
+    import numpy as np
+
+
+def _numpy():
+    """
+    Importiert numpy beim ersten Forecast statt beim Modul-Import
+    (Tool-Registry und andere Tools bleiben damit schnell importierbar).
+    """
+    try:
+        import numpy
+    except ImportError:
+        raise ImportError(
+            "numpy ist erforderlich für Sales Forecaster. "
+            "Installiere mit: pip install numpy"
+        ) from None
+    return numpy
+
+
+def _parse_date(value: str, default: Optional[datetime] = None) -> datetime:
+    """Parst ein Datum mit dateutil (Import erst beim ersten Aufruf)."""
+    from dateutil import parser as date_parser
+    return date_parser.parse(value, default=default)
+
+
+def parse_sales_dates(values: Sequence[Any]) -> "np.ndarray":
+    """
+    Parst alle Datumswerte einmalig zu einem datetime64[D]-Array.
+
+    ISO-Formate ("YYYY-MM", "YYYY-MM-DD", "YYYY-MM-DDTHH:MM") parst numpy in
+    einem Schritt. Nur bei abweichenden Formaten ("15.01.2024", "Jan 2024")
+    wird dateutil genutzt - einmal pro eindeutigem Wert, fehlende Tage
+    werden mit dem Monatsersten aufgefüllt.
+
+    Args:
+        values: Datumswerte (typischerweise Strings)
+
+    Returns:
+        datetime64[D]-Array, ungültige Werte als NaT
+    """
+    np = _numpy()
+    try:
+        return np.array(values, dtype="datetime64[D]")
+    except (ValueError, TypeError):
+        pass
+
+    default = datetime.now().replace(day=1, hour=0, minute=0, second=0, microsecond=0)
+    parsed: Dict[Any, Any] = {}
+
+    def parse(value: Any) -> Any:
+        if isinstance(value, str):
+            try:
+                return np.datetime64(value, "D")
+            except ValueError:
+                pass
+        try:
+            return np.datetime64(_parse_date(value, default=default).date(), "D")
+        except (ValueError, TypeError, OverflowError):
+            return np.datetime64("NaT", "D")
+
+    days = []
+    for value in values:
+        try:
+            day = parsed[value]
+        except KeyError:
+            day = parsed[value] = parse(value)
+        except TypeError:               # nicht hashbar
+            day = parse(value)
+        days.append(day)
+    return np.array(days, dtype="datetime64[D]")
+
+
+class SalesDataError(ValueError):
+    """Ungültige historische Verkaufsdaten (Meldung + Markdown für den User)."""
+
+    def __init__(self, message: str, formatted_output: str = ""):
+        super().__init__(message)
+        self.formatted_output = formatted_output or (
+            f"# ❌ Forecast-Fehler\n\n**Validierung fehlgeschlagen**: {message}"
+        )
+
+
+def sales_columns(historical_sales: Sequence[dict]) -> Tuple["np.ndarray", "np.ndarray"]:
+    """
+    Wandelt Verkaufsdaten in chronologisch sortierte Spalten um.
+
+    Datumswerte werden genau einmal geparst, Validierung (Betrag, Datumsformat,
+    Zukunftsdaten) und Sortierung laufen als Array-Operationen.
+
+    Args:
+        historical_sales: [{"date": "2025-01", "amount": 120000}, ...]
+
+    Returns:
+        Tuple (dates als datetime64[D], amounts als float64)
+
+    Raises:
+        SalesDataError: Für den ersten ungültigen Datenpunkt
+    """
+    np = _numpy()
+
+    try:
+        raw_dates = [data['date'] for data in historical_sales]
+        raw_amounts = [data['amount'] for data in historical_sales]
+    except (KeyError, TypeError):
+        index = next(
+            i for i, data in enumerate(historical_sales)
+            if not isinstance(data, dict) or 'date' not in data or 'amount' not in data
+        )
+        raise SalesDataError(
+            f"Datenpunkt {index+1} fehlen 'date' oder 'amount'",
+            f"# ❌ Forecast-Fehler\n\n"
+            f"Datenpunkt {index+1} ist ungültig. Erwartetes Format:\n"
+            f'```json\n{{"date": "2025-01", "amount": 120000}}```'
+        ) from None
+
+    try:
+        amounts = np.array(raw_amounts, dtype=np.float64)
+    except (TypeError, ValueError):
+        amounts = np.array([_to_float(value) for value in raw_amounts], dtype=np.float64)
+    dates = parse_sales_dates(raw_dates)
+
+    # Alle Prüfungen gleichzeitig, gemeldet wird der erste ungültige Datenpunkt
+    not_finite = ~np.isfinite(amounts)
+    negative = amounts < 0
+    bad_date = np.isnat(dates)
+    future = dates > np.datetime64(datetime.now().date(), "D")
+    invalid = not_finite | negative | bad_date | future
+
+    if invalid.any():
+        i = int(np.argmax(invalid))
+        if not_finite[i]:
+            message = f"Ungültiger Verkaufsbetrag in Datenpunkt {i+1}: {raw_amounts[i]!r}"
+        elif negative[i]:
+            message = f"Verkaufsbetrag kann nicht negativ sein: {float(amounts[i])}"
+        elif bad_date[i]:
+            try:
+                _parse_date(raw_dates[i])
+                reason = "kein Kalenderdatum"
+            except Exception as e:
+                reason = str(e)
+            message = f"Ungültiges Datumsformat: {raw_dates[i]} ({reason})"
+        else:
+            message = f"Datum liegt in der Zukunft: {raw_dates[i]}"
+        raise SalesDataError(message)
+
+    # Sortiere chronologisch (stabil, nur wenn nötig)
+    if len(dates) > 1 and (dates[1:] < dates[:-1]).any():
+        order = np.argsort(dates, kind="stable")
+        dates, amounts = dates[order], amounts[order]
+
+    return dates, amounts
+
+
+def _to_float(value: Any) -> float:
+    """Betrag als float, ungültige Werte werden NaN (→ Validierungsfehler)."""
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return float("nan")
+
 
 @dataclass
 class SalesDataPoint:
@@ -52,7 +203,7 @@ class SalesDataPoint:
 
         # Prüfe Datum
         try:
-            parsed_date = date_parser.parse(self.date)
+            parsed_date = _parse_date(self.date)
             # Akzeptiere nur Daten bis heute
             if parsed_date > datetime.now():
                 return False, f"Datum liegt in der Zukunft: {self.date}"
@@ -63,7 +214,7 @@ class SalesDataPoint:
 
     def get_parsed_date(self) -> datetime:
         """Parsed Datum als datetime-Objekt."""
-        return date_parser.parse(self.date)
+        return _parse_date(self.date)
 
 
 @dataclass
@@ -98,31 +249,53 @@ class SalesForecastResult:
     volatility_percentage: float
     trend_slope: float
     r_squared: float
+    forecast_method: str = "linear"     # "linear", "simple", "double", "triple"
+
+
+# Prognose-Methoden: lineare Regression oder exponentielle Glättung ("auto" = Holdout-Auswahl)
+FORECAST_METHODS = ("linear", "simple", "double", "triple", "auto")
+
+METHOD_LABELS = {
+    "linear": "Lineare Regression",
+    "simple": "Exponentielle Glättung (einfach)",
+    "double": "Holt (Niveau + Trend)",
+    "triple": "Holt-Winters (Niveau + Trend + Saison)",
+    "auto": "Auto (Holdout-Auswahl)",
+}
 
 
-def _calculate_trend(sales_data: List[SalesDataPoint]) -> Tuple[float, float, float]:
+def _calculate_trend(amounts: "np.ndarray") -> Tuple[float, float, float]:
     """
     Berechnet Trend mittels linearer Regression.
 
+    Geschlossene Form über den Zeitindex x = 0, 1, 2, ... (zentriert, O(n)
+    ohne Design-Matrix wie bei np.polyfit).
+
     Args:
-        sales_data: Liste von Verkaufsdaten (chronologisch sortiert)
+        amounts: Verkaufsbeträge als float-Array (chronologisch sortiert)
 
     Returns:
         Tuple[float, float, float]: (slope, intercept, r_squared)
     """
-    # X-Werte: 0, 1, 2, ... (Zeitindex)
-    x = np.arange(len(sales_data))
+    np = _numpy()
+
+    n = len(amounts)
+    x_mean = (n - 1) / 2
+    y_mean = float(amounts.mean())
 
-    # Y-Werte: Verkaufsbeträge
-    y = np.array([point.amount for point in sales_data])
+    # Zentrierte Werte: Σ(x - x̄)² = n(n² - 1) / 12
+    x = np.arange(n, dtype=np.float64) - x_mean
+    y = amounts - y_mean
+    sxx = n * (n * n - 1) / 12
+    sxy = float(x @ y)
 
     # Lineare Regression: y = slope * x + intercept
-    slope, intercept = np.polyfit(x, y, 1)
+    slope = sxy / sxx
+    intercept = y_mean - slope * x_mean
 
-    # R² berechnen (Bestimmtheitsmaß)
-    y_pred = slope * x + intercept
-    ss_res = np.sum((y - y_pred) ** 2)  # Sum of Squares Residual
-    ss_tot = np.sum((y - np.mean(y)) ** 2)  # Total Sum of Squares
+    # R² berechnen (Bestimmtheitsmaß): SS_res = SS_tot - slope * Sxy
+    ss_tot = float(y @ y)
+    ss_res = ss_tot - slope * sxy
 
     r_squared = 1 - (ss_res / ss_tot) if ss_tot != 0 else 0
     r_squared = max(0, min(1, r_squared))  # Clamp zwischen 0 und 1
@@ -130,68 +303,80 @@ def _calculate_trend(sales_data: List[SalesDataPoint]) -> Tuple[float, float, fl
     return float(slope), float(intercept), float(r_squared)
 
 
-def _calculate_seasonality_factors(sales_data: List[SalesDataPoint]) -> Optional[List[float]]:
+def _calculate_seasonality_factors(dates: "np.ndarray", amounts: "np.ndarray") -> Optional["np.ndarray"]:
     """
     Berechnet monatliche Saisonalitäts-Faktoren.
 
     Benötigt mindestens 12 Monate Daten.
 
     Args:
-        sales_data: Liste von Verkaufsdaten
+        dates: Datumswerte als datetime64-Array
+        amounts: Verkaufsbeträge als float-Array
 
     Returns:
-        Liste von 12 Faktoren (einer pro Monat), oder None wenn zu wenig Daten
+        Array von 12 Faktoren (einer pro Monat, Index 0 = Januar), oder None wenn zu wenig Daten
     """
-    if len(sales_data) < 12:
+    if len(amounts) < 12:
         return None
 
-    # Gruppiere nach Monat (1-12)
-    monthly_groups = {i: [] for i in range(1, 13)}
+    np = _numpy()
+
+    # Gruppiere nach Monat (0-11): Monate seit 1970-01 modulo 12
+    months = dates.astype("datetime64[M]").astype(np.int64) % 12
+    return _seasonality_from_monthly_sums(
+        np.bincount(months, weights=amounts, minlength=12),
+        np.bincount(months, minlength=12)
+    )
+
+
+def _seasonality_from_monthly_sums(sums: "np.ndarray", counts: "np.ndarray") -> Optional["np.ndarray"]:
+    """
+    Saisonalitäts-Faktoren aus Summe und Anzahl pro Kalendermonat.
 
-    for point in sales_data:
-        month = point.get_parsed_date().month
-        monthly_groups[month].append(point.amount)
+    Args:
+        sums: Umsatzsumme pro Monat (Index 0 = Januar)
+        counts: Anzahl Datenpunkte pro Monat
 
-    # Berechne Durchschnitt pro Monat
-    monthly_averages = {}
-    for month, amounts in monthly_groups.items():
-        if amounts:
-            monthly_averages[month] = np.mean(amounts)
+    Returns:
+        Array von 12 Faktoren, oder None wenn nicht alle Monate vorhanden
+    """
+    np = _numpy()
 
     # Wenn nicht alle Monate vorhanden, keine Saisonalität
-    if len(monthly_averages) < 12:
+    if (counts == 0).any():
         return None
 
-    # Gesamt-Durchschnitt
-    overall_avg = np.mean(list(monthly_averages.values()))
+    # Durchschnitt pro Monat und Gesamt-Durchschnitt
+    monthly_averages = sums / counts
+    overall_avg = monthly_averages.mean()
 
     # Faktoren berechnen (relativ zu Gesamt-Durchschnitt)
-    factors = []
-    for month in range(1, 13):
-        factor = monthly_averages[month] / overall_avg if overall_avg != 0 else 1.0
-        factors.append(factor)
-
-    return factors
+    if overall_avg == 0:
+        return np.ones(12)
+    return monthly_averages / overall_avg
 
 
 def _calculate_confidence_intervals(
-    predicted: float,
+    predicted: "np.ndarray",
     std_dev: float,
-    months_ahead: int
-) -> Tuple[float, float]:
+    months_ahead: "np.ndarray"
+) -> Tuple["np.ndarray", "np.ndarray"]:
     """
-    Berechnet 95%-Konfidenzintervall für Prognose.
+    Berechnet 95%-Konfidenzintervalle für Prognosen.
 
-    Das Intervall wächst mit der Prognose-Distanz.
+    Das Intervall wächst mit der Prognose-Distanz. Funktioniert für
+    einzelne Werte und für Arrays (ein Intervall pro Prognosemonat).
 
     Args:
-        predicted: Prognostizierter Wert
+        predicted: Prognostizierte Werte
         std_dev: Standardabweichung der historischen Daten
-        months_ahead: Anzahl Monate in die Zukunft
+        months_ahead: Anzahl Monate in die Zukunft (passend zu predicted)
 
     Returns:
-        Tuple[float, float]: (lower_bound, upper_bound)
+        Tuple (lower_bound, upper_bound)
     """
+    np = _numpy()
+
     # Z-Score für 95% Konfidenz
     z_score = 1.96
 
@@ -201,7 +386,7 @@ def _calculate_confidence_intervals(
     # Margin of Error
     margin = z_score * std_dev * confidence_factor
 
-    lower = max(0, predicted - margin)  # Keine negativen Verkäufe
+    lower = np.maximum(0, predicted - margin)  # Keine negativen Verkäufe
     upper = predicted + margin
 
     return lower, upper
@@ -430,7 +615,8 @@ def _check_forecast_warnings(
 
 def _format_forecast_output(
     result: SalesForecastResult,
-    historical_data: List[dict],
+    dates: "np.ndarray",
+    amounts: "np.ndarray",
     include_seasonality: bool
 ) -> str:
     """
@@ -438,7 +624,8 @@ def _format_forecast_output(
 
     Args:
         result: Forecast-Ergebnis
-        historical_data: Historische Verkaufsdaten
+        dates: Validierte, sortierte Datumswerte (aus sales_columns)
+        amounts: Validierte Beträge als float64 (aus sales_columns)
         include_seasonality: Wurde Saisonalität berücksichtigt?
 
     Returns:
@@ -453,7 +640,7 @@ def _format_forecast_output(
     growth_indicator = f"+{result.growth_rate_percentage:.2f}%" if result.growth_rate_percentage >= 0 else f"{result.growth_rate_percentage:.2f}%"
 
     summary = (
-        f"Basierend auf **{len(historical_data)} Monaten** historischer Daten zeigen die Verkäufe "
+        f"Basierend auf **{len(amounts)} Monaten** historischer Daten zeigen die Verkäufe "
         f"einen **{result.trend_direction}** Trend {trend_emoji} mit "
         f"**{result.trend_strength}** Stärke (R²={result.r_squared:.2f}). "
         f"Prognostiziertes Wachstum: **{growth_indicator}**. "
@@ -472,10 +659,9 @@ def _format_forecast_output(
     output += f"- **Minimum**: {_format_currency(result.historical_min)}\n"
     output += f"- **Maximum**: {_format_currency(result.historical_max)}\n"
 
-    first_date = historical_data[0]['date']
-    last_date = historical_data[-1]['date']
+    first_date, last_date = _numpy().datetime_as_string(dates[[0, -1]], unit="M")
     output += f"- **Zeitraum**: {first_date} bis {last_date}\n"
-    output += f"- **Datenpunkte**: {len(historical_data)} Monate\n"
+    output += f"- **Datenpunkte**: {len(amounts)} Monate\n"
     output += f"- **Volatilität**: {result.volatility_percentage:.1f}% (CoV)\n\n"
 
     # Trend-Analyse
@@ -500,6 +686,9 @@ def _format_forecast_output(
     elif include_seasonality:
         output += f"| **Saisonalität** | Nicht erkennbar | Zu wenig Daten |\n"
 
+    if result.forecast_method != "linear":
+        output += f"| **Methode** | {METHOD_LABELS[result.forecast_method]} | Exponentielle Glättung |\n"
+
     output += "\n"
 
     # Prognose-Tabelle
@@ -520,7 +709,7 @@ def _format_forecast_output(
     # Visualisierung
     output += "## 📊 Visualisierung\n\n"
     output += "```\n"
-    output += _create_forecast_chart(historical_data, result.forecasts)
+    output += _create_forecast_chart(amounts, result.forecasts)
     output += "```\n\n"
 
     # Interpretation
@@ -573,9 +762,10 @@ def _format_forecast_output(
     raw_data = {
         "tool": "sales_forecaster",
         "input": {
-            "historical_data_points": len(historical_data),
+            "historical_data_points": len(amounts),
             "forecast_months": len(result.forecasts),
-            "seasonality_included": include_seasonality
+            "seasonality_included": include_seasonality,
+            "method": result.forecast_method
         },
         "historical_stats": {
             "average": round(result.historical_average, 2),
@@ -613,21 +803,21 @@ def _format_forecast_output(
 
 
 def _create_forecast_chart(
-    historical_data: List[dict],
+    amounts: "np.ndarray",
     forecasts: List[ForecastDataPoint]
 ) -> str:
     """
     Erstellt ASCII-Chart mit historischen Daten + Prognosen.
 
     Args:
-        historical_data: Historische Verkaufsdaten
+        amounts: Validierte historische Beträge (chronologisch)
         forecasts: Prognosen
 
     Returns:
         ASCII-Chart als String
     """
     # Kombiniere alle Datenpunkte
-    all_amounts = [d['amount'] for d in historical_data] + [f.predicted_amount for f in forecasts]
+    all_amounts = amounts.tolist() + [f.predicted_amount for f in forecasts]
     min_amount = min(all_amounts)
     max_amount = max(all_amounts)
     amount_range = max_amount - min_amount if max_amount != min_amount else max_amount
@@ -641,12 +831,12 @@ def _create_forecast_chart(
         chart += f"{_format_currency(value):>12} │"
 
         # Zeige Datenpunkte auf diesem Level
-        for j, data in enumerate(historical_data + [{"amount": f.predicted_amount, "date": f.date} for f in forecasts]):
-            normalized = (data['amount'] - min_amount) / amount_range if amount_range > 0 else 0.5
+        for j, amount in enumerate(all_amounts):
+            normalized = (amount - min_amount) / amount_range if amount_range > 0 else 0.5
             level_normalized = i / levels
 
             if abs(normalized - level_normalized) < 0.1:
-                if j < len(historical_data):
+                if j < len(amounts):
                     chart += "●"  # Historisch
                 else:
                     chart += "○"  # Prognose
@@ -656,8 +846,8 @@ def _create_forecast_chart(
         chart += "\n"
 
     # X-Achse
-    chart += " " * 13 + "└" + "─" * (len(historical_data) + len(forecasts)) + "\n"
-    chart += " " * 14 + "←" + f" {len(historical_data)} hist " + "| " + f"{len(forecasts)} forecast →" + "\n\n"
+    chart += " " * 13 + "└" + "─" * len(all_amounts) + "\n"
+    chart += " " * 14 + "←" + f" {len(amounts)} hist " + "| " + f"{len(forecasts)} forecast →" + "\n\n"
 
     chart += "Legende: ● = Historische Daten | ○ = Prognose\n"
 
@@ -678,17 +868,266 @@ def _format_percentage(value: float) -> str:
     return f"{value:.2f}%"
 
 
+def forecast_from_statistics(
+    data_points: int,
+    historical_avg: float,
+    historical_min: float,
+    historical_max: float,
+    std_dev: float,
+    slope: float,
+    intercept: float,
+    r_squared: float,
+    seasonality_factors: Optional["np.ndarray"],
+    last_date: "np.datetime64",
+    forecast_months: int
+) -> SalesForecastResult:
+    """
+    Erstellt Prognosen, Klassifikation, Empfehlung und Warnungen aus
+    verdichteten Kennzahlen.
+
+    Gemeinsamer Schluss von build_sales_forecast und dem inkrementellen
+    OnlineSalesForecaster - beide liefern damit dieselben Ergebnisfelder.
+
+    Args:
+        data_points: Anzahl historischer Datenpunkte (Trend-Index 0..n-1)
+        historical_avg: Durchschnitt der Verkäufe
+        historical_min: Minimum der Verkäufe
+        historical_max: Maximum der Verkäufe
+        std_dev: Standardabweichung (Population)
+        slope: Trend-Steigung pro Datenpunkt
+        intercept: Trend-Achsenabschnitt bei Index 0
+        r_squared: Bestimmtheitsmaß (0-1)
+        seasonality_factors: 12 Monatsfaktoren (Index 0 = Januar) oder None
+        last_date: Letztes historisches Datum
+        forecast_months: Anzahl Monate für Prognose
+
+    Returns:
+        SalesForecastResult inkl. Empfehlung und Warnungen
+    """
+    np = _numpy()
+
+    # Basis-Prognose aus Trend-Linie (Kalendermonate nach dem letzten Datum)
+    months_ahead = np.arange(1, forecast_months + 1)
+    predicted = slope * (data_points + months_ahead - 1) + intercept
+
+    # Saisonalitäts-Anpassung
+    if seasonality_factors is not None:
+        forecast_months_index = (np.datetime64(last_date, "M") + months_ahead).astype(np.int64) % 12
+        predicted = predicted * seasonality_factors[forecast_months_index]
+
+    return forecast_from_predictions(
+        data_points=data_points,
+        historical_avg=historical_avg,
+        historical_min=historical_min,
+        historical_max=historical_max,
+        std_dev=std_dev,
+        slope=slope,
+        r_squared=r_squared,
+        predicted=predicted,
+        last_date=last_date,
+        seasonality_detected=seasonality_factors is not None
+    )
+
+
+def forecast_from_predictions(
+    data_points: int,
+    historical_avg: float,
+    historical_min: float,
+    historical_max: float,
+    std_dev: float,
+    slope: float,
+    r_squared: float,
+    predicted: "np.ndarray",
+    last_date: "np.datetime64",
+    seasonality_detected: bool,
+    interval_std: Optional[float] = None,
+    forecast_method: str = "linear"
+) -> SalesForecastResult:
+    """
+    Baut das SalesForecastResult aus fertigen Prognosewerten.
+
+    Gemeinsam für lineare Regression und exponentielle Glättung: Klassifikation,
+    Konfidenzintervalle, Konfidenz-Score, Empfehlung und Warnungen.
+
+    Args:
+        data_points: Anzahl historischer Datenpunkte
+        historical_avg: Durchschnitt der Verkäufe
+        historical_min: Minimum der Verkäufe
+        historical_max: Maximum der Verkäufe
+        std_dev: Standardabweichung der Verkäufe (Volatilität)
+        slope: Trend pro Monat (Regression bzw. geglätteter Trend)
+        r_squared: Bestimmtheitsmaß (0-1)
+        predicted: Prognosewerte, einer pro Monat nach last_date
+        last_date: Letztes historisches Datum
+        seasonality_detected: Saisonalität in der Prognose enthalten?
+        interval_std: Streuung für die Konfidenzintervalle (Default: std_dev)
+        forecast_method: Verwendete Methode (siehe FORECAST_METHODS)
+
+    Returns:
+        SalesForecastResult inkl. Empfehlung und Warnungen
+    """
+    np = _numpy()
+    n = data_points
+    if interval_std is None:
+        interval_std = std_dev
+
+    # Volatilität als Coefficient of Variation (CoV)
+    volatility_pct = (std_dev / historical_avg * 100) if historical_avg != 0 else 0
+
+    # Trend-Richtung bestimmen
+    # Normalisiere Slope relativ zum Durchschnitt
+    normalized_slope = (slope / historical_avg * 100) if historical_avg != 0 else 0
+
+    if normalized_slope > 0.5:  # > 0.5% Wachstum pro Monat
+        trend_direction = "upward"
+    elif normalized_slope < -0.5:  # < -0.5% Rückgang pro Monat
+        trend_direction = "downward"
+    else:
+        trend_direction = "stable"
+
+    # Trend-Stärke basierend auf R²
+    if r_squared > 0.7:
+        trend_strength = "strong"
+    elif r_squared > 0.4:
+        trend_strength = "moderate"
+    else:
+        trend_strength = "weak"
+
+    # Prognosen für alle Monate auf einmal (Kalendermonate nach dem letzten Datum)
+    months_ahead = np.arange(1, len(predicted) + 1)
+    forecast_dates = np.datetime64(last_date, "M") + months_ahead
+
+    # Konfidenzintervalle und Confidence Level
+    lower, upper = _calculate_confidence_intervals(predicted, interval_std, months_ahead)
+    conf_levels = np.where(months_ahead <= 3, "high", np.where(months_ahead <= 6, "medium", "low"))
+
+    predicted = np.round(predicted, 2)
+    forecasts = [
+        ForecastDataPoint(
+            date=date_str,
+            predicted_amount=amount,
+            confidence_level=level,
+            lower_bound=low,
+            upper_bound=high
+        )
+        for date_str, amount, level, low, high in zip(
+            np.datetime_as_string(forecast_dates, unit="M").tolist(),
+            predicted.tolist(),
+            conf_levels.tolist(),
+            np.round(lower, 2).tolist(),
+            np.round(upper, 2).tolist()
+        )
+    ]
+
+    # Gesamt-Statistiken
+    forecast_avg = float(predicted.mean())
+
+    # Wachstumsrate
+    growth_rate = ((forecast_avg - historical_avg) / historical_avg * 100) if historical_avg != 0 else 0
+
+    # Konfidenz-Score
+    confidence_score = _calculate_forecast_confidence(
+        data_points=n,
+        r_squared=r_squared,
+        volatility=volatility_pct
+    )
+
+    # Ergebnis erstellen
+    result = SalesForecastResult(
+        forecasts=forecasts,
+        historical_average=round(historical_avg, 2),
+        forecast_average=round(forecast_avg, 2),
+        growth_rate_percentage=round(growth_rate, 2),
+        trend_direction=trend_direction,
+        trend_strength=trend_strength,
+        confidence_score=confidence_score,
+        seasonality_detected=seasonality_detected,
+        recommendation="",  # Wird gleich gesetzt
+        warnings=[],        # Wird gleich gesetzt
+        historical_min=round(historical_min, 2),
+        historical_max=round(historical_max, 2),
+        volatility_percentage=round(volatility_pct, 2),
+        trend_slope=round(slope, 2),
+        r_squared=round(r_squared, 3),
+        forecast_method=forecast_method
+    )
+
+    # Empfehlung generieren
+    result.recommendation = _generate_forecast_recommendation(result)
+
+    # Warnungen prüfen
+    result.warnings = _check_forecast_warnings(result, n, volatility_pct)
+
+    return result
+
+
+def build_sales_forecast(
+    dates: "np.ndarray",
+    amounts: "np.ndarray",
+    forecast_months: int,
+    include_seasonality: bool = False
+) -> SalesForecastResult:
+    """
+    Erstellt die Prognose aus validierten, chronologisch sortierten Spalten.
+
+    Alle Schritte (Statistiken, Trend, Saisonalität, Prognosen und
+    Konfidenzintervalle) laufen als Array-Operationen - auch für Historien
+    mit 100k+ Datenpunkten.
+
+    Args:
+        dates: Datumswerte als datetime64[D]-Array (siehe sales_columns)
+        amounts: Verkaufsbeträge als float64-Array
+        forecast_months: Anzahl Monate für Prognose
+        include_seasonality: Saisonalitäts-Adjustment (benötigt >= 12 Datenpunkte)
+
+    Returns:
+        SalesForecastResult inkl. Empfehlung und Warnungen
+    """
+    n = len(amounts)
+
+    # 1. Historische Daten analysieren
+    historical_avg = float(amounts.mean())
+    historical_min = float(amounts.min())
+    historical_max = float(amounts.max())
+    std_dev = float(amounts.std())
+
+    # 2. Trend-Analyse (Lineare Regression)
+    slope, intercept, r_squared = _calculate_trend(amounts)
+
+    # 3. Saisonalität berechnen (optional)
+    seasonality_factors = None
+    if include_seasonality:
+        seasonality_factors = _calculate_seasonality_factors(dates, amounts)
+
+    return forecast_from_statistics(
+        data_points=n,
+        historical_avg=historical_avg,
+        historical_min=historical_min,
+        historical_max=historical_max,
+        std_dev=std_dev,
+        slope=slope,
+        intercept=intercept,
+        r_squared=r_squared,
+        seasonality_factors=seasonality_factors,
+        last_date=dates[-1],
+        forecast_months=forecast_months
+    )
+
+
 # Haupt-Tool-Funktion
 async def forecast_sales(
     historical_sales: List[dict],
     forecast_months: int,
-    include_seasonality: bool = False
+    include_seasonality: bool = False,
+    render: bool = True,
+    method: str = "linear",
+    backtest: bool = False
 ) -> dict[str, Any]:
     """
     Erstellt Verkaufsprognose mit Trend-Analyse.
 
     Diese Funktion analysiert historische Verkaufsdaten und erstellt Prognosen mit:
-    - Linearer Regression für Trend
+    - Linearer Regression für Trend (oder exponentieller Glättung, siehe method)
     - Konfidenzintervallen (95%)
     - Optional: Saisonalitäts-Anpassung
     - Wachstumsraten und Volatilität
@@ -700,6 +1139,12 @@ async def forecast_sales(
             Min. 3 Datenpunkte erforderlich
         forecast_months: Anzahl Monate für Prognose (1-24, optimal 1-12)
         include_seasonality: Optional Saisonalitäts-Adjustment (benötigt >= 12 Monate Daten)
+        render: Markdown-Report erstellen (False = nur Kennzahlen, z.B. für Batch-Läufe)
+        method: "linear" (Default), "simple", "double", "triple" (Holt-Winters)
+            oder "auto" (Glättungsmodell mit kleinstem Holdout-Fehler).
+            include_seasonality gilt nur für "linear".
+        backtest: Out-of-Sample-Genauigkeit aller Methoden per Rolling-Origin-Backtest
+            (MAPE, sMAPE, RMSE, Intervall-Abdeckung) in result["backtest"]
 
     Returns:
         Dictionary mit:
@@ -750,161 +1195,65 @@ async def forecast_sales(
             )
         }
 
-    # Konvertiere zu SalesDataPoint und validiere
-    sales_data = []
-    for i, data in enumerate(historical_sales):
-        if 'date' not in data or 'amount' not in data:
-            return {
-                "error": f"Datenpunkt {i+1} fehlen 'date' oder 'amount'",
-                "formatted_output": (
-                    f"# ❌ Forecast-Fehler\n\n"
-                    f"Datenpunkt {i+1} ist ungültig. Erwartetes Format:\n"
-                    f'```json\n{{"date": "2025-01", "amount": 120000}}```'
-                )
-            }
-
-        point = SalesDataPoint(date=data['date'], amount=float(data['amount']))
-        is_valid, error_msg = point.validate()
-
-        if not is_valid:
-            return {
-                "error": error_msg,
-                "formatted_output": f"# ❌ Forecast-Fehler\n\n**Validierung fehlgeschlagen**: {error_msg}"
-            }
-
-        sales_data.append(point)
-
-    # Sortiere chronologisch
-    sales_data.sort(key=lambda x: x.get_parsed_date())
-
-    # 2. Historische Daten analysieren
-    amounts = np.array([point.amount for point in sales_data])
-
-    historical_avg = float(np.mean(amounts))
-    historical_min = float(np.min(amounts))
-    historical_max = float(np.max(amounts))
-    std_dev = float(np.std(amounts))
-
-    # Volatilität als Coefficient of Variation (CoV)
-    volatility_pct = (std_dev / historical_avg * 100) if historical_avg != 0 else 0
-
-    # 3. Trend-Analyse (Lineare Regression)
-    slope, intercept, r_squared = _calculate_trend(sales_data)
-
-    # Trend-Richtung bestimmen
-    # Normalisiere Slope relativ zum Durchschnitt
-    normalized_slope = (slope / historical_avg * 100) if historical_avg != 0 else 0
-
-    if normalized_slope > 0.5:  # > 0.5% Wachstum pro Monat
-        trend_direction = "upward"
-    elif normalized_slope < -0.5:  # < -0.5% Rückgang pro Monat
-        trend_direction = "downward"
-    else:
-        trend_direction = "stable"
-
-    # Trend-Stärke basierend auf R²
-    if r_squared > 0.7:
-        trend_strength = "strong"
-    elif r_squared > 0.4:
-        trend_strength = "moderate"
-    else:
-        trend_strength = "weak"
+    if method not in FORECAST_METHODS:
+        return {
+            "error": f"Unbekannte Prognose-Methode: {method}",
+            "formatted_output": (
+                "# ❌ Forecast-Fehler\n\n"
+                f"Unbekannte Prognose-Methode **{method}**. Erlaubt: {', '.join(FORECAST_METHODS)}."
+            )
+        }
 
-    # 4. Saisonalität berechnen (optional)
-    seasonality_factors = None
-    seasonality_detected = False
-
-    if include_seasonality and len(sales_data) >= 12:
-        seasonality_factors = _calculate_seasonality_factors(sales_data)
-        if seasonality_factors:
-            seasonality_detected = True
-
-    # 5. Prognosen generieren
-    forecasts = []
-    last_date = sales_data[-1].get_parsed_date()
-
-    for month_ahead in range(1, forecast_months + 1):
-        # Nächstes Datum
-        forecast_date = last_date + timedelta(days=30 * month_ahead)
-        date_str = forecast_date.strftime("%Y-%m")
-
-        # Basis-Prognose aus Trend-Linie
-        t = len(sales_data) + month_ahead - 1
-        predicted = slope * t + intercept
-
-        # Saisonalitäts-Anpassung
-        if seasonality_factors:
-            month_index = forecast_date.month - 1  # 0-11
-            seasonal_factor = seasonality_factors[month_index]
-            predicted *= seasonal_factor
-
-        # Konfidenzintervall
-        lower, upper = _calculate_confidence_intervals(predicted, std_dev, month_ahead)
-
-        # Confidence Level
-        if month_ahead <= 3:
-            conf_level = "high"
-        elif month_ahead <= 6:
-            conf_level = "medium"
+    # Spalten bilden: Datumswerte einmal parsen, vektorisiert validieren und sortieren
+    try:
+        dates, amounts = sales_columns(historical_sales)
+        if method == "linear":
+            result = build_sales_forecast(dates, amounts, forecast_months, include_seasonality)
         else:
-            conf_level = "low"
-
-        forecast_point = ForecastDataPoint(
-            date=date_str,
-            predicted_amount=round(predicted, 2),
-            confidence_level=conf_level,
-            lower_bound=round(lower, 2),
-            upper_bound=round(upper, 2)
-        )
-
-        forecasts.append(forecast_point)
-
-    # 6. Gesamt-Statistiken
-    forecast_avg = np.mean([f.predicted_amount for f in forecasts])
-
-    # Wachstumsrate
-    growth_rate = ((forecast_avg - historical_avg) / historical_avg * 100) if historical_avg != 0 else 0
-
-    # 7. Konfidenz-Score
-    confidence_score = _calculate_forecast_confidence(
-        data_points=len(sales_data),
-        r_squared=r_squared,
-        volatility=volatility_pct
-    )
-
-    # 8. Ergebnis erstellen
-    result = SalesForecastResult(
-        forecasts=forecasts,
-        historical_average=round(historical_avg, 2),
-        forecast_average=round(forecast_avg, 2),
-        growth_rate_percentage=round(growth_rate, 2),
-        trend_direction=trend_direction,
-        trend_strength=trend_strength,
-        confidence_score=confidence_score,
-        seasonality_detected=seasonality_detected,
-        recommendation="",  # Wird gleich gesetzt
-        warnings=[],        # Wird gleich gesetzt
-        historical_min=round(historical_min, 2),
-        historical_max=round(historical_max, 2),
-        volatility_percentage=round(volatility_pct, 2),
-        trend_slope=round(slope, 2),
-        r_squared=round(r_squared, 3)
-    )
-
-    # 9. Empfehlung generieren
-    result.recommendation = _generate_forecast_recommendation(result)
-
-    # 10. Warnungen prüfen
-    result.warnings = _check_forecast_warnings(result, len(sales_data), volatility_pct)
-
-    # 11. Output formatieren
-    markdown_output = _format_forecast_output(result, historical_sales, include_seasonality)
-
-    return {
-        "result": asdict(result),
-        "formatted_output": markdown_output,
-        "success": True
-    }
+            from tools.sales_forecast_smoothing import build_smoothing_forecast
+            result = build_smoothing_forecast(dates, amounts, forecast_months, method)
+    except SalesDataError as e:
+        return {"error": str(e), "formatted_output": e.formatted_output}
+
+    response = {"result": asdict(result), "success": True}
+
+    # Backtest: gemessene statt geschätzter Prognosegüte, alle Methoden nebeneinander
+    report = None
+    if backtest:
+        from tools.sales_forecast_backtest import BACKTEST_METHODS, backtest_columns
+        methods = BACKTEST_METHODS + (("auto",) if method == "auto" else ())
+        try:
+            report = backtest_columns(dates, amounts, forecast_months, methods, include_seasonality=include_seasonality)
+        except ValueError:
+            pass  # Zu wenig Daten für einen Backtest
+        response["result"]["backtest"] = report.to_dict() if report else None
+
+    # Output formatieren
+    if render:
+        response["formatted_output"] = _format_forecast_output(result, dates, amounts, include_seasonality)
+        if report:
+            from tools.sales_forecast_backtest import _format_backtest_output
+            response["formatted_output"] += _format_backtest_output(report, method)
+
+    return response
+
+
+# Prognose-Kennzahlen für den model-facing Payload
+MODEL_PAYLOAD_FIELDS = (
+    "forecasts",
+    "historical_average",
+    "forecast_average",
+    "growth_rate_percentage",
+    "trend_direction",
+    "trend_strength",
+    "confidence_score",
+    "seasonality_detected",
+    "volatility_percentage",
+    "r_squared",
+    "forecast_method",
+    "backtest",
+    "warnings",
+)
 
 
 # Tool-Definition für Claude Agent SDK
@@ -924,7 +1273,8 @@ def get_sales_forecaster_tool_definition() -> dict:
             "- 'Wie entwickeln sich die Verkäufe?'\n"
             "- Umsatzplanung, Revenue Forecasting\n"
             "- Trend-Analysen, Wachstumsprognosen\n\n"
-            "Das Tool nutzt lineare Regression mit optionaler Saisonalitäts-Anpassung."
+            "Das Tool nutzt lineare Regression mit optionaler Saisonalitäts-Anpassung "
+            "oder exponentielle Glättung (Holt-Winters, 'auto' wählt das Modell per Holdout-Test)."
         ),
         "input_schema": {
             "type": "object",
@@ -952,6 +1302,24 @@ def get_sales_forecaster_tool_definition() -> dict:
                     "type": "boolean",
                     "description": "Saisonalität berücksichtigen? (benötigt >= 12 Monate Daten)",
                     "default": False
+                },
+                "method": {
+                    "type": "string",
+                    "enum": list(FORECAST_METHODS),
+                    "description": (
+                        "Prognose-Methode: 'linear' (Trend-Linie), 'simple'/'double'/'triple' "
+                        "(exponentielle Glättung, 'triple' = Holt-Winters mit Saison, >= 24 Monate) "
+                        "oder 'auto' (bestes Glättungsmodell per Holdout-Test)"
+                    ),
+                    "default": "linear"
+                },
+                "backtest": {
+                    "type": "boolean",
+                    "description": (
+                        "Prognosegüte per Backtest messen (MAPE, sMAPE, RMSE, Abdeckung der "
+                        "95%-Intervalle für alle Methoden) - sinnvoll bei Fragen zur Verlässlichkeit"
+                    ),
+                    "default": False
                 }
             },
             "required": ["historical_sales", "forecast_months"]
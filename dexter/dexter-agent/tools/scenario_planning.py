@@ -20,7 +20,6 @@ Version: 1.0.0
 from dataclasses import dataclass, field
 from typing import Any, Optional, List, Dict
 from enum import Enum
-import asyncio
 
 
 # ============================================================================